@@ -0,0 +1,19 @@
+-- CreateTable
+CREATE TABLE "auth_refresh_token_family" (
+    "id" VARCHAR(36) NOT NULL,
+    "user_id" INTEGER NOT NULL,
+    "karyawan_id" INTEGER NOT NULL,
+    "generation" INTEGER NOT NULL DEFAULT 0,
+    "revoked_at" TIMESTAMPTZ,
+    "expires_at" TIMESTAMPTZ NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL,
+
+    CONSTRAINT "auth_refresh_token_family_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE INDEX "idx_auth_refresh_token_family_karyawan_id" ON "auth_refresh_token_family"("karyawan_id");
+
+-- CreateIndex
+CREATE INDEX "idx_auth_refresh_token_family_expires_at" ON "auth_refresh_token_family"("expires_at");
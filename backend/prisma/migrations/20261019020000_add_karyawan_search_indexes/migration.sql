@@ -0,0 +1,11 @@
+-- CreateExtension
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- CreateIndex
+CREATE INDEX "idx_master_karyawan_nama_lengkap_id" ON "master_karyawan"("nama_lengkap", "id");
+
+-- CreateIndex
+CREATE INDEX "idx_master_karyawan_nama_lengkap_trgm" ON "master_karyawan" USING GIN ("nama_lengkap" gin_trgm_ops);
+
+-- CreateIndex
+CREATE INDEX "idx_master_karyawan_nik_trgm" ON "master_karyawan" USING GIN ("nomor_induk_karyawan" gin_trgm_ops);
@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "idx_transaction_pesanan_approval_pending" ON "transaction_pesanan"("requires_approval", "approval_status");
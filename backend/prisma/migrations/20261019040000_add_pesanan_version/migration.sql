@@ -0,0 +1,2 @@
+-- AlterTable: optimistic concurrency version for order writes
+ALTER TABLE "transaction_pesanan" ADD COLUMN "version" INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,52 @@
+-- CreateSequence: global, monotonically increasing change version for orders
+CREATE SEQUENCE "transaction_pesanan_change_version_seq" AS INTEGER;
+
+-- AlterTable: existing rows receive distinct versions from the sequence
+ALTER TABLE "transaction_pesanan"
+  ADD COLUMN "change_version" INTEGER NOT NULL DEFAULT nextval('transaction_pesanan_change_version_seq');
+
+ALTER SEQUENCE "transaction_pesanan_change_version_seq" OWNED BY "transaction_pesanan"."change_version";
+
+-- CreateIndex
+CREATE INDEX "idx_transaction_pesanan_change_version" ON "transaction_pesanan"("change_version");
+
+-- Every UPDATE (status change, approval, edit, ...) takes a fresh version,
+-- including writes that bypass the Prisma client.
+CREATE FUNCTION "transaction_pesanan_bump_change_version"() RETURNS trigger AS $$
+BEGIN
+  NEW.change_version := nextval('transaction_pesanan_change_version_seq');
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "trg_transaction_pesanan_change_version"
+  BEFORE UPDATE ON "transaction_pesanan"
+  FOR EACH ROW EXECUTE FUNCTION "transaction_pesanan_bump_change_version"();
+
+-- CreateTable: tombstones for deleted orders, served by GET /orders/changes
+CREATE TABLE "transaction_pesanan_tombstone" (
+    "pesanan_id" INTEGER NOT NULL,
+    "karyawan_pemesan_id" INTEGER NOT NULL,
+    "change_version" INTEGER NOT NULL DEFAULT nextval('transaction_pesanan_change_version_seq'),
+    "deleted_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "transaction_pesanan_tombstone_pkey" PRIMARY KEY ("pesanan_id")
+);
+
+-- CreateIndex
+CREATE INDEX "idx_transaction_pesanan_tombstone_change_version" ON "transaction_pesanan_tombstone"("change_version");
+
+CREATE FUNCTION "transaction_pesanan_record_tombstone"() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO "transaction_pesanan_tombstone" ("pesanan_id", "karyawan_pemesan_id")
+  VALUES (OLD.id, OLD.karyawan_pemesan_id)
+  ON CONFLICT ("pesanan_id") DO UPDATE
+    SET "change_version" = nextval('transaction_pesanan_change_version_seq'),
+        "deleted_at" = CURRENT_TIMESTAMP;
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "trg_transaction_pesanan_tombstone"
+  AFTER DELETE ON "transaction_pesanan"
+  FOR EACH ROW EXECUTE FUNCTION "transaction_pesanan_record_tombstone"();
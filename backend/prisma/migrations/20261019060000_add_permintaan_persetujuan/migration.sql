@@ -0,0 +1,86 @@
+-- CreateEnum
+CREATE TYPE "ApprovalRequestType" AS ENUM ('REJECT', 'EDIT');
+
+-- CreateTable
+CREATE TABLE "transaction_permintaan_persetujuan" (
+    "id" SERIAL NOT NULL,
+    "pesanan_id" INTEGER NOT NULL,
+    "request_type" "ApprovalRequestType" NOT NULL,
+    "requested_by_id" INTEGER,
+    "jumlah_pesanan_awal" INTEGER NOT NULL,
+    "jumlah_pesanan_baru" INTEGER,
+    "catatan_dapur" TEXT NOT NULL,
+    "approval_status" "ApprovalStatus" NOT NULL DEFAULT 'PENDING',
+    "decided_by_id" INTEGER,
+    "catatan_admin" TEXT,
+    "requested_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "decided_at" TIMESTAMPTZ,
+
+    CONSTRAINT "transaction_permintaan_persetujuan_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE INDEX "idx_permintaan_persetujuan_pesanan_status" ON "transaction_permintaan_persetujuan"("pesanan_id", "approval_status");
+
+-- CreateIndex
+CREATE INDEX "idx_permintaan_persetujuan_requested_at" ON "transaction_permintaan_persetujuan"("requested_at");
+
+-- CreateIndex
+CREATE INDEX "idx_permintaan_persetujuan_status_requested_at" ON "transaction_permintaan_persetujuan"("approval_status", "requested_at");
+
+-- AddForeignKey
+ALTER TABLE "transaction_permintaan_persetujuan" ADD CONSTRAINT "transaction_permintaan_persetujuan_pesanan_id_fkey" FOREIGN KEY ("pesanan_id") REFERENCES "transaction_pesanan"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "transaction_permintaan_persetujuan" ADD CONSTRAINT "transaction_permintaan_persetujuan_requested_by_id_fkey" FOREIGN KEY ("requested_by_id") REFERENCES "master_karyawan"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "transaction_permintaan_persetujuan" ADD CONSTRAINT "transaction_permintaan_persetujuan_decided_by_id_fkey" FOREIGN KEY ("decided_by_id") REFERENCES "master_karyawan"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- Backfill: one request per order that already went through the approval workflow.
+-- Requester and type come from the request audit entry when it exists (one-off text
+-- scan at migration time), otherwise from the quantity heuristic used so far.
+INSERT INTO "transaction_permintaan_persetujuan" (
+    "pesanan_id", "request_type", "requested_by_id", "jumlah_pesanan_awal",
+    "jumlah_pesanan_baru", "catatan_dapur", "approval_status", "decided_by_id",
+    "catatan_admin", "requested_at", "decided_at"
+)
+SELECT
+    p."id",
+    t."request_type",
+    req."user_id",
+    COALESCE(p."jumlah_pesanan_awal", p."jumlah_pesanan"),
+    CASE WHEN t."request_type" = 'EDIT' THEN p."jumlah_pesanan" END,
+    COALESCE(p."catatan_dapur", ''),
+    p."approval_status",
+    p."approved_by_id",
+    p."catatan_admin",
+    COALESCE(req."timestamp", p."waktu_dibuat"),
+    CASE WHEN p."approval_status" <> 'PENDING' THEN dec."timestamp" END
+FROM "transaction_pesanan" p
+LEFT JOIN LATERAL (
+    SELECT a."user_id", a."aksi", a."timestamp"
+    FROM "log_audit_trail" a
+    WHERE a."aksi" IN ('ORDER_REJECTION_REQUESTED', 'ORDER_EDIT_REQUESTED')
+      AND a."detail" LIKE '%order ' || p."kode_pesanan" || ':%'
+    ORDER BY a."timestamp" DESC
+    LIMIT 1
+) req ON TRUE
+LEFT JOIN LATERAL (
+    SELECT a."timestamp"
+    FROM "log_audit_trail" a
+    WHERE a."aksi" = 'APPROVAL_DECIDED'
+      AND a."detail" LIKE '%order ' || p."kode_pesanan" || ':%'
+    ORDER BY a."timestamp" DESC
+    LIMIT 1
+) dec ON TRUE
+CROSS JOIN LATERAL (
+    SELECT (CASE
+        WHEN req."aksi" = 'ORDER_EDIT_REQUESTED' THEN 'EDIT'
+        WHEN req."aksi" = 'ORDER_REJECTION_REQUESTED' THEN 'REJECT'
+        WHEN p."jumlah_pesanan_awal" IS NOT NULL
+             AND p."jumlah_pesanan_awal" <> p."jumlah_pesanan" THEN 'EDIT'
+        ELSE 'REJECT'
+    END)::"ApprovalRequestType" AS "request_type"
+) t
+WHERE p."approval_status" IS NOT NULL;
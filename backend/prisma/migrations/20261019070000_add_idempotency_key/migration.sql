@@ -0,0 +1,17 @@
+-- CreateTable
+CREATE TABLE "api_idempotency_key" (
+    "karyawan_id" INTEGER NOT NULL,
+    "key" VARCHAR(255) NOT NULL,
+    "fingerprint" VARCHAR(64) NOT NULL,
+    "status_code" INTEGER,
+    "response" JSONB,
+    "completed_at" TIMESTAMPTZ,
+    "locked_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "expires_at" TIMESTAMPTZ NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "api_idempotency_key_pkey" PRIMARY KEY ("karyawan_id","key")
+);
+
+-- CreateIndex
+CREATE INDEX "idx_api_idempotency_key_expires_at" ON "api_idempotency_key"("expires_at");
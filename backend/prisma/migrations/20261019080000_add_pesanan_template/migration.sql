@@ -0,0 +1,26 @@
+-- CreateTable
+CREATE TABLE "transaction_pesanan_template" (
+    "id" SERIAL NOT NULL,
+    "karyawan_id" INTEGER NOT NULL,
+    "shift_id" INTEGER NOT NULL,
+    "jumlah_pesanan" INTEGER NOT NULL,
+    "hari_aktif" INTEGER[] DEFAULT ARRAY[1, 2, 3, 4, 5]::INTEGER[],
+    "is_active" BOOLEAN NOT NULL DEFAULT true,
+    "paused_until" DATE,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL,
+
+    CONSTRAINT "transaction_pesanan_template_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "transaction_pesanan_template_karyawan_id_shift_id_key" ON "transaction_pesanan_template"("karyawan_id", "shift_id");
+
+-- CreateIndex
+CREATE INDEX "idx_transaction_pesanan_template_is_active" ON "transaction_pesanan_template"("is_active");
+
+-- AddForeignKey
+ALTER TABLE "transaction_pesanan_template" ADD CONSTRAINT "transaction_pesanan_template_karyawan_id_fkey" FOREIGN KEY ("karyawan_id") REFERENCES "master_karyawan"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "transaction_pesanan_template" ADD CONSTRAINT "transaction_pesanan_template_shift_id_fkey" FOREIGN KEY ("shift_id") REFERENCES "master_shift"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
@@ -0,0 +1,103 @@
+-- CreateTable: cold storage for finalised orders, same columns as transaction_pesanan
+CREATE TABLE "transaction_pesanan_archive" (
+    "id" INTEGER NOT NULL,
+    "kode_pesanan" VARCHAR(20) NOT NULL,
+    "karyawan_pemesan_id" INTEGER NOT NULL,
+    "department_pemesan_id" INTEGER NOT NULL,
+    "shift_id" INTEGER NOT NULL,
+    "jumlah_pesanan" INTEGER NOT NULL,
+    "jumlah_pesanan_awal" INTEGER,
+    "status_pesanan" "StatusPesanan" NOT NULL,
+    "tanggal_pesanan" DATE NOT NULL,
+    "requires_approval" BOOLEAN NOT NULL DEFAULT false,
+    "approval_status" "ApprovalStatus",
+    "catatan_dapur" TEXT,
+    "catatan_admin" TEXT,
+    "approved_by_id" INTEGER,
+    "waktu_dibuat" TIMESTAMPTZ NOT NULL,
+    "waktu_diproses" TIMESTAMPTZ,
+    "waktu_siap" TIMESTAMPTZ,
+    "waktu_diantar" TIMESTAMPTZ,
+    "waktu_selesai" TIMESTAMPTZ,
+    "version" INTEGER NOT NULL DEFAULT 0,
+    "change_version" INTEGER NOT NULL,
+    "archived_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "transaction_pesanan_archive_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateTable: approval requests of archived orders
+CREATE TABLE "transaction_permintaan_persetujuan_archive" (
+    "id" INTEGER NOT NULL,
+    "pesanan_id" INTEGER NOT NULL,
+    "request_type" "ApprovalRequestType" NOT NULL,
+    "requested_by_id" INTEGER,
+    "jumlah_pesanan_awal" INTEGER NOT NULL,
+    "jumlah_pesanan_baru" INTEGER,
+    "catatan_dapur" TEXT NOT NULL,
+    "approval_status" "ApprovalStatus" NOT NULL,
+    "decided_by_id" INTEGER,
+    "catatan_admin" TEXT,
+    "requested_at" TIMESTAMPTZ NOT NULL,
+    "decided_at" TIMESTAMPTZ,
+
+    CONSTRAINT "transaction_permintaan_persetujuan_archive_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "uq_transaction_pesanan_archive_kode_pesanan" ON "transaction_pesanan_archive"("kode_pesanan");
+
+-- CreateIndex
+CREATE INDEX "idx_transaction_pesanan_archive_karyawan_tanggal" ON "transaction_pesanan_archive"("karyawan_pemesan_id", "tanggal_pesanan");
+
+-- CreateIndex
+CREATE INDEX "idx_transaction_pesanan_archive_tanggal" ON "transaction_pesanan_archive"("tanggal_pesanan");
+
+-- CreateIndex
+CREATE INDEX "idx_transaction_pesanan_archive_waktu_dibuat" ON "transaction_pesanan_archive"("waktu_dibuat");
+
+-- CreateIndex
+CREATE INDEX "idx_permintaan_persetujuan_archive_pesanan" ON "transaction_permintaan_persetujuan_archive"("pesanan_id");
+
+-- CreateIndex
+CREATE INDEX "idx_permintaan_persetujuan_archive_requested_at" ON "transaction_permintaan_persetujuan_archive"("requested_at");
+
+-- CreateIndex
+CREATE INDEX "idx_permintaan_persetujuan_archive_status_requested_at" ON "transaction_permintaan_persetujuan_archive"("approval_status", "requested_at");
+
+-- AddForeignKey
+ALTER TABLE "transaction_pesanan_archive" ADD CONSTRAINT "transaction_pesanan_archive_karyawan_pemesan_id_fkey" FOREIGN KEY ("karyawan_pemesan_id") REFERENCES "master_karyawan"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "transaction_pesanan_archive" ADD CONSTRAINT "transaction_pesanan_archive_department_pemesan_id_fkey" FOREIGN KEY ("department_pemesan_id") REFERENCES "master_department"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "transaction_pesanan_archive" ADD CONSTRAINT "transaction_pesanan_archive_shift_id_fkey" FOREIGN KEY ("shift_id") REFERENCES "master_shift"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "transaction_pesanan_archive" ADD CONSTRAINT "transaction_pesanan_archive_approved_by_id_fkey" FOREIGN KEY ("approved_by_id") REFERENCES "master_karyawan"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "transaction_permintaan_persetujuan_archive" ADD CONSTRAINT "transaction_permintaan_persetujuan_archive_pesanan_id_fkey" FOREIGN KEY ("pesanan_id") REFERENCES "transaction_pesanan_archive"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "transaction_permintaan_persetujuan_archive" ADD CONSTRAINT "transaction_permintaan_persetujuan_archive_requested_by_id_fkey" FOREIGN KEY ("requested_by_id") REFERENCES "master_karyawan"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "transaction_permintaan_persetujuan_archive" ADD CONSTRAINT "transaction_permintaan_persetujuan_archive_decided_by_id_fkey" FOREIGN KEY ("decided_by_id") REFERENCES "master_karyawan"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- Moving an order to the archive is not a deletion for GET /orders/changes clients:
+-- OrderArchiveService sets app.archiving = 'on' (transaction-local) before deleting hot rows.
+CREATE OR REPLACE FUNCTION "transaction_pesanan_record_tombstone"() RETURNS trigger AS $$
+BEGIN
+  IF current_setting('app.archiving', true) = 'on' THEN
+    RETURN OLD;
+  END IF;
+  INSERT INTO "transaction_pesanan_tombstone" ("pesanan_id", "karyawan_pemesan_id")
+  VALUES (OLD.id, OLD.karyawan_pemesan_id)
+  ON CONFLICT ("pesanan_id") DO UPDATE
+    SET "change_version" = nextval('transaction_pesanan_change_version_seq'),
+        "deleted_at" = CURRENT_TIMESTAMP;
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
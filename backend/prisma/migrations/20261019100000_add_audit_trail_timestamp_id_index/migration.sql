@@ -0,0 +1,5 @@
+-- DropIndex
+DROP INDEX "idx_log_audit_trail_timestamp";
+
+-- CreateIndex
+CREATE INDEX "idx_log_audit_trail_timestamp_id" ON "log_audit_trail"("timestamp", "id");
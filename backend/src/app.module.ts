@@ -6,6 +6,8 @@
  *   sehingga modul lain (Prisma, Auth) dapat mengakses variabel env via ConfigService.
  * - EventEmitterModule.forRoot({ wildcard: true, delimiter: '.', maxListeners: 10 }): Mengaktifkan arsitektur event-driven
  *   dengan dukungan wildcard untuk pola event seperti 'order.*' agar perubahan status pesanan dapat di-broadcast.
+ * - MetricsModule: Modul global observabilitas (GET /api/metrics, histogram HTTP & Prisma, metrik runtime);
+ *   dimuat sebelum Prisma karena PrismaService memasang instrumentasi query saat dibuat.
  * - PrismaModule: Menyediakan PrismaService untuk akses database; harus tersedia sebelum Common/Auth/Users/Orders
  *   karena service-service tersebut bergantung pada koneksi database.
  * - CommonModule: Modul global yang mengekspos layanan lintas modul (AuditTrailService, decorators, guards, interfaces)
@@ -15,9 +17,10 @@
  * - OrdersModule: Manajemen pesanan dengan workflow dan approval system; bergantung pada Prisma + Common + EventEmitter.
  * - WebSocketModule: Gateway notifikasi realtime menggunakan Socket.IO; menerima event dari Orders untuk broadcast ke rooms berbasis role/department/user; bergantung pada Config (WS) dan Common.
  * - ReportsModule: Reporting and analytics endpoints; provides consumption, department, performance, and rejection reports with CSV export; extends AuditTrailService with query capabilities for audit trail viewer.
+ * - DashboardModule: GET /api/dashboard, satu respons per role untuk tampilan awal dashboard; bergantung pada Orders + Reports.
  *
  * Rationale:
- * - Memastikan dependency chain konsisten: Config → EventEmitter → Prisma → Common → Auth/Users → Orders → WebSocket → Reports
+ * - Memastikan dependency chain konsisten: Config → EventEmitter → Prisma → Common → Auth/Users → Orders → WebSocket → Reports → Dashboard
  * - Reports module is loaded last as it aggregates data from Orders and provides read-only analytics without affecting core workflow.
  * - Menghindari kondisi race saat bootstrap dengan menyediakan config & event bus & db terlebih dahulu
  *
@@ -38,6 +41,8 @@ import { OrdersModule } from './orders/orders.module';
 import { WebSocketModule } from './websocket/websocket.module';
 import { ReportsModule } from './reports/reports.module';
 import { MasterDataModule } from './master-data/master-data.module';
+import { MetricsModule } from './metrics/metrics.module';
+import { DashboardModule } from './dashboard/dashboard.module';
 
 @Module({
   imports: [
@@ -49,6 +54,7 @@ import { MasterDataModule } from './master-data/master-data.module';
       delimiter: '.',
       maxListeners: 10,
     }),
+    MetricsModule,
     PrismaModule,
     CommonModule,
     AuthModule,
@@ -57,6 +63,7 @@ import { MasterDataModule } from './master-data/master-data.module';
     MasterDataModule,
     WebSocketModule,
     ReportsModule,
+    DashboardModule,
   ],
   controllers: [AppController],
   providers: [AppService],
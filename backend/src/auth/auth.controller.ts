@@ -4,14 +4,18 @@ import {
   Body,
   UseGuards,
   Res,
+  Req,
   HttpCode,
   HttpStatus,
   Get,
   Inject,
+  Ip,
+  HttpException,
 } from '@nestjs/common';
-import { Response } from 'express';
+import { Request, Response } from 'express';
 import { AuthGuard } from '@nestjs/passport';
 import { AuthService } from './auth.service';
+import { LoginThrottleService } from './login-throttle.service';
 import { LoginDto } from './dto';
 import { Public, CurrentUser, Roles } from '../common/decorators';
 import { JwtPayload } from '../common/interfaces/jwt-payload.interface';
@@ -20,24 +24,35 @@ import { LoginAliasPipe } from '../common/pipes/alias-transform.pipes';
 
 @Controller('auth')
 export class AuthController {
-  constructor(@Inject(AuthService) private readonly authService: AuthService) {}
+  constructor(
+    @Inject(AuthService) private readonly authService: AuthService,
+    private readonly loginThrottle: LoginThrottleService,
+  ) {}
 
   @Public()
   @Post('login')
   @HttpCode(HttpStatus.OK)
   async login(
     @Body(LoginAliasPipe) loginDto: LoginDto,
+    @Ip() ip: string,
     @Res({ passthrough: true }) res: Response,
   ): Promise<{ accessToken: string; refreshToken: string; user: Record<string, unknown> }> {
-    // Debug: DI status for AuthController sebelum memanggil AuthService.login
-    // eslint-disable-next-line no-console
-    console.log('[Debug] AuthController.login DI check:', {
-      hasAuthService: !!this.authService,
-      authServiceType: this.authService?.constructor?.name,
-    });
+    // Tolak lebih awal (tanpa DB/bcrypt/audit) bila NIK atau IP sedang dibatasi
+    const retryAfter = this.loginThrottle.getRetryAfterSeconds(loginDto.nik, ip);
+    if (retryAfter > 0) {
+      res.setHeader('Retry-After', String(retryAfter));
+      throw new HttpException(
+        {
+          statusCode: HttpStatus.TOO_MANY_REQUESTS,
+          message: 'Too many failed login attempts, please try again later',
+          retryAfter,
+        },
+        HttpStatus.TOO_MANY_REQUESTS,
+      );
+    }
 
     const { accessToken, refreshToken, user } =
-      await this.authService.login(loginDto);
+      await this.authService.login(loginDto, ip);
 
     const isProd = (process.env.NODE_ENV || 'development') === 'production';
     const sevenDaysMs = 7 * 24 * 60 * 60 * 1000;
@@ -62,10 +77,8 @@ export class AuthController {
     @CurrentUser() user: JwtPayload,
     @Res({ passthrough: true }) res: Response,
   ): Promise<{ accessToken: string; refreshToken: string }> {
-    const { accessToken, refreshToken } = await this.authService.refreshTokens(
-      user.sub,
-      user.karyawanId,
-    );
+    const { accessToken, refreshToken } =
+      await this.authService.refreshTokens(user);
 
     const isProd = (process.env.NODE_ENV || 'development') === 'production';
     const sevenDaysMs = 7 * 24 * 60 * 60 * 1000;
@@ -84,7 +97,16 @@ export class AuthController {
 
   @Post('logout')
   @HttpCode(HttpStatus.OK)
-  logout(@Res({ passthrough: true }) res: Response): { message: string } {
+  async logout(
+    @Req() req: Request,
+    @Res({ passthrough: true }) res: Response,
+  ): Promise<{ message: string }> {
+    // Cabut token family agar refresh token sesi ini tidak bisa dipakai lagi
+    const refreshToken =
+      (req?.cookies?.refreshToken as string | undefined) ??
+      (req?.body?.refreshToken as string | undefined);
+    await this.authService.logout(refreshToken);
+
     const isProd = (process.env.NODE_ENV || 'development') === 'production';
     res.clearCookie('refreshToken', {
       httpOnly: true,
@@ -4,6 +4,8 @@ import { PassportModule } from '@nestjs/passport';
 import { ConfigModule, ConfigService } from '@nestjs/config';
 import { AuthController } from './auth.controller';
 import { AuthService } from './auth.service';
+import { LoginThrottleService } from './login-throttle.service';
+import { RefreshTokenService } from './refresh-token.service';
 import { JwtStrategy } from './strategies/jwt.strategy';
 import { JwtRefreshStrategy } from './strategies/jwt-refresh.strategy';
 import { PrismaModule } from '../prisma/prisma.module';
@@ -35,7 +37,20 @@ import { CommonModule } from '../common/common.module';
     CommonModule,
   ],
   controllers: [AuthController],
-  providers: [AuthService, JwtStrategy, JwtRefreshStrategy],
-  exports: [AuthService, JwtModule, JwtStrategy, JwtRefreshStrategy],
+  providers: [
+    AuthService,
+    LoginThrottleService,
+    RefreshTokenService,
+    JwtStrategy,
+    JwtRefreshStrategy,
+  ],
+  exports: [
+    AuthService,
+    LoginThrottleService,
+    RefreshTokenService,
+    JwtModule,
+    JwtStrategy,
+    JwtRefreshStrategy,
+  ],
 })
 export class AuthModule {}
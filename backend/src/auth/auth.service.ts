@@ -6,6 +6,8 @@ import { AuditTrailService } from '../common/services/audit-trail.service';
 import * as bcrypt from 'bcrypt';
 import { JwtPayload } from '../common/interfaces/jwt-payload.interface';
 import { LoginDto } from './dto';
+import { LoginThrottleService } from './login-throttle.service';
+import { RefreshTokenService } from './refresh-token.service';
 
 /**
  * AuthService — Layanan Autentikasi & Token Management
@@ -26,8 +28,11 @@ import { LoginDto } from './dto';
  * 6) Kembalikan { accessToken, refreshToken, user }
  *
  * Refresh Token:
- * - Endpoint refresh memanggil [refreshTokens(userId, karyawanId)] untuk verifikasi bahwa
- *   user dan karyawan masih valid & aktif, lalu mengeluarkan pasangan token baru.
+ * - Refresh token dirotasi per pemakaian dalam satu token family ([RefreshTokenService]).
+ *   Endpoint refresh memanggil [refreshTokens(payload)] yang memvalidasi family dari memori
+ *   (DB hanya saat family belum dikenal/stale) lalu mengeluarkan pasangan token baru.
+ * - Logout memanggil [logout(refreshToken)] untuk mencabut family sehingga refresh token lama
+ *   tidak bisa dipakai lagi.
  *
  * Keamanan:
  * - Payload JWT berisi hanya data minimal (sub, karyawanId, nik, role)
@@ -39,14 +44,20 @@ import { LoginDto } from './dto';
  *   whitelisting kolom aman (id, username, role, createdAt). Hindari `include` tanpa `select`
  *   pada response agar `passwordHash` tidak pernah terserialisasi ke klien.
  *
+ * Proteksi Brute-force:
+ * - Controller memeriksa [LoginThrottleService] (sliding window per NIK & IP) sebelum memanggil login()
+ * - NIK yang tidak terdaftar disimpan di cache negatif sehingga percobaan berulang tidak menyentuh DB
+ *
  * AuditTrail:
  * - LOGIN_SUCCESS, LOGIN_FAILURE dibangkitkan otomatis oleh service ini, untuk visibilitas ops
+ * - LOGIN_FAILURE digabung per NIK oleh LoginThrottleService (satu baris per interval flush)
  */
 
 interface KaryawanWithUser {
   id: number;
   nomorIndukKaryawan: string;
   roleAccess: JwtPayload['role'];
+  departmentId?: number | null;
   isActive: boolean;
   user: { id: number; passwordHash: string } | null;
 }
@@ -58,6 +69,8 @@ export class AuthService {
     private readonly jwtService: JwtService,
     private readonly configService: ConfigService,
     private readonly auditTrail: AuditTrailService,
+    private readonly loginThrottle: LoginThrottleService,
+    private readonly refreshTokenService: RefreshTokenService,
   ) {}
 
   /**
@@ -95,7 +108,11 @@ export class AuthService {
       include: { user: true },
     });
 
-    if (!karyawan || !karyawan.isActive || !karyawan.user) {
+    if (!karyawan) {
+      this.loginThrottle.rememberUnknownNik(nik);
+      return null;
+    }
+    if (!karyawan.isActive || !karyawan.user) {
       return null;
     }
 
@@ -116,9 +133,11 @@ export class AuthService {
    *
    * Parameter:
    * - loginDto: { nik, password }
+   * - ip: alamat IP klien (opsional) untuk sliding window per IP
    *
    * Langkah:
-   * 1) validateUser() → jika null, audit LOGIN_FAILURE dan lempar UnauthorizedException
+   * 0) NIK ada di cache negatif → langsung gagal tanpa query DB
+   * 1) validateUser() → jika null, catat kegagalan (audit digabung) dan lempar UnauthorizedException
    * 2) generateTokens() → keluarkan pasangan access/refresh token
    * 3) audit LOGIN_SUCCESS
    * 4) load profil user lengkap (include user/department/jabatan) untuk UI
@@ -128,18 +147,28 @@ export class AuthService {
    */
   async login(
     loginDto: LoginDto,
+    ip?: string,
   ): Promise<{ accessToken: string; refreshToken: string; user: any }> {
     const { nik, password } = loginDto;
+
+    if (this.loginThrottle.isKnownUnknownNik(nik)) {
+      this.loginThrottle.recordFailure(nik, ip, 'Unknown NIK');
+      throw new UnauthorizedException('Invalid credentials');
+    }
+
     const karyawan = await this.validateUser(nik, password);
 
     if (!karyawan) {
-      await this.auditTrail.logLoginFailure(
+      this.loginThrottle.recordFailure(
         nik,
+        ip,
         'Invalid credentials or inactive user',
       );
       throw new UnauthorizedException('Invalid credentials');
     }
 
+    this.loginThrottle.recordSuccess(nik);
+
     const { accessToken, refreshToken } = await this.generateTokens(karyawan);
     await this.auditTrail.logLoginSuccess(
       karyawan.id,
@@ -169,7 +198,8 @@ export class AuthService {
 
   /**
    * generateTokens
-   * Menghasilkan access token dan refresh token berbasis payload JWT.
+   * Menghasilkan access token dan refresh token berbasis payload JWT, sekaligus membuka
+   * token family baru (satu family per sesi login).
    *
    * Parameter:
    * - karyawan: hasil validasi berisi id, nik, roleAccess, dan user.id
@@ -179,6 +209,8 @@ export class AuthService {
    * - karyawanId: id karyawan (authorization/ops)
    * - nik: NIK (identifikasi)
    * - role: role akses (authorization)
+   * - departmentId: department karyawan saat login (penjadwalan admission, bukan otorisasi)
+   * - fid/gen: hanya pada refresh token — family id dan generation (lihat RefreshTokenService)
    *
    * Konfigurasi:
    * - Secret & expiresIn diambil dari ConfigService dengan fallback default
@@ -194,57 +226,67 @@ export class AuthService {
       karyawanId: karyawan.id,
       nik: karyawan.nomorIndukKaryawan,
       role: karyawan.roleAccess,
+      ...(typeof karyawan.departmentId === 'number'
+        ? { departmentId: karyawan.departmentId }
+        : {}),
     };
 
-    const accessSecret =
-      this.configService.get<string>('JWT_SECRET') ?? 'supersecretjwt';
-    const accessExpiresIn =
-      this.configService.get<string>('JWT_EXPIRES_IN') ?? '15m';
-
-    const refreshSecret =
-      this.configService.get<string>('JWT_REFRESH_SECRET') ??
-      'supersecretrefresh';
-    const refreshExpiresIn =
-      this.configService.get<string>('JWT_REFRESH_EXPIRES_IN') ?? '7d';
-
-    const accessToken = await this.jwtService.signAsync(payload, {
-      secret: accessSecret,
-      expiresIn: accessExpiresIn,
-    });
-
-    const refreshToken = await this.jwtService.signAsync(payload, {
-      secret: refreshSecret,
-      expiresIn: refreshExpiresIn,
-    });
+    const { fid, gen } = await this.refreshTokenService.openFamily(
+      payload.sub,
+      payload.karyawanId,
+      this.getRefreshExpiresAt(),
+    );
 
-    return { accessToken, refreshToken };
+    return this.signTokens(payload, fid, gen);
   }
 
   /**
    * refreshTokens
-   * Mengeluarkan pasangan token baru (access+refresh) setelah verifikasi user/karyawan.
+   * Mengeluarkan pasangan token baru (access+refresh) dengan rotasi refresh token.
    *
    * Parameter:
-   * - userId: id user (sub dari JWT)
-   * - karyawanId: id karyawan terkait
+   * - payload: payload refresh token yang sudah diverifikasi oleh JwtRefreshStrategy
    *
    * Validasi:
-   * - Karyawan harus aktif dan memiliki user yang sesuai (user.id === userId)
+   * - Token dengan klaim fid/gen divalidasi terhadap family (in-memory, DB hanya bila
+   *   family belum dikenal/stale) lalu generation dinaikkan
+   * - Token lama tanpa fid (diterbitkan sebelum rotasi family) divalidasi ke DB sekali:
+   *   karyawan harus aktif dan memiliki user yang sesuai (user.id === sub), lalu family baru dibuka
    *
    * Return:
-   * - Pasangan token baru via generateTokens()
+   * - Pasangan token baru
    *
    * Error:
-   * - UnauthorizedException jika tidak valid atau tidak aktif
+   * - UnauthorizedException jika tidak valid, dicabut, dipakai ulang, atau user tidak aktif
    */
   async refreshTokens(
-    userId: number,
-    karyawanId: number,
+    payload: JwtPayload,
   ): Promise<{ accessToken: string; refreshToken: string }> {
+    const base: JwtPayload = {
+      sub: payload.sub,
+      karyawanId: payload.karyawanId,
+      nik: payload.nik,
+      role: payload.role,
+      ...(typeof payload.departmentId === 'number'
+        ? { departmentId: payload.departmentId }
+        : {}),
+    };
+
+    if (typeof payload.fid === 'string' && typeof payload.gen === 'number') {
+      const next = await this.refreshTokenService.rotate(
+        payload.fid,
+        payload.gen,
+        payload.sub,
+        payload.karyawanId,
+        this.getRefreshExpiresAt(),
+      );
+      return this.signTokens(base, next.fid, next.gen);
+    }
+
     // INTERNAL ONLY: include { user: true } aman digunakan di sini karena objek tidak di-return,
     // hanya untuk verifikasi konsistensi userId ↔ karyawan.user.id.
     const karyawan = await this.prisma.karyawan.findUnique({
-      where: { id: karyawanId },
+      where: { id: payload.karyawanId },
       include: { user: true },
     });
 
@@ -252,7 +294,7 @@ export class AuthService {
       !karyawan ||
       !karyawan.isActive ||
       !karyawan.user ||
-      karyawan.user.id !== userId
+      karyawan.user.id !== payload.sub
     ) {
       throw new UnauthorizedException('User no longer valid or inactive');
     }
@@ -260,6 +302,82 @@ export class AuthService {
     return this.generateTokens(karyawan as unknown as KaryawanWithUser);
   }
 
+  /**
+   * logout
+   * Mencabut token family dari refresh token yang dikirim klien (jika ada & valid).
+   * Token yang tidak valid diabaikan agar logout selalu berhasil menghapus cookie.
+   */
+  async logout(refreshToken?: string | null): Promise<void> {
+    if (!refreshToken) return;
+    try {
+      const payload = await this.jwtService.verifyAsync<JwtPayload>(
+        refreshToken,
+        { secret: this.getRefreshSecret(), ignoreExpiration: true },
+      );
+      if (typeof payload.fid === 'string') {
+        await this.refreshTokenService.revokeFamily(payload.fid);
+      }
+    } catch {
+      // Token rusak/palsu: tidak ada family yang perlu dicabut
+    }
+  }
+
+  private async signTokens(
+    payload: JwtPayload,
+    fid: string,
+    gen: number,
+  ): Promise<{ accessToken: string; refreshToken: string }> {
+    const accessSecret =
+      this.configService.get<string>('JWT_SECRET') ?? 'supersecretjwt';
+    const accessExpiresIn =
+      this.configService.get<string>('JWT_EXPIRES_IN') ?? '15m';
+
+    const [accessToken, refreshToken] = await Promise.all([
+      this.jwtService.signAsync(payload, {
+        secret: accessSecret,
+        expiresIn: accessExpiresIn,
+      }),
+      this.jwtService.signAsync(
+        { ...payload, fid, gen },
+        {
+          secret: this.getRefreshSecret(),
+          expiresIn: this.getRefreshExpiresIn(),
+        },
+      ),
+    ]);
+
+    return { accessToken, refreshToken };
+  }
+
+  private getRefreshSecret(): string {
+    return (
+      this.configService.get<string>('JWT_REFRESH_SECRET') ??
+      'supersecretrefresh'
+    );
+  }
+
+  private getRefreshExpiresIn(): string {
+    return this.configService.get<string>('JWT_REFRESH_EXPIRES_IN') ?? '7d';
+  }
+
+  // Mengonversi JWT_REFRESH_EXPIRES_IN ('7d', '12h', '30m', '3600') menjadi waktu kedaluwarsa family
+  private getRefreshExpiresAt(): Date {
+    const match = /^(\d+)\s*([smhd]?)$/.exec(
+      this.getRefreshExpiresIn().trim(),
+    );
+    const unitMs: Record<string, number> = {
+      '': 1000,
+      s: 1000,
+      m: 60_000,
+      h: 3_600_000,
+      d: 86_400_000,
+    };
+    const ttlMs = match
+      ? parseInt(match[1], 10) * unitMs[match[2]]
+      : 7 * 86_400_000;
+    return new Date(Date.now() + ttlMs);
+  }
+
   /**
    * getUserProfile
    * Mengambil profil karyawan beserta relasinya, dengan verifikasi kecocokan userId.
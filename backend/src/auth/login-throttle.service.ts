@@ -0,0 +1,314 @@
+import {
+  Injectable,
+  Logger,
+  OnModuleDestroy,
+  OnModuleInit,
+  Optional,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { OnEvent } from '@nestjs/event-emitter';
+import { AuditTrailService } from '../common/services/audit-trail.service';
+import { MetricsService } from '../metrics/metrics.service';
+import { readInt } from '../common/utils';
+
+/**
+ * LoginThrottleService — Pembatas laju login & cache negatif NIK
+ *
+ * Tujuan:
+ * - Membuat badai kegagalan login (kiosk bermasalah, credential stuffing) nyaris tanpa biaya
+ *   bagi backend: tanpa query DB, tanpa bcrypt.compare, tanpa INSERT audit per percobaan.
+ *
+ * Mekanisme:
+ * - Sliding window per NIK dan per IP: menyimpan timestamp kegagalan dalam jendela waktu
+ *   (LOGIN_RATE_WINDOW_SECONDS). Jika jumlah kegagalan mencapai batas
+ *   (LOGIN_MAX_FAILURES_PER_NIK / LOGIN_MAX_FAILURES_PER_IP), percobaan berikutnya ditolak
+ *   sebelum [AuthService.login()] dipanggil.
+ * - Cache negatif NIK: NIK yang tidak terdaftar diingat selama LOGIN_UNKNOWN_NIK_TTL_SECONDS
+ *   sehingga percobaan berulang tidak menyentuh DB. Entri dihapus saat user dengan NIK tersebut
+ *   dibuat (event 'user.created').
+ * - Audit kegagalan digabung (coalesced): kegagalan dikumpulkan per NIK dan ditulis sebagai satu
+ *   baris LOGIN_FAILURE per NIK per interval flush ("N failures for NIK X in window").
+ *
+ * Catatan:
+ * - State bersifat in-memory per proses. Pada PM2 cluster (lihat ecosystem.config.js) setiap
+ *   instance memiliki jendela sendiri; batas efektif = batas × jumlah instance.
+ * - Jumlah key dibatasi (MAX_TRACKED_KEYS) agar memori tetap terbatas saat diserang dari
+ *   banyak IP/NIK acak.
+ */
+
+type FailureBucket = {
+  count: number;
+  firstAt: Date;
+  lastAt: Date;
+  reason: string;
+  ips: Set<string>;
+};
+
+const MAX_TRACKED_KEYS = 50_000;
+const MAX_IPS_PER_BUCKET = 10;
+
+@Injectable()
+export class LoginThrottleService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(LoginThrottleService.name);
+
+  private readonly windowMs: number;
+  private readonly maxFailuresPerNik: number;
+  private readonly maxFailuresPerIp: number;
+  private readonly unknownNikTtlMs: number;
+  private readonly auditFlushMs: number;
+
+  // key → timestamp kegagalan (ms), urut naik
+  private readonly nikFailures = new Map<string, number[]>();
+  private readonly ipFailures = new Map<string, number[]>();
+  // nik → expiresAt (ms)
+  private readonly unknownNiks = new Map<string, number>();
+  // nik → ringkasan kegagalan yang belum ditulis ke audit trail
+  private pendingAudit = new Map<string, FailureBucket>();
+
+  private flushTimer?: NodeJS.Timeout;
+
+  constructor(
+    private readonly configService: ConfigService,
+    private readonly auditTrail: AuditTrailService,
+    @Optional() metrics?: MetricsService,
+  ) {
+    this.windowMs =
+      readInt(this.configService, 'LOGIN_RATE_WINDOW_SECONDS', 300) * 1000;
+    this.maxFailuresPerNik = readInt(
+      this.configService,
+      'LOGIN_MAX_FAILURES_PER_NIK',
+      5,
+    );
+    this.maxFailuresPerIp = readInt(
+      this.configService,
+      'LOGIN_MAX_FAILURES_PER_IP',
+      30,
+    );
+    this.unknownNikTtlMs =
+      readInt(this.configService, 'LOGIN_UNKNOWN_NIK_TTL_SECONDS', 60) * 1000;
+    this.auditFlushMs =
+      readInt(
+        this.configService,
+        'LOGIN_FAILURE_AUDIT_FLUSH_SECONDS',
+        30,
+      ) * 1000;
+
+    metrics?.registerGauge(
+      'audit_write_queue_depth',
+      'Audit trail writes waiting to complete, by queue',
+      () => [
+        {
+          labels: { queue: 'login_failure_buffer' },
+          value: this.pendingAudit.size,
+        },
+      ],
+    );
+  }
+
+  onModuleInit(): void {
+    this.flushTimer = setInterval(() => {
+      void this.flushFailureAudit();
+      this.sweep();
+    }, this.auditFlushMs);
+    this.flushTimer.unref();
+  }
+
+  async onModuleDestroy(): Promise<void> {
+    if (this.flushTimer) {
+      clearInterval(this.flushTimer);
+    }
+    await this.flushFailureAudit();
+  }
+
+  /**
+   * getRetryAfterSeconds
+   * Mengembalikan jumlah detik hingga percobaan login boleh dilakukan lagi untuk kombinasi
+   * NIK + IP ini; 0 berarti diizinkan.
+   */
+  getRetryAfterSeconds(nik: string, ip?: string): number {
+    const now = Date.now();
+    const byNik = this.retryAfterMs(
+      this.nikFailures,
+      this.normalizeNik(nik),
+      this.maxFailuresPerNik,
+      now,
+    );
+    const byIp = ip
+      ? this.retryAfterMs(this.ipFailures, ip, this.maxFailuresPerIp, now)
+      : 0;
+    const ms = Math.max(byNik, byIp);
+    return ms > 0 ? Math.ceil(ms / 1000) : 0;
+  }
+
+  /**
+   * isKnownUnknownNik
+   * true jika NIK baru saja terbukti tidak terdaftar (cache negatif masih berlaku).
+   */
+  isKnownUnknownNik(nik: string): boolean {
+    const key = this.normalizeNik(nik);
+    const expiresAt = this.unknownNiks.get(key);
+    if (expiresAt === undefined) return false;
+    if (expiresAt <= Date.now()) {
+      this.unknownNiks.delete(key);
+      return false;
+    }
+    return true;
+  }
+
+  rememberUnknownNik(nik: string): void {
+    this.boundedSet(
+      this.unknownNiks,
+      this.normalizeNik(nik),
+      Date.now() + this.unknownNikTtlMs,
+    );
+  }
+
+  /**
+   * recordFailure
+   * Mencatat satu kegagalan login ke sliding window (NIK + IP) dan ke buffer audit.
+   * Tidak melakukan I/O; audit ditulis berkala oleh [flushFailureAudit()].
+   */
+  recordFailure(nik: string, ip: string | undefined, reason: string): void {
+    const now = Date.now();
+    const key = this.normalizeNik(nik);
+    this.pushFailure(this.nikFailures, key, this.maxFailuresPerNik, now);
+    if (ip) {
+      this.pushFailure(this.ipFailures, ip, this.maxFailuresPerIp, now);
+    }
+
+    const bucket = this.pendingAudit.get(key);
+    if (bucket) {
+      bucket.count += 1;
+      bucket.lastAt = new Date(now);
+      bucket.reason = reason;
+      if (ip && bucket.ips.size < MAX_IPS_PER_BUCKET) bucket.ips.add(ip);
+    } else {
+      this.boundedSet(this.pendingAudit, key, {
+        count: 1,
+        firstAt: new Date(now),
+        lastAt: new Date(now),
+        reason,
+        ips: new Set(ip ? [ip] : []),
+      });
+    }
+  }
+
+  /**
+   * recordSuccess
+   * Login sukses mereset jendela kegagalan NIK (jendela IP tetap dipertahankan).
+   */
+  recordSuccess(nik: string): void {
+    const key = this.normalizeNik(nik);
+    this.nikFailures.delete(key);
+    this.unknownNiks.delete(key);
+  }
+
+  /**
+   * Listener: user baru dibuat → NIK tersebut tidak lagi "unknown".
+   */
+  @OnEvent('user.created')
+  handleUserCreated(event: { nik?: string }): void {
+    if (event?.nik) {
+      this.unknownNiks.delete(this.normalizeNik(event.nik));
+    }
+  }
+
+  /**
+   * flushFailureAudit
+   * Menulis ringkasan kegagalan yang terkumpul sebagai satu entri audit per NIK.
+   */
+  async flushFailureAudit(): Promise<void> {
+    if (this.pendingAudit.size === 0) return;
+    const batch = this.pendingAudit;
+    this.pendingAudit = new Map();
+
+    for (const [nik, bucket] of batch) {
+      try {
+        await this.auditTrail.logLoginFailureSummary(
+          nik,
+          bucket.count,
+          bucket.firstAt,
+          bucket.lastAt,
+          bucket.reason,
+          Array.from(bucket.ips),
+        );
+      } catch (err) {
+        this.logger.error(
+          `Failed to write login failure audit for NIK ${nik}: ${String(err)}`,
+        );
+      }
+    }
+  }
+
+  // Helpers
+
+  private retryAfterMs(
+    store: Map<string, number[]>,
+    key: string,
+    limit: number,
+    now: number,
+  ): number {
+    const timestamps = store.get(key);
+    if (!timestamps) return 0;
+    this.prune(timestamps, now);
+    if (timestamps.length === 0) {
+      store.delete(key);
+      return 0;
+    }
+    if (timestamps.length < limit) return 0;
+    // Diizinkan lagi ketika kegagalan tertua dalam jendela kedaluwarsa
+    return timestamps[timestamps.length - limit] + this.windowMs - now;
+  }
+
+  private pushFailure(
+    store: Map<string, number[]>,
+    key: string,
+    limit: number,
+    now: number,
+  ): void {
+    const timestamps = store.get(key);
+    if (!timestamps) {
+      this.boundedSet(store, key, [now]);
+      return;
+    }
+    this.prune(timestamps, now);
+    timestamps.push(now);
+    // Hanya `limit` entri terakhir yang relevan untuk keputusan blokir
+    if (timestamps.length > limit) {
+      timestamps.splice(0, timestamps.length - limit);
+    }
+  }
+
+  private prune(timestamps: number[], now: number): void {
+    const cutoff = now - this.windowMs;
+    let drop = 0;
+    while (drop < timestamps.length && timestamps[drop] <= cutoff) drop++;
+    if (drop > 0) timestamps.splice(0, drop);
+  }
+
+  private sweep(): void {
+    const now = Date.now();
+    for (const store of [this.nikFailures, this.ipFailures]) {
+      for (const [key, timestamps] of store) {
+        this.prune(timestamps, now);
+        if (timestamps.length === 0) store.delete(key);
+      }
+    }
+    for (const [key, expiresAt] of this.unknownNiks) {
+      if (expiresAt <= now) this.unknownNiks.delete(key);
+    }
+  }
+
+  // Map mempertahankan urutan insert → hapus entri tertua saat melewati batas
+  private boundedSet<V>(store: Map<string, V>, key: string, value: V): void {
+    if (!store.has(key) && store.size >= MAX_TRACKED_KEYS) {
+      const oldest = store.keys().next().value;
+      if (oldest !== undefined) store.delete(oldest);
+    }
+    store.set(key, value);
+  }
+
+  private normalizeNik(nik: string): string {
+    return String(nik ?? '').trim();
+  }
+}
@@ -0,0 +1,289 @@
+import {
+  Injectable,
+  Logger,
+  OnModuleDestroy,
+  OnModuleInit,
+  UnauthorizedException,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { OnEvent } from '@nestjs/event-emitter';
+import { randomUUID } from 'crypto';
+import { PrismaService } from '../prisma/prisma.service';
+import { readInt } from '../common/utils';
+
+/**
+ * RefreshTokenService — Rotasi refresh token berbasis token family
+ *
+ * Model:
+ * - Setiap login membuka satu "family" (id UUID) yang disimpan di tabel auth_refresh_token_family.
+ * - Refresh token membawa klaim `fid` (family id) dan `gen` (generation). Hanya generation
+ *   terbaru yang berlaku; setiap refresh menaikkan generation (rotasi).
+ * - Pemakaian ulang generation lama dianggap kebocoran token → seluruh family dicabut.
+ *   Pengecualian: generation tepat sebelumnya dalam ROTATION_GRACE_MS (beberapa tab me-refresh
+ *   bersamaan) menerima token baru dengan generation terkini.
+ *
+ * Hot path:
+ * - Status family (pemilik, generation, revoked) di-cache in-memory. DB hanya dibaca saat family
+ *   belum dikenal atau entri cache sudah stale (REFRESH_FAMILY_CACHE_TTL_SECONDS).
+ * - Rotasi ditulis dengan satu UPDATE bersyarat (id + generation + belum dicabut) sehingga
+ *   tetap benar di PM2 cluster meskipun cache antar-instance berbeda.
+ *
+ * Revokasi:
+ * - Logout mencabut family dari refresh token yang dikirim.
+ * - Nonaktif user, perubahan role, dan reset password mencabut semua family milik karyawan
+ *   (event 'user.status.changed', 'user.role.changed', 'user.password.reset').
+ * - Baris kedaluwarsa dibersihkan berkala (REFRESH_FAMILY_SWEEP_SECONDS).
+ */
+
+type FamilyEntry = {
+  userId: number;
+  karyawanId: number;
+  generation: number;
+  revoked: boolean;
+  expiresAt: number;
+  rotatedAt: number;
+  loadedAt: number;
+};
+
+const MAX_CACHED_FAMILIES = 20_000;
+// Toleransi untuk beberapa tab yang me-refresh bersamaan dengan token yang sama
+const ROTATION_GRACE_MS = 10_000;
+
+@Injectable()
+export class RefreshTokenService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(RefreshTokenService.name);
+  private readonly families = new Map<string, FamilyEntry>();
+  private readonly cacheTtlMs: number;
+  private readonly sweepIntervalMs: number;
+  private sweepTimer?: NodeJS.Timeout;
+
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly configService: ConfigService,
+  ) {
+    this.cacheTtlMs =
+      readInt(
+        this.configService,
+        'REFRESH_FAMILY_CACHE_TTL_SECONDS',
+        60,
+      ) * 1000;
+    this.sweepIntervalMs =
+      readInt(this.configService, 'REFRESH_FAMILY_SWEEP_SECONDS', 3600) * 1000;
+  }
+
+  onModuleInit(): void {
+    this.sweepTimer = setInterval(() => {
+      void this.sweepExpired();
+    }, this.sweepIntervalMs);
+    this.sweepTimer.unref();
+  }
+
+  onModuleDestroy(): void {
+    if (this.sweepTimer) {
+      clearInterval(this.sweepTimer);
+    }
+  }
+
+  /**
+   * openFamily
+   * Membuat family baru untuk sesi login. Return: { fid, gen } untuk klaim refresh token pertama.
+   */
+  async openFamily(
+    userId: number,
+    karyawanId: number,
+    expiresAt: Date,
+  ): Promise<{ fid: string; gen: number }> {
+    const fid = randomUUID();
+    await this.prisma.refreshTokenFamily.create({
+      data: { id: fid, userId, karyawanId, generation: 0, expiresAt },
+    });
+    const now = Date.now();
+    this.cache(fid, {
+      userId,
+      karyawanId,
+      generation: 0,
+      revoked: false,
+      expiresAt: expiresAt.getTime(),
+      rotatedAt: now,
+      loadedAt: now,
+    });
+    return { fid, gen: 0 };
+  }
+
+  /**
+   * rotate
+   * Memvalidasi klaim (fid, gen) refresh token dan menaikkan generation.
+   *
+   * Error:
+   * - UnauthorizedException jika family tidak dikenal, dicabut, bukan milik user, atau token
+   *   sudah pernah dipakai (reuse → family dicabut).
+   */
+  async rotate(
+    fid: string,
+    gen: number,
+    userId: number,
+    karyawanId: number,
+    nextExpiresAt: Date,
+  ): Promise<{ fid: string; gen: number }> {
+    const family = await this.getFamily(fid);
+    const now = Date.now();
+
+    if (
+      !family ||
+      family.revoked ||
+      family.expiresAt <= now ||
+      family.userId !== userId ||
+      family.karyawanId !== karyawanId
+    ) {
+      throw new UnauthorizedException('Refresh token revoked or invalid');
+    }
+
+    if (gen !== family.generation) {
+      const concurrent =
+        gen === family.generation - 1 &&
+        now - family.rotatedAt <= ROTATION_GRACE_MS;
+      if (concurrent) {
+        // Tab paralel me-refresh dengan token yang sama: terbitkan ulang generation terkini
+        return { fid, gen: family.generation };
+      }
+      this.logger.warn(
+        `Refresh token reuse detected: family=${fid} karyawanId=${karyawanId} gen=${gen} current=${family.generation}`,
+      );
+      await this.revokeFamily(fid);
+      throw new UnauthorizedException('Refresh token already used');
+    }
+
+    const nextGen = gen + 1;
+    const { count } = await this.prisma.refreshTokenFamily.updateMany({
+      where: { id: fid, generation: gen, revokedAt: null },
+      data: { generation: nextGen, expiresAt: nextExpiresAt },
+    });
+    if (count === 0) {
+      // Dirotasi/dicabut oleh instance lain: buang cache agar pembacaan berikutnya segar
+      this.families.delete(fid);
+      throw new UnauthorizedException('Refresh token already used');
+    }
+
+    family.generation = nextGen;
+    family.expiresAt = nextExpiresAt.getTime();
+    family.rotatedAt = now;
+    return { fid, gen: nextGen };
+  }
+
+  /**
+   * revokeFamily
+   * Mencabut satu family (logout atau reuse terdeteksi).
+   */
+  async revokeFamily(fid: string): Promise<void> {
+    const cached = this.families.get(fid);
+    if (cached) cached.revoked = true;
+    await this.prisma.refreshTokenFamily.updateMany({
+      where: { id: fid, revokedAt: null },
+      data: { revokedAt: new Date() },
+    });
+  }
+
+  /**
+   * revokeAllForKaryawan
+   * Mencabut seluruh family aktif milik satu karyawan.
+   */
+  async revokeAllForKaryawan(karyawanId: number): Promise<void> {
+    for (const entry of this.families.values()) {
+      if (entry.karyawanId === karyawanId) entry.revoked = true;
+    }
+    await this.prisma.refreshTokenFamily.updateMany({
+      where: { karyawanId, revokedAt: null },
+      data: { revokedAt: new Date() },
+    });
+  }
+
+  @OnEvent('user.status.changed', { async: true })
+  async handleUserStatusChanged(event: {
+    karyawanId: number;
+    isActive: boolean;
+  }): Promise<void> {
+    if (event && event.isActive === false) {
+      await this.safeRevokeAll(event.karyawanId);
+    }
+  }
+
+  @OnEvent('user.role.changed', { async: true })
+  async handleUserRoleChanged(event: { karyawanId: number }): Promise<void> {
+    await this.safeRevokeAll(event?.karyawanId);
+  }
+
+  @OnEvent('user.password.reset', { async: true })
+  async handleUserPasswordReset(event: { karyawanId: number }): Promise<void> {
+    await this.safeRevokeAll(event?.karyawanId);
+  }
+
+  /**
+   * sweepExpired
+   * Menghapus family kedaluwarsa dari DB dan cache.
+   */
+  async sweepExpired(): Promise<void> {
+    const now = new Date();
+    for (const [fid, entry] of this.families) {
+      if (entry.expiresAt <= now.getTime()) this.families.delete(fid);
+    }
+    try {
+      const { count } = await this.prisma.refreshTokenFamily.deleteMany({
+        where: { expiresAt: { lt: now } },
+      });
+      if (count > 0) {
+        this.logger.log(`Swept ${count} expired refresh token families`);
+      }
+    } catch (err) {
+      this.logger.error(`Refresh family sweep failed: ${String(err)}`);
+    }
+  }
+
+  // Helpers
+
+  private async getFamily(fid: string): Promise<FamilyEntry | undefined> {
+    const now = Date.now();
+    const cached = this.families.get(fid);
+    if (cached && now - cached.loadedAt <= this.cacheTtlMs) {
+      return cached;
+    }
+
+    const row = await this.prisma.refreshTokenFamily.findUnique({
+      where: { id: fid },
+    });
+    if (!row) {
+      this.families.delete(fid);
+      return undefined;
+    }
+
+    const entry: FamilyEntry = {
+      userId: row.userId,
+      karyawanId: row.karyawanId,
+      generation: row.generation,
+      revoked: row.revokedAt != null,
+      expiresAt: row.expiresAt.getTime(),
+      rotatedAt: cached?.rotatedAt ?? row.updatedAt.getTime(),
+      loadedAt: now,
+    };
+    this.cache(fid, entry);
+    return entry;
+  }
+
+  private cache(fid: string, entry: FamilyEntry): void {
+    if (!this.families.has(fid) && this.families.size >= MAX_CACHED_FAMILIES) {
+      const oldest = this.families.keys().next().value;
+      if (oldest !== undefined) this.families.delete(oldest);
+    }
+    this.families.set(fid, entry);
+  }
+
+  private async safeRevokeAll(karyawanId?: number): Promise<void> {
+    if (typeof karyawanId !== 'number') return;
+    try {
+      await this.revokeAllForKaryawan(karyawanId);
+    } catch (err) {
+      this.logger.error(
+        `Failed to revoke refresh families for karyawan ${karyawanId}: ${String(err)}`,
+      );
+    }
+  }
+}
@@ -3,7 +3,6 @@ import { ConfigService } from '@nestjs/config';
 import { PassportStrategy } from '@nestjs/passport';
 import { Strategy, ExtractJwt } from 'passport-jwt';
 import { Request } from 'express';
-import { PrismaService } from '../../prisma/prisma.service';
 import { JwtPayload } from '../../common/interfaces/jwt-payload.interface';
 
 @Injectable()
@@ -11,10 +10,7 @@ export class JwtRefreshStrategy extends PassportStrategy(
   Strategy,
   'jwt-refresh',
 ) {
-  constructor(
-    private readonly configService: ConfigService,
-    private readonly prisma: PrismaService,
-  ) {
+  constructor(private readonly configService: ConfigService) {
     const cfgRefreshSecret = configService?.get<string>('JWT_REFRESH_SECRET');
 const envRefreshSecret = process?.env?.JWT_REFRESH_SECRET;
 const jwtRefreshSecret = cfgRefreshSecret ?? envRefreshSecret ?? 'supersecretrefresh';
@@ -32,10 +28,10 @@ console.log('[Auth] JwtRefreshStrategy.secret source:', cfgRefreshSecret ? 'conf
     });
   }
 
-  async validate(
+  validate(
     req: Request,
     payload: JwtPayload,
-  ): Promise<JwtPayload & { refreshToken: string }> {
+  ): JwtPayload & { refreshToken: string } {
     const refreshToken =
       (req?.cookies?.refreshToken as string | undefined) ??
       (req?.body?.refreshToken as string | undefined);
@@ -44,15 +40,8 @@ console.log('[Auth] JwtRefreshStrategy.secret source:', cfgRefreshSecret ? 'conf
       throw new UnauthorizedException('Refresh token is missing');
     }
 
-    const karyawan = await this.prisma.karyawan.findUnique({
-      where: { id: payload.karyawanId },
-      include: { user: true },
-    });
-
-    if (!karyawan || !karyawan.isActive || !karyawan.user) {
-      throw new UnauthorizedException('Invalid refresh token user');
-    }
-
+    // Validasi user/family dilakukan oleh AuthService.refreshTokens (in-memory family store),
+    // sehingga strategy ini tidak lagi melakukan query DB per refresh.
     return { ...payload, refreshToken };
   }
 }
@@ -2,3 +2,4 @@
 export * from './order-status-changed.event';
 export * from './order-approval-requested.event';
 export * from './order-approval-decided.event';
+export * from './orders-materialized.event';
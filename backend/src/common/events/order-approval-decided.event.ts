@@ -16,5 +16,8 @@ export class OrderApprovalDecidedEvent {
     public readonly departmentId: number,
     public readonly requestedBy: number,
     public readonly timestamp: Date = new Date(),
+    // Order row version after the change and the fields it wrote (websocket patch)
+    public readonly version?: number,
+    public readonly changes?: Record<string, unknown>,
   ) {}
 }
@@ -11,5 +11,8 @@ export class OrderApprovalRequestedEvent {
     public readonly karyawanPemesanId: number,
     public readonly jumlahPesananBaru?: number,
     public readonly timestamp: Date = new Date(),
+    // Order row version after the change and the fields it wrote (websocket patch)
+    public readonly version?: number,
+    public readonly changes?: Record<string, unknown>,
   ) {}
 }
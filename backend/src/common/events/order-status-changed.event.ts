@@ -23,5 +23,8 @@ export class OrderStatusChangedEvent {
     public readonly departmentId: number,
     public readonly karyawanPemesanId: number,
     public readonly timestamp: Date = new Date(),
+    // Order row version after the change and the fields it wrote (websocket patch)
+    public readonly version?: number,
+    public readonly changes?: Record<string, unknown>,
   ) {}
 }
@@ -0,0 +1,19 @@
+/**
+ * Summary event for orders created in bulk from standing order templates
+ * ('orders.materialized'). Emitted once per run instead of one 'order.created' per order.
+ */
+export class OrdersMaterializedEvent {
+  constructor(
+    // Order date as YYYY-MM-DD
+    public readonly tanggalPesanan: string,
+    public readonly totalOrders: number,
+    public readonly totalMeals: number,
+    // Order count and meals per department, for room targeting and counters
+    public readonly byDepartment: Array<{
+      departmentId: number;
+      orders: number;
+      meals: number;
+    }>,
+    public readonly timestamp: Date = new Date(),
+  ) {}
+}
@@ -11,6 +11,12 @@ export interface JwtPayload {
   nik: string;
   // User role
   role: RoleAccessType;
+  // Department karyawan saat token diterbitkan (hanya untuk penjadwalan, bukan otorisasi)
+  departmentId?: number;
+  // Refresh token family id (hanya pada refresh token)
+  fid?: string;
+  // Refresh token generation dalam family (hanya pada refresh token)
+  gen?: number;
   // Issued at (opsional)
   iat?: number;
   // Expiration (opsional)
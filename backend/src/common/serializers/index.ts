@@ -0,0 +1,3 @@
+export { compileSerializer } from './json-serializer';
+export type { JsonSchema, JsonSerializer } from './json-serializer';
+export { SerializeInterceptor, SerializeWith } from './serialize.interceptor';
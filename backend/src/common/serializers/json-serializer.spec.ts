@@ -0,0 +1,128 @@
+import { compileSerializer, JsonSchema } from './json-serializer';
+
+const ITEM: JsonSchema = {
+  type: 'object',
+  properties: {
+    id: { type: 'bigint' },
+    count: { type: 'integer', nullable: true },
+    ratio: { type: 'number' },
+    active: { type: 'boolean' },
+    name: { type: 'string' },
+    at: { type: 'date' },
+    owner: {
+      type: 'object',
+      nullable: true,
+      properties: { id: { type: 'integer' }, name: { type: 'string' } },
+    },
+    tags: { type: 'array', items: { type: 'string' } },
+  },
+};
+
+const serializeItems = compileSerializer({ type: 'array', items: ITEM });
+
+describe('compileSerializer', () => {
+  it('matches JSON.stringify for declared fields', () => {
+    const value = [
+      {
+        id: BigInt('9007199254740993'),
+        count: 3,
+        ratio: 0.25,
+        active: true,
+        name: 'Quote " backslash \\ newline \n emoji 🍱  ',
+        at: new Date(Date.UTC(2025, 0, 2, 3, 4, 5, 6)),
+        owner: { id: 7, name: 'Budi' },
+        tags: ['a', 'b'],
+      },
+    ];
+
+    expect(JSON.parse(serializeItems(value))).toEqual([
+      {
+        id: '9007199254740993',
+        count: 3,
+        ratio: 0.25,
+        active: true,
+        name: value[0].name,
+        at: '2025-01-02T03:04:05.006Z',
+        owner: { id: 7, name: 'Budi' },
+        tags: ['a', 'b'],
+      },
+    ]);
+    const { id, ...rest } = value[0];
+    expect(serializeItems(value)).toBe(
+      JSON.stringify([{ id: id.toString(), ...rest }]),
+    );
+  });
+
+  it('writes only declared fields, in schema order', () => {
+    const out = serializeItems([
+      {
+        secret: 'x',
+        tags: [],
+        owner: { name: 'A', id: 1, password: 'y' },
+        at: new Date(0),
+        name: 'n',
+        active: false,
+        ratio: 1,
+        count: 0,
+        id: 1n,
+      },
+    ]);
+
+    expect(out).toBe(
+      '[{"id":"1","count":0,"ratio":1,"active":false,"name":"n",' +
+        '"at":"1970-01-01T00:00:00.000Z","owner":{"id":1,"name":"A"},"tags":[]}]',
+    );
+  });
+
+  it('writes null for missing, null and non-finite values', () => {
+    const out = JSON.parse(
+      serializeItems([
+        { ratio: NaN, count: Infinity, at: new Date('invalid'), owner: null },
+      ]),
+    );
+
+    expect(out).toEqual([
+      {
+        id: null,
+        count: null,
+        ratio: null,
+        active: null,
+        name: null,
+        at: null,
+        owner: null,
+        tags: null,
+      },
+    ]);
+  });
+
+  it('handles empty and null roots', () => {
+    expect(serializeItems([])).toBe('[]');
+    expect(serializeItems(null)).toBe('null');
+    expect(compileSerializer({ type: 'object', properties: {} })({ a: 1 })).toBe(
+      '{}',
+    );
+  });
+
+  it('serializes scalar roots and string dates', () => {
+    expect(compileSerializer({ type: 'integer' })(5)).toBe('5');
+    expect(compileSerializer({ type: 'string' })('a"b')).toBe('"a\\"b"');
+    expect(compileSerializer({ type: 'date' })('2025-01-02T00:00:00.000Z')).toBe(
+      '"2025-01-02T00:00:00.000Z"',
+    );
+  });
+
+  it('does not let property names break out of the generated code', () => {
+    const serialize = compileSerializer({
+      type: 'object',
+      properties: {
+        "a'];throw 1;//": { type: 'integer' },
+        'b"c': { type: 'string' },
+      },
+    });
+
+    expect(JSON.parse(serialize({ "a'];throw 1;//": 1, 'b"c': 'x' }))).toEqual({
+      "a'];throw 1;//": 1,
+      'b"c': 'x',
+    });
+  });
+});
@@ -0,0 +1,116 @@
+/**
+ * Schema-compiled JSON serialization
+ *
+ * compileSerializer() turns a response schema into a dedicated stringify function, once at
+ * module load. The generated code reads each declared field by name and concatenates its
+ * JSON text, so:
+ * - only declared fields are written (relations and columns added later never leak);
+ * - no key enumeration, toJSON lookups or replacer checks per value as in JSON.stringify.
+ *
+ * Output matches JSON.stringify for the declared fields: Dates as ISO strings, BigInt as
+ * decimal strings (same as the BigInt toJSON patch in main.ts), non-finite numbers and
+ * missing values as null. Nested objects and arrays get their own compiled function.
+ */
+
+type Nullable = { nullable?: boolean };
+
+export type JsonSchema =
+  | ({ type: 'integer' | 'number' | 'boolean' | 'string' | 'date' | 'bigint' } & Nullable)
+  | ({ type: 'object'; properties: Record<string, JsonSchema> } & Nullable)
+  | ({ type: 'array'; items: JsonSchema } & Nullable);
+
+export type JsonSerializer<T = unknown> = (value: T) => string;
+
+// Runtime helpers shared by all generated functions
+const helpers = {
+  num(v: unknown): string {
+    return typeof v === 'number' && Number.isFinite(v) ? String(v) : 'null';
+  },
+  bool(v: unknown): string {
+    if (v === null || v === undefined) return 'null';
+    return v ? 'true' : 'false';
+  },
+  str(v: unknown): string {
+    return v === null || v === undefined ? 'null' : JSON.stringify(String(v));
+  },
+  date(v: unknown): string {
+    if (v === null || v === undefined) return 'null';
+    const d = v instanceof Date ? v : new Date(v as string | number);
+    return Number.isNaN(d.getTime()) ? 'null' : `"${d.toISOString()}"`;
+  },
+  big(v: unknown): string {
+    return v === null || v === undefined ? 'null' : `"${String(v)}"`;
+  },
+};
+
+const SCALAR_HELPER: Record<string, keyof typeof helpers> = {
+  integer: 'num',
+  number: 'num',
+  boolean: 'bool',
+  string: 'str',
+  date: 'date',
+  bigint: 'big',
+};
+
+/**
+ * compileSerializer
+ * Build the stringify function for `schema`. Call once per schema (module scope).
+ */
+export function compileSerializer<T = unknown>(
+  schema: JsonSchema,
+): JsonSerializer<T> {
+  const fns: Array<(v: unknown) => string> = [];
+
+  // Expression producing the JSON text of `access` under `node`
+  const expression = (node: JsonSchema, access: string): string => {
+    if (node.type === 'object' || node.type === 'array') {
+      return `f[${compile(node)}](${access})`;
+    }
+    return `h.${SCALAR_HELPER[node.type]}(${access})`;
+  };
+
+  // Compiles an object/array node into fns and returns its index
+  const compile = (node: JsonSchema): number => {
+    const index = fns.length;
+    fns.push(() => 'null'); // reserve the slot before compiling children
+    let body: string;
+    if (node.type === 'object') {
+      const parts = Object.entries(node.properties).map(([key, child], i) => {
+        const prefix = `${i === 0 ? '{' : ','}${JSON.stringify(key)}:`;
+        return `${JSON.stringify(prefix)} + ${expression(child, `v[${JSON.stringify(key)}]`)}`;
+      });
+      body =
+        parts.length === 0
+          ? `return '{}';`
+          : `return ${parts.join(' + ')} + '}';`;
+    } else if (node.type === 'array') {
+      body =
+        `let out = '[';\n` +
+        `for (let i = 0; i < v.length; i++) {\n` +
+        `  if (i > 0) out += ',';\n` +
+        `  out += ${expression(node.items, 'v[i]')};\n` +
+        `}\n` +
+        `return out + ']';`;
+    } else {
+      return index;
+    }
+    // eslint-disable-next-line @typescript-eslint/no-implied-eval
+    const factory = new Function(
+      'f',
+      'h',
+      `return function (v) {\n  if (v === null || v === undefined) return 'null';\n  ${body}\n};`,
+    ) as (
+      f: typeof fns,
+      h: typeof helpers,
+    ) => (v: unknown) => string;
+    fns[index] = factory(fns, helpers);
+    return index;
+  };
+
+  if (schema.type !== 'object' && schema.type !== 'array') {
+    const helper = helpers[SCALAR_HELPER[schema.type]];
+    return (value: T) => helper(value);
+  }
+  const root = fns[compile(schema)];
+  return (value: T) => root(value);
+}
@@ -0,0 +1,40 @@
+import {
+  CallHandler,
+  ExecutionContext,
+  NestInterceptor,
+  UseInterceptors,
+} from '@nestjs/common';
+import type { Response } from 'express';
+import { Observable } from 'rxjs';
+import { map } from 'rxjs/operators';
+import type { JsonSerializer } from './json-serializer';
+
+/**
+ * SerializeInterceptor
+ *
+ * Writes the handler's return value with a compiled serializer instead of Express'
+ * res.json (generic JSON.stringify). The body reaches Express as a ready JSON string.
+ * Handlers that answer through @Res() themselves (CSV/PDF export) return undefined and
+ * are left alone.
+ */
+export class SerializeInterceptor<T> implements NestInterceptor {
+  constructor(private readonly serializer: JsonSerializer<T>) {}
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<unknown> {
+    const res = context.switchToHttp().getResponse<Response>();
+    return next.handle().pipe(
+      map((body: T) => {
+        if (body === undefined || res.headersSent) return body;
+        res.setHeader('Content-Type', 'application/json; charset=utf-8');
+        return this.serializer(body);
+      }),
+    );
+  }
+}
+
+/**
+ * SerializeWith
+ * Route decorator: respond with `serializer` (see compileSerializer).
+ */
+export const SerializeWith = <T>(serializer: JsonSerializer<T>) =>
+  UseInterceptors(new SerializeInterceptor(serializer));
@@ -0,0 +1,101 @@
+import type { PrismaService } from '../../prisma/prisma.service';
+import type { ReadReplicaService } from '../../prisma/read-replica.service';
+import { inMemoryTable } from '../testing/in-memory-table';
+import { AuditTrailService } from './audit-trail.service';
+
+type Row = Record<string, unknown> & { id: number };
+
+const at = (minute: number) => new Date(2025, 0, 1, 8, minute);
+
+const entry = (id: number, timestamp: Date, aksi = 'LOGIN_SUCCESS'): Row => ({
+  id,
+  userId: 1,
+  aksi,
+  detail: null,
+  timestamp,
+  user: null,
+});
+
+function setup(rows: Row[]) {
+  const db = { auditTrail: inMemoryTable(rows) };
+  const service = new AuditTrailService(
+    {} as PrismaService,
+    { reader: () => db } as unknown as ReadReplicaService,
+  );
+  return { service, db };
+}
+
+async function collect(
+  service: AuditTrailService,
+  batchSize: number,
+  query = {},
+): Promise<number[][]> {
+  const batches: number[][] = [];
+  for await (const batch of service.iterateAuditTrail(query, batchSize)) {
+    batches.push(batch.data.map((log) => Number(log.id)));
+  }
+  return batches;
+}
+
+describe('AuditTrailService.iterateAuditTrail', () => {
+  it('reads keyset batches newest first with id breaking timestamp ties', async () => {
+    // Entries 2, 3 and 4 share a timestamp
+    const { service, db } = setup([
+      entry(1, at(1)),
+      entry(2, at(2)),
+      entry(3, at(2)),
+      entry(4, at(2)),
+      entry(5, at(3)),
+    ]);
+
+    expect(await collect(service, 2)).toEqual([[5, 4], [3, 2], [1]]);
+    const skips = db.auditTrail.findMany.mock.calls.map(
+      ([args]: [{ skip?: number }]) => args.skip,
+    );
+    expect(skips.every((skip) => skip === undefined)).toBe(true);
+  });
+
+  it('stops at the newest entry seen when the export started', async () => {
+    const rows = [entry(1, at(1)), entry(2, at(2)), entry(3, at(3))];
+    const { service } = setup(rows);
+
+    const seen: number[] = [];
+    let total = 0;
+    for await (const batch of service.iterateAuditTrail({}, 2)) {
+      total = batch.total;
+      seen.push(...batch.data.map((log) => Number(log.id)));
+      // Written mid-export, including one with the bound's own timestamp
+      rows.push(entry(10 + seen.length, at(3)), entry(20 + seen.length, at(9)));
+    }
+
+    expect(seen).toEqual([3, 2, 1]);
+    expect(total).toBe(3);
+  });
+
+  it('applies the query filters to every batch and the total', async () => {
+    const { service } = setup([
+      entry(1, at(1), 'USER_CREATED'),
+      entry(2, at(2)),
+      entry(3, at(3), 'USER_CREATED'),
+      entry(4, at(4), 'USER_CREATED'),
+    ]);
+
+    const totals: number[] = [];
+    const ids: number[][] = [];
+    for await (const batch of service.iterateAuditTrail(
+      { aksi: 'USER_CREATED' },
+      2,
+    )) {
+      totals.push(batch.total);
+      ids.push(batch.data.map((log) => Number(log.id)));
+    }
+
+    expect(ids).toEqual([[4, 3], [1]]);
+    expect(totals).toEqual([3, 3]);
+  });
+
+  it('yields nothing when no entry matches', async () => {
+    const { service } = setup([entry(1, at(1))]);
+    expect(await collect(service, 2, { aksi: 'ORDER_CREATED' })).toEqual([]);
+  });
+});
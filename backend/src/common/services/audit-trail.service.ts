@@ -1,6 +1,22 @@
-import { Injectable } from '@nestjs/common';
+import { Injectable, Optional } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../../prisma/prisma.service';
+import { ReadReplicaService } from '../../prisma/read-replica.service';
+import { MetricsService } from '../../metrics/metrics.service';
 import { AuditTrailQueryDto } from '../../reports/dto/audit-trail-query.dto';
+import { AUDIT_TRAIL_SELECT } from '../../reports/dto/audit-trail-response.dto';
+
+// Terbaru dulu; id memutus seri timestamp agar halaman tidak tumpang tindih/terlewat
+const AUDIT_TRAIL_ORDER = [
+  { timestamp: 'desc' },
+  { id: 'desc' },
+] as const satisfies readonly Prisma.AuditTrailOrderByWithRelationInput[];
+
+type AuditTrailKey = { timestamp: Date; id: bigint };
+
+export type AuditTrailEntry = Prisma.AuditTrailGetPayload<{
+  select: typeof AUDIT_TRAIL_SELECT;
+}>;
 
 /**
  * AuditTrailService
@@ -43,12 +59,26 @@ import { AuditTrailQueryDto } from '../../reports/dto/audit-trail-query.dto';
  *
  *   // Query Methods (baru)
  *   const page1 = await this.auditTrail.query({ search: 'ORDER', page: 1, limit: 50 });
+ *   for await (const batch of this.auditTrail.iterateAuditTrail({ aksi: 'LOGIN_SUCCESS' }, 500)) { ... }
  *   const history = await this.auditTrail.getByOrderCode('PM-20251001-001');
  *   const actionTypes = await this.auditTrail.getActionTypes();
  */
 @Injectable()
 export class AuditTrailService {
-  constructor(private readonly prisma: PrismaService) {}
+  // Jumlah INSERT audit yang sedang berjalan (diekspos sebagai audit_write_queue_depth)
+  private pendingWrites = 0;
+
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly readReplica: ReadReplicaService,
+    @Optional() metrics?: MetricsService,
+  ) {
+    metrics?.registerGauge(
+      'audit_write_queue_depth',
+      'Audit trail writes waiting to complete, by queue',
+      () => [{ labels: { queue: 'inflight' }, value: this.pendingWrites }],
+    );
+  }
 
   /**
    * log
@@ -71,13 +101,18 @@ export class AuditTrailService {
     detail?: string | null;
   }): Promise<any> {
     const { userId, aksi, detail } = params;
-    return this.prisma.auditTrail.create({
-      data: {
-        userId: userId ?? null,
-        aksi,
-        detail: detail ?? null,
-      },
-    });
+    this.pendingWrites++;
+    try {
+      return await this.prisma.auditTrail.create({
+        data: {
+          userId: userId ?? null,
+          aksi,
+          detail: detail ?? null,
+        },
+      });
+    } finally {
+      this.pendingWrites--;
+    }
   }
 
   /**
@@ -118,6 +153,41 @@ export class AuditTrailService {
     });
   }
 
+  /**
+   * logLoginFailureSummary
+   * Mencatat ringkasan beberapa kegagalan login untuk satu NIK dalam satu jendela waktu.
+   * Dipakai oleh LoginThrottleService agar badai kegagalan tidak menghasilkan satu INSERT
+   * per percobaan.
+   *
+   * Parameter:
+   * - nik: NIK yang dicoba saat login
+   * - count: jumlah kegagalan dalam jendela
+   * - firstAt/lastAt: rentang waktu kegagalan
+   * - reason: alasan kegagalan terakhir
+   * - ips: sampel alamat IP asal percobaan (opsional)
+   *
+   * Catatan:
+   * - aksi tetap 'LOGIN_FAILURE' agar filter audit trail yang ada tetap berlaku.
+   */
+  async logLoginFailureSummary(
+    nik: string,
+    count: number,
+    firstAt: Date,
+    lastAt: Date,
+    reason: string,
+    ips: string[] = [],
+  ): Promise<any> {
+    if (count <= 1) {
+      return this.logLoginFailure(nik, reason);
+    }
+    const ipsPart = ips.length > 0 ? `, ips=${ips.join(',')}` : '';
+    return this.log({
+      userId: null,
+      aksi: 'LOGIN_FAILURE',
+      detail: `${count} failed login attempts for NIK ${nik} between ${firstAt.toISOString()} and ${lastAt.toISOString()}: ${reason}${ipsPart}`,
+    });
+  }
+
   /**
    * logUserCreated
    * Mencatat pembuatan akun user baru oleh admin.
@@ -137,6 +207,31 @@ export class AuditTrailService {
     });
   }
 
+  /**
+   * logUsersCreated
+   * Mencatat pembuatan banyak akun sekaligus (bulk import) dalam satu INSERT multi-baris.
+   * Setiap NIK tetap mendapat satu entri 'USER_CREATED' seperti [logUserCreated()].
+   *
+   * Parameter:
+   * - adminId: ID karyawan admin yang melakukan import
+   * - createdNiks: daftar NIK user yang baru dibuat
+   */
+  async logUsersCreated(adminId: number, createdNiks: string[]): Promise<any> {
+    if (createdNiks.length === 0) return { count: 0 };
+    this.pendingWrites++;
+    try {
+      return await this.prisma.auditTrail.createMany({
+        data: createdNiks.map((nik) => ({
+          userId: adminId,
+          aksi: 'USER_CREATED',
+          detail: `Admin created user with NIK ${nik}`,
+        })),
+      });
+    } finally {
+      this.pendingWrites--;
+    }
+  }
+
   /**
    * logUserStatusChanged
    * Mencatat perubahan status aktif/non-aktif pada user oleh admin.
@@ -206,6 +301,39 @@ export class AuditTrailService {
     });
   }
 
+  /**
+   * logOrdersCreated
+   * Mencatat pesanan yang dibuat massal dari template standing order dalam satu INSERT
+   * multi-baris. Setiap pesanan tetap mendapat satu entri 'ORDER_CREATED' seperti
+   * [logOrderCreated()] (pelaku = karyawan pemilik template), sehingga riwayat per kode
+   * pesanan tetap lengkap.
+   *
+   * Parameter:
+   * - orders: daftar { karyawanId, kodePesanan, jumlahPesanan, shiftName }
+   */
+  async logOrdersCreated(
+    orders: Array<{
+      karyawanId: number;
+      kodePesanan: string;
+      jumlahPesanan: number;
+      shiftName: string;
+    }>,
+  ): Promise<any> {
+    if (orders.length === 0) return { count: 0 };
+    this.pendingWrites++;
+    try {
+      return await this.prisma.auditTrail.createMany({
+        data: orders.map((o) => ({
+          userId: o.karyawanId,
+          aksi: 'ORDER_CREATED',
+          detail: `Order ${o.kodePesanan} created: qty=${o.jumlahPesanan}, shift=${o.shiftName} (standing order)`,
+        })),
+      });
+    } finally {
+      this.pendingWrites--;
+    }
+  }
+
   /**
    * logOrderStatusChanged
    * Mencatat perubahan status pesanan.
@@ -359,67 +487,21 @@ export class AuditTrailService {
     limit: number;
     totalPages: number;
   }> {
-    const {
-      search,
-      userId,
-      aksi,
-      tanggalMulai,
-      tanggalAkhir,
-      page = 1,
-      limit = 50,
-    } = queryDto;
-
-    const where: any = { AND: [] };
-
-    if (search) {
-      where.AND.push({
-        OR: [
-          { aksi: { contains: search, mode: 'insensitive' } },
-          { detail: { contains: search, mode: 'insensitive' } },
-        ],
-      });
-    }
-
-    if (typeof userId === 'number') {
-      where.AND.push({ userId });
-    }
-
-    if (aksi) {
-      where.AND.push({ aksi });
-    }
-
-    if (tanggalMulai || tanggalAkhir) {
-      const range: any = {};
-      if (tanggalMulai) range.gte = new Date(tanggalMulai);
-      if (tanggalAkhir) range.lte = new Date(tanggalAkhir);
-      where.AND.push({ timestamp: range });
-    }
-
-    if (where.AND.length === 0) {
-      delete where.AND;
-    }
+    const { page = 1, limit = 50 } = queryDto;
+    const where = this.auditTrailWhere(queryDto);
 
     const skip = (page - 1) * limit;
+    // Query baca berat: replica bila tersedia dan lag masih dalam batas
+    const db = this.readReplica.reader();
 
     const [total, logs] = await Promise.all([
-      this.prisma.auditTrail.count({ where }),
-      this.prisma.auditTrail.findMany({
+      db.auditTrail.count({ where }),
+      db.auditTrail.findMany({
         where,
         skip,
         take: limit,
-        orderBy: { timestamp: 'desc' },
-        include: {
-          user: {
-            select: {
-              id: true,
-              nomorIndukKaryawan: true,
-              namaLengkap: true,
-              roleAccess: true,
-              departmentId: true,
-              jabatanId: true,
-            },
-          },
-        },
+        orderBy: [...AUDIT_TRAIL_ORDER],
+        select: AUDIT_TRAIL_SELECT,
       }),
     ]);
 
@@ -432,6 +514,54 @@ export class AuditTrailService {
     };
   }
 
+  /**
+   * iterateAuditTrail
+   * Audit log untuk export, terbaru dulu, `batchSize` baris per batch.
+   * - Keyset pagination pada (timestamp, id), bukan offset: timestamp tidak unik,
+   *   jadi id memutus seri dan batch tidak tumpang tindih atau melewatkan baris
+   * - Dibatasi oleh entri terbaru yang cocok saat export dimulai: log yang ditulis
+   *   selama export berjalan tidak ikut dan tidak menggeser batch berikutnya
+   * - `total` dihitung sekali terhadap batas tersebut
+   */
+  async *iterateAuditTrail(
+    queryDto: AuditTrailQueryDto,
+    batchSize: number,
+  ): AsyncGenerator<{ data: AuditTrailEntry[]; total: number }> {
+    const db = this.readReplica.reader();
+    const where = this.auditTrailWhere(queryDto);
+
+    const [newest] = await db.auditTrail.findMany({
+      where,
+      orderBy: [...AUDIT_TRAIL_ORDER],
+      take: 1,
+      select: { timestamp: true, id: true },
+    });
+    if (!newest) return;
+
+    const total = await db.auditTrail.count({
+      where: { AND: [where, this.auditTrailCursor(newest, true)] },
+    });
+
+    let after: AuditTrailKey = newest;
+    let inclusive = true;
+    for (;;) {
+      const logs = await db.auditTrail.findMany({
+        where: { AND: [where, this.auditTrailCursor(after, inclusive)] },
+        orderBy: [...AUDIT_TRAIL_ORDER],
+        take: batchSize,
+        select: AUDIT_TRAIL_SELECT,
+      });
+      if (logs.length === 0) return;
+
+      yield { data: logs, total };
+      if (logs.length < batchSize) return;
+
+      const last = logs[logs.length - 1];
+      after = { timestamp: last.timestamp, id: last.id };
+      inclusive = false;
+    }
+  }
+
   /**
    * getByOrderCode
    * Mengambil seluruh audit log yang terkait dengan satu kode pesanan tertentu.
@@ -439,23 +569,12 @@ export class AuditTrailService {
    * berdasarkan timestamp ascending agar histori kronologis terbaca jelas.
    */
   async getByOrderCode(kodePesanan: string): Promise<any[]> {
-    return this.prisma.auditTrail.findMany({
+    return this.readReplica.reader().auditTrail.findMany({
       where: {
         detail: { contains: kodePesanan, mode: 'insensitive' },
       },
       orderBy: { timestamp: 'asc' },
-      include: {
-        user: {
-          select: {
-            id: true,
-            nomorIndukKaryawan: true,
-            namaLengkap: true,
-            roleAccess: true,
-            departmentId: true,
-            jabatanId: true,
-          },
-        },
-      },
+      select: AUDIT_TRAIL_SELECT,
     });
   }
 
@@ -465,11 +584,61 @@ export class AuditTrailService {
    * Berguna untuk menyediakan pilihan filter di UI (dropdown action types).
    */
   async getActionTypes(): Promise<string[]> {
-    const rows = await this.prisma.auditTrail.findMany({
+    const rows = await this.readReplica.reader().auditTrail.findMany({
       distinct: ['aksi'],
       select: { aksi: true },
       orderBy: { aksi: 'asc' },
     });
     return rows.map((r) => r.aksi);
   }
+
+  // Filter dinamis bersama untuk query() dan iterateAuditTrail()
+  private auditTrailWhere(
+    queryDto: AuditTrailQueryDto,
+  ): Prisma.AuditTrailWhereInput {
+    const { search, userId, aksi, tanggalMulai, tanggalAkhir } = queryDto;
+    const and: Prisma.AuditTrailWhereInput[] = [];
+
+    if (search) {
+      and.push({
+        OR: [
+          { aksi: { contains: search, mode: 'insensitive' } },
+          { detail: { contains: search, mode: 'insensitive' } },
+        ],
+      });
+    }
+
+    if (typeof userId === 'number') {
+      and.push({ userId });
+    }
+
+    if (aksi) {
+      and.push({ aksi });
+    }
+
+    if (tanggalMulai || tanggalAkhir) {
+      const range: Prisma.DateTimeFilter = {};
+      if (tanggalMulai) range.gte = new Date(tanggalMulai);
+      if (tanggalAkhir) range.lte = new Date(tanggalAkhir);
+      and.push({ timestamp: range });
+    }
+
+    return and.length > 0 ? { AND: and } : {};
+  }
+
+  // Baris setelah `key` dalam AUDIT_TRAIL_ORDER (termasuk `key` bila inclusive)
+  private auditTrailCursor(
+    key: AuditTrailKey,
+    inclusive: boolean,
+  ): Prisma.AuditTrailWhereInput {
+    return {
+      OR: [
+        { timestamp: { lt: key.timestamp } },
+        {
+          timestamp: key.timestamp,
+          id: inclusive ? { lte: key.id } : { lt: key.id },
+        },
+      ],
+    };
+  }
 }
@@ -0,0 +1,73 @@
+/**
+ * In-memory stand-in for a Prisma model delegate, for specs only (excluded from the
+ * build like *.spec.ts).
+ *
+ * findMany/count understand the subset of Prisma arguments the services page with:
+ * where (AND/OR, equality, gte/lte/lt/in on scalar columns), orderBy (object or list),
+ * skip/take and select. `include` is ignored: rows are returned whole.
+ */
+
+type Row = Record<string, unknown> & { id: number };
+type Where = Record<string, unknown>;
+type OrderBy = Record<string, 'asc' | 'desc'>;
+
+export function matches(row: Row, where: Where = {}): boolean {
+  return Object.entries(where).every(([key, cond]) => {
+    if (key === 'AND') return (cond as Where[]).every((w) => matches(row, w));
+    if (key === 'OR') return (cond as Where[]).some((w) => matches(row, w));
+    const value = row[key] as number | Date;
+    if (cond instanceof Date) return +value === +cond;
+    if (cond === null || typeof cond !== 'object') return value === cond;
+    const ops = cond as Record<string, unknown>;
+    return (
+      (ops.gte === undefined || +value >= +(ops.gte as Date)) &&
+      (ops.lte === undefined || +value <= +(ops.lte as Date)) &&
+      (ops.lt === undefined || +value < +(ops.lt as Date)) &&
+      (ops.in === undefined || (ops.in as unknown[]).includes(value))
+    );
+  });
+}
+
+function compare(orderBy?: OrderBy | OrderBy[]) {
+  const keys = ([] as OrderBy[]).concat(orderBy ?? []);
+  return (a: Row, b: Row) => {
+    for (const key of keys) {
+      const [field, dir] = Object.entries(key)[0];
+      const diff = +(a[field] as number) - +(b[field] as number);
+      if (diff !== 0) return dir === 'desc' ? -diff : diff;
+    }
+    return 0;
+  };
+}
+
+export function inMemoryTable(rows: Row[]) {
+  return {
+    count: jest.fn(({ where }: { where?: Where } = {}) =>
+      Promise.resolve(rows.filter((r) => matches(r, where)).length),
+    ),
+    findMany: jest.fn(
+      (
+        args: {
+          where?: Where;
+          orderBy?: OrderBy | OrderBy[];
+          skip?: number;
+          take?: number;
+          select?: Record<string, unknown>;
+        } = {},
+      ) => {
+        const skip = args.skip ?? 0;
+        const select = args.select;
+        const found = rows
+          .filter((r) => matches(r, args.where))
+          .sort(compare(args.orderBy))
+          .slice(skip, args.take === undefined ? undefined : skip + args.take)
+          .map((r) =>
+            select
+              ? Object.fromEntries(Object.keys(select).map((k) => [k, r[k]]))
+              : r,
+          );
+        return Promise.resolve(found);
+      },
+    ),
+  };
+}
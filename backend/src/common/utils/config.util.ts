@@ -0,0 +1,16 @@
+import type { ConfigService } from '@nestjs/config';
+
+/**
+ * readInt
+ * Baca bilangan bulat positif dari konfigurasi (ConfigService, lalu process.env).
+ * Nilai kosong, tidak valid, nol atau negatif → `fallback`.
+ */
+export function readInt(
+  configService: ConfigService,
+  key: string,
+  fallback: number,
+): number {
+  const raw = configService.get<string>(key) ?? process.env[key];
+  const n = raw !== undefined ? parseInt(String(raw), 10) : NaN;
+  return Number.isFinite(n) && n > 0 ? n : fallback;
+}
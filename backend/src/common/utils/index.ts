@@ -0,0 +1,2 @@
+// Barrel export untuk helper lintas modul
+export * from './config.util';
@@ -0,0 +1,29 @@
+import { Controller, Get, UseGuards } from '@nestjs/common';
+import { DashboardPayload, DashboardService } from './dashboard.service';
+import { Roles, CurrentUser } from '../common/decorators';
+import { RolesGuard } from '../common/guards';
+import type { JwtPayload } from '../common/interfaces';
+
+/**
+ * DashboardController
+ *
+ * Route prefix: /api/dashboard (global prefix 'api' configured in bootstrap)
+ * Guarding: RolesGuard at class-level, JwtAuthGuard applied globally in bootstrap
+ */
+@Controller('dashboard')
+@UseGuards(RolesGuard)
+export class DashboardController {
+  constructor(private readonly dashboardService: DashboardService) {}
+
+  /**
+   * GET /api/dashboard
+   * First-paint data of the caller's role dashboard in one response
+   */
+  @Get()
+  @Roles('employee', 'dapur', 'delivery', 'administrator')
+  async getDashboard(
+    @CurrentUser() user: JwtPayload,
+  ): Promise<DashboardPayload> {
+    return this.dashboardService.getDashboard(user);
+  }
+}
@@ -0,0 +1,19 @@
+import { Module } from '@nestjs/common';
+import { OrdersModule } from '../orders/orders.module';
+import { ReportsModule } from '../reports/reports.module';
+import { DashboardController } from './dashboard.controller';
+import { DashboardService } from './dashboard.service';
+
+/**
+ * DashboardModule
+ *
+ * Menyediakan GET /api/dashboard: satu respons ringkas per role untuk tampilan awal dashboard
+ * (counter hari ini, jumlah persetujuan tertunda, daftar pesanan singkat, laporan departemen).
+ * OrdersModule dan ReportsModule diimpor untuk OrdersService dan ReportsService.
+ */
+@Module({
+  imports: [OrdersModule, ReportsModule],
+  controllers: [DashboardController],
+  providers: [DashboardService],
+})
+export class DashboardModule {}
@@ -0,0 +1,89 @@
+import type { ConfigService } from '@nestjs/config';
+import type { PrismaService } from '../prisma/prisma.service';
+import type { OrdersService } from '../orders/orders.service';
+import type { ReportsService } from '../reports/services/reports.service';
+import type { JwtPayload } from '../common/interfaces';
+import { OrdersMaterializedEvent } from '../common/events';
+import { DashboardService, EmployeeDashboard } from './dashboard.service';
+
+function setup() {
+  const prisma = {
+    pesanan: {
+      findMany: jest.fn().mockResolvedValue([]),
+      groupBy: jest.fn().mockResolvedValue([]),
+    },
+  };
+  const ordersService = {
+    getTodayCounters: jest.fn().mockResolvedValue({
+      date: '2025-01-01',
+      version: 1,
+      totals: { orders: 0, meals: 0 },
+      byStatus: {},
+    }),
+    getPendingApprovals: jest.fn().mockResolvedValue([]),
+  };
+  const service = new DashboardService(
+    prisma as unknown as PrismaService,
+    { get: () => undefined } as unknown as ConfigService,
+    ordersService as unknown as OrdersService,
+    {} as ReportsService,
+  );
+  return { service, prisma };
+}
+
+const employee = (karyawanId: number) =>
+  ({ karyawanId, role: 'employee' }) as unknown as JwtPayload;
+
+describe('DashboardService', () => {
+  it('labels the employee window with the local calendar date', async () => {
+    const { service } = setup();
+
+    const dashboard = (await service.getDashboard(
+      employee(1),
+    )) as EmployeeDashboard;
+
+    const from = new Date();
+    from.setDate(from.getDate() - 6);
+    const local = [
+      from.getFullYear(),
+      String(from.getMonth() + 1).padStart(2, '0'),
+      String(from.getDate()).padStart(2, '0'),
+    ].join('-');
+    expect(dashboard.from).toBe(local);
+  });
+
+  it('includes READY orders in the dapur queue preview', async () => {
+    const { service, prisma } = setup();
+
+    await service.getDashboard({ role: 'dapur' } as unknown as JwtPayload);
+
+    expect(prisma.pesanan.findMany).toHaveBeenCalledWith(
+      expect.objectContaining({
+        where: expect.objectContaining({
+          statusPesanan: { in: ['MENUNGGU', 'IN_PROGRESS', 'READY'] },
+        }),
+      }),
+    );
+  });
+
+  it('drops cached employee dashboards after a standing order run', async () => {
+    const { service, prisma } = setup();
+
+    await service.getDashboard(employee(1));
+    await service.getDashboard(employee(2));
+    await service.getDashboard({ role: 'delivery' } as unknown as JwtPayload);
+    await service.getDashboard(employee(1));
+    expect(prisma.pesanan.groupBy).toHaveBeenCalledTimes(2);
+
+    service.handleOrdersMaterialized(
+      new OrdersMaterializedEvent('2025-01-02', 2, 4, []),
+    );
+    await service.getDashboard(employee(1));
+    await service.getDashboard(employee(2));
+    await service.getDashboard({ role: 'delivery' } as unknown as JwtPayload);
+
+    expect(prisma.pesanan.groupBy).toHaveBeenCalledTimes(4);
+    // Shared role entries are unaffected
+    expect(prisma.pesanan.findMany).toHaveBeenCalledTimes(5);
+  });
+});
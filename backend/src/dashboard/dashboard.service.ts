@@ -0,0 +1,377 @@
+import { Injectable, Optional } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { OnEvent } from '@nestjs/event-emitter';
+import { PrismaService } from '../prisma/prisma.service';
+import { MetricsService } from '../metrics/metrics.service';
+import { OrdersService } from '../orders/orders.service';
+import type { OrderCountersSummary } from '../orders/order-status-counters.service';
+import {
+  DepartmentResult,
+  ReportsService,
+} from '../reports/services/reports.service';
+import type { JwtPayload } from '../common/interfaces';
+import {
+  OrderApprovalRequestedEvent,
+  OrdersMaterializedEvent,
+  OrderStatusChangedEvent,
+} from '../common/events';
+import { readInt } from '../common/utils';
+
+/**
+ * DashboardService
+ *
+ * Everything a role's dashboard shows on first paint, assembled server-side in one
+ * response (GET /dashboard) instead of several calls from the browser.
+ *
+ * - The parts of a payload are read in parallel. Counters and the pending approval
+ *   count come from memory (OrderStatusCountersService, PendingApprovalQueueService);
+ *   order lists are short projected queries with only the columns the dashboards render.
+ * - Payloads are cached for DASHBOARD_CACHE_TTL_SECONDS (default 5s). administrator,
+ *   dapur and delivery see the same data regardless of department, so they share one
+ *   entry per role; employee entries are per karyawan and dropped when one of their own
+ *   orders changes on this instance (all of them after a standing order run, whose
+ *   event carries no karyawan ids). Concurrent requests for a key share one build.
+ * - Dashboard windows (today, last 7 days) are always younger than the archive horizon,
+ *   so only the hot order table is read.
+ *
+ * Cluster note:
+ * - Each instance keeps its own cache; shared entries lag other instances' writes by at
+ *   most the TTL.
+ */
+
+const COUNTER_STATUSES = [
+  'MENUNGGU',
+  'IN_PROGRESS',
+  'READY',
+  'ON_DELIVERY',
+  'COMPLETE',
+  'DITOLAK',
+  'MENUNGGU_PERSETUJUAN',
+] as const;
+
+type StatusType = (typeof COUNTER_STATUSES)[number];
+
+type CounterCell = { orders: number; meals: number };
+
+type DashboardCounters = Pick<
+  OrderCountersSummary,
+  'date' | 'version' | 'totals' | 'byStatus'
+>;
+
+// Columns rendered by the dashboard tables
+const DASHBOARD_ORDER_SELECT = {
+  id: true,
+  kodePesanan: true,
+  statusPesanan: true,
+  jumlahPesanan: true,
+  tanggalPesanan: true,
+  waktuDibuat: true,
+  waktuDiproses: true,
+  waktuSiap: true,
+} as const;
+
+type DashboardOrder = {
+  id: number;
+  kodePesanan: string;
+  statusPesanan: string;
+  jumlahPesanan: number;
+  tanggalPesanan: Date;
+  waktuDibuat: Date;
+  waktuDiproses: Date | null;
+  waktuSiap: Date | null;
+};
+
+export type AdminDashboard = {
+  role: 'administrator';
+  generatedAt: string;
+  counters: DashboardCounters;
+  pendingApprovals: number;
+  recentOrders: DashboardOrder[];
+  departments: DepartmentResult[];
+};
+
+export type DapurDashboard = {
+  role: 'dapur';
+  generatedAt: string;
+  counters: DashboardCounters;
+  pendingApprovals: number;
+  queue: DashboardOrder[];
+};
+
+export type DeliveryDashboard = {
+  role: 'delivery';
+  generatedAt: string;
+  counters: DashboardCounters;
+  ready: DashboardOrder[];
+};
+
+export type EmployeeDashboard = {
+  role: 'employee';
+  generatedAt: string;
+  from: string;
+  totals: CounterCell;
+  byStatus: Record<StatusType, CounterCell>;
+  recentOrders: DashboardOrder[];
+};
+
+export type DashboardPayload =
+  | AdminDashboard
+  | DapurDashboard
+  | DeliveryDashboard
+  | EmployeeDashboard;
+
+type CacheEntry = {
+  expiresAt: number;
+  value: Promise<DashboardPayload>;
+};
+
+const RECENT_ORDERS_ADMIN = 10;
+const RECENT_ORDERS_EMPLOYEE = 5;
+const QUEUE_PREVIEW = 8;
+const EMPLOYEE_WINDOW_DAYS = 7;
+
+@Injectable()
+export class DashboardService {
+  private readonly cache = new Map<string, CacheEntry>();
+  private readonly ttlMs: number;
+  private readonly maxEntries: number;
+
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly configService: ConfigService,
+    private readonly ordersService: OrdersService,
+    private readonly reportsService: ReportsService,
+    @Optional() private readonly metrics?: MetricsService,
+  ) {
+    this.ttlMs =
+      readInt(this.configService, 'DASHBOARD_CACHE_TTL_SECONDS', 5) * 1000;
+    this.maxEntries = readInt(
+      this.configService,
+      'DASHBOARD_CACHE_MAX_ENTRIES',
+      5000,
+    );
+  }
+
+  /**
+   * getDashboard
+   * - Payload for the caller's role, served from cache while fresh
+   * - Error: a failed build is not cached, the next request retries it
+   */
+  getDashboard(user: JwtPayload): Promise<DashboardPayload> {
+    const key =
+      user.role === 'employee' ? `employee:${user.karyawanId}` : user.role;
+    const now = Date.now();
+
+    const cached = this.cache.get(key);
+    if (cached && cached.expiresAt > now) {
+      this.count(user.role, 'hit');
+      return cached.value;
+    }
+
+    this.count(user.role, 'miss');
+    const value = this.build(user);
+    const entry: CacheEntry = { expiresAt: now + this.ttlMs, value };
+    this.store(key, entry);
+    value.catch(() => {
+      if (this.cache.get(key) === entry) this.cache.delete(key);
+    });
+    return value;
+  }
+
+  @OnEvent('order.created')
+  handleOrderCreated(event: { karyawanPemesanId: number }): void {
+    this.cache.delete(`employee:${event.karyawanPemesanId}`);
+  }
+
+  @OnEvent('order.status.changed')
+  handleStatusChanged(event: OrderStatusChangedEvent): void {
+    this.cache.delete(`employee:${event.karyawanPemesanId}`);
+  }
+
+  @OnEvent('order.approval.requested')
+  handleApprovalRequested(event: OrderApprovalRequestedEvent): void {
+    this.cache.delete(`employee:${event.karyawanPemesanId}`);
+  }
+
+  // Standing orders were created for many karyawan at once
+  @OnEvent('orders.materialized')
+  handleOrdersMaterialized(_event: OrdersMaterializedEvent): void {
+    for (const key of this.cache.keys()) {
+      if (key.startsWith('employee:')) this.cache.delete(key);
+    }
+  }
+
+  // Helpers
+
+  private build(user: JwtPayload): Promise<DashboardPayload> {
+    switch (user.role) {
+      case 'administrator':
+        return this.buildAdmin();
+      case 'dapur':
+        return this.buildDapur();
+      case 'delivery':
+        return this.buildDelivery();
+      default:
+        return this.buildEmployee(user.karyawanId);
+    }
+  }
+
+  private async buildAdmin(): Promise<AdminDashboard> {
+    const today = this.startOfToday();
+    const now = new Date().toISOString();
+    const [counters, pending, recentOrders, departments] = await Promise.all([
+      this.counters(),
+      this.ordersService.getPendingApprovals(),
+      this.prisma.pesanan.findMany({
+        where: { tanggalPesanan: today },
+        orderBy: { waktuDibuat: 'desc' },
+        take: RECENT_ORDERS_ADMIN,
+        select: DASHBOARD_ORDER_SELECT,
+      }),
+      this.reportsService.getDepartmentReport({
+        tanggalMulai: now,
+        tanggalAkhir: now,
+      }),
+    ]);
+    return {
+      role: 'administrator',
+      generatedAt: now,
+      counters,
+      pendingApprovals: pending.length,
+      recentOrders,
+      departments,
+    };
+  }
+
+  private async buildDapur(): Promise<DapurDashboard> {
+    const [counters, pending, queue] = await Promise.all([
+      this.counters(),
+      this.ordersService.getPendingApprovals(),
+      this.prisma.pesanan.findMany({
+        where: {
+          tanggalPesanan: this.startOfToday(),
+          statusPesanan: { in: ['MENUNGGU', 'IN_PROGRESS', 'READY'] },
+        },
+        orderBy: { waktuDibuat: 'desc' },
+        take: QUEUE_PREVIEW,
+        select: DASHBOARD_ORDER_SELECT,
+      }),
+    ]);
+    return {
+      role: 'dapur',
+      generatedAt: new Date().toISOString(),
+      counters,
+      pendingApprovals: pending.length,
+      queue,
+    };
+  }
+
+  private async buildDelivery(): Promise<DeliveryDashboard> {
+    const [counters, ready] = await Promise.all([
+      this.counters(),
+      this.prisma.pesanan.findMany({
+        where: { tanggalPesanan: this.startOfToday(), statusPesanan: 'READY' },
+        orderBy: { waktuDibuat: 'desc' },
+        take: QUEUE_PREVIEW,
+        select: DASHBOARD_ORDER_SELECT,
+      }),
+    ]);
+    return {
+      role: 'delivery',
+      generatedAt: new Date().toISOString(),
+      counters,
+      ready,
+    };
+  }
+
+  private async buildEmployee(karyawanId: number): Promise<EmployeeDashboard> {
+    const from = this.startOfToday();
+    from.setDate(from.getDate() - (EMPLOYEE_WINDOW_DAYS - 1));
+    const where = { karyawanPemesanId: karyawanId, tanggalPesanan: { gte: from } };
+
+    const [groups, recentOrders] = await Promise.all([
+      this.prisma.pesanan.groupBy({
+        by: ['statusPesanan'],
+        where,
+        _count: { _all: true },
+        _sum: { jumlahPesanan: true },
+      }),
+      this.prisma.pesanan.findMany({
+        where,
+        orderBy: { waktuDibuat: 'desc' },
+        take: RECENT_ORDERS_EMPLOYEE,
+        select: DASHBOARD_ORDER_SELECT,
+      }),
+    ]);
+
+    const totals: CounterCell = { orders: 0, meals: 0 };
+    const byStatus = Object.fromEntries(
+      COUNTER_STATUSES.map((status) => [status, { orders: 0, meals: 0 }]),
+    ) as Record<StatusType, CounterCell>;
+    for (const group of groups) {
+      const orders = group._count._all;
+      const meals = group._sum.jumlahPesanan ?? 0;
+      const cell = byStatus[group.statusPesanan as StatusType];
+      if (cell) {
+        cell.orders += orders;
+        cell.meals += meals;
+      }
+      totals.orders += orders;
+      totals.meals += meals;
+    }
+
+    return {
+      role: 'employee',
+      generatedAt: new Date().toISOString(),
+      from: this.formatDate(from),
+      totals,
+      byStatus,
+      recentOrders,
+    };
+  }
+
+  // Department and shift breakdowns are not shown on dashboards
+  private async counters(): Promise<DashboardCounters> {
+    const { date, version, totals, byStatus } =
+      await this.ordersService.getTodayCounters();
+    return { date, version, totals, byStatus };
+  }
+
+  private store(key: string, entry: CacheEntry): void {
+    if (!this.cache.has(key) && this.cache.size >= this.maxEntries) {
+      const now = Date.now();
+      for (const [k, e] of this.cache) {
+        if (e.expiresAt <= now) this.cache.delete(k);
+      }
+      if (this.cache.size >= this.maxEntries) {
+        const oldest = this.cache.keys().next().value;
+        if (oldest !== undefined) this.cache.delete(oldest);
+      }
+    }
+    this.cache.set(key, entry);
+  }
+
+  // Local midnight, same mapping as OrdersService for the DATE column
+  private startOfToday(): Date {
+    const d = new Date();
+    d.setHours(0, 0, 0, 0);
+    return d;
+  }
+
+  // YYYY-MM-DD in local time (toISOString would give the previous day east of UTC)
+  private formatDate(d: Date): string {
+    const yyyy = d.getFullYear();
+    const mm = (d.getMonth() + 1).toString().padStart(2, '0');
+    const dd = d.getDate().toString().padStart(2, '0');
+    return `${yyyy}-${mm}-${dd}`;
+  }
+
+  private count(role: string, result: 'hit' | 'miss'): void {
+    this.metrics?.increment(
+      'dashboard_requests_total',
+      { role, result },
+      1,
+      'Dashboard payload requests, by role and cache result',
+    );
+  }
+}
@@ -25,6 +25,8 @@ import 'reflect-metadata';
  */
 import { NestFactory } from '@nestjs/core';
 import { ValidationPipe } from '@nestjs/common';
+import type { NestExpressApplication } from '@nestjs/platform-express';
+import type { NextFunction, Request, Response } from 'express';
 import { Reflector } from '@nestjs/core';
 import cookieParser from 'cookie-parser';
 import { AppModule } from './app.module';
@@ -45,12 +47,15 @@ import { Server as SocketIOServer, ServerOptions } from 'socket.io';
  * Opsi penting:
  * - transports: ['websocket'] untuk koneksi WebSocket murni
  * - CORS dikonfigurasi di level server WS sehingga decorator Gateway tidak perlu memuat CORS
+ * - permessage-deflate opsional (WS_COMPRESSION_THRESHOLD_BYTES > 0): hanya pesan yang
+ *   lebih besar dari ambang yang dikompres, event kecil tetap tanpa overhead deflate
  */
 class DedicatedSocketIoAdapter extends IoAdapter {
   constructor(
     app: any,
     private readonly wsPort: number,
     private readonly corsOrigin: true | string[],
+    private readonly compressionThreshold = 0,
   ) {
     super(app);
   }
@@ -68,13 +73,45 @@ class DedicatedSocketIoAdapter extends IoAdapter {
         allowedHeaders: 'Content-Type, Authorization',
       },
       transports: ['websocket'],
+      perMessageDeflate:
+        this.compressionThreshold > 0
+          ? { threshold: this.compressionThreshold }
+          : false,
     });
     return server;
   }
 }
 
 async function bootstrap() {
-  const app = await NestFactory.create(AppModule);
+  const app = await NestFactory.create<NestExpressApplication>(AppModule);
+
+  // Di belakang reverse proxy (nginx), aktifkan TRUST_PROXY agar req.ip berisi IP klien asli
+  // (dipakai oleh pembatas laju login per IP). Nilai: 'true' | jumlah hop | daftar subnet.
+  const trustProxy = process.env.TRUST_PROXY;
+  if (trustProxy) {
+    app.set(
+      'trust proxy',
+      trustProxy === 'true'
+        ? true
+        : /^\d+$/.test(trustProxy)
+          ? parseInt(trustProxy, 10)
+          : trustProxy,
+    );
+  } else {
+    // Request dari proxy tanpa TRUST_PROXY: semua klien terlihat sebagai IP proxy
+    let warned = false;
+    app.use((req: Request, _res: Response, next: NextFunction) => {
+      if (!warned && req.headers['x-forwarded-for'] !== undefined) {
+        warned = true;
+        console.warn(
+          '[Bootstrap] Request membawa X-Forwarded-For tetapi TRUST_PROXY kosong: ' +
+            'req.ip berisi IP proxy, sehingga limit login per IP dan akses loopback ' +
+            '/api/metrics tidak dapat membedakan klien. Set TRUST_PROXY (mis. loopback).',
+        );
+      }
+      next();
+    });
+  }
 
   // Get Reflector instance
   const reflector = app.get(Reflector);
@@ -97,7 +134,8 @@ async function bootstrap() {
     origin: corsOrigin.includes('*') ? true : corsOrigin,
     credentials: true,
     methods: 'GET,HEAD,PUT,PATCH,POST,DELETE,OPTIONS',
-    allowedHeaders: 'Content-Type, Authorization',
+    allowedHeaders: 'Content-Type, Authorization, Idempotency-Key',
+    exposedHeaders: 'Retry-After, Idempotent-Replayed',
   });
 
   // Enable cookie parser for WebSocket handshake
@@ -125,9 +163,18 @@ async function bootstrap() {
   // WebSocket dedicated port configuration
   const wsPort = parseInt(process.env.WS_PORT || '3001', 10);
   const wsCorsOrigin = corsOrigin.includes('*') ? true : corsOrigin;
+  const wsCompressionThreshold = parseInt(
+    process.env.WS_COMPRESSION_THRESHOLD_BYTES || '0',
+    10,
+  );
   // Pasang adapter agar semua Gateway NestJS menggunakan server WS dedicated
   app.useWebSocketAdapter(
-    new DedicatedSocketIoAdapter(app, wsPort, wsCorsOrigin),
+    new DedicatedSocketIoAdapter(
+      app,
+      wsPort,
+      wsCorsOrigin,
+      Number.isFinite(wsCompressionThreshold) ? wsCompressionThreshold : 0,
+    ),
   );
 
   // Debug logs for validation
@@ -0,0 +1,33 @@
+import { Injectable, NestMiddleware } from '@nestjs/common';
+import type { NextFunction, Request, Response } from 'express';
+import { MetricsService } from './metrics.service';
+
+/**
+ * HttpMetricsMiddleware
+ * Mengukur latensi setiap request HTTP dan mencatatnya per method, route template, dan status.
+ *
+ * - Label `route` memakai template Express (mis. /api/orders/:id), bukan path mentah,
+ *   sehingga kardinalitas tetap kecil. Request tanpa route yang cocok → 'unmatched'.
+ * - Dipasang sebelum guard sehingga 401/403 juga terukur.
+ */
+@Injectable()
+export class HttpMetricsMiddleware implements NestMiddleware {
+  constructor(private readonly metrics: MetricsService) {}
+
+  use(req: Request, res: Response, next: NextFunction): void {
+    const start = process.hrtime.bigint();
+    res.once('finish', () => {
+      const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+      const routePath = (req as any).route?.path as string | undefined;
+      const route = routePath
+        ? `${req.baseUrl ?? ''}${routePath}`
+        : 'unmatched';
+      this.metrics.observe(
+        'http_request_duration_seconds',
+        { method: req.method, route, status: res.statusCode },
+        seconds,
+      );
+    });
+    next();
+  }
+}
@@ -0,0 +1,53 @@
+import {
+  Controller,
+  ForbiddenException,
+  Get,
+  Header,
+  Req,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import type { Request } from 'express';
+import { Public } from '../common/decorators/public.decorator';
+import { MetricsService } from './metrics.service';
+
+/**
+ * MetricsController
+ *
+ * GET /api/metrics — metrik format teks Prometheus.
+ * Akses:
+ * - Jika METRICS_TOKEN di-set: wajib header `Authorization: Bearer <METRICS_TOKEN>`.
+ * - Jika tidak: hanya dari loopback (scraper lokal, mis. curl http://127.0.0.1:3000/api/metrics).
+ */
+@Controller('metrics')
+export class MetricsController {
+  constructor(
+    private readonly metrics: MetricsService,
+    private readonly configService: ConfigService,
+  ) {}
+
+  @Public()
+  @Get()
+  @Header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+  @Header('Cache-Control', 'no-store')
+  getMetrics(@Req() req: Request): string {
+    this.assertScrapeAllowed(req);
+    return this.metrics.render();
+  }
+
+  private assertScrapeAllowed(req: Request): void {
+    const token = this.configService.get<string>('METRICS_TOKEN');
+    if (token) {
+      const header = req.headers.authorization ?? '';
+      if (header !== `Bearer ${token}`) {
+        throw new ForbiddenException('Invalid metrics token');
+      }
+      return;
+    }
+    const ip = req.ip ?? req.socket?.remoteAddress ?? '';
+    const loopback =
+      ip === '127.0.0.1' || ip === '::1' || ip === '::ffff:127.0.0.1';
+    if (!loopback) {
+      throw new ForbiddenException('Metrics are only available from loopback');
+    }
+  }
+}
@@ -0,0 +1,24 @@
+import { Global, MiddlewareConsumer, Module, NestModule } from '@nestjs/common';
+import { MetricsController } from './metrics.controller';
+import { MetricsService } from './metrics.service';
+import { HttpMetricsMiddleware } from './http-metrics.middleware';
+
+/**
+ * MetricsModule — Modul global observabilitas
+ *
+ * - MetricsService tersedia global agar PrismaService, AuditTrailService, gateway websocket,
+ *   dan service lain dapat menyumbang metrik tanpa impor modul eksplisit.
+ * - HttpMetricsMiddleware dipasang untuk semua route.
+ * - MetricsController mengekspos GET /api/metrics.
+ */
+@Global()
+@Module({
+  controllers: [MetricsController],
+  providers: [MetricsService],
+  exports: [MetricsService],
+})
+export class MetricsModule implements NestModule {
+  configure(consumer: MiddlewareConsumer): void {
+    consumer.apply(HttpMetricsMiddleware).forRoutes('*');
+  }
+}
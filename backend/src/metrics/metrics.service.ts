@@ -0,0 +1,313 @@
+import { Injectable, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
+import {
+  IntervalHistogram,
+  PerformanceObserver,
+  monitorEventLoopDelay,
+} from 'perf_hooks';
+import { getHeapStatistics } from 'v8';
+
+/**
+ * MetricsService — Registry metrik format teks Prometheus (exposition format 0.0.4)
+ *
+ * Isi:
+ * - Histogram & counter berlabel yang diisi oleh instrumentasi (HTTP middleware, Prisma).
+ * - Gauge berbasis callback yang dibaca saat scrape (antrean audit, koneksi websocket).
+ * - Metrik runtime Node.js: event-loop lag, heap, RSS, dan durasi GC per jenis.
+ *
+ * Pola Penggunaan:
+ *   metrics.observe('http_request_duration_seconds', { method, route, status }, seconds);
+ *   metrics.registerGauge('audit_write_queue_depth', 'help', () => [{ labels, value }]);
+ *
+ * Catatan:
+ * - Registry bersifat per proses. Pada PM2 cluster setiap scrape hanya melihat satu instance;
+ *   label `instance` (NODE_APP_INSTANCE) membedakan sumbernya.
+ * - Jumlah kombinasi label per metrik dibatasi (MAX_SERIES_PER_METRIC) agar label yang tidak
+ *   terduga (mis. path tanpa route) tidak membuat memori tumbuh tanpa batas.
+ */
+
+type Labels = Record<string, string | number>;
+
+export type GaugeSample = { labels?: Labels; value: number };
+
+type HistogramSeries = {
+  labels: Labels;
+  counts: number[];
+  sum: number;
+  count: number;
+};
+
+type HistogramMetric = {
+  help: string;
+  buckets: number[];
+  series: Map<string, HistogramSeries>;
+};
+
+type CounterMetric = {
+  help: string;
+  series: Map<string, { labels: Labels; value: number }>;
+};
+
+type GaugeMetric = {
+  help: string;
+  collectors: Array<() => GaugeSample[] | number>;
+};
+
+const MAX_SERIES_PER_METRIC = 2000;
+
+// Detik; cocok untuk latensi HTTP dan query DB (1ms .. 10s)
+export const LATENCY_BUCKETS = [
+  0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+];
+
+const GC_KINDS: Record<number, string> = {
+  1: 'minor',
+  2: 'major',
+  4: 'incremental',
+  8: 'weakcb',
+};
+
+@Injectable()
+export class MetricsService implements OnModuleInit, OnModuleDestroy {
+  private readonly histograms = new Map<string, HistogramMetric>();
+  private readonly counters = new Map<string, CounterMetric>();
+  private readonly gauges = new Map<string, GaugeMetric>();
+  private readonly instance = process.env.NODE_APP_INSTANCE ?? '0';
+
+  private loopDelay?: IntervalHistogram;
+  private gcObserver?: PerformanceObserver;
+
+  constructor() {
+    this.defineHistogram(
+      'http_request_duration_seconds',
+      'HTTP request latency by route template and status code',
+    );
+    this.defineHistogram(
+      'prisma_operation_duration_seconds',
+      'Prisma client operation latency by model and action (middleware)',
+    );
+    this.defineHistogram(
+      'prisma_query_duration_seconds',
+      'SQL query duration reported by Prisma query events, by statement type',
+    );
+    this.defineHistogram(
+      'nodejs_gc_duration_seconds',
+      'Garbage collection pause duration by kind',
+      [0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25],
+    );
+    this.registerRuntimeGauges();
+  }
+
+  onModuleInit(): void {
+    this.loopDelay = monitorEventLoopDelay({ resolution: 20 });
+    this.loopDelay.enable();
+
+    this.gcObserver = new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) {
+        const kind = (entry as any).detail?.kind ?? (entry as any).kind;
+        this.observe(
+          'nodejs_gc_duration_seconds',
+          { kind: GC_KINDS[kind] ?? 'other' },
+          entry.duration / 1000,
+        );
+      }
+    });
+    this.gcObserver.observe({ entryTypes: ['gc'] });
+  }
+
+  onModuleDestroy(): void {
+    this.loopDelay?.disable();
+    this.gcObserver?.disconnect();
+  }
+
+  defineHistogram(
+    name: string,
+    help: string,
+    buckets: number[] = LATENCY_BUCKETS,
+  ): void {
+    if (this.histograms.has(name)) return;
+    this.histograms.set(name, {
+      help,
+      buckets: [...buckets].sort((a, b) => a - b),
+      series: new Map(),
+    });
+  }
+
+  /**
+   * observe
+   * Menambahkan satu observasi (detik) ke histogram. Histogram yang belum didefinisikan
+   * dibuat otomatis dengan LATENCY_BUCKETS.
+   */
+  observe(name: string, labels: Labels, value: number): void {
+    let metric = this.histograms.get(name);
+    if (!metric) {
+      this.defineHistogram(name, name);
+      metric = this.histograms.get(name)!;
+    }
+    const key = this.seriesKey(labels);
+    let series = metric.series.get(key);
+    if (!series) {
+      if (metric.series.size >= MAX_SERIES_PER_METRIC) return;
+      series = {
+        labels,
+        counts: new Array(metric.buckets.length).fill(0),
+        sum: 0,
+        count: 0,
+      };
+      metric.series.set(key, series);
+    }
+    for (let i = 0; i < metric.buckets.length; i++) {
+      if (value <= metric.buckets[i]) series.counts[i]++;
+    }
+    series.sum += value;
+    series.count++;
+  }
+
+  increment(name: string, labels: Labels = {}, by = 1, help?: string): void {
+    let metric = this.counters.get(name);
+    if (!metric) {
+      metric = { help: help ?? name, series: new Map() };
+      this.counters.set(name, metric);
+    }
+    const key = this.seriesKey(labels);
+    const series = metric.series.get(key);
+    if (series) {
+      series.value += by;
+    } else if (metric.series.size < MAX_SERIES_PER_METRIC) {
+      metric.series.set(key, { labels, value: by });
+    }
+  }
+
+  /**
+   * registerGauge
+   * Mendaftarkan callback yang dibaca saat scrape. Beberapa callback untuk nama yang sama
+   * digabung (mis. beberapa service menyumbang label `queue` berbeda).
+   */
+  registerGauge(
+    name: string,
+    help: string,
+    collect: () => GaugeSample[] | number,
+  ): void {
+    const metric = this.gauges.get(name);
+    if (metric) {
+      metric.collectors.push(collect);
+    } else {
+      this.gauges.set(name, { help, collectors: [collect] });
+    }
+  }
+
+  /**
+   * render
+   * Serialisasi seluruh metrik ke format teks Prometheus.
+   */
+  render(): string {
+    const lines: string[] = [];
+
+    for (const [name, metric] of this.gauges) {
+      lines.push(`# HELP ${name} ${metric.help}`, `# TYPE ${name} gauge`);
+      for (const collect of metric.collectors) {
+        let samples: GaugeSample[];
+        try {
+          const result = collect();
+          samples = typeof result === 'number' ? [{ value: result }] : result;
+        } catch {
+          continue;
+        }
+        for (const s of samples) {
+          lines.push(`${name}${this.formatLabels(s.labels ?? {})} ${s.value}`);
+        }
+      }
+    }
+
+    for (const [name, metric] of this.counters) {
+      lines.push(`# HELP ${name} ${metric.help}`, `# TYPE ${name} counter`);
+      for (const s of metric.series.values()) {
+        lines.push(`${name}_total${this.formatLabels(s.labels)} ${s.value}`);
+      }
+    }
+
+    for (const [name, metric] of this.histograms) {
+      lines.push(`# HELP ${name} ${metric.help}`, `# TYPE ${name} histogram`);
+      for (const s of metric.series.values()) {
+        metric.buckets.forEach((le, i) => {
+          const labels = this.formatLabels(s.labels, String(le));
+          lines.push(`${name}_bucket${labels} ${s.counts[i]}`);
+        });
+        lines.push(
+          `${name}_bucket${this.formatLabels(s.labels, '+Inf')} ${s.count}`,
+          `${name}_sum${this.formatLabels(s.labels)} ${s.sum}`,
+          `${name}_count${this.formatLabels(s.labels)} ${s.count}`,
+        );
+      }
+    }
+
+    // Event-loop delay dihitung per interval scrape
+    this.loopDelay?.reset();
+
+    return lines.join('\n') + '\n';
+  }
+
+  // Helpers
+
+  private registerRuntimeGauges(): void {
+    this.registerGauge(
+      'nodejs_eventloop_lag_seconds',
+      'Event loop delay since the previous scrape',
+      () => {
+        const h = this.loopDelay;
+        if (!h || h.count === 0) return [];
+        return [
+          { labels: { quantile: '0.5' }, value: h.percentile(50) / 1e9 },
+          { labels: { quantile: '0.99' }, value: h.percentile(99) / 1e9 },
+          { labels: { quantile: 'max' }, value: h.max / 1e9 },
+        ];
+      },
+    );
+    this.registerGauge(
+      'nodejs_memory_bytes',
+      'Process memory usage by type',
+      () => {
+        const m = process.memoryUsage();
+        return [
+          { labels: { type: 'rss' }, value: m.rss },
+          { labels: { type: 'heap_used' }, value: m.heapUsed },
+          { labels: { type: 'heap_total' }, value: m.heapTotal },
+          { labels: { type: 'external' }, value: m.external },
+          { labels: { type: 'array_buffers' }, value: m.arrayBuffers },
+        ];
+      },
+    );
+    this.registerGauge(
+      'nodejs_heap_size_limit_bytes',
+      'V8 heap size limit',
+      () => getHeapStatistics().heap_size_limit,
+    );
+    this.registerGauge(
+      'process_uptime_seconds',
+      'Process uptime',
+      () => process.uptime(),
+    );
+  }
+
+  private seriesKey(labels: Labels): string {
+    return Object.keys(labels)
+      .sort()
+      .map((k) => `${k}=${labels[k]}`)
+      .join(',');
+  }
+
+  private formatLabels(labels: Labels, le?: string): string {
+    const parts = Object.keys(labels).map(
+      (k) => `${k}="${this.escapeLabel(String(labels[k]))}"`,
+    );
+    parts.push(`instance="${this.escapeLabel(this.instance)}"`);
+    if (le !== undefined) parts.push(`le="${le}"`);
+    return `{${parts.join(',')}}`;
+  }
+
+  private escapeLabel(value: string): string {
+    return value
+      .replace(/\\/g, '\\\\')
+      .replace(/\n/g, '\\n')
+      .replace(/"/g, '\\"');
+  }
+}
@@ -5,3 +5,7 @@ export * from './reject-order.dto';
 export * from './edit-order.dto';
 export * from './approve-reject-order.dto';
 export * from './query-orders.dto';
+export * from './pending-approval-changes-query.dto';
+export * from './order-changes-query.dto';
+export * from './order-template.dto';
+export * from './order-response.dto';
@@ -0,0 +1,31 @@
+import { IsInt, IsOptional, Max, Min } from 'class-validator';
+import { Type } from 'class-transformer';
+
+/**
+ * Query of GET /orders/changes.
+ *
+ * Client contract for the { version, hasMore, changes, removed } response:
+ * - Store `version` and send it as `since` on the next call; apply `changes` as upserts
+ *   and `removed` as deletions (both idempotent, rows may be sent more than once).
+ * - hasMore: true → call again right away with the new `version`.
+ * - hasMore: false → wait for the regular poll interval (or a websocket event). This is
+ *   also returned for a full page whose `version` could not advance because a
+ *   transaction still open in the database holds back its first row; refetching at once
+ *   would return the same page.
+ */
+export class OrderChangesQueryDto {
+  // `version` returned by the previous orders/changes response (0 = from the start)
+  @IsInt()
+  @Min(0)
+  @IsOptional()
+  @Type(() => Number)
+  since?: number;
+
+  // Maximum number of changed rows + tombstones per response
+  @IsInt()
+  @Min(1)
+  @Max(1000)
+  @IsOptional()
+  @Type(() => Number)
+  limit?: number;
+}
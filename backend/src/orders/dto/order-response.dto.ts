@@ -0,0 +1,153 @@
+import type { Prisma } from '@prisma/client';
+import {
+  compileSerializer,
+  JsonSchema,
+} from '../../common/serializers';
+
+/**
+ * Response shape of orders in list endpoints (GET /orders, /orders/changes,
+ * /orders/pending-approvals[/changes]).
+ *
+ * ORDER_LIST_SELECT is the Prisma projection, ORDER_LIST_ITEM_SCHEMA the matching
+ * serializer schema: keep both in sync. Relations carry only what list views render
+ * (names, shift times), not the full master rows. The same field names exist on
+ * PesananArchive, so the select is used for both tables.
+ */
+export const ORDER_LIST_SELECT = {
+  id: true,
+  kodePesanan: true,
+  karyawanPemesanId: true,
+  departmentPemesanId: true,
+  shiftId: true,
+  jumlahPesanan: true,
+  jumlahPesananAwal: true,
+  statusPesanan: true,
+  tanggalPesanan: true,
+  requiresApproval: true,
+  approvalStatus: true,
+  catatanDapur: true,
+  catatanAdmin: true,
+  approvedById: true,
+  waktuDibuat: true,
+  waktuDiproses: true,
+  waktuSiap: true,
+  waktuDiantar: true,
+  waktuSelesai: true,
+  version: true,
+  pemesan: { select: { id: true, nomorIndukKaryawan: true, namaLengkap: true } },
+  departemen: { select: { id: true, namaDivisi: true } },
+  shift: {
+    select: { id: true, namaShift: true, jamMulai: true, jamSelesai: true },
+  },
+} as const;
+
+export type OrderListItem = Prisma.PesananGetPayload<{
+  select: typeof ORDER_LIST_SELECT;
+}>;
+
+const int = { type: 'integer' } as const;
+const nullableInt = { type: 'integer', nullable: true } as const;
+const str = { type: 'string' } as const;
+const nullableStr = { type: 'string', nullable: true } as const;
+const date = { type: 'date' } as const;
+const nullableDate = { type: 'date', nullable: true } as const;
+
+export const ORDER_LIST_ITEM_SCHEMA: JsonSchema = {
+  type: 'object',
+  properties: {
+    id: int,
+    kodePesanan: str,
+    karyawanPemesanId: int,
+    departmentPemesanId: int,
+    shiftId: int,
+    jumlahPesanan: int,
+    jumlahPesananAwal: nullableInt,
+    statusPesanan: str,
+    tanggalPesanan: date,
+    requiresApproval: { type: 'boolean' },
+    approvalStatus: nullableStr,
+    catatanDapur: nullableStr,
+    catatanAdmin: nullableStr,
+    approvedById: nullableInt,
+    waktuDibuat: date,
+    waktuDiproses: nullableDate,
+    waktuSiap: nullableDate,
+    waktuDiantar: nullableDate,
+    waktuSelesai: nullableDate,
+    version: int,
+    pemesan: {
+      type: 'object',
+      properties: { id: int, nomorIndukKaryawan: str, namaLengkap: str },
+    },
+    departemen: {
+      type: 'object',
+      properties: { id: int, namaDivisi: str },
+    },
+    shift: {
+      type: 'object',
+      properties: {
+        id: int,
+        namaShift: str,
+        jamMulai: date,
+        jamSelesai: date,
+      },
+    },
+  },
+};
+
+const orderArray: JsonSchema = { type: 'array', items: ORDER_LIST_ITEM_SCHEMA };
+
+// GET /orders → { data, total, page, limit, totalPages }
+export const serializeOrderPage = compileSerializer<{
+  data: OrderListItem[];
+  total: number;
+  page: number;
+  limit: number;
+  totalPages: number;
+}>({
+  type: 'object',
+  properties: {
+    data: orderArray,
+    total: int,
+    page: int,
+    limit: int,
+    totalPages: int,
+  },
+});
+
+// GET /orders/changes → { version, hasMore, changes, removed }
+export const serializeOrderChanges = compileSerializer<{
+  version: number;
+  hasMore: boolean;
+  changes: OrderListItem[];
+  removed: number[];
+}>({
+  type: 'object',
+  properties: {
+    version: int,
+    hasMore: { type: 'boolean' },
+    changes: orderArray,
+    removed: { type: 'array', items: int },
+  },
+});
+
+// GET /orders/pending-approvals → OrderListItem[]
+export const serializeOrderList = compileSerializer<OrderListItem[]>(orderArray);
+
+// GET /orders/pending-approvals/changes → { epoch, version, full, upserts, removed }
+export const serializePendingApprovalChanges = compileSerializer<{
+  epoch: string;
+  version: number;
+  full: boolean;
+  upserts: OrderListItem[];
+  removed: number[];
+}>({
+  type: 'object',
+  properties: {
+    epoch: str,
+    version: int,
+    full: { type: 'boolean' },
+    upserts: orderArray,
+    removed: { type: 'array', items: int },
+  },
+});
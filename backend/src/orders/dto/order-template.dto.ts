@@ -0,0 +1,76 @@
+import {
+  ArrayMaxSize,
+  ArrayMinSize,
+  ArrayUnique,
+  IsArray,
+  IsBoolean,
+  IsDateString,
+  IsInt,
+  IsNotEmpty,
+  IsOptional,
+  Max,
+  Min,
+} from 'class-validator';
+import { Type } from 'class-transformer';
+
+export class CreateOrderTemplateDto {
+  @IsInt()
+  @IsNotEmpty()
+  @Type(() => Number)
+  shiftId!: number;
+
+  @IsInt()
+  @Min(1)
+  @IsNotEmpty()
+  @Type(() => Number)
+  jumlahPesanan!: number;
+
+  // ISO weekdays: 1 = Monday … 7 = Sunday (default Monday–Friday)
+  @IsArray()
+  @ArrayMinSize(1)
+  @ArrayMaxSize(7)
+  @ArrayUnique()
+  @IsInt({ each: true })
+  @Min(1, { each: true })
+  @Max(7, { each: true })
+  @IsOptional()
+  hariAktif?: number[];
+
+  @IsDateString()
+  @IsOptional()
+  pausedUntil?: string;
+}
+
+export class UpdateOrderTemplateDto {
+  @IsInt()
+  @Min(1)
+  @IsOptional()
+  @Type(() => Number)
+  jumlahPesanan?: number;
+
+  @IsArray()
+  @ArrayMinSize(1)
+  @ArrayMaxSize(7)
+  @ArrayUnique()
+  @IsInt({ each: true })
+  @Min(1, { each: true })
+  @Max(7, { each: true })
+  @IsOptional()
+  hariAktif?: number[];
+
+  @IsBoolean()
+  @IsOptional()
+  isActive?: boolean;
+
+  // null clears the pause
+  @IsDateString()
+  @IsOptional()
+  pausedUntil?: string | null;
+}
+
+export class MaterializeOrdersDto {
+  // Order date to generate (default: tomorrow)
+  @IsDateString()
+  @IsOptional()
+  tanggalPesanan?: string;
+}
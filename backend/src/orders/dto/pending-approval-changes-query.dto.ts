@@ -0,0 +1,17 @@
+import { IsInt, IsOptional, IsString, MaxLength, Min } from 'class-validator';
+import { Type } from 'class-transformer';
+
+export class PendingApprovalChangesQueryDto {
+  // Version returned by the previous pending-approvals/changes response
+  @IsInt()
+  @Min(0)
+  @IsOptional()
+  @Type(() => Number)
+  since?: number;
+
+  // Epoch returned together with `version`; a different epoch yields a full snapshot
+  @IsString()
+  @MaxLength(64)
+  @IsOptional()
+  epoch?: string;
+}
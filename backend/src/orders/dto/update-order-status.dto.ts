@@ -1,4 +1,4 @@
-import { IsEnum, IsNotEmpty } from 'class-validator';
+import { IsEnum, IsInt, IsNotEmpty, IsOptional, Min } from 'class-validator';
 
 // Fallback enum konsisten dengan enum Prisma `StatusPesanan` di schema.prisma.
 // Ganti ke: `import type { StatusPesanan } from '@prisma/client'` bila Prisma Client mengekspor enum tersebut.
@@ -19,4 +19,11 @@ export class UpdateOrderStatusDto {
   @IsEnum(StatusPesananEnum)
   @IsNotEmpty()
   status!: StatusPesananType;
+
+  // Optimistic concurrency: versi pesanan yang terakhir dilihat klien (opsional).
+  // Bila sudah berubah, update ditolak dengan 409 Conflict.
+  @IsOptional()
+  @IsInt()
+  @Min(0)
+  expectedVersion?: number;
 }
@@ -0,0 +1,85 @@
+import {
+  CallHandler,
+  ExecutionContext,
+  HttpException,
+  HttpStatus,
+  Injectable,
+  NestInterceptor,
+} from '@nestjs/common';
+import type { Request, Response } from 'express';
+import { from, Observable, throwError } from 'rxjs';
+import { catchError, finalize, mergeMap } from 'rxjs/operators';
+import type { JwtPayload } from '../common/interfaces';
+import {
+  OrderAdmissionRejectedError,
+  OrderAdmissionService,
+} from './order-admission.service';
+
+/**
+ * OrderAdmissionInterceptor
+ *
+ * Runs the wrapped handler only after OrderAdmissionService grants a slot, and releases the
+ * slot when the response observable completes or errors. Requests are keyed by the caller's
+ * department (JWT `departmentId`) so queues are served fairly across departments; staff
+ * without a department share one queue per role.
+ *
+ * Rejections become 503 Service Unavailable with a Retry-After header, mirroring the
+ * 429 response of the login throttle.
+ */
+@Injectable()
+export class OrderAdmissionInterceptor implements NestInterceptor {
+  constructor(private readonly admission: OrderAdmissionService) {}
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<unknown> {
+    const http = context.switchToHttp();
+    const req = http.getRequest<Request & { user?: JwtPayload }>();
+    const res = http.getResponse<Response>();
+
+    const route = `${req.method} ${req.route?.path ?? req.path}`;
+    const key = this.keyFor(req.user);
+
+    // Drop the waiter if the client goes away while still queued
+    const abort = new AbortController();
+    const onClose = () => {
+      if (!res.writableFinished) abort.abort();
+    };
+    res.once('close', onClose);
+
+    return from(this.admission.acquire(key, route, abort.signal)).pipe(
+      catchError((err) => {
+        res.off('close', onClose);
+        if (err instanceof OrderAdmissionRejectedError) {
+          const retryAfter = err.retryAfterSeconds;
+          res.setHeader('Retry-After', String(retryAfter));
+          return throwError(
+            () =>
+              new HttpException(
+                {
+                  statusCode: HttpStatus.SERVICE_UNAVAILABLE,
+                  message: 'Order service is busy, please try again shortly',
+                  retryAfter,
+                },
+                HttpStatus.SERVICE_UNAVAILABLE,
+              ),
+          );
+        }
+        return throwError(() => err);
+      }),
+      mergeMap((release) =>
+        next.handle().pipe(
+          finalize(() => {
+            res.off('close', onClose);
+            release();
+          }),
+        ),
+      ),
+    );
+  }
+
+  private keyFor(user?: JwtPayload): string {
+    if (typeof user?.departmentId === 'number') {
+      return `dept:${user.departmentId}`;
+    }
+    return `role:${user?.role ?? 'anonymous'}`;
+  }
+}
@@ -0,0 +1,257 @@
+import { Injectable, Logger, OnModuleDestroy, Optional } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { MetricsService } from '../metrics/metrics.service';
+import { readInt } from '../common/utils';
+
+/**
+ * OrderAdmissionService
+ *
+ * Admission control for order write endpoints. At shift cutoff thousands of POST /orders
+ * arrive within minutes; without a bound they all run the OrdersService pipeline at once
+ * and the Prisma pool becomes a hidden queue where every request times out. Here the
+ * number of in-flight writes is capped near the database's saturation point and the rest
+ * wait in a visible, measured in-memory queue.
+ *
+ * - ORDER_ADMISSION_CONCURRENCY: writes allowed to run concurrently.
+ * - One FIFO per key (the caller's department; role for staff without one), served
+ *   round-robin so a single busy department cannot starve the others.
+ * - ORDER_ADMISSION_QUEUE_LIMIT: when the queue is full, requests are rejected immediately.
+ * - ORDER_ADMISSION_MAX_WAIT_MS: requests queued longer than this are rejected.
+ *   OrderAdmissionInterceptor answers rejections with 503 + Retry-After (estimated from
+ *   the moving average service time) instead of letting the client time out.
+ * - Waiters whose client disconnects are dropped from the queue.
+ *
+ * Cluster note:
+ * - State is per process. Under PM2 cluster mode the effective limit is limit × instances;
+ *   keep ORDER_ADMISSION_CONCURRENCY × instances a little below Prisma's connection_limit
+ *   so reads still get connections.
+ */
+
+export type AdmissionRejectReason = 'queue_full' | 'timeout';
+
+export class OrderAdmissionRejectedError extends Error {
+  constructor(
+    readonly reason: AdmissionRejectReason,
+    readonly retryAfterSeconds: number,
+  ) {
+    super(`Order admission rejected (${reason})`);
+  }
+}
+
+type Waiter = {
+  key: string;
+  route: string;
+  enqueuedAt: number;
+  timer: NodeJS.Timeout;
+  resolve: (release: () => void) => void;
+  reject: (err: unknown) => void;
+};
+
+const MAX_RETRY_AFTER_SECONDS = 30;
+
+@Injectable()
+export class OrderAdmissionService implements OnModuleDestroy {
+  private readonly logger = new Logger(OrderAdmissionService.name);
+
+  private readonly concurrency: number;
+  private readonly queueLimit: number;
+  private readonly maxWaitMs: number;
+
+  private active = 0;
+  private queued = 0;
+  // key → FIFO; Map insertion order is the round-robin turn (a served key moves to the back)
+  private readonly queues = new Map<string, Waiter[]>();
+  // Moving average of service time (ms), used to estimate Retry-After
+  private avgServiceMs = 100;
+
+  constructor(
+    private readonly configService: ConfigService,
+    @Optional() private readonly metrics?: MetricsService,
+  ) {
+    this.concurrency = readInt(
+      this.configService,
+      'ORDER_ADMISSION_CONCURRENCY',
+      8,
+    );
+    this.queueLimit = readInt(
+      this.configService,
+      'ORDER_ADMISSION_QUEUE_LIMIT',
+      1000,
+    );
+    this.maxWaitMs = readInt(
+      this.configService,
+      'ORDER_ADMISSION_MAX_WAIT_MS',
+      5000,
+    );
+
+    metrics?.defineHistogram(
+      'order_admission_wait_seconds',
+      'Time order writes spent queued before admission, by route and result',
+    );
+    metrics?.defineHistogram(
+      'order_admission_service_seconds',
+      'Time admitted order writes held a concurrency slot, by route',
+    );
+    metrics?.registerGauge(
+      'order_admission_in_flight',
+      'Order writes currently holding a concurrency slot',
+      () => this.active,
+    );
+    metrics?.registerGauge(
+      'order_admission_queued',
+      'Order writes waiting for admission',
+      () => this.queued,
+    );
+  }
+
+  onModuleDestroy(): void {
+    for (const queue of this.queues.values()) {
+      for (const waiter of queue) {
+        clearTimeout(waiter.timer);
+        waiter.reject(new OrderAdmissionRejectedError('timeout', 1));
+      }
+    }
+    this.queues.clear();
+    this.queued = 0;
+  }
+
+  /**
+   * Wait for a slot on behalf of `key` and resolve with a release function that must be
+   * called once the request finishes. Rejects with OrderAdmissionRejectedError when the
+   * queue is full or the wait limit passes; aborting `signal` drops the waiter.
+   */
+  acquire(
+    key: string,
+    route: string,
+    signal?: AbortSignal,
+  ): Promise<() => void> {
+    const enqueuedAt = Date.now();
+
+    if (this.active < this.concurrency && this.queued === 0) {
+      this.observeWait(route, 'admitted', 0);
+      return Promise.resolve(this.admit(route));
+    }
+
+    if (this.queued >= this.queueLimit) {
+      return Promise.reject(this.reject(route, 'queue_full', 0));
+    }
+
+    return new Promise<() => void>((resolve, reject) => {
+      const waiter: Waiter = {
+        key,
+        route,
+        enqueuedAt,
+        resolve,
+        reject,
+        timer: setTimeout(() => {
+          if (this.remove(waiter)) {
+            reject(this.reject(route, 'timeout', Date.now() - enqueuedAt));
+          }
+        }, this.maxWaitMs),
+      };
+      waiter.timer.unref();
+
+      let queue = this.queues.get(key);
+      if (!queue) {
+        queue = [];
+        this.queues.set(key, queue);
+      }
+      queue.push(waiter);
+      this.queued++;
+
+      signal?.addEventListener(
+        'abort',
+        () => {
+          if (this.remove(waiter)) {
+            clearTimeout(waiter.timer);
+            this.observeWait(route, 'cancelled', Date.now() - enqueuedAt);
+            reject(new OrderAdmissionRejectedError('timeout', 1));
+          }
+        },
+        { once: true },
+      );
+    });
+  }
+
+  private admit(route: string): () => void {
+    this.active++;
+    const startedAt = Date.now();
+    let released = false;
+    return () => {
+      if (released) return;
+      released = true;
+      this.active--;
+      const serviceMs = Date.now() - startedAt;
+      this.avgServiceMs = this.avgServiceMs * 0.9 + serviceMs * 0.1;
+      this.metrics?.observe(
+        'order_admission_service_seconds',
+        { route },
+        serviceMs / 1000,
+      );
+      this.dispatch();
+    };
+  }
+
+  /**
+   * Fill free slots from the queues, one waiter per key per turn.
+   */
+  private dispatch(): void {
+    while (this.active < this.concurrency && this.queued > 0) {
+      const next = this.queues.entries().next();
+      if (next.done) return;
+      const [key, queue] = next.value;
+      const waiter = queue.shift()!;
+      this.queues.delete(key);
+      if (queue.length > 0) this.queues.set(key, queue);
+      this.queued--;
+
+      clearTimeout(waiter.timer);
+      this.observeWait(waiter.route, 'admitted', Date.now() - waiter.enqueuedAt);
+      waiter.resolve(this.admit(waiter.route));
+    }
+  }
+
+  private remove(waiter: Waiter): boolean {
+    const queue = this.queues.get(waiter.key);
+    const index = queue ? queue.indexOf(waiter) : -1;
+    if (!queue || index < 0) return false;
+    queue.splice(index, 1);
+    if (queue.length === 0) this.queues.delete(waiter.key);
+    this.queued--;
+    return true;
+  }
+
+  private reject(
+    route: string,
+    reason: AdmissionRejectReason,
+    waitedMs: number,
+  ): OrderAdmissionRejectedError {
+    this.observeWait(route, reason, waitedMs);
+    this.metrics?.increment(
+      'order_admission_rejected_total',
+      { route, reason },
+      1,
+      'Order writes rejected by admission control, by route and reason',
+    );
+    // Time to drain the current queue at the current service rate
+    const drainSeconds = Math.ceil(
+      (this.queued * this.avgServiceMs) / this.concurrency / 1000,
+    );
+    const retryAfter = Math.min(
+      Math.max(drainSeconds, 1),
+      MAX_RETRY_AFTER_SECONDS,
+    );
+    this.logger.warn(
+      `Order write rejected (${reason}) route=${route} queued=${this.queued} retryAfter=${retryAfter}s`,
+    );
+    return new OrderAdmissionRejectedError(reason, retryAfter);
+  }
+
+  private observeWait(route: string, result: string, waitedMs: number): void {
+    this.metrics?.observe(
+      'order_admission_wait_seconds',
+      { route, result },
+      waitedMs / 1000,
+    );
+  }
+}
@@ -0,0 +1,309 @@
+import {
+  Injectable,
+  Logger,
+  OnApplicationBootstrap,
+  OnModuleDestroy,
+  Optional,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Prisma } from '@prisma/client';
+import { PrismaService } from '../prisma/prisma.service';
+import { MetricsService } from '../metrics/metrics.service';
+import { parseTime } from './standing-order.service';
+import { readInt } from '../common/utils';
+
+/**
+ * OrderArchiveService
+ *
+ * Hot/cold split for orders. Finalised orders (COMPLETE / DITOLAK) whose order date is older
+ * than ORDER_ARCHIVE_AFTER_DAYS are moved from transaction_pesanan into
+ * transaction_pesanan_archive (same columns), together with their approval requests, so the
+ * hot table and its indexes only hold the recent working set.
+ *
+ * Moving (daily at ORDER_ARCHIVE_RUN_AT local time, off-peak):
+ * - Batches of ORDER_ARCHIVE_BATCH_SIZE rows, each in its own short transaction:
+ *   SELECT … FOR UPDATE SKIP LOCKED, copy orders and approval requests, DELETE.
+ *   Only the rows of the batch are locked, so live traffic is never blocked for long and
+ *   concurrent runs from several PM2 instances pick disjoint rows.
+ * - The delete sets app.archiving = 'on' for the transaction, so the tombstone trigger does
+ *   not report archived orders as deleted to GET /orders/changes clients.
+ *
+ * Reading: needsArchive() tells OrdersService and ReportsService whether a date range can
+ * contain archived rows, so queries on recent data keep touching the hot table only.
+ * The boundary is the newest archived date (refreshed every minute and after each run) or
+ * the archive horizon, whichever is later, so ranges on either side of a run on another
+ * instance are still answered completely.
+ */
+
+export type ArchiveRunResult = {
+  cutoff: string;
+  archived: number;
+  batches: number;
+};
+
+const ORDER_COLUMNS = Prisma.raw(
+  [
+    'id',
+    'kode_pesanan',
+    'karyawan_pemesan_id',
+    'department_pemesan_id',
+    'shift_id',
+    'jumlah_pesanan',
+    'jumlah_pesanan_awal',
+    'status_pesanan',
+    'tanggal_pesanan',
+    'requires_approval',
+    'approval_status',
+    'catatan_dapur',
+    'catatan_admin',
+    'approved_by_id',
+    'waktu_dibuat',
+    'waktu_diproses',
+    'waktu_siap',
+    'waktu_diantar',
+    'waktu_selesai',
+    'version',
+    'change_version',
+  ].join(', '),
+);
+
+const REQUEST_COLUMNS = Prisma.raw(
+  [
+    'id',
+    'pesanan_id',
+    'request_type',
+    'requested_by_id',
+    'jumlah_pesanan_awal',
+    'jumlah_pesanan_baru',
+    'catatan_dapur',
+    'approval_status',
+    'decided_by_id',
+    'catatan_admin',
+    'requested_at',
+    'decided_at',
+  ].join(', '),
+);
+
+const BATCH_TX_TIMEOUT_MS = 30_000;
+// Pause between batches so the move never hogs connections or WAL bandwidth
+const BATCH_PAUSE_MS = 200;
+const WATERMARK_REFRESH_MS = 60_000;
+// Archived orders may have been created, or had approval requests, some days after
+// their order date; reads on those timestamps look this much further ahead.
+const TIMESTAMP_SLACK_DAYS = 7;
+const DAY_MS = 86_400_000;
+
+@Injectable()
+export class OrderArchiveService
+  implements OnApplicationBootstrap, OnModuleDestroy
+{
+  private readonly logger = new Logger(OrderArchiveService.name);
+  private readonly afterDays: number;
+  private readonly batchSize: number;
+  // [hour, minute] local time, or null when the schedule is disabled
+  private readonly runAt: [number, number] | null;
+  private timer?: NodeJS.Timeout;
+  private watermarkTimer?: NodeJS.Timeout;
+  private running?: Promise<ArchiveRunResult>;
+  // Day after the newest date found in the archive (YYYY-MM-DD), null while it is empty
+  private watermark: string | null = null;
+
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly configService: ConfigService,
+    @Optional() private readonly metrics?: MetricsService,
+  ) {
+    this.afterDays = readInt(
+      this.configService,
+      'ORDER_ARCHIVE_AFTER_DAYS',
+      180,
+    );
+    this.batchSize = readInt(
+      this.configService,
+      'ORDER_ARCHIVE_BATCH_SIZE',
+      1000,
+    );
+    this.runAt = this.readTime('ORDER_ARCHIVE_RUN_AT', '02:00');
+  }
+
+  onApplicationBootstrap(): void {
+    void this.refreshWatermark();
+    this.watermarkTimer = setInterval(() => {
+      void this.refreshWatermark();
+    }, WATERMARK_REFRESH_MS);
+    this.watermarkTimer.unref();
+    if (this.runAt) this.scheduleNext();
+  }
+
+  onModuleDestroy(): void {
+    if (this.timer) clearTimeout(this.timer);
+    if (this.watermarkTimer) clearInterval(this.watermarkTimer);
+  }
+
+  /**
+   * needsArchive
+   * Whether rows dated (order date, creation or request time) on or after `from` may be in
+   * the archive. Without a lower bound the answer is whether the archive holds anything.
+   */
+  needsArchive(from?: Date | null): boolean {
+    if (!from) return this.watermark !== null;
+    const horizon = this.toDateKey(
+      new Date(this.cutoff().getTime() + TIMESTAMP_SLACK_DAYS * DAY_MS),
+    );
+    const boundary =
+      this.watermark !== null && this.watermark > horizon
+        ? this.watermark
+        : horizon;
+    return this.toDateKey(from) < boundary;
+  }
+
+  /**
+   * archiveFinalized
+   * Move every finalised order older than the horizon, batch by batch.
+   * A call while a run is in progress on this instance joins that run.
+   */
+  archiveFinalized(): Promise<ArchiveRunResult> {
+    if (!this.running) {
+      this.running = this.runBatches().finally(() => {
+        this.running = undefined;
+      });
+    }
+    return this.running;
+  }
+
+  // Helpers
+
+  private async runBatches(): Promise<ArchiveRunResult> {
+    const cutoff = this.toDateKey(this.cutoff());
+    const startedAt = Date.now();
+    let archived = 0;
+    let batches = 0;
+
+    for (;;) {
+      const moved = await this.moveBatch(cutoff);
+      if (moved === 0) break;
+      archived += moved;
+      batches++;
+      this.metrics?.increment(
+        'orders_archived_total',
+        {},
+        moved,
+        'Finalised orders moved to the archive table',
+      );
+      if (moved < this.batchSize) break;
+      await new Promise((resolve) => setTimeout(resolve, BATCH_PAUSE_MS));
+    }
+
+    await this.refreshWatermark();
+    if (archived > 0) {
+      this.logger.log(
+        `Archived ${archived} orders dated before ${cutoff} in ${batches} batches (${Date.now() - startedAt} ms)`,
+      );
+    }
+    return { cutoff, archived, batches };
+  }
+
+  /**
+   * Move one batch. Approval requests are copied before the DELETE cascades them away.
+   */
+  private moveBatch(cutoff: string): Promise<number> {
+    return this.prisma.$transaction(
+      async (tx) => {
+        const rows = await tx.$queryRaw<Array<{ id: number }>>`
+          SELECT id FROM transaction_pesanan
+          WHERE status_pesanan IN ('COMPLETE', 'DITOLAK')
+            AND tanggal_pesanan < ${cutoff}::date
+          ORDER BY tanggal_pesanan, id
+          LIMIT ${this.batchSize}
+          FOR UPDATE SKIP LOCKED
+        `;
+        if (rows.length === 0) return 0;
+        const ids = rows.map((row) => row.id);
+
+        await tx.$executeRaw`SELECT set_config('app.archiving', 'on', true)`;
+        await tx.$executeRaw`
+          INSERT INTO transaction_pesanan_archive (${ORDER_COLUMNS})
+          SELECT ${ORDER_COLUMNS} FROM transaction_pesanan
+          WHERE id = ANY(${ids}::int[])
+        `;
+        await tx.$executeRaw`
+          INSERT INTO transaction_permintaan_persetujuan_archive (${REQUEST_COLUMNS})
+          SELECT ${REQUEST_COLUMNS} FROM transaction_permintaan_persetujuan
+          WHERE pesanan_id = ANY(${ids}::int[])
+        `;
+        return tx.$executeRaw`
+          DELETE FROM transaction_pesanan WHERE id = ANY(${ids}::int[])
+        `;
+      },
+      { timeout: BATCH_TX_TIMEOUT_MS },
+    );
+  }
+
+  private async refreshWatermark(): Promise<void> {
+    try {
+      const [row] = await this.prisma.$queryRaw<
+        Array<{ newest: string | null }>
+      >`
+        SELECT to_char(GREATEST(
+          (SELECT max(tanggal_pesanan) FROM transaction_pesanan_archive),
+          (SELECT max(waktu_dibuat)::date FROM transaction_pesanan_archive),
+          (SELECT max(requested_at)::date FROM transaction_permintaan_persetujuan_archive)
+        ) + 1, 'YYYY-MM-DD') AS newest
+      `;
+      this.watermark = row?.newest ?? null;
+    } catch (err) {
+      this.logger.error(`Failed to read archive watermark: ${String(err)}`);
+    }
+  }
+
+  private scheduleNext(): void {
+    if (!this.runAt) return;
+    const now = new Date();
+    const next = new Date(now);
+    next.setHours(this.runAt[0], this.runAt[1], 0, 0);
+    if (next.getTime() <= now.getTime()) {
+      next.setDate(next.getDate() + 1);
+    }
+
+    this.timer = setTimeout(() => {
+      void this.runScheduled().finally(() => this.scheduleNext());
+    }, next.getTime() - now.getTime());
+    this.timer.unref();
+  }
+
+  private async runScheduled(): Promise<void> {
+    try {
+      await this.archiveFinalized();
+    } catch (err) {
+      this.logger.error(`Order archival failed: ${String(err)}`);
+    }
+  }
+
+  // Local midnight ORDER_ARCHIVE_AFTER_DAYS ago; orders dated before it are archived
+  private cutoff(): Date {
+    const d = new Date();
+    d.setHours(0, 0, 0, 0);
+    d.setDate(d.getDate() - this.afterDays);
+    return d;
+  }
+
+  // Same date mapping as OrdersService (local midnight stored in a DATE column)
+  private toDateKey(value: Date): string {
+    const d = new Date(value);
+    d.setHours(0, 0, 0, 0);
+    return d.toISOString().slice(0, 10);
+  }
+
+  private readTime(key: string, fallback: string): [number, number] | null {
+    const raw = String(
+      this.configService.get<string>(key) ?? process.env[key] ?? fallback,
+    ).trim();
+    if (raw === '' || raw.toLowerCase() === 'off') return null;
+    const parsed = parseTime(raw);
+    if (!parsed) {
+      this.logger.warn(`Invalid ${key}="${raw}", using ${fallback}`);
+      return parseTime(fallback);
+    }
+    return parsed;
+  }
+}
@@ -0,0 +1,110 @@
+import {
+  BadRequestException,
+  CallHandler,
+  ExecutionContext,
+  HttpStatus,
+  Injectable,
+  NestInterceptor,
+} from '@nestjs/common';
+import { HTTP_CODE_METADATA } from '@nestjs/common/constants';
+import { Reflector } from '@nestjs/core';
+import { createHash } from 'crypto';
+import type { Request, Response } from 'express';
+import { from, Observable, of } from 'rxjs';
+import { catchError, map, mergeMap } from 'rxjs/operators';
+import type { JwtPayload } from '../common/interfaces';
+import { OrderIdempotencyService } from './order-idempotency.service';
+
+const IDEMPOTENCY_KEY_PATTERN = /^[\x21-\x7e]{1,255}$/;
+
+/**
+ * OrderIdempotencyInterceptor
+ *
+ * Honors the optional `Idempotency-Key` request header (printable ASCII, max 255 chars).
+ * Without the header the request runs as before. With it, OrderIdempotencyService either
+ * claims the key and stores the handler's response, or returns the stored response of an
+ * earlier request with the same key without reaching OrdersService
+ * (`Idempotent-Replayed: true` response header).
+ *
+ * Applied outside OrderAdmissionInterceptor so replays never take an admission slot.
+ */
+@Injectable()
+export class OrderIdempotencyInterceptor implements NestInterceptor {
+  constructor(
+    private readonly idempotency: OrderIdempotencyService,
+    private readonly reflector: Reflector,
+  ) {}
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<unknown> {
+    const http = context.switchToHttp();
+    const req = http.getRequest<Request & { user?: JwtPayload }>();
+    const res = http.getResponse<Response>();
+
+    const header = req.headers['idempotency-key'];
+    const key = Array.isArray(header) ? header[0] : header;
+    const karyawanId = req.user?.karyawanId;
+    if (key === undefined || typeof karyawanId !== 'number') {
+      return next.handle();
+    }
+    if (!IDEMPOTENCY_KEY_PATTERN.test(key)) {
+      throw new BadRequestException('Invalid Idempotency-Key header');
+    }
+
+    const route = `${req.method} ${req.route?.path ?? req.path}`;
+    const fingerprint = createHash('sha256')
+      .update(`${req.method} ${req.originalUrl}\n${stableStringify(req.body)}`)
+      .digest('hex');
+    const statusCode =
+      this.reflector.get<number>(HTTP_CODE_METADATA, context.getHandler()) ??
+      (req.method === 'POST' ? HttpStatus.CREATED : HttpStatus.OK);
+
+    return from(
+      this.idempotency.begin(karyawanId, key, fingerprint, route),
+    ).pipe(
+      mergeMap((claim) => {
+        if (claim.kind === 'replay') {
+          res.setHeader('Idempotent-Replayed', 'true');
+          return of(claim.response.body);
+        }
+        return next.handle().pipe(
+          // Store before replying so a retry after a lost response always finds it
+          mergeMap((body) => {
+            const stored = body === undefined ? null : toJson(body);
+            return from(claim.complete({ statusCode, body: stored })).pipe(
+              map(() => body),
+            );
+          }),
+          catchError((err) =>
+            from(claim.abandon()).pipe(
+              mergeMap(() => {
+                throw err;
+              }),
+            ),
+          ),
+        );
+      }),
+    );
+  }
+}
+
+// Same JSON the client receives (Dates → ISO strings, undefined dropped)
+function toJson(value: unknown): unknown {
+  return JSON.parse(JSON.stringify(value));
+}
+
+// JSON with sorted object keys, so key order in a retried body does not change the fingerprint
+function stableStringify(value: unknown): string {
+  if (Array.isArray(value)) {
+    return `[${value.map(stableStringify).join(',')}]`;
+  }
+  if (value && typeof value === 'object') {
+    const entries = Object.keys(value as Record<string, unknown>)
+      .sort()
+      .map(
+        (k) =>
+          `${JSON.stringify(k)}:${stableStringify((value as Record<string, unknown>)[k])}`,
+      );
+    return `{${entries.join(',')}}`;
+  }
+  return JSON.stringify(value) ?? 'null';
+}
@@ -0,0 +1,315 @@
+import {
+  ConflictException,
+  Injectable,
+  Logger,
+  OnModuleDestroy,
+  OnModuleInit,
+  Optional,
+  UnprocessableEntityException,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Prisma } from '@prisma/client';
+import { PrismaService } from '../prisma/prisma.service';
+import { MetricsService } from '../metrics/metrics.service';
+import { readInt } from '../common/utils';
+
+/**
+ * OrderIdempotencyService
+ *
+ * Store behind the `Idempotency-Key` header on order write endpoints. A retried request with
+ * the same key (same caller, same method/path/body) gets the stored response back instead of
+ * running the OrdersService pipeline again, so flaky networks cannot create duplicate orders.
+ *
+ * - Keys are scoped per karyawan. The fingerprint (SHA-256 of method, path and body) must
+ *   match: reusing a key for a different request is rejected with 422.
+ * - Completed responses live in memory (bounded, IDEMPOTENCY_CACHE_MAX_ENTRIES) and in
+ *   api_idempotency_key for IDEMPOTENCY_TTL_SECONDS. The table covers other PM2 instances
+ *   and restarts; memory covers the common case of a retry hitting the same instance.
+ * - A key is claimed with one INSERT … ON CONFLICT DO NOTHING before the handler runs.
+ *   Concurrent duplicates on the same instance wait for the first request and replay its
+ *   response; duplicates on another instance get 409 until it completes.
+ * - Claims left behind by a crashed process are taken over after IDEMPOTENCY_LOCK_SECONDS.
+ * - Failed requests release their claim, so the client can retry with the same key.
+ */
+
+export type IdempotentResponse = { statusCode: number; body: unknown };
+
+export type IdempotencyClaim =
+  | { kind: 'replay'; response: IdempotentResponse }
+  | {
+      kind: 'acquired';
+      complete: (response: IdempotentResponse) => Promise<void>;
+      abandon: () => Promise<void>;
+    };
+
+type Entry = {
+  fingerprint: string;
+  expiresAt: number;
+  response?: IdempotentResponse;
+  // Set while a request on this instance holds the claim
+  settled?: Promise<IdempotentResponse | undefined>;
+};
+
+const MAX_CLAIM_ATTEMPTS = 3;
+
+@Injectable()
+export class OrderIdempotencyService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(OrderIdempotencyService.name);
+  private readonly entries = new Map<string, Entry>();
+  private readonly ttlMs: number;
+  private readonly lockMs: number;
+  private readonly maxEntries: number;
+  private readonly sweepIntervalMs: number;
+  private sweepTimer?: NodeJS.Timeout;
+
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly configService: ConfigService,
+    @Optional() private readonly metrics?: MetricsService,
+  ) {
+    this.ttlMs =
+      readInt(this.configService, 'IDEMPOTENCY_TTL_SECONDS', 86400) * 1000;
+    this.lockMs =
+      readInt(this.configService, 'IDEMPOTENCY_LOCK_SECONDS', 60) * 1000;
+    this.maxEntries = readInt(
+      this.configService,
+      'IDEMPOTENCY_CACHE_MAX_ENTRIES',
+      10000,
+    );
+    this.sweepIntervalMs =
+      readInt(this.configService, 'IDEMPOTENCY_SWEEP_SECONDS', 3600) * 1000;
+  }
+
+  onModuleInit(): void {
+    this.sweepTimer = setInterval(() => {
+      void this.sweepExpired();
+    }, this.sweepIntervalMs);
+    this.sweepTimer.unref();
+  }
+
+  onModuleDestroy(): void {
+    if (this.sweepTimer) {
+      clearInterval(this.sweepTimer);
+    }
+  }
+
+  /**
+   * begin
+   * Claim `key` for this request or return the stored response of an earlier one.
+   *
+   * Error:
+   * - UnprocessableEntityException when the key was used for a different request
+   * - ConflictException when another instance is still processing the key
+   */
+  async begin(
+    karyawanId: number,
+    key: string,
+    fingerprint: string,
+    route: string,
+  ): Promise<IdempotencyClaim> {
+    const id = `${karyawanId}:${key}`;
+
+    for (let attempt = 0; attempt < MAX_CLAIM_ATTEMPTS; attempt++) {
+      const cached = this.entries.get(id);
+      if (cached && cached.expiresAt > Date.now()) {
+        this.assertFingerprint(cached.fingerprint, fingerprint, route);
+        if (cached.response) {
+          return this.replay(cached.response, route);
+        }
+        if (cached.settled) {
+          const response = await cached.settled;
+          if (response) return this.replay(response, route);
+          // First request failed and released the claim: try to claim it ourselves
+          continue;
+        }
+      }
+
+      const claim = await this.claim(karyawanId, key, fingerprint, route);
+      if (claim) return claim;
+    }
+
+    this.count(route, 'in_progress');
+    throw new ConflictException(
+      'A request with this Idempotency-Key is still being processed',
+    );
+  }
+
+  /**
+   * sweepExpired
+   * Remove expired keys from memory and the database.
+   */
+  async sweepExpired(): Promise<void> {
+    const now = new Date();
+    for (const [id, entry] of this.entries) {
+      if (entry.expiresAt <= now.getTime() && !entry.settled) {
+        this.entries.delete(id);
+      }
+    }
+    try {
+      const { count } = await this.prisma.idempotencyKey.deleteMany({
+        where: { expiresAt: { lt: now } },
+      });
+      if (count > 0) {
+        this.logger.log(`Swept ${count} expired idempotency keys`);
+      }
+    } catch (err) {
+      this.logger.error(`Idempotency key sweep failed: ${String(err)}`);
+    }
+  }
+
+  // Helpers
+
+  /**
+   * Claim the key in the database. Returns a replay when the key is already completed,
+   * or undefined when the row changed underneath us and the caller should look again.
+   */
+  private async claim(
+    karyawanId: number,
+    key: string,
+    fingerprint: string,
+    route: string,
+  ): Promise<IdempotencyClaim | undefined> {
+    const now = new Date();
+    const expiresAt = new Date(now.getTime() + this.ttlMs);
+
+    const { count: inserted } = await this.prisma.idempotencyKey.createMany({
+      data: [{ karyawanId, key, fingerprint, lockedAt: now, expiresAt }],
+      skipDuplicates: true,
+    });
+    if (inserted === 1) {
+      return this.acquired(karyawanId, key, fingerprint, expiresAt, route);
+    }
+
+    const row = await this.prisma.idempotencyKey.findUnique({
+      where: { karyawanId_key: { karyawanId, key } },
+    });
+    if (!row) return undefined;
+
+    const expired = row.expiresAt.getTime() <= now.getTime();
+    const abandoned =
+      !row.completedAt && now.getTime() - row.lockedAt.getTime() > this.lockMs;
+    if (expired || abandoned) {
+      // Take over, guarded by the lock timestamp we just read
+      const { count } = await this.prisma.idempotencyKey.updateMany({
+        where: { karyawanId, key, lockedAt: row.lockedAt },
+        data: {
+          fingerprint,
+          statusCode: null,
+          response: Prisma.DbNull,
+          completedAt: null,
+          lockedAt: now,
+          expiresAt,
+        },
+      });
+      return count === 1
+        ? this.acquired(karyawanId, key, fingerprint, expiresAt, route)
+        : undefined;
+    }
+
+    this.assertFingerprint(row.fingerprint, fingerprint, route);
+
+    if (row.completedAt && row.statusCode !== null) {
+      const response = { statusCode: row.statusCode, body: row.response };
+      this.cache(`${karyawanId}:${key}`, {
+        fingerprint: row.fingerprint,
+        expiresAt: row.expiresAt.getTime(),
+        response,
+      });
+      return this.replay(response, route);
+    }
+
+    this.count(route, 'in_progress');
+    throw new ConflictException(
+      'A request with this Idempotency-Key is still being processed',
+    );
+  }
+
+  private acquired(
+    karyawanId: number,
+    key: string,
+    fingerprint: string,
+    expiresAt: Date,
+    route: string,
+  ): IdempotencyClaim {
+    const id = `${karyawanId}:${key}`;
+    let settle!: (response: IdempotentResponse | undefined) => void;
+    const entry: Entry = {
+      fingerprint,
+      expiresAt: expiresAt.getTime(),
+      settled: new Promise((resolve) => (settle = resolve)),
+    };
+    this.cache(id, entry);
+    this.count(route, 'acquired');
+
+    return {
+      kind: 'acquired',
+      complete: async (response) => {
+        entry.response = response;
+        entry.settled = undefined;
+        settle(response);
+        try {
+          await this.prisma.idempotencyKey.updateMany({
+            where: { karyawanId, key, completedAt: null },
+            data: {
+              statusCode: response.statusCode,
+              response: (response.body ?? null) as Prisma.InputJsonValue,
+              completedAt: new Date(),
+            },
+          });
+        } catch (err) {
+          this.logger.error(
+            `Failed to store idempotent response for karyawan ${karyawanId}: ${String(err)}`,
+          );
+        }
+      },
+      abandon: async () => {
+        if (this.entries.get(id) === entry) this.entries.delete(id);
+        settle(undefined);
+        try {
+          await this.prisma.idempotencyKey.deleteMany({
+            where: { karyawanId, key, completedAt: null },
+          });
+        } catch (err) {
+          this.logger.error(
+            `Failed to release idempotency key for karyawan ${karyawanId}: ${String(err)}`,
+          );
+        }
+      },
+    };
+  }
+
+  private replay(response: IdempotentResponse, route: string): IdempotencyClaim {
+    this.count(route, 'replayed');
+    return { kind: 'replay', response };
+  }
+
+  private assertFingerprint(
+    stored: string,
+    fingerprint: string,
+    route: string,
+  ): void {
+    if (stored !== fingerprint) {
+      this.count(route, 'mismatch');
+      throw new UnprocessableEntityException(
+        'Idempotency-Key was already used for a different request',
+      );
+    }
+  }
+
+  private cache(id: string, entry: Entry): void {
+    if (!this.entries.has(id) && this.entries.size >= this.maxEntries) {
+      const oldest = this.entries.keys().next().value;
+      if (oldest !== undefined) this.entries.delete(oldest);
+    }
+    this.entries.set(id, entry);
+  }
+
+  private count(route: string, result: string): void {
+    this.metrics?.increment(
+      'order_idempotency_requests_total',
+      { route, result },
+      1,
+      'Order writes carrying an Idempotency-Key, by route and result',
+    );
+  }
+}
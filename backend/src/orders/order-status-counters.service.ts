@@ -0,0 +1,399 @@
+import {
+  Injectable,
+  Logger,
+  OnApplicationBootstrap,
+  OnModuleDestroy,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { EventEmitter2, OnEvent } from '@nestjs/event-emitter';
+import { PrismaService } from '../prisma/prisma.service';
+import {
+  OrderApprovalDecidedEvent,
+  OrderApprovalRequestedEvent,
+  OrderStatusChangedEvent,
+  OrdersMaterializedEvent,
+} from '../common/events';
+
+/**
+ * OrderStatusCountersService
+ *
+ * In-memory counters of today's orders (and meals) by status, department and shift,
+ * used for dashboard header numbers without a query per request.
+ *
+ * - Loaded with one projected query of today's orders at bootstrap and again when the
+ *   day rolls over; counters are aggregated in memory from that snapshot.
+ * - Kept current from 'order.created' and 'order.status.changed' (a same-day
+ *   'orders.materialized' bulk insert triggers a reload). Approval events change
+ *   status and quantity together, so the affected order is re-read by id.
+ * - Each change schedules one 'order.counters.updated' event (coalesced per
+ *   COUNTERS_PUSH_DELAY_MS) that NotificationsGateway pushes to dashboards.
+ *
+ * Cluster note:
+ * - Events are process-local. Each instance re-reads today's orders every
+ *   ORDER_COUNTERS_RESYNC_SECONDS so writes handled by other instances are folded in.
+ */
+
+const COUNTERS_PUSH_DELAY_MS = 1000;
+
+const STATUSES = [
+  'MENUNGGU',
+  'IN_PROGRESS',
+  'READY',
+  'ON_DELIVERY',
+  'COMPLETE',
+  'DITOLAK',
+  'MENUNGGU_PERSETUJUAN',
+] as const;
+
+type StatusType = (typeof STATUSES)[number];
+
+type CounterCell = { orders: number; meals: number };
+
+type StatusCounters = {
+  totals: CounterCell;
+  byStatus: Record<StatusType, CounterCell>;
+};
+
+type CounterEntry = {
+  status: StatusType;
+  departmentId: number;
+  shiftId: number;
+  jumlahPesanan: number;
+};
+
+export type OrderCountersSummary = {
+  date: string;
+  version: number;
+  totals: CounterCell;
+  byStatus: Record<StatusType, CounterCell>;
+  byDepartment: Array<{ departmentId: number } & StatusCounters>;
+  byShift: Array<{ shiftId: number } & StatusCounters>;
+};
+
+const ENTRY_SELECT = {
+  id: true,
+  statusPesanan: true,
+  departmentPemesanId: true,
+  shiftId: true,
+  jumlahPesanan: true,
+  tanggalPesanan: true,
+} as const;
+
+@Injectable()
+export class OrderStatusCountersService
+  implements OnApplicationBootstrap, OnModuleDestroy
+{
+  private readonly logger = new Logger(OrderStatusCountersService.name);
+  private readonly resyncIntervalMs: number;
+
+  private day = '';
+  private readonly entries = new Map<number, CounterEntry>();
+  // Per-order counter to discard stale reads that finish after a newer event
+  private readonly eventSeq = new Map<number, number>();
+  private overall = this.emptyCounters();
+  private readonly byDepartment = new Map<number, StatusCounters>();
+  private readonly byShift = new Map<number, StatusCounters>();
+
+  private version = 0;
+  private summary: OrderCountersSummary | null = null;
+  private loading: Promise<void> | null = null;
+  private resyncTimer?: NodeJS.Timeout;
+  private pushTimer?: NodeJS.Timeout;
+
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly configService: ConfigService,
+    private readonly eventEmitter: EventEmitter2,
+  ) {
+    const raw =
+      this.configService.get<string>('ORDER_COUNTERS_RESYNC_SECONDS') ??
+      process.env.ORDER_COUNTERS_RESYNC_SECONDS;
+    const seconds = raw !== undefined ? parseInt(String(raw), 10) : NaN;
+    this.resyncIntervalMs =
+      (Number.isFinite(seconds) && seconds > 0 ? seconds : 60) * 1000;
+  }
+
+  async onApplicationBootstrap(): Promise<void> {
+    try {
+      await this.reload();
+    } catch (err) {
+      // Retried lazily on first read and by the resync timer
+      this.logger.error(`Initial order counters load failed: ${String(err)}`);
+    }
+    this.resyncTimer = setInterval(() => {
+      void this.reload().catch((err) =>
+        this.logger.error(`Order counters resync failed: ${String(err)}`),
+      );
+    }, this.resyncIntervalMs);
+    this.resyncTimer.unref();
+  }
+
+  onModuleDestroy(): void {
+    if (this.resyncTimer) clearInterval(this.resyncTimer);
+    if (this.pushTimer) clearTimeout(this.pushTimer);
+  }
+
+  /**
+   * getSummary
+   * Today's counters. Only touches the database on first use or after day rollover.
+   */
+  async getSummary(): Promise<OrderCountersSummary> {
+    if (this.day !== this.todayKey()) {
+      await this.reload();
+    }
+    if (!this.summary) {
+      this.summary = this.buildSummary();
+    }
+    return this.summary;
+  }
+
+  @OnEvent('order.created')
+  handleOrderCreated(event: {
+    orderId: number;
+    departmentId: number;
+    shiftId: number;
+    jumlahPesanan: number;
+    tanggalPesanan: Date | string;
+  }): void {
+    if (this.dateKey(event.tanggalPesanan) !== this.day) return;
+    this.bumpSeq(event.orderId);
+    this.apply(event.orderId, {
+      status: 'MENUNGGU',
+      departmentId: event.departmentId,
+      shiftId: event.shiftId,
+      jumlahPesanan: event.jumlahPesanan,
+    });
+  }
+
+  @OnEvent('orders.materialized', { async: true })
+  async handleOrdersMaterialized(event: OrdersMaterializedEvent): Promise<void> {
+    // Standing orders are normally generated for tomorrow; only a same-day run counts
+    if (event.tanggalPesanan !== this.day) return;
+    try {
+      await this.reload();
+    } catch (err) {
+      this.logger.error(
+        `Order counters reload after standing orders failed: ${String(err)}`,
+      );
+    }
+  }
+
+  @OnEvent('order.status.changed')
+  handleStatusChanged(event: OrderStatusChangedEvent): void {
+    const current = this.entries.get(event.orderId);
+    // Orders of other days are not counted
+    if (!current) return;
+    this.bumpSeq(event.orderId);
+    this.apply(event.orderId, { ...current, status: event.newStatus });
+  }
+
+  @OnEvent('order.approval.requested', { async: true })
+  async handleApprovalRequested(
+    event: OrderApprovalRequestedEvent,
+  ): Promise<void> {
+    await this.refreshOrder(event.orderId);
+  }
+
+  @OnEvent('order.approval.decided', { async: true })
+  async handleApprovalDecided(event: OrderApprovalDecidedEvent): Promise<void> {
+    await this.refreshOrder(event.orderId);
+  }
+
+  // Helpers
+
+  private reload(): Promise<void> {
+    // Concurrent callers (timer, rollover read) share one query
+    if (!this.loading) {
+      this.loading = this.load().finally(() => {
+        this.loading = null;
+      });
+    }
+    return this.loading;
+  }
+
+  private async load(): Promise<void> {
+    const day = this.todayKey();
+    const seqBefore = new Map(this.eventSeq);
+    const rows = await this.prisma.pesanan.findMany({
+      where: { tanggalPesanan: new Date(`${day}T00:00:00.000Z`) },
+      select: ENTRY_SELECT,
+    });
+
+    const next = new Map<number, CounterEntry>();
+    for (const row of rows) {
+      next.set(row.id, this.toEntry(row));
+    }
+    if (day === this.day) {
+      // An event arrived while reading: the event path already has fresher data
+      for (const [orderId, seq] of this.eventSeq) {
+        if (seqBefore.get(orderId) === seq) continue;
+        const current = this.entries.get(orderId);
+        if (current) next.set(orderId, current);
+        else next.delete(orderId);
+      }
+    } else {
+      this.eventSeq.clear();
+    }
+
+    const before = this.summary ?? this.buildSummary();
+    this.day = day;
+    this.entries.clear();
+    this.overall = this.emptyCounters();
+    this.byDepartment.clear();
+    this.byShift.clear();
+    for (const [orderId, entry] of next) {
+      this.entries.set(orderId, entry);
+      this.count(entry, 1);
+    }
+
+    const after = this.buildSummary();
+    if (this.countersKey(before) !== this.countersKey(after)) {
+      this.changed();
+    } else {
+      this.summary = after;
+    }
+  }
+
+  private async refreshOrder(orderId: number): Promise<void> {
+    const seq = this.bumpSeq(orderId);
+    try {
+      const row = await this.prisma.pesanan.findUnique({
+        where: { id: orderId },
+        select: ENTRY_SELECT,
+      });
+      if (this.eventSeq.get(orderId) !== seq) return;
+      const isToday = !!row && this.dateKey(row.tanggalPesanan) === this.day;
+      this.apply(orderId, isToday ? this.toEntry(row) : null);
+    } catch (err) {
+      this.logger.error(
+        `Failed to refresh counters for order ${orderId}: ${String(err)}`,
+      );
+    }
+  }
+
+  private apply(orderId: number, next: CounterEntry | null): void {
+    const current = this.entries.get(orderId);
+    if (!current && !next) return;
+    if (current) this.count(current, -1);
+    if (next) {
+      this.entries.set(orderId, next);
+      this.count(next, 1);
+    } else {
+      this.entries.delete(orderId);
+    }
+    this.changed();
+  }
+
+  private count(entry: CounterEntry, sign: 1 | -1): void {
+    const targets = [
+      this.overall,
+      this.countersFor(this.byDepartment, entry.departmentId),
+      this.countersFor(this.byShift, entry.shiftId),
+    ];
+    for (const counters of targets) {
+      for (const cell of [counters.totals, counters.byStatus[entry.status]]) {
+        cell.orders += sign;
+        cell.meals += sign * entry.jumlahPesanan;
+      }
+    }
+  }
+
+  private changed(): void {
+    this.version += 1;
+    this.summary = null;
+    if (this.pushTimer) return;
+    this.pushTimer = setTimeout(() => {
+      this.pushTimer = undefined;
+      void this.getSummary()
+        .then((summary) =>
+          this.eventEmitter.emit('order.counters.updated', summary),
+        )
+        .catch((err) =>
+          this.logger.error(`Order counters push failed: ${String(err)}`),
+        );
+    }, COUNTERS_PUSH_DELAY_MS);
+    this.pushTimer.unref();
+  }
+
+  private buildSummary(): OrderCountersSummary {
+    const copy = (c: StatusCounters): StatusCounters => ({
+      totals: { ...c.totals },
+      byStatus: Object.fromEntries(
+        STATUSES.map((s) => [s, { ...c.byStatus[s] }]),
+      ) as Record<StatusType, CounterCell>,
+    });
+    return {
+      date: this.day,
+      version: this.version,
+      ...copy(this.overall),
+      byDepartment: Array.from(this.byDepartment)
+        .filter(([, c]) => c.totals.orders > 0)
+        .sort(([a], [b]) => a - b)
+        .map(([departmentId, c]) => ({ departmentId, ...copy(c) })),
+      byShift: Array.from(this.byShift)
+        .filter(([, c]) => c.totals.orders > 0)
+        .sort(([a], [b]) => a - b)
+        .map(([shiftId, c]) => ({ shiftId, ...copy(c) })),
+    };
+  }
+
+  private countersKey(summary: OrderCountersSummary): string {
+    const { date, byStatus, byDepartment, byShift } = summary;
+    return JSON.stringify([date, byStatus, byDepartment, byShift]);
+  }
+
+  private countersFor(
+    map: Map<number, StatusCounters>,
+    key: number,
+  ): StatusCounters {
+    let counters = map.get(key);
+    if (!counters) {
+      counters = this.emptyCounters();
+      map.set(key, counters);
+    }
+    return counters;
+  }
+
+  private emptyCounters(): StatusCounters {
+    return {
+      totals: { orders: 0, meals: 0 },
+      byStatus: Object.fromEntries(
+        STATUSES.map((s) => [s, { orders: 0, meals: 0 }]),
+      ) as Record<StatusType, CounterCell>,
+    };
+  }
+
+  private toEntry(row: {
+    statusPesanan: string;
+    departmentPemesanId: number;
+    shiftId: number;
+    jumlahPesanan: number;
+  }): CounterEntry {
+    return {
+      status: row.statusPesanan as StatusType,
+      departmentId: row.departmentPemesanId,
+      shiftId: row.shiftId,
+      jumlahPesanan: row.jumlahPesanan,
+    };
+  }
+
+  private bumpSeq(orderId: number): number {
+    const next = (this.eventSeq.get(orderId) ?? 0) + 1;
+    this.eventSeq.set(orderId, next);
+    return next;
+  }
+
+  /**
+   * Calendar day the way OrdersService stores tanggalPesanan (local midnight sent
+   * to a DATE column), formatted YYYY-MM-DD.
+   */
+  private todayKey(): string {
+    const d = new Date();
+    d.setHours(0, 0, 0, 0);
+    return d.toISOString().slice(0, 10);
+  }
+
+  private dateKey(value: Date | string): string {
+    return new Date(value).toISOString().slice(0, 10);
+  }
+}
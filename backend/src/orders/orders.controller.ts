@@ -3,17 +3,23 @@ import {
   Get,
   Post,
   Patch,
+  Delete,
   Body,
   Param,
   Query,
   ParseIntPipe,
   UseGuards,
+  UseInterceptors,
   HttpCode,
   HttpStatus,
 } from '@nestjs/common';
 import { OrdersService } from './orders.service';
+import { StandingOrderService } from './standing-order.service';
+import { OrderAdmissionInterceptor } from './order-admission.interceptor';
+import { OrderIdempotencyInterceptor } from './order-idempotency.interceptor';
 import { Roles, CurrentUser } from '../common/decorators';
 import { RolesGuard } from '../common/guards';
+import { SerializeWith } from '../common/serializers';
 
 import type { JwtPayload } from '../common/interfaces';
 import {
@@ -23,6 +29,15 @@ import {
   EditOrderDto,
   ApproveRejectOrderDto,
   QueryOrdersDto,
+  PendingApprovalChangesQueryDto,
+  OrderChangesQueryDto,
+  CreateOrderTemplateDto,
+  UpdateOrderTemplateDto,
+  MaterializeOrdersDto,
+  serializeOrderPage,
+  serializeOrderChanges,
+  serializeOrderList,
+  serializePendingApprovalChanges,
 } from './dto';
 
 /**
@@ -41,11 +56,22 @@ type RoleAccessType = 'administrator' | 'employee' | 'dapur' | 'delivery';
  * - Standard flow: create, list, details, status update
  * - Exception flow: request-rejection, request-edit
  * - Admin tools: pending-approvals, approve-reject
+ * - Standing orders: templates (employee), templates/materialize (admin)
+ *
+ * List endpoints (list, changes, pending-approvals) answer through compiled serializers
+ * (SerializeWith + dto/order-response.dto): only the declared list fields are sent.
+ *
+ * Write endpoints pass through OrderIdempotencyInterceptor (optional Idempotency-Key,
+ * retries replay the stored response) and then OrderAdmissionInterceptor (bounded
+ * concurrency, fair per-department queueing, 503 + Retry-After when saturated).
  */
 @Controller('orders')
 @UseGuards(RolesGuard)
 export class OrdersController {
-  constructor(private readonly ordersService: OrdersService) {}
+  constructor(
+    private readonly ordersService: OrdersService,
+    private readonly standingOrders: StandingOrderService,
+  ) {}
 
   /**
    * POST /api/orders
@@ -53,6 +79,7 @@ export class OrdersController {
    */
   @Post()
   @Roles('employee')
+  @UseInterceptors(OrderIdempotencyInterceptor, OrderAdmissionInterceptor)
   @HttpCode(HttpStatus.CREATED)
   async create(
     @Body() createOrderDto: CreateOrderDto,
@@ -67,6 +94,7 @@ export class OrdersController {
    */
   @Get()
   @Roles('employee', 'dapur', 'delivery', 'administrator')
+  @SerializeWith(serializeOrderPage)
   async findAll(
     @Query() queryDto: QueryOrdersDto,
     @CurrentUser() user: JwtPayload,
@@ -86,10 +114,131 @@ export class OrdersController {
    */
   @Get('pending-approvals')
   @Roles('administrator', 'dapur')
+  @SerializeWith(serializeOrderList)
   async getPendingApprovals(): Promise<any[]> {
     return this.ordersService.getPendingApprovals();
   }
 
+  /**
+   * GET /api/orders/pending-approvals/changes?since=&epoch=
+   * Delta of pending approvals since a previously returned version (Admin and Dapur)
+   */
+  @Get('pending-approvals/changes')
+  @Roles('administrator', 'dapur')
+  @SerializeWith(serializePendingApprovalChanges)
+  async getPendingApprovalChanges(
+    @Query() queryDto: PendingApprovalChangesQueryDto,
+  ): Promise<any> {
+    return this.ordersService.getPendingApprovalChanges(queryDto);
+  }
+
+  /**
+   * GET /api/orders/counters
+   * Today's order counts by status, department and shift (Dapur, Delivery, Admin)
+   * Note: Must be defined BEFORE @Get(':id') to avoid route conflict
+   */
+  @Get('counters')
+  @Roles('dapur', 'delivery', 'administrator')
+  async getTodayCounters(): Promise<any> {
+    return this.ordersService.getTodayCounters();
+  }
+
+  /**
+   * GET /api/orders/changes?since=&limit=
+   * Orders changed since a previously returned version, plus removed ids (all roles)
+   * Note: Must be defined BEFORE @Get(':id') to avoid route conflict
+   */
+  @Get('changes')
+  @Roles('employee', 'dapur', 'delivery', 'administrator')
+  @SerializeWith(serializeOrderChanges)
+  async getChanges(
+    @Query() queryDto: OrderChangesQueryDto,
+    @CurrentUser() user: JwtPayload,
+  ): Promise<any> {
+    return this.ordersService.getChanges(
+      user.karyawanId,
+      user.role as RoleAccessType,
+      queryDto,
+    );
+  }
+
+  /**
+   * GET /api/orders/templates
+   * Standing order templates (Employee: own, Admin: all)
+   * Note: Must be defined BEFORE @Get(':id') to avoid route conflict
+   */
+  @Get('templates')
+  @Roles('employee', 'administrator')
+  async listTemplates(@CurrentUser() user: JwtPayload): Promise<any[]> {
+    return this.standingOrders.listTemplates(
+      user.karyawanId,
+      user.role as RoleAccessType,
+    );
+  }
+
+  /**
+   * POST /api/orders/templates
+   * Create or replace the caller's standing order for a shift (Employee only)
+   */
+  @Post('templates')
+  @Roles('employee')
+  @HttpCode(HttpStatus.OK)
+  async upsertTemplate(
+    @Body() dto: CreateOrderTemplateDto,
+    @CurrentUser() user: JwtPayload,
+  ): Promise<any> {
+    return this.standingOrders.upsertTemplate(user.karyawanId, dto);
+  }
+
+  /**
+   * POST /api/orders/templates/materialize
+   * Generate orders from standing order templates now (Admin only; default: tomorrow)
+   */
+  @Post('templates/materialize')
+  @Roles('administrator')
+  @HttpCode(HttpStatus.OK)
+  async materializeTemplates(@Body() dto: MaterializeOrdersDto): Promise<any> {
+    return this.standingOrders.materialize(
+      dto.tanggalPesanan ? new Date(dto.tanggalPesanan) : undefined,
+    );
+  }
+
+  /**
+   * PATCH /api/orders/templates/:id
+   * Change quantity/days, pause or deactivate a standing order (owner or Admin)
+   */
+  @Patch('templates/:id')
+  @Roles('employee', 'administrator')
+  async updateTemplate(
+    @Param('id', ParseIntPipe) id: number,
+    @Body() dto: UpdateOrderTemplateDto,
+    @CurrentUser() user: JwtPayload,
+  ): Promise<any> {
+    return this.standingOrders.updateTemplate(
+      id,
+      user.karyawanId,
+      user.role as RoleAccessType,
+      dto,
+    );
+  }
+
+  /**
+   * DELETE /api/orders/templates/:id
+   * Remove a standing order (owner or Admin)
+   */
+  @Delete('templates/:id')
+  @Roles('employee', 'administrator')
+  async removeTemplate(
+    @Param('id', ParseIntPipe) id: number,
+    @CurrentUser() user: JwtPayload,
+  ): Promise<any> {
+    return this.standingOrders.removeTemplate(
+      id,
+      user.karyawanId,
+      user.role as RoleAccessType,
+    );
+  }
+
   /**
    * GET /api/orders/:id
    * Get order details
@@ -113,6 +262,7 @@ export class OrdersController {
    */
   @Patch(':id/status')
   @Roles('dapur', 'delivery', 'administrator')
+  @UseInterceptors(OrderIdempotencyInterceptor, OrderAdmissionInterceptor)
   async updateStatus(
     @Param('id', ParseIntPipe) id: number,
     @Body() updateStatusDto: UpdateOrderStatusDto,
@@ -123,6 +273,7 @@ export class OrdersController {
       user.karyawanId,
       user.role as RoleAccessType,
       updateStatusDto,
+      user.nik,
     );
   }
 
@@ -132,6 +283,7 @@ export class OrdersController {
    */
   @Post(':id/request-rejection')
   @Roles('dapur')
+  @UseInterceptors(OrderIdempotencyInterceptor, OrderAdmissionInterceptor)
   @HttpCode(HttpStatus.OK)
   async requestRejection(
     @Param('id', ParseIntPipe) id: number,
@@ -147,6 +299,7 @@ export class OrdersController {
    */
   @Post(':id/request-edit')
   @Roles('dapur')
+  @UseInterceptors(OrderIdempotencyInterceptor, OrderAdmissionInterceptor)
   @HttpCode(HttpStatus.OK)
   async requestEdit(
     @Param('id', ParseIntPipe) id: number,
@@ -162,6 +315,7 @@ export class OrdersController {
    */
   @Post(':id/approve-reject')
   @Roles('administrator')
+  @UseInterceptors(OrderIdempotencyInterceptor, OrderAdmissionInterceptor)
   @HttpCode(HttpStatus.OK)
   async approveRejectRequest(
     @Param('id', ParseIntPipe) id: number,
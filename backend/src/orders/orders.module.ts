@@ -1,10 +1,28 @@
 import { Module } from '@nestjs/common';
 import { OrdersController } from './orders.controller';
 import { OrdersService } from './orders.service';
+import { PendingApprovalQueueService } from './pending-approval-queue.service';
+import { OrderStatusCountersService } from './order-status-counters.service';
+import { OrderAdmissionService } from './order-admission.service';
+import { OrderAdmissionInterceptor } from './order-admission.interceptor';
+import { OrderIdempotencyService } from './order-idempotency.service';
+import { OrderIdempotencyInterceptor } from './order-idempotency.interceptor';
+import { StandingOrderService } from './standing-order.service';
+import { OrderArchiveService } from './order-archive.service';
 
 @Module({
   controllers: [OrdersController],
-  providers: [OrdersService],
-  exports: [OrdersService],
+  providers: [
+    OrdersService,
+    PendingApprovalQueueService,
+    OrderStatusCountersService,
+    OrderAdmissionService,
+    OrderAdmissionInterceptor,
+    OrderIdempotencyService,
+    OrderIdempotencyInterceptor,
+    StandingOrderService,
+    OrderArchiveService,
+  ],
+  exports: [OrdersService, OrderArchiveService],
 })
 export class OrdersModule {}
@@ -0,0 +1,311 @@
+import type { EventEmitter2 } from '@nestjs/event-emitter';
+import type { PrismaService } from '../prisma/prisma.service';
+import type { AuditTrailService } from '../common/services/audit-trail.service';
+import type { PendingApprovalQueueService } from './pending-approval-queue.service';
+import type { OrderStatusCountersService } from './order-status-counters.service';
+import type { OrderArchiveService } from './order-archive.service';
+import { inMemoryTable } from '../common/testing/in-memory-table';
+import { OrdersService } from './orders.service';
+
+type ChangeRow = {
+  id: number;
+  change_version: number;
+  deleted: boolean;
+  settled: boolean;
+};
+
+const row = (
+  id: number,
+  changeVersion: number,
+  settled = true,
+  deleted = false,
+): ChangeRow => ({ id, change_version: changeVersion, deleted, settled });
+
+function setup(rows: ChangeRow[]) {
+  const prisma = {
+    $queryRaw: jest.fn().mockResolvedValue(rows),
+    pesanan: {
+      // Every live row is visible to the caller
+      findMany: jest.fn(({ where }: { where: { AND: [{ id: { in: number[] } }] } }) =>
+        Promise.resolve(where.AND[0].id.in.map((id) => ({ id }))),
+      ),
+    },
+  };
+  const service = new OrdersService(
+    prisma as unknown as PrismaService,
+    {} as AuditTrailService,
+    {} as EventEmitter2,
+    {} as PendingApprovalQueueService,
+    {} as OrderStatusCountersService,
+    {} as OrderArchiveService,
+  );
+  return { service, prisma };
+}
+
+describe('OrdersService.getChanges', () => {
+  it('advances version to the last row of a settled page', async () => {
+    const { service } = setup([row(1, 11), row(2, 12), row(3, 13, true, true)]);
+
+    const result = await service.getChanges(1, 'administrator', {
+      since: 10,
+      limit: 5,
+    });
+
+    expect(result.version).toBe(13);
+    expect(result.hasMore).toBe(false);
+    expect(result.changes.map((o) => o.id)).toEqual([1, 2]);
+    expect(result.removed).toEqual([3]);
+  });
+
+  it('reports hasMore for a full page whose version advanced', async () => {
+    const { service } = setup([row(1, 11), row(2, 12), row(3, 13)]);
+
+    const result = await service.getChanges(1, 'administrator', {
+      since: 10,
+      limit: 2,
+    });
+
+    expect(result.version).toBe(12);
+    expect(result.hasMore).toBe(true);
+    expect(result.changes.map((o) => o.id)).toEqual([1, 2]);
+  });
+
+  it('stops version at the first unsettled row but still sends later rows', async () => {
+    const { service } = setup([row(1, 11), row(2, 12, false), row(3, 13)]);
+
+    const result = await service.getChanges(1, 'administrator', {
+      since: 10,
+      limit: 2,
+    });
+
+    expect(result.version).toBe(11);
+    expect(result.hasMore).toBe(true);
+    expect(result.changes.map((o) => o.id)).toEqual([1, 2]);
+  });
+
+  it('returns hasMore: false when a full page cannot advance version', async () => {
+    const { service } = setup([row(1, 11, false), row(2, 12), row(3, 13)]);
+
+    const result = await service.getChanges(1, 'administrator', {
+      since: 10,
+      limit: 2,
+    });
+
+    expect(result.version).toBe(10);
+    expect(result.hasMore).toBe(false);
+    expect(result.changes.map((o) => o.id)).toEqual([1, 2]);
+  });
+
+  it('keeps since when there are no changes', async () => {
+    const { service, prisma } = setup([]);
+
+    const result = await service.getChanges(1, 'employee', { since: 42 });
+
+    expect(result).toEqual({
+      version: 42,
+      hasMore: false,
+      changes: [],
+      removed: [],
+    });
+    expect(prisma.pesanan.findMany).not.toHaveBeenCalled();
+  });
+});
+
+describe('OrdersService.findAll across the archive', () => {
+  const at = (hour: number) => new Date(2025, 0, 1, hour);
+  const order = (id: number, waktuDibuat: Date) => ({
+    id,
+    waktuDibuat,
+    statusPesanan: 'COMPLETE',
+  });
+
+  function setupArchive() {
+    // Orders 3 and 4 share a creation time across the two tables
+    const prisma = {
+      pesanan: inMemoryTable([order(6, at(6)), order(4, at(4)), order(2, at(2))]),
+      pesananArchive: inMemoryTable([
+        order(5, at(5)),
+        order(3, at(4)),
+        order(1, at(1)),
+      ]),
+    };
+    const service = new OrdersService(
+      prisma as unknown as PrismaService,
+      {} as AuditTrailService,
+      {} as EventEmitter2,
+      {} as PendingApprovalQueueService,
+      {} as OrderStatusCountersService,
+      { needsArchive: () => true } as unknown as OrderArchiveService,
+    );
+    return { service, prisma };
+  }
+
+  it('merges both tables newest first and cuts pages from the merged keys', async () => {
+    const { service } = setupArchive();
+
+    const pages = await Promise.all(
+      [1, 2, 3, 4].map((page) =>
+        service.findAll(1, 'administrator', { page, limit: 2 }),
+      ),
+    );
+
+    expect(pages.map((p) => p.data.map((o) => o.id))).toEqual([
+      [6, 5],
+      [4, 3],
+      [2, 1],
+      [],
+    ]);
+    expect(pages[0]).toMatchObject({ total: 6, totalPages: 3 });
+  });
+
+  it('loads only the rows of the requested page', async () => {
+    const { service, prisma } = setupArchive();
+
+    await service.findAll(1, 'administrator', { page: 2, limit: 2 });
+
+    const rowReads = (table: { findMany: jest.Mock }) =>
+      table.findMany.mock.calls
+        .map(([args]: [{ where: { id?: { in: number[] } } }]) => args.where.id)
+        .filter(Boolean);
+    expect(rowReads(prisma.pesanan)).toEqual([{ in: [4] }]);
+    expect(rowReads(prisma.pesananArchive)).toEqual([{ in: [3] }]);
+  });
+
+  it('reads only the hot table for dapur', async () => {
+    const { service, prisma } = setupArchive();
+
+    await service.findAll(1, 'dapur', { page: 1, limit: 2 });
+
+    expect(prisma.pesananArchive.findMany).not.toHaveBeenCalled();
+  });
+});
+
+describe('OrdersService.updateStatus', () => {
+  const siap = new Date(2025, 0, 1, 9, 30);
+  const updatedRow = {
+    old_status: 'IN_PROGRESS',
+    old_version: 3,
+    updated: true,
+    id: 7,
+    kodePesanan: 'PM-20250101-007',
+    karyawanPemesanId: 11,
+    departmentPemesanId: 2,
+    shiftId: 1,
+    jumlahPesanan: 4,
+    jumlahPesananAwal: null,
+    statusPesanan: 'READY',
+    tanggalPesanan: new Date(2025, 0, 1),
+    requiresApproval: false,
+    approvalStatus: null,
+    catatanDapur: null,
+    catatanAdmin: null,
+    approvedById: null,
+    waktuDibuat: new Date(2025, 0, 1, 8),
+    waktuDiproses: new Date(2025, 0, 1, 9),
+    waktuSiap: siap,
+    waktuDiantar: null,
+    waktuSelesai: null,
+    version: 4,
+    pemesan_nik: 'EMP011',
+    pemesan_nama: 'Budi',
+    departemen_nama: 'IT',
+    shift_nama: 'Pagi',
+    shift_jam_mulai: new Date(Date.UTC(1970, 0, 1, 7)),
+    shift_jam_selesai: new Date(Date.UTC(1970, 0, 1, 15)),
+  };
+
+  function setupUpdate(rows: unknown[]) {
+    const prisma = {
+      $queryRaw: jest.fn().mockResolvedValue(rows),
+      pesanan: { findUniqueOrThrow: jest.fn() },
+    };
+    const auditTrail = { logOrderStatusChanged: jest.fn() };
+    const eventEmitter = { emit: jest.fn() };
+    const service = new OrdersService(
+      prisma as unknown as PrismaService,
+      auditTrail as unknown as AuditTrailService,
+      eventEmitter as unknown as EventEmitter2,
+      {} as PendingApprovalQueueService,
+      {} as OrderStatusCountersService,
+      {} as OrderArchiveService,
+    );
+    return { service, prisma, auditTrail, eventEmitter };
+  }
+
+  // Dapur marks order 7 as READY
+  const markReady = (service: OrdersService) =>
+    service.updateStatus(7, 5, 'dapur', { status: 'READY' }, 'DPR001');
+
+  it('returns the list projection from the UPDATE without reading the order back', async () => {
+    const { service, prisma, auditTrail, eventEmitter } = setupUpdate([
+      updatedRow,
+    ]);
+
+    const result = await markReady(service);
+
+    expect(result).toEqual({
+      id: 7,
+      kodePesanan: 'PM-20250101-007',
+      karyawanPemesanId: 11,
+      departmentPemesanId: 2,
+      shiftId: 1,
+      jumlahPesanan: 4,
+      jumlahPesananAwal: null,
+      statusPesanan: 'READY',
+      tanggalPesanan: updatedRow.tanggalPesanan,
+      requiresApproval: false,
+      approvalStatus: null,
+      catatanDapur: null,
+      catatanAdmin: null,
+      approvedById: null,
+      waktuDibuat: updatedRow.waktuDibuat,
+      waktuDiproses: updatedRow.waktuDiproses,
+      waktuSiap: siap,
+      waktuDiantar: null,
+      waktuSelesai: null,
+      version: 4,
+      pemesan: { id: 11, nomorIndukKaryawan: 'EMP011', namaLengkap: 'Budi' },
+      departemen: { id: 2, namaDivisi: 'IT' },
+      shift: {
+        id: 1,
+        namaShift: 'Pagi',
+        jamMulai: updatedRow.shift_jam_mulai,
+        jamSelesai: updatedRow.shift_jam_selesai,
+      },
+    });
+    expect(prisma.$queryRaw).toHaveBeenCalledTimes(1);
+    expect(prisma.pesanan.findUniqueOrThrow).not.toHaveBeenCalled();
+    expect(auditTrail.logOrderStatusChanged).toHaveBeenCalledWith(
+      5,
+      'PM-20250101-007',
+      'IN_PROGRESS',
+      'READY',
+    );
+    expect(eventEmitter.emit).toHaveBeenCalledWith(
+      'order.status.changed',
+      expect.objectContaining({
+        orderId: 7,
+        oldStatus: 'IN_PROGRESS',
+        newStatus: 'READY',
+        departmentId: 2,
+        karyawanPemesanId: 11,
+        version: 4,
+        changes: { statusPesanan: 'READY', waktuSiap: siap },
+      }),
+    );
+  });
+
+  it('maps a missing order to 404 and a lost race to 409', async () => {
+    await expect(markReady(setupUpdate([]).service)).rejects.toThrow(
+      'Order not found',
+    );
+
+    const raced = setupUpdate([
+      { old_status: 'MENUNGGU', old_version: 4, updated: false },
+    ]);
+    await expect(markReady(raced.service)).rejects.toThrow(
+      'Order status is MENUNGGU; cannot change to READY',
+    );
+    expect(raced.eventEmitter.emit).not.toHaveBeenCalled();
+  });
+});
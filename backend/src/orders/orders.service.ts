@@ -3,10 +3,15 @@ import {
   NotFoundException,
   BadRequestException,
   ForbiddenException,
+  ConflictException,
 } from '@nestjs/common';
 import { EventEmitter2 } from '@nestjs/event-emitter';
+import { Prisma } from '@prisma/client';
 import { PrismaService } from '../prisma/prisma.service';
 import { AuditTrailService } from '../common/services/audit-trail.service';
+import { PendingApprovalQueueService } from './pending-approval-queue.service';
+import { OrderStatusCountersService } from './order-status-counters.service';
+import { OrderArchiveService } from './order-archive.service';
 import {
   CreateOrderDto,
   UpdateOrderStatusDto,
@@ -14,6 +19,10 @@ import {
   EditOrderDto,
   ApproveRejectOrderDto,
   QueryOrdersDto,
+  PendingApprovalChangesQueryDto,
+  OrderChangesQueryDto,
+  ORDER_LIST_SELECT,
+  OrderListItem,
 } from './dto';
 import {
   OrderStatusChangedEvent,
@@ -38,12 +47,50 @@ type StatusType = StatusPesananFallback;
 type ApprovalType = ApprovalStatusFallback;
 type RoleAccessType = RoleAccessFallback;
 
+const ALL_STATUSES: StatusType[] = [
+  'MENUNGGU',
+  'IN_PROGRESS',
+  'READY',
+  'ON_DELIVERY',
+  'COMPLETE',
+  'DITOLAK',
+  'MENUNGGU_PERSETUJUAN',
+];
+
+// Only these statuses are ever moved to the archive table
+const ARCHIVED_STATUSES: StatusType[] = ['COMPLETE', 'DITOLAK'];
+const ORDER_INCLUDE = { pemesan: true, departemen: true, shift: true } as const;
+
+// Row returned by the updateStatus statement: the updated order flattened
+// with the relation columns of ORDER_LIST_SELECT (pemesan_*, departemen_*, shift_*)
+type OrderListScalars = Omit<OrderListItem, 'pemesan' | 'departemen' | 'shift'>;
+type UpdatedOrderRow = OrderListScalars & {
+  old_status: string;
+  old_version: number;
+  updated: boolean;
+  pemesan_nik: string;
+  pemesan_nama: string;
+  departemen_nama: string;
+  shift_nama: string;
+  shift_jam_mulai: Date;
+  shift_jam_selesai: Date;
+};
+
+// Newest first; id breaks ties so offset pages neither overlap nor skip rows
+const ORDER_LIST_ORDER = [
+  { waktuDibuat: Prisma.SortOrder.desc },
+  { id: Prisma.SortOrder.desc },
+];
+
 @Injectable()
 export class OrdersService {
   constructor(
     private readonly prisma: PrismaService,
     private readonly auditTrail: AuditTrailService,
     private readonly eventEmitter: EventEmitter2,
+    private readonly pendingApprovalQueue: PendingApprovalQueueService,
+    private readonly statusCounters: OrderStatusCountersService,
+    private readonly orderArchive: OrderArchiveService,
   ) {}
 
   /**
@@ -60,11 +107,20 @@ export class OrdersService {
 
     const seq = (totalForDay + 1).toString().padStart(3, '0');
 
+    return `${this.orderCodePrefix(normalized)}${seq}`;
+  }
+
+  /**
+   * orderCodePrefix
+   * `PM-YYYYMMDD-` for the given order date (shared with bulk code allocation).
+   */
+  orderCodePrefix(tanggalPesanan: Date): string {
+    const normalized = this.normalizeDateOnly(tanggalPesanan);
     const yyyy = normalized.getFullYear();
     const mm = (normalized.getMonth() + 1).toString().padStart(2, '0');
     const dd = normalized.getDate().toString().padStart(2, '0');
 
-    return `PM-${yyyy}${mm}${dd}-${seq}`;
+    return `PM-${yyyy}${mm}${dd}-`;
   }
 
   /**
@@ -142,6 +198,7 @@ export class OrdersService {
       jumlahPesanan: created.jumlahPesanan,
       tanggalPesanan: created.tanggalPesanan,
       timestamp: new Date(),
+      version: created.version,
     });
 
     return created;
@@ -152,6 +209,8 @@ export class OrdersService {
    * - Role-based where clause
    * - Apply filters from queryDto
    * - Implement pagination
+   * - Include archived orders only when the role and date range can reach them
+   * - Rows projected with ORDER_LIST_SELECT (list response shape)
    * - Return { data, total, page, limit, totalPages }
    */
   async findAll(
@@ -171,23 +230,7 @@ export class OrdersService {
     } = queryDto;
 
     // Base where by role
-    let baseWhere: any = {};
-    if (role === 'employee') {
-      baseWhere = { karyawanPemesanId: karyawanId };
-    } else if (role === 'dapur') {
-      baseWhere = {
-        statusPesanan: {
-          in: ['MENUNGGU', 'IN_PROGRESS', 'MENUNGGU_PERSETUJUAN'] as any,
-        },
-      };
-    } else if (role === 'delivery') {
-      baseWhere = { statusPesanan: { in: ['READY', 'ON_DELIVERY'] as any } };
-    } else if (role === 'administrator') {
-      baseWhere = {};
-    } else {
-      // Unknown role: restrict to none
-      baseWhere = { karyawanPemesanId: -1 };
-    }
+    const baseWhere = this.buildRoleWhere(karyawanId, role);
 
     // Additional filters
     const andFilters: any[] = [];
@@ -206,13 +249,13 @@ export class OrdersService {
     }
 
     // Date range
-    if (tanggalMulai || tanggalAkhir) {
-      const gte = tanggalMulai
-        ? this.normalizeDateOnly(new Date(tanggalMulai))
-        : undefined;
-      const lte = tanggalAkhir
-        ? this.normalizeDateOnly(new Date(tanggalAkhir))
-        : undefined;
+    const gte = tanggalMulai
+      ? this.normalizeDateOnly(new Date(tanggalMulai))
+      : undefined;
+    const lte = tanggalAkhir
+      ? this.normalizeDateOnly(new Date(tanggalAkhir))
+      : undefined;
+    if (gte || lte) {
       andFilters.push({
         tanggalPesanan: {
           ...(gte ? { gte } : {}),
@@ -227,32 +270,134 @@ export class OrdersService {
     const skip = (page - 1) * limit;
     const take = limit;
 
-    const [data, total] = await Promise.all([
-      this.prisma.pesanan.findMany({
-        where,
-        orderBy: { waktuDibuat: 'desc' },
-        skip,
-        take,
-        include: { pemesan: true, departemen: true, shift: true },
-      }),
-      this.prisma.pesanan.count({ where }),
-    ]);
+    const readsArchive =
+      (role === 'employee' || role === 'administrator') &&
+      (!status || ARCHIVED_STATUSES.includes(status as StatusType)) &&
+      this.orderArchive.needsArchive(gte);
+
+    const { data, total } = readsArchive
+      ? await this.findAllAcrossArchive(where, skip, take)
+      : await Promise.all([
+          this.prisma.pesanan.findMany({
+            where,
+            orderBy: ORDER_LIST_ORDER,
+            skip,
+            take,
+            select: ORDER_LIST_SELECT,
+          }),
+          this.prisma.pesanan.count({ where }),
+        ]).then(([data, total]) => ({ data, total }));
 
     const totalPages = Math.ceil(total / limit);
 
     return { data, total, page, limit, totalPages };
   }
 
+  /**
+   * getChanges
+   * - Orders whose change_version is above `since`, oldest change first
+   * - Rows that left the caller's role view, and deleted orders, come back as `removed` ids
+   * - `version` only advances past rows whose writing transaction is older than every
+   *   transaction still in flight, so a slower concurrent writer holding a lower
+   *   version is not skipped; rows beyond that point are simply sent again next time
+   * - `hasMore` is only true when the page was full and `version` advanced. While any
+   *   open transaction in the cluster (export, archive batch, idle session) holds back
+   *   the first row, a full page returns hasMore: false so the client waits for its
+   *   next poll instead of refetching the same page
+   * - Return { version, hasMore, changes, removed }
+   */
+  async getChanges(
+    karyawanId: number,
+    role: RoleAccessType,
+    queryDto: OrderChangesQueryDto,
+  ) {
+    const { since = 0, limit = 500 } = queryDto;
+
+    const ownOrdersOnly =
+      role === 'employee'
+        ? Prisma.sql` AND karyawan_pemesan_id = ${karyawanId}`
+        : Prisma.empty;
+
+    const rows = await this.prisma.$queryRaw<
+      Array<{
+        id: number;
+        change_version: number;
+        deleted: boolean;
+        settled: boolean;
+      }>
+    >(Prisma.sql`
+      WITH horizon AS (
+        SELECT ((pg_snapshot_xmin(pg_current_snapshot())::text::bigint
+                 % 4294967296)::text)::xid AS xmin
+      )
+      SELECT c.id, c.change_version, c.deleted,
+             age(c.writer) > age(h.xmin) AS settled
+      FROM (
+        (SELECT id, change_version, false AS deleted, xmin AS writer
+         FROM transaction_pesanan
+         WHERE change_version > ${since}${ownOrdersOnly}
+         ORDER BY change_version
+         LIMIT ${limit + 1})
+        UNION ALL
+        (SELECT pesanan_id, change_version, true, xmin
+         FROM transaction_pesanan_tombstone
+         WHERE change_version > ${since}${ownOrdersOnly}
+         ORDER BY change_version
+         LIMIT ${limit + 1})
+      ) c
+      CROSS JOIN horizon h
+      ORDER BY c.change_version
+      LIMIT ${limit + 1}
+    `);
+
+    const full = rows.length > limit;
+    const page = full ? rows.slice(0, limit) : rows;
+
+    let version = since;
+    for (const row of page) {
+      if (!row.settled) break;
+      version = row.change_version;
+    }
+    const hasMore = full && version > since;
+
+    const liveIds = page.filter((r) => !r.deleted).map((r) => r.id);
+    const changes =
+      liveIds.length > 0
+        ? await this.prisma.pesanan.findMany({
+            where: {
+              AND: [
+                { id: { in: liveIds } },
+                this.buildRoleWhere(karyawanId, role),
+              ],
+            },
+            orderBy: { changeVersion: 'asc' },
+            select: ORDER_LIST_SELECT,
+          })
+        : [];
+
+    const visible = new Set(changes.map((order) => order.id));
+    const removed = page
+      .filter((r) => r.deleted || !visible.has(r.id))
+      .map((r) => r.id);
+
+    return { version, hasMore, changes, removed };
+  }
+
   /**
    * findOne
-   * - Query order with relations
+   * - Query order with relations (archived orders are looked up when not in the hot table)
    * - Access check: employee can only access their own orders
    */
   async findOne(id: number, karyawanId: number, role: RoleAccessType) {
-    const order = await this.prisma.pesanan.findUnique({
-      where: { id },
-      include: { pemesan: true, departemen: true, shift: true },
-    });
+    const order =
+      (await this.prisma.pesanan.findUnique({
+        where: { id },
+        include: ORDER_INCLUDE,
+      })) ??
+      (await this.prisma.pesananArchive.findUnique({
+        where: { id },
+        include: ORDER_INCLUDE,
+      }));
 
     if (!order) {
       throw new NotFoundException('Order not found');
@@ -267,8 +412,12 @@ export class OrdersService {
 
   /**
    * updateStatus
-   * - Validate role-based allowed transitions
-   * - Update appropriate timestamp field
+   * - Resolve source statuses the role may transition from (no read needed)
+   * - Single conditional UPDATE: WHERE id AND status_pesanan IN (<from>) [AND version]
+   *   returning the previous status, so concurrent clicks cannot both succeed
+   * - The same statement returns the updated row joined with the relation columns
+   *   of ORDER_LIST_SELECT, so no read follows the write
+   * - Zero rows updated → 409 Conflict (status or version moved on)
    * - Log audit
    * - Emit OrderStatusChangedEvent
    */
@@ -277,46 +426,91 @@ export class OrdersService {
     karyawanId: number,
     role: RoleAccessType,
     updateStatusDto: UpdateOrderStatusDto,
+    actorNik: string,
   ) {
-    const order = await this.prisma.pesanan.findUnique({
-      where: { id },
-    });
-    if (!order) {
-      throw new NotFoundException('Order not found');
-    }
-
-    const actor = await this.prisma.karyawan.findUnique({
-      where: { id: karyawanId },
-    });
-    if (!actor) {
-      throw new NotFoundException('Karyawan not found');
-    }
-
-    const oldStatus = order.statusPesanan as StatusType;
     const newStatus = updateStatusDto.status as StatusType;
-
-    if (oldStatus === newStatus) {
-      throw new BadRequestException('Status is unchanged');
-    }
-
-    if (!this.isTransitionAllowed(role, oldStatus, newStatus)) {
+    const allowedFrom = this.getAllowedSourceStatuses(role, newStatus);
+    if (allowedFrom.length === 0) {
       throw new ForbiddenException('Invalid status transition for role');
     }
 
-    const timestampField = this.getTimestampFieldForStatus(newStatus);
-
-    const data: any = {
-      statusPesanan: newStatus as any,
-    };
-    if (timestampField) {
-      data[timestampField] = new Date();
+    const { expectedVersion } = updateStatusDto;
+    const timestampColumn = this.getTimestampColumnForStatus(newStatus);
+    const setTimestamp = timestampColumn
+      ? Prisma.sql`, ${Prisma.raw(timestampColumn)} = now()`
+      : Prisma.empty;
+    const versionFilter =
+      typeof expectedVersion === 'number'
+        ? Prisma.sql` AND prev.version = ${expectedVersion}`
+        : Prisma.empty;
+
+    // prev locks the row so the returned old status is the one actually replaced
+    const rows = await this.prisma.$queryRaw<UpdatedOrderRow[]>(Prisma.sql`
+      WITH prev AS (
+        SELECT id, status_pesanan, version
+        FROM transaction_pesanan
+        WHERE id = ${id}
+        FOR UPDATE
+      ), changed AS (
+        UPDATE transaction_pesanan t
+        SET status_pesanan = ${newStatus}::"StatusPesanan",
+            version = t.version + 1${setTimestamp}
+        FROM prev
+        WHERE t.id = prev.id
+          AND prev.status_pesanan::text IN (${Prisma.join(allowedFrom)})${versionFilter}
+        RETURNING t.*
+      )
+      SELECT prev.status_pesanan::text AS old_status,
+             prev.version AS old_version,
+             c.id IS NOT NULL AS updated,
+             c.id,
+             c.kode_pesanan AS "kodePesanan",
+             c.karyawan_pemesan_id AS "karyawanPemesanId",
+             c.department_pemesan_id AS "departmentPemesanId",
+             c.shift_id AS "shiftId",
+             c.jumlah_pesanan AS "jumlahPesanan",
+             c.jumlah_pesanan_awal AS "jumlahPesananAwal",
+             c.status_pesanan::text AS "statusPesanan",
+             c.tanggal_pesanan AS "tanggalPesanan",
+             c.requires_approval AS "requiresApproval",
+             c.approval_status::text AS "approvalStatus",
+             c.catatan_dapur AS "catatanDapur",
+             c.catatan_admin AS "catatanAdmin",
+             c.approved_by_id AS "approvedById",
+             c.waktu_dibuat AS "waktuDibuat",
+             c.waktu_diproses AS "waktuDiproses",
+             c.waktu_siap AS "waktuSiap",
+             c.waktu_diantar AS "waktuDiantar",
+             c.waktu_selesai AS "waktuSelesai",
+             c.version,
+             k.nomor_induk_karyawan AS pemesan_nik,
+             k.nama_lengkap AS pemesan_nama,
+             d.nama_divisi AS departemen_nama,
+             s.nama_shift AS shift_nama,
+             s.jam_mulai AS shift_jam_mulai,
+             s.jam_selesai AS shift_jam_selesai
+      FROM prev
+      LEFT JOIN changed c ON c.id = prev.id
+      LEFT JOIN master_karyawan k ON k.id = c.karyawan_pemesan_id
+      LEFT JOIN master_department d ON d.id = c.department_pemesan_id
+      LEFT JOIN master_shift s ON s.id = c.shift_id
+    `);
+
+    const result = rows[0];
+    if (!result) {
+      throw new NotFoundException('Order not found');
+    }
+    if (!result.updated) {
+      throw new ConflictException(
+        typeof expectedVersion === 'number' &&
+          result.old_version !== expectedVersion
+          ? `Order was modified (version ${result.old_version}, expected ${expectedVersion})`
+          : `Order status is ${result.old_status}; cannot change to ${newStatus}`,
+      );
     }
 
-    const updated = await this.prisma.pesanan.update({
-      where: { id },
-      data,
-      include: { pemesan: true, departemen: true, shift: true },
-    });
+    const oldStatus = result.old_status as StatusType;
+    const updated = this.toOrderListItem(result);
 
     await this.auditTrail.logOrderStatusChanged(
       karyawanId,
@@ -332,12 +526,17 @@ export class OrdersService {
         updated.kodePesanan,
         oldStatus ?? null,
         newStatus,
-        actor.id,
-        actor.nomorIndukKaryawan,
-        String(actor.roleAccess),
+        karyawanId,
+        actorNik,
+        role,
         updated.departmentPemesanId,
         updated.karyawanPemesanId,
         new Date(),
+        updated.version,
+        this.pickChanges(updated, [
+          'statusPesanan',
+          ...(timestampColumn ? [this.toFieldName(timestampColumn)] : []),
+        ]),
       ),
     );
 
@@ -349,6 +548,7 @@ export class OrdersService {
    * - Validate current order status
    * - Store original quantity
    * - Update to MENUNGGU_PERSETUJUAN with requiresApproval and PENDING
+   * - Record the approval request (requester, reason) in the same transaction
    * - Log & Emit OrderApprovalRequestedEvent (REJECT)
    */
   async requestRejection(
@@ -377,17 +577,34 @@ export class OrdersService {
 
     const oldStatus = order.statusPesanan as StatusType;
 
-    const updated = await this.prisma.pesanan.update({
-      where: { id },
-      data: {
-        jumlahPesananAwal: order.jumlahPesanan,
-        statusPesanan: 'MENUNGGU_PERSETUJUAN' as any,
-        requiresApproval: true,
-        approvalStatus: 'PENDING' as any,
-        catatanDapur: rejectDto.catatanDapur,
-      },
-      include: { pemesan: true, departemen: true, shift: true },
-    });
+    // Order update and approval request row commit together
+    const [updated] = await this.prisma
+      .$transaction([
+        this.prisma.pesanan.update({
+          where: { id, version: order.version },
+          data: {
+            jumlahPesananAwal: order.jumlahPesanan,
+            statusPesanan: 'MENUNGGU_PERSETUJUAN' as any,
+            requiresApproval: true,
+            approvalStatus: 'PENDING' as any,
+            catatanDapur: rejectDto.catatanDapur,
+            version: { increment: 1 },
+          },
+          include: { pemesan: true, departemen: true, shift: true },
+        }),
+        this.prisma.permintaanPersetujuan.create({
+          data: {
+            pesananId: id,
+            requestType: 'REJECT',
+            requestedById: dapurKaryawanId,
+            jumlahPesananAwal: order.jumlahPesanan,
+            catatanDapur: rejectDto.catatanDapur,
+          },
+        }),
+      ])
+      .catch((err) => {
+        throw this.toConflictIfStale(err);
+      });
 
     await this.auditTrail.logOrderStatusChanged(
       dapurKaryawanId,
@@ -415,6 +632,15 @@ export class OrdersService {
         updated.departmentPemesanId,
         updated.karyawanPemesanId,
         undefined,
+        new Date(),
+        updated.version,
+        this.pickChanges(updated, [
+          'jumlahPesananAwal',
+          'statusPesanan',
+          'requiresApproval',
+          'approvalStatus',
+          'catatanDapur',
+        ]),
       ),
     );
 
@@ -426,6 +652,7 @@ export class OrdersService {
    * - Validate new quantity differs
    * - Store original quantity, set new jumlahPesanan
    * - Update approval flags and status
+   * - Record the approval request (requester, quantities, reason) in the same transaction
    * - Log & Emit OrderApprovalRequestedEvent (EDIT)
    */
   async requestEdit(
@@ -459,18 +686,36 @@ export class OrdersService {
 
     const oldStatus = order.statusPesanan as StatusType;
 
-    const updated = await this.prisma.pesanan.update({
-      where: { id },
-      data: {
-        jumlahPesananAwal: order.jumlahPesanan,
-        jumlahPesanan: newQty,
-        statusPesanan: 'MENUNGGU_PERSETUJUAN' as any,
-        requiresApproval: true,
-        approvalStatus: 'PENDING' as any,
-        catatanDapur: editDto.catatanDapur,
-      },
-      include: { pemesan: true, departemen: true, shift: true },
-    });
+    // Order update and approval request row commit together
+    const [updated] = await this.prisma
+      .$transaction([
+        this.prisma.pesanan.update({
+          where: { id, version: order.version },
+          data: {
+            jumlahPesananAwal: order.jumlahPesanan,
+            jumlahPesanan: newQty,
+            statusPesanan: 'MENUNGGU_PERSETUJUAN' as any,
+            requiresApproval: true,
+            approvalStatus: 'PENDING' as any,
+            catatanDapur: editDto.catatanDapur,
+            version: { increment: 1 },
+          },
+          include: { pemesan: true, departemen: true, shift: true },
+        }),
+        this.prisma.permintaanPersetujuan.create({
+          data: {
+            pesananId: id,
+            requestType: 'EDIT',
+            requestedById: dapurKaryawanId,
+            jumlahPesananAwal: order.jumlahPesanan,
+            jumlahPesananBaru: newQty,
+            catatanDapur: editDto.catatanDapur,
+          },
+        }),
+      ])
+      .catch((err) => {
+        throw this.toConflictIfStale(err);
+      });
 
     await this.auditTrail.logOrderStatusChanged(
       dapurKaryawanId,
@@ -500,6 +745,16 @@ export class OrdersService {
         updated.departmentPemesanId,
         updated.karyawanPemesanId,
         newQty,
+        new Date(),
+        updated.version,
+        this.pickChanges(updated, [
+          'jumlahPesananAwal',
+          'jumlahPesanan',
+          'statusPesanan',
+          'requiresApproval',
+          'approvalStatus',
+          'catatanDapur',
+        ]),
       ),
     );
 
@@ -509,8 +764,8 @@ export class OrdersService {
   /**
    * approveRejectRequest
    * - Validate approval flags
-   * - Determine original request type (REJECT | EDIT)
-   * - Apply decision rules
+   * - Load the pending approval request with the order (type and requester)
+   * - Apply decision rules; order and request are updated in one transaction
    * - Log & Emit OrderApprovalDecidedEvent
    */
   async approveRejectRequest(
@@ -518,7 +773,16 @@ export class OrdersService {
     adminId: number,
     approveRejectDto: ApproveRejectOrderDto,
   ) {
-    const order = await this.prisma.pesanan.findUnique({ where: { id } });
+    const order = await this.prisma.pesanan.findUnique({
+      where: { id },
+      include: {
+        permintaanPersetujuan: {
+          where: { approvalStatus: 'PENDING' },
+          orderBy: { requestedAt: 'desc' },
+          take: 1,
+        },
+      },
+    });
     if (!order) {
       throw new NotFoundException('Order not found');
     }
@@ -537,10 +801,13 @@ export class OrdersService {
       throw new BadRequestException('Order is not pending approval');
     }
 
-    // Determine original request type using quantity difference as primary heuristic
-    const originalRequest: 'REJECT' | 'EDIT' =
-      order.jumlahPesananAwal != null &&
-      order.jumlahPesananAwal !== order.jumlahPesanan
+    // Request type comes from the approval request row; orders flagged before the
+    // table existed fall back to the quantity heuristic
+    const request = order.permintaanPersetujuan[0];
+    const originalRequest: 'REJECT' | 'EDIT' = request
+      ? request.requestType
+      : order.jumlahPesananAwal != null &&
+          order.jumlahPesananAwal !== order.jumlahPesanan
         ? 'EDIT'
         : 'REJECT';
 
@@ -554,6 +821,7 @@ export class OrdersService {
       requiresApproval: false,
       approvedById: adminId,
       catatanAdmin: approveRejectDto.catatanAdmin ?? null,
+      version: { increment: 1 },
     };
 
     if (decision === 'APPROVED') {
@@ -572,11 +840,27 @@ export class OrdersService {
       data.statusPesanan = 'MENUNGGU' as any;
     }
 
-    const updated = await this.prisma.pesanan.update({
-      where: { id },
-      data,
-      include: { pemesan: true, departemen: true, shift: true },
-    });
+    // Conditional on the version read above: a concurrent decision gets 409
+    const [updated] = await this.prisma
+      .$transaction([
+        this.prisma.pesanan.update({
+          where: { id, version: order.version },
+          data,
+          include: { pemesan: true, departemen: true, shift: true },
+        }),
+        this.prisma.permintaanPersetujuan.updateMany({
+          where: { pesananId: id, approvalStatus: 'PENDING' },
+          data: {
+            approvalStatus: decision as any,
+            decidedById: adminId,
+            catatanAdmin: approveRejectDto.catatanAdmin ?? null,
+            decidedAt: new Date(),
+          },
+        }),
+      ])
+      .catch((err) => {
+        throw this.toConflictIfStale(err);
+      });
 
     // Log status change transitions after DB update
     if (decision === 'APPROVED' && originalRequest === 'REJECT') {
@@ -604,18 +888,7 @@ export class OrdersService {
       approveRejectDto.catatanAdmin,
     );
 
-    // Resolve requestedBy from audit trail logs if available
-    const latestRequestLog = await this.prisma.auditTrail.findFirst({
-      where: {
-        aksi:
-          originalRequest === 'REJECT'
-            ? 'ORDER_REJECTION_REQUESTED'
-            : 'ORDER_EDIT_REQUESTED',
-        detail: { contains: updated.kodePesanan },
-      },
-      orderBy: { timestamp: 'desc' },
-    });
-    const requestedBy = latestRequestLog?.userId ?? 0;
+    const requestedBy = request?.requestedById ?? 0;
 
     this.eventEmitter.emit(
       'order.approval.decided',
@@ -630,6 +903,11 @@ export class OrdersService {
         updated.departmentPemesanId,
         requestedBy,
         new Date(),
+        updated.version,
+        this.pickChanges(
+          updated,
+          Object.keys(data).filter((key) => key !== 'version'),
+        ),
       ),
     );
 
@@ -641,20 +919,104 @@ export class OrdersService {
    * - List orders requiring approval with PENDING status
    * - Include related data
    * - Order by waktuDibuat descending
+   * - Served from PendingApprovalQueueService (no DB query per poll)
    */
   async getPendingApprovals() {
-    return this.prisma.pesanan.findMany({
-      where: {
-        requiresApproval: true,
-        approvalStatus: 'PENDING' as any,
-      },
-      include: { pemesan: true, departemen: true, shift: true },
-      orderBy: { waktuDibuat: 'desc' },
-    });
+    return this.pendingApprovalQueue.list();
+  }
+
+  /**
+   * getPendingApprovalChanges
+   * - Delta of the pending approval queue since a version returned earlier
+   * - Falls back to a full snapshot when the version/epoch is unknown
+   */
+  async getPendingApprovalChanges(queryDto: PendingApprovalChangesQueryDto) {
+    return this.pendingApprovalQueue.getChangesSince(
+      queryDto.since,
+      queryDto.epoch,
+    );
+  }
+
+  /**
+   * getTodayCounters
+   * - Today's order/meal counts by status, department and shift
+   * - Served from OrderStatusCountersService (no DB query per request)
+   */
+  async getTodayCounters() {
+    return this.statusCounters.getSummary();
   }
 
   // Helpers
 
+  /**
+   * Page through hot and archived orders merged by waktuDibuat (newest first, id breaks
+   * ties so pages do not overlap).
+   * Each table returns at most skip + take keys; the page is cut from the merged keys and
+   * only those rows are loaded with their relations.
+   */
+  private async findAllAcrossArchive(
+    where: Prisma.PesananWhereInput,
+    skip: number,
+    take: number,
+  ) {
+    // Same columns and relation names, so the filter applies to both tables
+    const archiveWhere = where as Prisma.PesananArchiveWhereInput;
+    const keys = { id: true, waktuDibuat: true } as const;
+
+    const [hotKeys, archivedKeys, hotTotal, archivedTotal] = await Promise.all([
+      this.prisma.pesanan.findMany({
+        where,
+        orderBy: ORDER_LIST_ORDER,
+        take: skip + take,
+        select: keys,
+      }),
+      this.prisma.pesananArchive.findMany({
+        where: archiveWhere,
+        orderBy: ORDER_LIST_ORDER,
+        take: skip + take,
+        select: keys,
+      }),
+      this.prisma.pesanan.count({ where }),
+      this.prisma.pesananArchive.count({ where: archiveWhere }),
+    ]);
+
+    const pageKeys = [
+      ...hotKeys.map((key) => ({ ...key, archived: false })),
+      ...archivedKeys.map((key) => ({ ...key, archived: true })),
+    ]
+      .sort(
+        (a, b) =>
+          b.waktuDibuat.getTime() - a.waktuDibuat.getTime() || b.id - a.id,
+      )
+      .slice(skip, skip + take);
+
+    const hotIds = pageKeys.filter((k) => !k.archived).map((k) => k.id);
+    const archivedIds = pageKeys.filter((k) => k.archived).map((k) => k.id);
+    const [hotRows, archivedRows] = await Promise.all([
+      hotIds.length > 0
+        ? this.prisma.pesanan.findMany({
+            where: { id: { in: hotIds } },
+            select: ORDER_LIST_SELECT,
+          })
+        : [],
+      archivedIds.length > 0
+        ? this.prisma.pesananArchive.findMany({
+            where: { id: { in: archivedIds } },
+            select: ORDER_LIST_SELECT,
+          })
+        : [],
+    ]);
+
+    const hotById = new Map(hotRows.map((row) => [row.id, row]));
+    const archivedById = new Map(archivedRows.map((row) => [row.id, row]));
+    // A row archived between the two reads is simply left out of this page
+    const data = pageKeys
+      .map((k) => (k.archived ? archivedById.get(k.id) : hotById.get(k.id)))
+      .filter((row): row is NonNullable<typeof row> => row !== undefined);
+
+    return { data, total: hotTotal + archivedTotal };
+  }
+
   private normalizeDateOnly(date: Date): Date {
     // Normalize to local midnight to avoid time component interfering with @db.Date
     const d = new Date(date);
@@ -662,45 +1024,132 @@ export class OrdersService {
     return d;
   }
 
-  private isTransitionAllowed(
+  private buildRoleWhere(
+    karyawanId: number,
     role: RoleAccessType,
-    from: StatusType,
-    to: StatusType,
-  ): boolean {
+  ): Prisma.PesananWhereInput {
+    if (role === 'employee') {
+      return { karyawanPemesanId: karyawanId };
+    }
+    if (role === 'dapur') {
+      return {
+        statusPesanan: {
+          in: ['MENUNGGU', 'IN_PROGRESS', 'MENUNGGU_PERSETUJUAN'] as any,
+        },
+      };
+    }
+    if (role === 'delivery') {
+      return { statusPesanan: { in: ['READY', 'ON_DELIVERY'] as any } };
+    }
     if (role === 'administrator') {
-      return true;
+      return {};
     }
-    if (role === 'employee') {
-      // Employee is not allowed to change order status
-      return false;
+    // Unknown role: restrict to none
+    return { karyawanPemesanId: -1 };
+  }
+
+  /**
+   * Statuses an order may be in for `role` to move it to `to`.
+   * Empty when the role can never produce that status.
+   */
+  private getAllowedSourceStatuses(
+    role: RoleAccessType,
+    to: StatusType,
+  ): StatusType[] {
+    if (role === 'administrator') {
+      return ALL_STATUSES.filter((status) => status !== to);
     }
     if (role === 'dapur') {
-      return (
-        (from === 'MENUNGGU' && to === 'IN_PROGRESS') ||
-        (from === 'IN_PROGRESS' && to === 'READY')
-      );
+      if (to === 'IN_PROGRESS') return ['MENUNGGU'];
+      if (to === 'READY') return ['IN_PROGRESS'];
     }
     if (role === 'delivery') {
-      return (
-        (from === 'READY' && to === 'ON_DELIVERY') ||
-        (from === 'ON_DELIVERY' && to === 'COMPLETE')
-      );
+      if (to === 'ON_DELIVERY') return ['READY'];
+      if (to === 'COMPLETE') return ['ON_DELIVERY'];
     }
-    return false;
+    // Employee is not allowed to change order status
+    return [];
   }
 
-  private getTimestampFieldForStatus(status: StatusType): string | undefined {
+  private getTimestampColumnForStatus(status: StatusType): string | undefined {
     switch (status) {
       case 'IN_PROGRESS':
-        return 'waktuDiproses';
+        return 'waktu_diproses';
       case 'READY':
-        return 'waktuSiap';
+        return 'waktu_siap';
       case 'ON_DELIVERY':
-        return 'waktuDiantar';
+        return 'waktu_diantar';
       case 'COMPLETE':
-        return 'waktuSelesai';
+        return 'waktu_selesai';
       default:
         return undefined;
     }
   }
+
+  // waktu_diproses -> waktuDiproses
+  private toFieldName(column: string): string {
+    return column.replace(/_([a-z])/g, (_, c: string) => c.toUpperCase());
+  }
+
+  /**
+   * Nest the flattened relation columns of an updateStatus row into the
+   * ORDER_LIST_SELECT shape returned by the list endpoints.
+   */
+  private toOrderListItem(row: UpdatedOrderRow): OrderListItem {
+    const {
+      old_status: _oldStatus,
+      old_version: _oldVersion,
+      updated: _updated,
+      pemesan_nik,
+      pemesan_nama,
+      departemen_nama,
+      shift_nama,
+      shift_jam_mulai,
+      shift_jam_selesai,
+      ...order
+    } = row;
+    return {
+      ...order,
+      pemesan: {
+        id: order.karyawanPemesanId,
+        nomorIndukKaryawan: pemesan_nik,
+        namaLengkap: pemesan_nama,
+      },
+      departemen: { id: order.departmentPemesanId, namaDivisi: departemen_nama },
+      shift: {
+        id: order.shiftId,
+        namaShift: shift_nama,
+        jamMulai: shift_jam_mulai,
+        jamSelesai: shift_jam_selesai,
+      },
+    };
+  }
+
+  /**
+   * Scalar fields written by an update, read back from the updated row.
+   * Carried on order.* events so websocket clients can patch local state.
+   */
+  private pickChanges(
+    row: Record<string, any>,
+    fields: string[],
+  ): Record<string, unknown> {
+    const changes: Record<string, unknown> = {};
+    for (const field of fields) {
+      changes[field] = row[field] ?? null;
+    }
+    return changes;
+  }
+
+  private toConflictIfStale(err: unknown): unknown {
+    // update() with a version in `where` matched no row
+    if (
+      err instanceof Prisma.PrismaClientKnownRequestError &&
+      err.code === 'P2025'
+    ) {
+      return new ConflictException(
+        'Order was modified by another request, reload and retry',
+      );
+    }
+    return err;
+  }
 }
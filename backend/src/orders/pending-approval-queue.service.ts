@@ -0,0 +1,297 @@
+import {
+  Injectable,
+  Logger,
+  OnApplicationBootstrap,
+  OnModuleDestroy,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { OnEvent } from '@nestjs/event-emitter';
+import { randomUUID } from 'crypto';
+import { PrismaService } from '../prisma/prisma.service';
+import { ORDER_LIST_SELECT, OrderListItem } from './dto';
+import {
+  OrderApprovalDecidedEvent,
+  OrderApprovalRequestedEvent,
+  OrderStatusChangedEvent,
+} from '../common/events';
+
+/**
+ * PendingApprovalQueueService
+ *
+ * In-memory queue of orders awaiting admin approval
+ * (requiresApproval = true AND approvalStatus = PENDING).
+ *
+ * - Loaded once at application bootstrap with a single query.
+ * - Maintained from 'order.approval.requested' (upsert), 'order.approval.decided' (remove)
+ *   and 'order.status.changed' (refresh an order that is already queued).
+ * - Every mutation bumps a monotonically increasing `version` and is recorded in a bounded
+ *   change log, so clients can poll for deltas with `getChangesSince()`.
+ *
+ * Cluster note:
+ * - Events are process-local. Under PM2 cluster mode each instance also re-reads the pending
+ *   set every PENDING_APPROVAL_RESYNC_SECONDS and folds the difference into its change log.
+ * - `epoch` identifies this instance's version sequence. A delta request carrying another
+ *   epoch (different instance or restart) receives a full snapshot instead.
+ */
+
+const MAX_CHANGE_LOG = 1000;
+
+// Kept in the list response shape, so snapshots are served without another projection
+type PendingOrder = OrderListItem;
+
+type ChangeLogEntry = {
+  version: number;
+  orderId: number;
+  removed: boolean;
+};
+
+export type PendingApprovalChanges = {
+  epoch: string;
+  version: number;
+  full: boolean;
+  upserts: PendingOrder[];
+  removed: number[];
+};
+
+@Injectable()
+export class PendingApprovalQueueService
+  implements OnApplicationBootstrap, OnModuleDestroy
+{
+  private readonly logger = new Logger(PendingApprovalQueueService.name);
+  private readonly epoch = randomUUID();
+  private readonly resyncIntervalMs: number;
+
+  private readonly orders = new Map<number, PendingOrder>();
+  private readonly changeLog: ChangeLogEntry[] = [];
+  // Per-order counter to discard stale reads that finish after a newer event
+  private readonly eventSeq = new Map<number, number>();
+  private version = 0;
+  private sorted: PendingOrder[] | null = null;
+  private loaded = false;
+  private resyncTimer?: NodeJS.Timeout;
+
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly configService: ConfigService,
+  ) {
+    const raw =
+      this.configService.get<string>('PENDING_APPROVAL_RESYNC_SECONDS') ??
+      process.env.PENDING_APPROVAL_RESYNC_SECONDS;
+    const seconds = raw !== undefined ? parseInt(String(raw), 10) : NaN;
+    this.resyncIntervalMs =
+      (Number.isFinite(seconds) && seconds > 0 ? seconds : 30) * 1000;
+  }
+
+  async onApplicationBootstrap(): Promise<void> {
+    try {
+      await this.resync();
+    } catch (err) {
+      // Retried lazily on first read and by the resync timer
+      this.logger.error(`Initial pending approval load failed: ${String(err)}`);
+    }
+    this.resyncTimer = setInterval(() => {
+      void this.resync().catch((err) =>
+        this.logger.error(`Pending approval resync failed: ${String(err)}`),
+      );
+    }, this.resyncIntervalMs);
+    this.resyncTimer.unref();
+  }
+
+  onModuleDestroy(): void {
+    if (this.resyncTimer) {
+      clearInterval(this.resyncTimer);
+    }
+  }
+
+  /**
+   * list
+   * Pending orders sorted by waktuDibuat descending (same order as the former DB query).
+   */
+  async list(): Promise<PendingOrder[]> {
+    await this.ensureLoaded();
+    if (!this.sorted) {
+      this.sorted = Array.from(this.orders.values()).sort(
+        (a, b) =>
+          new Date(b.waktuDibuat).getTime() - new Date(a.waktuDibuat).getTime(),
+      );
+    }
+    return this.sorted;
+  }
+
+  /**
+   * getChangesSince
+   * Returns orders added/updated and ids removed after `since`.
+   * A full snapshot (full = true) is returned when the epoch differs or the change log
+   * no longer reaches back to `since`.
+   */
+  async getChangesSince(
+    since?: number,
+    epoch?: string,
+  ): Promise<PendingApprovalChanges> {
+    await this.ensureLoaded();
+
+    const oldestLogged =
+      this.changeLog.length > 0 ? this.changeLog[0].version - 1 : this.version;
+    const canDelta =
+      typeof since === 'number' &&
+      epoch === this.epoch &&
+      since <= this.version &&
+      since >= oldestLogged;
+
+    if (!canDelta) {
+      return {
+        epoch: this.epoch,
+        version: this.version,
+        full: true,
+        upserts: await this.list(),
+        removed: [],
+      };
+    }
+
+    const touched = new Map<number, boolean>();
+    for (let i = this.changeLog.length - 1; i >= 0; i--) {
+      const entry = this.changeLog[i];
+      if (entry.version <= since) break;
+      if (!touched.has(entry.orderId)) {
+        touched.set(entry.orderId, entry.removed);
+      }
+    }
+
+    const upserts: PendingOrder[] = [];
+    const removed: number[] = [];
+    for (const [orderId, wasRemoved] of touched) {
+      const order = this.orders.get(orderId);
+      if (wasRemoved || !order) removed.push(orderId);
+      else upserts.push(order);
+    }
+
+    return {
+      epoch: this.epoch,
+      version: this.version,
+      full: false,
+      upserts,
+      removed,
+    };
+  }
+
+  @OnEvent('order.approval.requested', { async: true })
+  async handleApprovalRequested(
+    event: OrderApprovalRequestedEvent,
+  ): Promise<void> {
+    await this.refreshOrder(event.orderId);
+  }
+
+  @OnEvent('order.approval.decided')
+  handleApprovalDecided(event: OrderApprovalDecidedEvent): void {
+    this.bumpSeq(event.orderId);
+    this.remove(event.orderId);
+  }
+
+  @OnEvent('order.status.changed', { async: true })
+  async handleStatusChanged(event: OrderStatusChangedEvent): Promise<void> {
+    // Only queued orders can change their pending view through a status update
+    if (this.orders.has(event.orderId)) {
+      await this.refreshOrder(event.orderId);
+    }
+  }
+
+  // Helpers
+
+  private async ensureLoaded(): Promise<void> {
+    if (!this.loaded) {
+      await this.resync();
+    }
+  }
+
+  /**
+   * Re-reads the whole pending set and applies the difference to the queue.
+   */
+  private async resync(): Promise<void> {
+    const seqBefore = new Map(this.eventSeq);
+    const rows = (await this.prisma.pesanan.findMany({
+      where: { requiresApproval: true, approvalStatus: 'PENDING' as any },
+      select: ORDER_LIST_SELECT,
+    })) as PendingOrder[];
+
+    const seen = new Set<number>();
+    for (const row of rows) {
+      seen.add(row.id);
+      // An event arrived while reading: the event path already has fresher data
+      if (this.eventSeq.get(row.id) !== seqBefore.get(row.id)) continue;
+      const current = this.orders.get(row.id);
+      if (!current || this.fingerprint(current) !== this.fingerprint(row)) {
+        this.upsert(row);
+      }
+    }
+    for (const orderId of Array.from(this.orders.keys())) {
+      if (seen.has(orderId)) continue;
+      if (this.eventSeq.get(orderId) !== seqBefore.get(orderId)) continue;
+      this.remove(orderId);
+    }
+
+    this.loaded = true;
+  }
+
+  private async refreshOrder(orderId: number): Promise<void> {
+    const seq = this.bumpSeq(orderId);
+    try {
+      const row = (await this.prisma.pesanan.findFirst({
+        where: {
+          id: orderId,
+          requiresApproval: true,
+          approvalStatus: 'PENDING' as any,
+        },
+        select: ORDER_LIST_SELECT,
+      })) as PendingOrder | null;
+
+      if (this.eventSeq.get(orderId) !== seq) return;
+      if (row) this.upsert(row);
+      else this.remove(orderId);
+    } catch (err) {
+      this.logger.error(
+        `Failed to refresh pending approval for order ${orderId}: ${String(err)}`,
+      );
+    }
+  }
+
+  private upsert(order: PendingOrder): void {
+    this.orders.set(order.id, order);
+    this.record(order.id, false);
+  }
+
+  private remove(orderId: number): void {
+    if (!this.orders.delete(orderId)) return;
+    this.record(orderId, true);
+  }
+
+  private record(orderId: number, removed: boolean): void {
+    this.version += 1;
+    this.sorted = null;
+    this.changeLog.push({ version: this.version, orderId, removed });
+    if (this.changeLog.length > MAX_CHANGE_LOG) {
+      this.changeLog.splice(0, this.changeLog.length - MAX_CHANGE_LOG);
+    }
+  }
+
+  private bumpSeq(orderId: number): number {
+    const next = (this.eventSeq.get(orderId) ?? 0) + 1;
+    this.eventSeq.set(orderId, next);
+    if (this.eventSeq.size > MAX_CHANGE_LOG * 10) {
+      const oldest = this.eventSeq.keys().next().value;
+      if (oldest !== undefined) this.eventSeq.delete(oldest);
+    }
+    return next;
+  }
+
+  private fingerprint(order: PendingOrder): string {
+    return [
+      order.statusPesanan,
+      order.jumlahPesanan,
+      order.jumlahPesananAwal,
+      order.approvalStatus,
+      order.catatanDapur,
+      order.catatanAdmin,
+      order.shiftId,
+    ].join('|');
+  }
+}
@@ -0,0 +1,144 @@
+import type { ConfigService } from '@nestjs/config';
+import type { EventEmitter2 } from '@nestjs/event-emitter';
+import type { PrismaService } from '../prisma/prisma.service';
+import type { AuditTrailService } from '../common/services/audit-trail.service';
+import type { PendingApprovalQueueService } from './pending-approval-queue.service';
+import type { OrderStatusCountersService } from './order-status-counters.service';
+import type { OrderArchiveService } from './order-archive.service';
+import { OrdersService } from './orders.service';
+import { parseTime, StandingOrderService } from './standing-order.service';
+
+const ordersService = new OrdersService(
+  {} as PrismaService,
+  {} as AuditTrailService,
+  {} as EventEmitter2,
+  {} as PendingApprovalQueueService,
+  {} as OrderStatusCountersService,
+  {} as OrderArchiveService,
+);
+
+function inDays(days: number): Date {
+  const d = new Date();
+  d.setDate(d.getDate() + days);
+  d.setHours(0, 0, 0, 0);
+  return d;
+}
+
+function setup(queryRaw: jest.Mock) {
+  const tx = { $executeRaw: jest.fn(), $queryRaw: queryRaw };
+  const prisma = {
+    $transaction: jest.fn((fn: (t: typeof tx) => Promise<unknown>) => fn(tx)),
+    shift: { findMany: jest.fn().mockResolvedValue([]) },
+  };
+  const auditTrail = { logOrdersCreated: jest.fn() };
+  const eventEmitter = { emit: jest.fn() };
+  const service = new StandingOrderService(
+    prisma as unknown as PrismaService,
+    auditTrail as unknown as AuditTrailService,
+    eventEmitter as unknown as EventEmitter2,
+    ordersService,
+    { get: () => 'off' } as unknown as ConfigService,
+  );
+  return { service, prisma, tx, eventEmitter };
+}
+
+const created = (id: number, kodePesanan: string, departmentId = 1) => ({
+  id,
+  kodePesanan,
+  karyawanPemesanId: id,
+  departmentId,
+  shiftId: 1,
+  jumlahPesanan: 2,
+});
+
+describe('StandingOrderService.materialize', () => {
+  it('allocates codes with the order date prefix under the per-date lock', async () => {
+    const target = inDays(1);
+    const queryRaw = jest.fn().mockResolvedValue([]);
+    const { service, tx } = setup(queryRaw);
+
+    await service.materialize(target);
+
+    const prefix = ordersService.orderCodePrefix(target);
+    expect(prefix).toMatch(/^PM-\d{8}-$/);
+    // Tagged template call: (strings, ...values)
+    const values = queryRaw.mock.calls[0].slice(1);
+    expect(values[0]).toBe(prefix);
+    expect(values).toContain(target.toISOString().slice(0, 10));
+
+    const lockValues = tx.$executeRaw.mock.calls[0].slice(1);
+    expect(lockValues[1]).toBe(
+      Number(target.toISOString().slice(0, 10).replace(/-/g, '')),
+    );
+  });
+
+  it('reallocates codes after a conflict with a manual order', async () => {
+    const queryRaw = jest
+      .fn()
+      .mockRejectedValueOnce(
+        new Error('Unique constraint failed on the fields: (`kode_pesanan`)'),
+      )
+      .mockResolvedValueOnce([
+        created(1, 'PM-20250101-004'),
+        created(2, 'PM-20250101-005', 2),
+      ]);
+    const { service, prisma, eventEmitter } = setup(queryRaw);
+
+    const result = await service.materialize(inDays(1));
+
+    expect(prisma.$transaction).toHaveBeenCalledTimes(2);
+    expect(result).toMatchObject({ created: 2, meals: 4 });
+    expect(eventEmitter.emit).toHaveBeenCalledWith(
+      'orders.materialized',
+      expect.objectContaining({
+        totalOrders: 2,
+        totalMeals: 4,
+        byDepartment: [
+          { departmentId: 1, orders: 1, meals: 2 },
+          { departmentId: 2, orders: 1, meals: 2 },
+        ],
+      }),
+    );
+  });
+
+  it('gives up after repeated code conflicts', async () => {
+    const queryRaw = jest
+      .fn()
+      .mockRejectedValue(new Error('duplicate key value (kode_pesanan)'));
+    const { service, prisma } = setup(queryRaw);
+
+    await expect(service.materialize(inDays(1))).rejects.toThrow('kode_pesanan');
+    expect(prisma.$transaction).toHaveBeenCalledTimes(3);
+  });
+
+  it('does not retry other errors', async () => {
+    const queryRaw = jest.fn().mockRejectedValue(new Error('connection lost'));
+    const { service, prisma } = setup(queryRaw);
+
+    await expect(service.materialize(inDays(1))).rejects.toThrow(
+      'connection lost',
+    );
+    expect(prisma.$transaction).toHaveBeenCalledTimes(1);
+  });
+
+  it('rejects past dates', async () => {
+    const { service, prisma } = setup(jest.fn());
+
+    await expect(service.materialize(inDays(-1))).rejects.toThrow(
+      'past date',
+    );
+    expect(prisma.$transaction).not.toHaveBeenCalled();
+  });
+});
+
+describe('parseTime', () => {
+  it.each([
+    ['18:00', [18, 0]],
+    ['7:05', [7, 5]],
+    ['24:00', null],
+    ['18:60', null],
+    ['1800', null],
+  ])('parses %s', (raw, expected) => {
+    expect(parseTime(raw)).toEqual(expected);
+  });
+});
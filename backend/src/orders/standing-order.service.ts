@@ -0,0 +1,415 @@
+import {
+  BadRequestException,
+  ForbiddenException,
+  Injectable,
+  Logger,
+  NotFoundException,
+  OnApplicationBootstrap,
+  OnModuleDestroy,
+  Optional,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { EventEmitter2 } from '@nestjs/event-emitter';
+import { PrismaService } from '../prisma/prisma.service';
+import { AuditTrailService } from '../common/services/audit-trail.service';
+import { MetricsService } from '../metrics/metrics.service';
+import { OrdersMaterializedEvent } from '../common/events';
+import { OrdersService } from './orders.service';
+import { CreateOrderTemplateDto, UpdateOrderTemplateDto } from './dto';
+
+type RoleAccessType = 'administrator' | 'employee' | 'dapur' | 'delivery';
+
+/**
+ * StandingOrderService
+ *
+ * Recurring order templates (one per karyawan + shift) and the daily job that turns them
+ * into orders, so employees who order the same meals every day no longer send one
+ * POST /orders each morning at cutoff.
+ *
+ * Materialisation (default: tomorrow, daily at STANDING_ORDER_RUN_AT local time):
+ * - One INSERT … SELECT creates an order for every active template whose weekday matches,
+ *   is not paused, belongs to an active karyawan with a department, and has no order for
+ *   that karyawan/shift/date yet (orders placed by hand take precedence).
+ * - Order codes are allocated inside the same statement, continuing the per-day sequence
+ *   used by OrdersService.generateOrderCode (grouped by department and shift).
+ * - The transaction holds an advisory lock per order date, so runs from several PM2
+ *   instances (or the manual endpoint) serialise and the later ones insert nothing.
+ * - Audit rows are written with multi-row INSERTs and a single 'orders.materialized'
+ *   summary event replaces one 'order.created' per order.
+ * - On startup a run that was missed today is caught up immediately.
+ */
+
+type MaterializedRow = {
+  id: number;
+  kodePesanan: string;
+  karyawanPemesanId: number;
+  departmentId: number;
+  shiftId: number;
+  jumlahPesanan: number;
+};
+
+export type MaterializeResult = {
+  tanggalPesanan: string;
+  created: number;
+  meals: number;
+};
+
+// pg_advisory_xact_lock(key, yyyymmdd)
+const MATERIALIZE_LOCK_KEY = 46_001;
+const MATERIALIZE_TX_TIMEOUT_MS = 60_000;
+const MAX_CODE_CONFLICT_RETRIES = 3;
+const AUDIT_BATCH_SIZE = 5000;
+const TEMPLATE_INCLUDE = {
+  shift: { select: { id: true, namaShift: true } },
+} as const;
+
+@Injectable()
+export class StandingOrderService
+  implements OnApplicationBootstrap, OnModuleDestroy
+{
+  private readonly logger = new Logger(StandingOrderService.name);
+  // [hour, minute] local time, or null when the schedule is disabled
+  private readonly runAt: [number, number] | null;
+  private timer?: NodeJS.Timeout;
+
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly auditTrail: AuditTrailService,
+    private readonly eventEmitter: EventEmitter2,
+    private readonly ordersService: OrdersService,
+    private readonly configService: ConfigService,
+    @Optional() private readonly metrics?: MetricsService,
+  ) {
+    this.runAt = this.readTime('STANDING_ORDER_RUN_AT', '18:00');
+  }
+
+  onApplicationBootstrap(): void {
+    if (this.runAt) this.scheduleNext(true);
+  }
+
+  onModuleDestroy(): void {
+    if (this.timer) clearTimeout(this.timer);
+  }
+
+  /**
+   * listTemplates
+   * Employees see their own templates; administrators see all.
+   */
+  async listTemplates(karyawanId: number, role: RoleAccessType) {
+    return this.prisma.pesananTemplate.findMany({
+      where: role === 'administrator' ? {} : { karyawanId },
+      include: TEMPLATE_INCLUDE,
+      orderBy: [{ karyawanId: 'asc' }, { shiftId: 'asc' }],
+    });
+  }
+
+  /**
+   * upsertTemplate
+   * Create the caller's template for a shift, or replace it if one exists.
+   */
+  async upsertTemplate(karyawanId: number, dto: CreateOrderTemplateDto) {
+    const karyawan = await this.prisma.karyawan.findUnique({
+      where: { id: karyawanId },
+      select: { isActive: true, departmentId: true },
+    });
+    if (!karyawan) {
+      throw new NotFoundException('Karyawan not found');
+    }
+    if (!karyawan.isActive) {
+      throw new ForbiddenException('Inactive karyawan cannot create orders');
+    }
+    if (typeof karyawan.departmentId !== 'number') {
+      throw new BadRequestException('Karyawan has no department assigned');
+    }
+    const shift = await this.prisma.shift.findUnique({
+      where: { id: dto.shiftId },
+      select: { id: true },
+    });
+    if (!shift) {
+      throw new BadRequestException('Shift not found');
+    }
+
+    const data = {
+      jumlahPesanan: dto.jumlahPesanan,
+      hariAktif: dto.hariAktif ?? [1, 2, 3, 4, 5],
+      isActive: true,
+      pausedUntil: dto.pausedUntil ? this.toDateOnly(dto.pausedUntil) : null,
+    };
+    return this.prisma.pesananTemplate.upsert({
+      where: { karyawanId_shiftId: { karyawanId, shiftId: dto.shiftId } },
+      create: { karyawanId, shiftId: dto.shiftId, ...data },
+      update: data,
+      include: TEMPLATE_INCLUDE,
+    });
+  }
+
+  /**
+   * updateTemplate
+   * Change quantity/days, pause until a date (exceptions) or deactivate.
+   */
+  async updateTemplate(
+    id: number,
+    karyawanId: number,
+    role: RoleAccessType,
+    dto: UpdateOrderTemplateDto,
+  ) {
+    await this.findOwnedTemplate(id, karyawanId, role);
+    return this.prisma.pesananTemplate.update({
+      where: { id },
+      data: {
+        jumlahPesanan: dto.jumlahPesanan,
+        hariAktif: dto.hariAktif,
+        isActive: dto.isActive,
+        pausedUntil:
+          dto.pausedUntil === undefined
+            ? undefined
+            : dto.pausedUntil === null
+              ? null
+              : this.toDateOnly(dto.pausedUntil),
+      },
+      include: TEMPLATE_INCLUDE,
+    });
+  }
+
+  /**
+   * removeTemplate
+   */
+  async removeTemplate(id: number, karyawanId: number, role: RoleAccessType) {
+    await this.findOwnedTemplate(id, karyawanId, role);
+    await this.prisma.pesananTemplate.delete({ where: { id } });
+    return { id, deleted: true };
+  }
+
+  /**
+   * materialize
+   * Create the orders of `tanggalPesanan` (default: tomorrow) from active templates.
+   * Safe to call repeatedly: templates that already have an order for the date are skipped.
+   */
+  async materialize(tanggalPesanan?: Date): Promise<MaterializeResult> {
+    const target = this.toDateOnly(tanggalPesanan ?? this.tomorrow());
+    if (target.getTime() < this.toDateOnly(new Date()).getTime()) {
+      throw new BadRequestException(
+        'Cannot materialise standing orders for a past date',
+      );
+    }
+
+    // Same date mapping as OrdersService.create (local midnight stored in a DATE column)
+    const dateKey = target.toISOString().slice(0, 10);
+    const isoWeekday = target.getDay() === 0 ? 7 : target.getDay();
+    const prefix = this.ordersService.orderCodePrefix(target);
+    const startedAt = Date.now();
+
+    const rows = await this.insertOrders(dateKey, isoWeekday, prefix);
+    const result: MaterializeResult = {
+      tanggalPesanan: dateKey,
+      created: rows.length,
+      meals: rows.reduce((sum, r) => sum + r.jumlahPesanan, 0),
+    };
+    if (rows.length === 0) return result;
+
+    await this.writeAudit(rows);
+
+    const byDepartment = new Map<number, { orders: number; meals: number }>();
+    for (const row of rows) {
+      const cell = byDepartment.get(row.departmentId) ?? { orders: 0, meals: 0 };
+      cell.orders++;
+      cell.meals += row.jumlahPesanan;
+      byDepartment.set(row.departmentId, cell);
+    }
+    this.eventEmitter.emit(
+      'orders.materialized',
+      new OrdersMaterializedEvent(
+        dateKey,
+        result.created,
+        result.meals,
+        Array.from(byDepartment, ([departmentId, cell]) => ({
+          departmentId,
+          ...cell,
+        })),
+      ),
+    );
+
+    this.metrics?.increment(
+      'standing_orders_created_total',
+      {},
+      rows.length,
+      'Orders created from standing order templates',
+    );
+    this.logger.log(
+      `Materialised ${result.created} standing orders (${result.meals} meals) for ${dateKey} in ${Date.now() - startedAt}ms`,
+    );
+    return result;
+  }
+
+  // Helpers
+
+  private async insertOrders(
+    dateKey: string,
+    isoWeekday: number,
+    prefix: string,
+  ): Promise<MaterializedRow[]> {
+    const lockDay = Number(dateKey.replace(/-/g, ''));
+
+    for (let attempt = 1; ; attempt++) {
+      try {
+        return await this.prisma.$transaction(
+          async (tx) => {
+            await tx.$executeRaw`SELECT pg_advisory_xact_lock(${MATERIALIZE_LOCK_KEY}::int, ${lockDay}::int)`;
+            return tx.$queryRaw<MaterializedRow[]>`
+              INSERT INTO "transaction_pesanan" (
+                "kode_pesanan", "karyawan_pemesan_id", "department_pemesan_id", "shift_id",
+                "jumlah_pesanan", "status_pesanan", "tanggal_pesanan"
+              )
+              SELECT
+                ${prefix}::text || lpad(c.seq::text, greatest(3, length(c.seq::text)), '0'),
+                c."karyawan_id", c."department_id", c."shift_id", c."jumlah_pesanan",
+                'MENUNGGU'::"StatusPesanan", ${dateKey}::date
+              FROM (
+                SELECT
+                  t."karyawan_id", k."department_id", t."shift_id", t."jumlah_pesanan",
+                  base.n + row_number() OVER (
+                    ORDER BY k."department_id", t."shift_id", t."karyawan_id"
+                  ) AS seq
+                FROM "transaction_pesanan_template" t
+                JOIN "master_karyawan" k ON k."id" = t."karyawan_id"
+                CROSS JOIN (
+                  SELECT count(*) AS n FROM "transaction_pesanan"
+                  WHERE "tanggal_pesanan" = ${dateKey}::date
+                ) base
+                WHERE t."is_active"
+                  AND k."is_active"
+                  AND k."department_id" IS NOT NULL
+                  AND ${isoWeekday}::int = ANY (t."hari_aktif")
+                  AND (t."paused_until" IS NULL OR t."paused_until" < ${dateKey}::date)
+                  AND NOT EXISTS (
+                    SELECT 1 FROM "transaction_pesanan" p
+                    WHERE p."karyawan_pemesan_id" = t."karyawan_id"
+                      AND p."shift_id" = t."shift_id"
+                      AND p."tanggal_pesanan" = ${dateKey}::date
+                  )
+              ) c
+              RETURNING
+                "id",
+                "kode_pesanan" AS "kodePesanan",
+                "karyawan_pemesan_id" AS "karyawanPemesanId",
+                "department_pemesan_id" AS "departmentId",
+                "shift_id" AS "shiftId",
+                "jumlah_pesanan" AS "jumlahPesanan"`;
+          },
+          { timeout: MATERIALIZE_TX_TIMEOUT_MS },
+        );
+      } catch (err) {
+        // A manual order for the same date took one of the allocated codes: reallocate
+        const codeConflict = String(err).includes('kode_pesanan');
+        if (!codeConflict || attempt >= MAX_CODE_CONFLICT_RETRIES) throw err;
+        this.logger.warn(
+          `Order code conflict while materialising ${dateKey}, retrying (${attempt})`,
+        );
+      }
+    }
+  }
+
+  private async writeAudit(rows: MaterializedRow[]): Promise<void> {
+    const shifts = await this.prisma.shift.findMany({
+      where: { id: { in: Array.from(new Set(rows.map((r) => r.shiftId))) } },
+      select: { id: true, namaShift: true },
+    });
+    const shiftNames = new Map(shifts.map((s) => [s.id, s.namaShift]));
+
+    for (let i = 0; i < rows.length; i += AUDIT_BATCH_SIZE) {
+      const batch = rows.slice(i, i + AUDIT_BATCH_SIZE);
+      try {
+        await this.auditTrail.logOrdersCreated(
+          batch.map((r) => ({
+            karyawanId: r.karyawanPemesanId,
+            kodePesanan: r.kodePesanan,
+            jumlahPesanan: r.jumlahPesanan,
+            shiftName: shiftNames.get(r.shiftId) ?? String(r.shiftId),
+          })),
+        );
+      } catch (err) {
+        // Orders are committed; a failed audit batch must not hide them from the caller
+        this.logger.error(
+          `Failed to write standing order audit batch: ${String(err)}`,
+        );
+      }
+    }
+  }
+
+  private async findOwnedTemplate(
+    id: number,
+    karyawanId: number,
+    role: RoleAccessType,
+  ) {
+    const template = await this.prisma.pesananTemplate.findUnique({
+      where: { id },
+      select: { id: true, karyawanId: true },
+    });
+    if (!template) {
+      throw new NotFoundException('Order template not found');
+    }
+    if (role !== 'administrator' && template.karyawanId !== karyawanId) {
+      throw new ForbiddenException('You can only change your own templates');
+    }
+    return template;
+  }
+
+  private scheduleNext(catchUp: boolean): void {
+    if (!this.runAt) return;
+    const now = new Date();
+    const next = new Date(now);
+    next.setHours(this.runAt[0], this.runAt[1], 0, 0);
+    if (next.getTime() <= now.getTime()) {
+      if (catchUp) void this.runScheduled();
+      next.setDate(next.getDate() + 1);
+    }
+
+    this.timer = setTimeout(() => {
+      void this.runScheduled().finally(() => this.scheduleNext(false));
+    }, next.getTime() - now.getTime());
+    this.timer.unref();
+  }
+
+  private async runScheduled(): Promise<void> {
+    try {
+      await this.materialize();
+    } catch (err) {
+      this.logger.error(`Standing order materialisation failed: ${String(err)}`);
+    }
+  }
+
+  private tomorrow(): Date {
+    const d = new Date();
+    d.setDate(d.getDate() + 1);
+    return d;
+  }
+
+  private toDateOnly(value: Date | string): Date {
+    // Same normalisation as OrdersService (local midnight)
+    const d = new Date(value);
+    d.setHours(0, 0, 0, 0);
+    return d;
+  }
+
+  private readTime(key: string, fallback: string): [number, number] | null {
+    const raw = String(
+      this.configService.get<string>(key) ?? process.env[key] ?? fallback,
+    ).trim();
+    if (raw === '' || raw.toLowerCase() === 'off') return null;
+    const parsed = parseTime(raw);
+    if (!parsed) {
+      this.logger.warn(`Invalid ${key}="${raw}", using ${fallback}`);
+      return parseTime(fallback);
+    }
+    return parsed;
+  }
+}
+
+// "HH:MM" → [hour, minute]
+export function parseTime(value: string): [number, number] | null {
+  const match = /^(\d{1,2}):(\d{2})$/.exec(value);
+  if (!match) return null;
+  const hour = Number(match[1]);
+  const minute = Number(match[2]);
+  return hour < 24 && minute < 60 ? [hour, minute] : null;
+}
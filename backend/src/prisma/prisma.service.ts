@@ -1,11 +1,42 @@
-import { Injectable, OnModuleInit, OnModuleDestroy } from '@nestjs/common';
-import { PrismaClient } from '@prisma/client';
+import {
+  Injectable,
+  OnModuleInit,
+  OnModuleDestroy,
+  Optional,
+} from '@nestjs/common';
+import { Prisma, PrismaClient } from '@prisma/client';
+import { GaugeSample, MetricsService } from '../metrics/metrics.service';
+
+const DEFAULT_DB_STATS_INTERVAL_SECONDS = 15;
 
 @Injectable()
 export class PrismaService
-  extends PrismaClient
+  extends PrismaClient<Prisma.PrismaClientOptions, 'query'>
   implements OnModuleInit, OnModuleDestroy
 {
+  // Snapshot pg_stat_activity terakhir; gauge dibaca sinkron saat scrape
+  private dbConnections: GaugeSample[] = [];
+  private dbMaxConnections: number | null = null;
+  private dbStatsTimer?: NodeJS.Timeout;
+
+  constructor(@Optional() private readonly metrics?: MetricsService) {
+    // Query events hanya diaktifkan bila MetricsService tersedia (durasi SQL per statement)
+    super(
+      metrics
+        ? {
+            log: [
+              { emit: 'event', level: 'query' },
+              { emit: 'stdout', level: 'warn' },
+              { emit: 'stdout', level: 'error' },
+            ],
+          }
+        : undefined,
+    );
+    if (metrics) {
+      this.instrument(metrics);
+    }
+  }
+
   async onModuleInit(): Promise<void> {
     const url = process.env.DATABASE_URL || '';
     try {
@@ -22,6 +53,9 @@ export class PrismaService
       await this.$connect();
       // eslint-disable-next-line no-console
       console.log('[Prisma] Connected.');
+      if (this.metrics) {
+        this.startDbStats();
+      }
     } catch (e: any) {
       // eslint-disable-next-line no-console
       console.error('[Prisma] Connection failed:', e?.message || e);
@@ -32,6 +66,89 @@ export class PrismaService
   }
 
   async onModuleDestroy(): Promise<void> {
+    if (this.dbStatsTimer) clearInterval(this.dbStatsTimer);
     await this.$disconnect();
   }
+
+  /**
+   * instrument
+   * - Middleware: durasi operasi Prisma per model/action (termasuk serialisasi engine)
+   * - Query event: durasi SQL yang dilaporkan engine, per jenis statement
+   */
+  private instrument(metrics: MetricsService): void {
+    this.$use(async (params, next) => {
+      const start = process.hrtime.bigint();
+      try {
+        return await next(params);
+      } finally {
+        metrics.observe(
+          'prisma_operation_duration_seconds',
+          { model: params.model ?? 'raw', action: params.action },
+          Number(process.hrtime.bigint() - start) / 1e9,
+        );
+      }
+    });
+
+    this.$on('query', (e: Prisma.QueryEvent) => {
+      const statement =
+        /^\s*(\w+)/.exec(e.query)?.[1]?.toUpperCase() ?? 'OTHER';
+      metrics.observe(
+        'prisma_query_duration_seconds',
+        { statement },
+        Number(e.duration) / 1000,
+      );
+    });
+
+    metrics.registerGauge(
+      'db_connections',
+      'Client connections to this database by state (pg_stat_activity, all instances)',
+      () => this.dbConnections,
+    );
+    metrics.registerGauge(
+      'db_max_connections',
+      'PostgreSQL max_connections',
+      () => (this.dbMaxConnections === null ? [] : this.dbMaxConnections),
+    );
+  }
+
+  /**
+   * startDbStats
+   * Sampling pg_stat_activity tiap DB_STATS_INTERVAL_SECONDS (default 15) untuk mendeteksi
+   * pool yang bocor atau koneksi "idle in transaction" yang menumpuk (soak test).
+   */
+  private startDbStats(): void {
+    const raw = parseInt(process.env.DB_STATS_INTERVAL_SECONDS ?? '', 10);
+    const seconds =
+      Number.isFinite(raw) && raw > 0 ? raw : DEFAULT_DB_STATS_INTERVAL_SECONDS;
+
+    const sample = async () => {
+      try {
+        const rows = await this.$queryRaw<
+          Array<{ state: string; count: number }>
+        >`
+          SELECT COALESCE(state, 'unknown') AS state, COUNT(*)::int AS count
+          FROM pg_stat_activity
+          WHERE datname = current_database() AND backend_type = 'client backend'
+          GROUP BY 1
+        `;
+        this.dbConnections = rows.map((row) => ({
+          labels: { state: row.state },
+          value: row.count,
+        }));
+        if (this.dbMaxConnections === null) {
+          const max = await this.$queryRaw<Array<{ max_connections: string }>>`
+            SHOW max_connections
+          `;
+          this.dbMaxConnections = Number(max[0]?.max_connections) || null;
+        }
+      } catch {
+        // Hak akses/DB sementara tidak tersedia: gauge kosong sampai sampling berikutnya
+        this.dbConnections = [];
+      }
+    };
+
+    void sample();
+    this.dbStatsTimer = setInterval(() => void sample(), seconds * 1000);
+    this.dbStatsTimer.unref();
+  }
 }
@@ -0,0 +1,166 @@
+import {
+  Injectable,
+  Logger,
+  OnModuleDestroy,
+  OnModuleInit,
+  Optional,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Prisma, PrismaClient } from '@prisma/client';
+import { PrismaService } from './prisma.service';
+import { MetricsService } from '../metrics/metrics.service';
+import { readInt } from '../common/utils';
+
+/**
+ * ReadReplicaService — Routing query baca berat ke replica PostgreSQL
+ *
+ * Tujuan:
+ * - Laporan (ReportsService), AuditTrailService.query, dan export memakai pool koneksi
+ *   terpisah sehingga scan panjang tidak merebut koneksi dari POST /orders dan update status.
+ *
+ * Konfigurasi:
+ * - DATABASE_REPLICA_URL: URL replica (opsional). Jika kosong → semua baca ke primary.
+ * - REPLICA_CONNECTION_LIMIT: ukuran pool replica (default 5), dipasang sebagai parameter
+ *   `connection_limit` bila URL belum menentukannya.
+ * - REPLICA_MAX_LAG_SECONDS: batas lag replikasi (default 30). Di atas batas → fallback primary.
+ * - REPLICA_LAG_CHECK_SECONDS: interval pengecekan lag (default 10).
+ *
+ * Fallback:
+ * - Replica tidak terkonfigurasi, gagal konek, pengecekan lag gagal, atau lag melewati batas
+ *   → reader() mengembalikan PrismaService (primary). Pengecekan berikutnya dapat memulihkan.
+ */
+
+export type ReadClient = PrismaClient<Prisma.PrismaClientOptions, 'query'>;
+
+@Injectable()
+export class ReadReplicaService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(ReadReplicaService.name);
+  private readonly replica?: ReadClient;
+  private readonly maxLagSeconds: number;
+  private readonly checkIntervalMs: number;
+
+  private healthy = false;
+  private lastLagSeconds: number | null = null;
+  private checkTimer?: NodeJS.Timeout;
+
+  constructor(
+    private readonly primary: PrismaService,
+    private readonly configService: ConfigService,
+    @Optional() metrics?: MetricsService,
+  ) {
+    this.maxLagSeconds = readInt(
+      this.configService,
+      'REPLICA_MAX_LAG_SECONDS',
+      30,
+    );
+    this.checkIntervalMs =
+      readInt(this.configService, 'REPLICA_LAG_CHECK_SECONDS', 10) * 1000;
+
+    const url = this.configService.get<string>('DATABASE_REPLICA_URL');
+    if (url) {
+      this.replica = new PrismaClient({
+        datasources: {
+          db: {
+            url: this.withConnectionLimit(
+              url,
+              readInt(this.configService, 'REPLICA_CONNECTION_LIMIT', 5),
+            ),
+          },
+        },
+      }) as ReadClient;
+    }
+
+    metrics?.registerGauge(
+      'db_replica_lag_seconds',
+      'Last measured replication lag of DATABASE_REPLICA_URL',
+      () => (this.lastLagSeconds === null ? [] : this.lastLagSeconds),
+    );
+    metrics?.registerGauge(
+      'db_replica_in_use',
+      '1 when read-heavy queries are routed to the replica, 0 on primary',
+      () => (this.isUsingReplica() ? 1 : 0),
+    );
+  }
+
+  async onModuleInit(): Promise<void> {
+    if (!this.replica) return;
+    try {
+      await this.replica.$connect();
+      await this.checkLag();
+    } catch (err) {
+      this.markUnhealthy(`Replica connect failed: ${String(err)}`);
+    }
+    this.checkTimer = setInterval(() => {
+      void this.checkLag();
+    }, this.checkIntervalMs);
+    this.checkTimer.unref();
+  }
+
+  async onModuleDestroy(): Promise<void> {
+    if (this.checkTimer) {
+      clearInterval(this.checkTimer);
+    }
+    await this.replica?.$disconnect();
+  }
+
+  /**
+   * reader
+   * Client untuk query baca berat: replica bila sehat, selain itu primary.
+   */
+  reader(): ReadClient {
+    return this.isUsingReplica() ? this.replica! : this.primary;
+  }
+
+  isUsingReplica(): boolean {
+    return !!this.replica && this.healthy;
+  }
+
+  // Helpers
+
+  private async checkLag(): Promise<void> {
+    if (!this.replica) return;
+    try {
+      // Replica yang sudah mengejar WAL = lag 0 walau primary sedang idle
+      const rows = await this.replica.$queryRaw<Array<{ lag: number | null }>>`
+        SELECT CASE
+          WHEN NOT pg_is_in_recovery() THEN 0
+          WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+          ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END::float8 AS lag
+      `;
+      const lag = Number(rows[0]?.lag ?? 0);
+      this.lastLagSeconds = lag;
+
+      const healthy = lag <= this.maxLagSeconds;
+      if (healthy !== this.healthy) {
+        this.logger.log(
+          healthy
+            ? `Routing report queries to replica (lag=${lag.toFixed(1)}s)`
+            : `Replica lag ${lag.toFixed(1)}s exceeds ${this.maxLagSeconds}s, falling back to primary`,
+        );
+      }
+      this.healthy = healthy;
+    } catch (err) {
+      this.markUnhealthy(`Replica lag check failed: ${String(err)}`);
+    }
+  }
+
+  private markUnhealthy(message: string): void {
+    if (this.healthy || this.lastLagSeconds === null) {
+      this.logger.warn(`${message}; falling back to primary`);
+    }
+    this.healthy = false;
+  }
+
+  private withConnectionLimit(url: string, limit: number): string {
+    try {
+      const u = new URL(url);
+      if (!u.searchParams.has('connection_limit')) {
+        u.searchParams.set('connection_limit', String(limit));
+      }
+      return u.toString();
+    } catch {
+      return url;
+    }
+  }
+}
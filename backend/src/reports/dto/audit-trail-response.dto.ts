@@ -0,0 +1,75 @@
+import {
+  compileSerializer,
+  JsonSchema,
+} from '../../common/serializers';
+
+/**
+ * Response shape of audit trail entries (GET /reports/audit-trail and
+ * /reports/audit-trail/order/:kodePesanan).
+ *
+ * AUDIT_TRAIL_SELECT is the Prisma projection used by AuditTrailService,
+ * AUDIT_TRAIL_ENTRY_SCHEMA the matching serializer schema: keep both in sync.
+ * `id` is a BIGINT and is sent as a decimal string, as before.
+ */
+export const AUDIT_TRAIL_SELECT = {
+  id: true,
+  userId: true,
+  aksi: true,
+  detail: true,
+  timestamp: true,
+  user: {
+    select: {
+      id: true,
+      nomorIndukKaryawan: true,
+      namaLengkap: true,
+      roleAccess: true,
+      departmentId: true,
+      jabatanId: true,
+    },
+  },
+} as const;
+
+const int = { type: 'integer' } as const;
+const nullableInt = { type: 'integer', nullable: true } as const;
+const str = { type: 'string' } as const;
+
+export const AUDIT_TRAIL_ENTRY_SCHEMA: JsonSchema = {
+  type: 'object',
+  properties: {
+    id: { type: 'bigint' },
+    userId: nullableInt,
+    aksi: str,
+    detail: { type: 'string', nullable: true },
+    timestamp: { type: 'date' },
+    user: {
+      type: 'object',
+      nullable: true,
+      properties: {
+        id: int,
+        nomorIndukKaryawan: str,
+        namaLengkap: str,
+        roleAccess: str,
+        departmentId: nullableInt,
+        jabatanId: nullableInt,
+      },
+    },
+  },
+};
+
+// GET /reports/audit-trail → { data, total, page, limit, totalPages }
+export const serializeAuditTrailPage = compileSerializer({
+  type: 'object',
+  properties: {
+    data: { type: 'array', items: AUDIT_TRAIL_ENTRY_SCHEMA },
+    total: int,
+    page: int,
+    limit: int,
+    totalPages: int,
+  },
+});
+
+// GET /reports/audit-trail/order/:kodePesanan → entries, oldest first
+export const serializeAuditTrailEntries = compileSerializer({
+  type: 'array',
+  items: AUDIT_TRAIL_ENTRY_SCHEMA,
+});
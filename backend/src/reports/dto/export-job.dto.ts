@@ -0,0 +1,12 @@
+export enum ExportFormat {
+  CSV = 'csv',
+  PDF = 'pdf',
+}
+
+export enum ExportReportType {
+  CONSUMPTION = 'consumption',
+  DEPARTMENT = 'department',
+  PERFORMANCE = 'performance',
+  REJECTIONS = 'rejections',
+  AUDIT_TRAIL = 'audit-trail',
+}
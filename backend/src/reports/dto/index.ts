@@ -4,6 +4,8 @@ export * from './department-report-query.dto';
 export * from './performance-report-query.dto';
 export * from './rejection-report-query.dto';
 export * from './audit-trail-query.dto';
+export * from './export-job.dto';
+export * from './audit-trail-response.dto';
 
 // Explicitly re-export enum to satisfy consumers expecting a named export
 export { ConsumptionGroupBy } from './consumption-report-query.dto';
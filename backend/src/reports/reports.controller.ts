@@ -1,26 +1,40 @@
 import {
   Controller,
   Get,
+  Post,
   Query,
   Res,
   UseGuards,
   HttpStatus,
+  HttpCode,
   Header,
   Param,
+  ParseEnumPipe,
+  ParseUUIDPipe,
 } from '@nestjs/common';
 import type { Response } from 'express';
 import { ReportsService } from './services/reports.service';
 import { ExportService } from './services/export.service';
+import {
+  ExportJob,
+  ExportJobService,
+} from './services/export-job.service';
 import { AuditTrailService } from '../common/services/audit-trail.service';
-import { Roles } from '../common/decorators';
+import { Roles, CurrentUser } from '../common/decorators';
 import { RolesGuard } from '../common/guards';
+import { SerializeWith } from '../common/serializers';
 import type { RoleAccess } from '@prisma/client';
+import type { JwtPayload } from '../common/interfaces/jwt-payload.interface';
 import {
   ConsumptionReportQueryDto,
   DepartmentReportQueryDto,
   PerformanceReportQueryDto,
   RejectionReportQueryDto,
   AuditTrailQueryDto,
+  ExportFormat,
+  ExportReportType,
+  serializeAuditTrailPage,
+  serializeAuditTrailEntries,
 } from './dto';
 
 /**
@@ -39,6 +53,7 @@ export class ReportsController {
     private readonly reportsService: ReportsService,
     private readonly exportService: ExportService,
     private readonly auditTrailService: AuditTrailService,
+    private readonly exportJobService: ExportJobService,
   ) {}
 
   /**
@@ -61,12 +76,12 @@ export class ReportsController {
       return;
     }
     if (fmt === 'pdf') {
-      const pdf = await this.exportService.exportToPDF(
+      await this.streamPdf(
+        res!,
+        'consumption_report',
         data as any[],
         'Consumption Report',
       );
-      this.setExportHeaders(res!, 'consumption_report', 'pdf');
-      res!.status(HttpStatus.OK).send(pdf);
       return;
     }
 
@@ -93,12 +108,12 @@ export class ReportsController {
       return;
     }
     if (fmt === 'pdf') {
-      const pdf = await this.exportService.exportToPDF(
+      await this.streamPdf(
+        res!,
+        'department_report',
         data as any[],
         'Department Report',
       );
-      this.setExportHeaders(res!, 'department_report', 'pdf');
-      res!.status(HttpStatus.OK).send(pdf);
       return;
     }
 
@@ -120,51 +135,7 @@ export class ReportsController {
     const fmt = (format ?? '').toLowerCase();
     if (fmt === 'csv' || fmt === 'pdf') {
       // Flatten nested breakdowns for export
-      const rows: Array<Record<string, any>> = [];
-
-      // Overall
-      rows.push({
-        section: 'overall',
-        groupType: 'overall',
-        groupId: '',
-        groupName: '',
-        count: report.overall.count,
-        avgTotalDurationMinutes: report.overall.avgTotalDurationMinutes ?? '',
-        avgProcessingTimeMinutes: report.overall.avgProcessingTimeMinutes ?? '',
-        avgPreparationTimeMinutes:
-          report.overall.avgPreparationTimeMinutes ?? '',
-        avgDeliveryTimeMinutes: report.overall.avgDeliveryTimeMinutes ?? '',
-      });
-
-      // By Department
-      for (const d of report.byDepartment) {
-        rows.push({
-          section: 'byDepartment',
-          groupType: 'department',
-          groupId: d.departmentId,
-          groupName: d.departmentName,
-          count: d.count,
-          avgTotalDurationMinutes: d.avgTotalDurationMinutes ?? '',
-          avgProcessingTimeMinutes: d.avgProcessingTimeMinutes ?? '',
-          avgPreparationTimeMinutes: d.avgPreparationTimeMinutes ?? '',
-          avgDeliveryTimeMinutes: d.avgDeliveryTimeMinutes ?? '',
-        });
-      }
-
-      // By Shift
-      for (const s of report.byShift) {
-        rows.push({
-          section: 'byShift',
-          groupType: 'shift',
-          groupId: s.shiftId,
-          groupName: s.shiftName,
-          count: s.count,
-          avgTotalDurationMinutes: s.avgTotalDurationMinutes ?? '',
-          avgProcessingTimeMinutes: s.avgProcessingTimeMinutes ?? '',
-          avgPreparationTimeMinutes: s.avgPreparationTimeMinutes ?? '',
-          avgDeliveryTimeMinutes: s.avgDeliveryTimeMinutes ?? '',
-        });
-      }
+      const rows = this.exportService.toPerformanceRows(report);
 
       if (fmt === 'csv') {
         const csv = await this.exportService.exportToCSV(rows);
@@ -173,12 +144,12 @@ export class ReportsController {
         return;
       }
 
-      const pdf = await this.exportService.exportToPDF(
+      await this.streamPdf(
+        res!,
+        'performance_report',
         rows,
         'Performance Report',
       );
-      this.setExportHeaders(res!, 'performance_report', 'pdf');
-      res!.status(HttpStatus.OK).send(pdf);
       return;
     }
 
@@ -199,24 +170,7 @@ export class ReportsController {
 
     const fmt = (format ?? '').toLowerCase();
     if (fmt === 'csv' || fmt === 'pdf') {
-      const rows = pageData.data.map((r) => ({
-        id: r.id,
-        kodePesanan: r.kodePesanan,
-        departmentId: r.departmentId,
-        departmentName: r.departmentName,
-        karyawanPemesanId: r.karyawanPemesanId,
-        shiftId: r.shiftId,
-        shiftName: r.shiftName,
-        jumlahPesanan: r.jumlahPesanan,
-        jumlahPesananAwal: r.jumlahPesananAwal ?? '',
-        statusPesanan: r.statusPesanan,
-        requiresApproval: r.requiresApproval,
-        approvalStatus: r.approvalStatus ?? '',
-        catatanDapur: r.catatanDapur ?? '',
-        catatanAdmin: r.catatanAdmin ?? '',
-        waktuDibuat: r.waktuDibuat ? new Date(r.waktuDibuat).toISOString() : '',
-        requestType: r.requestType,
-      }));
+      const rows = this.exportService.toRejectionRows(pageData.data);
 
       if (fmt === 'csv') {
         const csv = await this.exportService.exportToCSV(rows);
@@ -225,12 +179,12 @@ export class ReportsController {
         return;
       }
 
-      const pdf = await this.exportService.exportToPDF(
+      await this.streamPdf(
+        res!,
+        'rejections_report',
         rows,
         'Rejections Report',
       );
-      this.setExportHeaders(res!, 'rejections_report', 'pdf');
-      res!.status(HttpStatus.OK).send(pdf);
       return;
     }
 
@@ -242,6 +196,7 @@ export class ReportsController {
    * Query audit logs with filters. Supports CSV/PDF export.
    */
   @Get('audit-trail')
+  @SerializeWith(serializeAuditTrailPage)
   async getAuditTrail(
     @Query() queryDto: AuditTrailQueryDto,
     @Query('format') format?: string,
@@ -251,18 +206,7 @@ export class ReportsController {
 
     const fmt = (format ?? '').toLowerCase();
     if (fmt === 'csv' || fmt === 'pdf') {
-      const rows = (result.data ?? []).map((log: any) => ({
-        id: log.id,
-        timestamp: log.timestamp ? new Date(log.timestamp).toISOString() : '',
-        aksi: log.aksi,
-        detail: log.detail ?? '',
-        user_id: log.user?.id ?? '',
-        user_nik: log.user?.nomorIndukKaryawan ?? '',
-        user_nama: log.user?.namaLengkap ?? '',
-        user_role: log.user?.roleAccess ?? '',
-        user_departmentId: log.user?.departmentId ?? '',
-        user_jabatanId: log.user?.jabatanId ?? '',
-      }));
+      const rows = this.exportService.toAuditTrailRows(result.data ?? []);
 
       if (fmt === 'csv') {
         const csv = await this.exportService.exportToCSV(rows);
@@ -271,9 +215,7 @@ export class ReportsController {
         return;
       }
 
-      const pdf = await this.exportService.exportToPDF(rows, 'Audit Trail');
-      this.setExportHeaders(res!, 'audit_trail', 'pdf');
-      res!.status(HttpStatus.OK).send(pdf);
+      await this.streamPdf(res!, 'audit_trail', rows, 'Audit Trail');
       return;
     }
 
@@ -285,6 +227,7 @@ export class ReportsController {
    * Get chronological history of an order by its code
    */
   @Get('audit-trail/order/:kodePesanan')
+  @SerializeWith(serializeAuditTrailEntries)
   async getAuditTrailByOrder(
     @Param('kodePesanan') kodePesanan: string,
   ): Promise<any[]> {
@@ -300,6 +243,160 @@ export class ReportsController {
     return this.auditTrailService.getActionTypes();
   }
 
+  /**
+   * POST /api/reports/exports/consumption/:format
+   * Queue a background export (all rows of the filtered range); returns the job (202)
+   */
+  @Post('exports/consumption/:format')
+  @HttpCode(HttpStatus.ACCEPTED)
+  async exportConsumptionReport(
+    @Param('format', new ParseEnumPipe(ExportFormat)) format: ExportFormat,
+    @Query() queryDto: ConsumptionReportQueryDto,
+    @CurrentUser() user: JwtPayload,
+  ): Promise<ExportJob> {
+    return this.exportJobService.submit(
+      ExportReportType.CONSUMPTION,
+      format,
+      queryDto,
+      user.karyawanId,
+    );
+  }
+
+  /**
+   * POST /api/reports/exports/department/:format
+   */
+  @Post('exports/department/:format')
+  @HttpCode(HttpStatus.ACCEPTED)
+  async exportDepartmentReport(
+    @Param('format', new ParseEnumPipe(ExportFormat)) format: ExportFormat,
+    @Query() queryDto: DepartmentReportQueryDto,
+    @CurrentUser() user: JwtPayload,
+  ): Promise<ExportJob> {
+    return this.exportJobService.submit(
+      ExportReportType.DEPARTMENT,
+      format,
+      queryDto,
+      user.karyawanId,
+    );
+  }
+
+  /**
+   * POST /api/reports/exports/performance/:format
+   */
+  @Post('exports/performance/:format')
+  @HttpCode(HttpStatus.ACCEPTED)
+  async exportPerformanceReport(
+    @Param('format', new ParseEnumPipe(ExportFormat)) format: ExportFormat,
+    @Query() queryDto: PerformanceReportQueryDto,
+    @CurrentUser() user: JwtPayload,
+  ): Promise<ExportJob> {
+    return this.exportJobService.submit(
+      ExportReportType.PERFORMANCE,
+      format,
+      queryDto,
+      user.karyawanId,
+    );
+  }
+
+  /**
+   * POST /api/reports/exports/rejections/:format
+   * Exports every page of the filtered range (page/limit are ignored)
+   */
+  @Post('exports/rejections/:format')
+  @HttpCode(HttpStatus.ACCEPTED)
+  async exportRejectionReport(
+    @Param('format', new ParseEnumPipe(ExportFormat)) format: ExportFormat,
+    @Query() queryDto: RejectionReportQueryDto,
+    @CurrentUser() user: JwtPayload,
+  ): Promise<ExportJob> {
+    return this.exportJobService.submit(
+      ExportReportType.REJECTIONS,
+      format,
+      queryDto,
+      user.karyawanId,
+    );
+  }
+
+  /**
+   * POST /api/reports/exports/audit-trail/:format
+   * Exports every page of the filtered logs (page/limit are ignored)
+   */
+  @Post('exports/audit-trail/:format')
+  @HttpCode(HttpStatus.ACCEPTED)
+  async exportAuditTrail(
+    @Param('format', new ParseEnumPipe(ExportFormat)) format: ExportFormat,
+    @Query() queryDto: AuditTrailQueryDto,
+    @CurrentUser() user: JwtPayload,
+  ): Promise<ExportJob> {
+    return this.exportJobService.submit(
+      ExportReportType.AUDIT_TRAIL,
+      format,
+      queryDto,
+      user.karyawanId,
+    );
+  }
+
+  /**
+   * GET /api/reports/exports
+   * Export jobs of the current user, newest first
+   */
+  @Get('exports')
+  async listExportJobs(@CurrentUser() user: JwtPayload): Promise<ExportJob[]> {
+    return this.exportJobService.list(user.karyawanId);
+  }
+
+  /**
+   * GET /api/reports/exports/:id
+   * Status and progress of one export job
+   */
+  @Get('exports/:id')
+  async getExportJob(
+    @Param('id', ParseUUIDPipe) id: string,
+    @CurrentUser() user: JwtPayload,
+  ): Promise<ExportJob> {
+    return this.exportJobService.get(id, user.karyawanId);
+  }
+
+  /**
+   * GET /api/reports/exports/:id/download
+   * Streams the finished file; 409 while running, 410 after EXPORT_TTL_MINUTES
+   */
+  @Get('exports/:id/download')
+  async downloadExport(
+    @Param('id', ParseUUIDPipe) id: string,
+    @CurrentUser() user: JwtPayload,
+    @Res() res: Response,
+  ): Promise<void> {
+    const file = await this.exportJobService.resolveDownload(
+      id,
+      user.karyawanId,
+    );
+    const baseName = file.fileName.replace(/\.\w+$/, '');
+    this.setExportHeaders(res, baseName, file.format);
+    res.sendFile(file.path);
+  }
+
+  /**
+   * Helper: stream a PDF table into the response page by page
+   * - headers are sent with the first page; a failure afterwards can only abort
+   *   the connection, so the client sees a truncated download instead of JSON
+   */
+  private async streamPdf(
+    res: Response,
+    filename: string,
+    rows: Array<Record<string, any>>,
+    title: string,
+  ): Promise<void> {
+    this.setExportHeaders(res, filename, 'pdf');
+    res.status(HttpStatus.OK);
+    try {
+      await this.exportService.exportToPDF(rows, title, res);
+      res.end();
+    } catch (err) {
+      res.destroy(err as Error);
+    }
+  }
+
   /**
    * Helper: set response headers for export downloads
    */
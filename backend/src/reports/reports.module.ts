@@ -1,7 +1,10 @@
 import { Module } from '@nestjs/common';
+import { OrdersModule } from '../orders/orders.module';
 import { ReportsController } from './reports.controller';
 import { ReportsService } from './services/reports.service';
 import { ExportService } from './services/export.service';
+import { ReportCacheService } from './services/report-cache.service';
+import { ExportJobService } from './services/export-job.service';
 
 /**
  * ReportsModule
@@ -9,11 +12,19 @@ import { ExportService } from './services/export.service';
  * Mendaftarkan ReportsController beserta providers ReportsService dan ExportService.
  * AuditTrailService disediakan oleh CommonModule secara global (lihat CommonModule di AppModule),
  * sehingga tidak perlu dideklarasikan ulang di sini.
+ * ReportCacheService menyimpan hasil laporan untuk rentang hari yang sudah lewat.
+ * ExportJobService menjalankan export CSV/PDF di background (antrean + worker terbatas).
+ * OrdersModule diimpor untuk OrderArchiveService (apakah rentang laporan perlu membaca tabel arsip).
  */
 @Module({
-  imports: [],
+  imports: [OrdersModule],
   controllers: [ReportsController],
-  providers: [ReportsService, ExportService],
+  providers: [
+    ReportsService,
+    ExportService,
+    ReportCacheService,
+    ExportJobService,
+  ],
   exports: [ReportsService, ExportService],
 })
 export class ReportsModule {}
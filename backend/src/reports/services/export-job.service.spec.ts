@@ -0,0 +1,241 @@
+import {
+  ConflictException,
+  GoneException,
+  NotFoundException,
+  ServiceUnavailableException,
+} from '@nestjs/common';
+import type { ConfigService } from '@nestjs/config';
+import type { EventEmitter2 } from '@nestjs/event-emitter';
+import { promises as fs } from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import type { AuditTrailService } from '../../common/services/audit-trail.service';
+import { ExportFormat, ExportReportType } from '../dto';
+import { ExportService } from './export.service';
+import { ExportJobService, ExportJob } from './export-job.service';
+import type { ReportsService } from './reports.service';
+
+const ADMIN = 1;
+const range = { tanggalMulai: '2025-01-01', tanggalAkhir: '2025-01-31' };
+
+let dir: string;
+
+beforeEach(async () => {
+  dir = await fs.mkdtemp(path.join(os.tmpdir(), 'export-job-spec-'));
+});
+
+afterEach(async () => {
+  jest.restoreAllMocks();
+  await fs.rm(dir, { recursive: true, force: true });
+});
+
+function setup(config: Record<string, string> = {}) {
+  const reportsService = {
+    getConsumptionReport: jest.fn().mockResolvedValue([
+      { tanggal: '2025-01-01', totalPesanan: 3 },
+      { tanggal: '2025-01-02', totalPesanan: 5 },
+    ]),
+  };
+  const auditTrailService = { iterateAuditTrail: jest.fn() };
+  const emitted: ExportJob[] = [];
+  const eventEmitter = {
+    emit: jest.fn((_event: string, job: ExportJob) => emitted.push(job)),
+  };
+  const values: Record<string, string> = { EXPORT_DIR: dir, ...config };
+  const service = new ExportJobService(
+    reportsService as unknown as ReportsService,
+    new ExportService(),
+    auditTrailService as unknown as AuditTrailService,
+    { get: (key: string) => values[key] } as unknown as ConfigService,
+    eventEmitter as unknown as EventEmitter2,
+  );
+  return { service, reportsService, auditTrailService, emitted };
+}
+
+async function settle(
+  service: ExportJobService,
+  id: string,
+): Promise<ExportJob> {
+  for (let i = 0; i < 200; i++) {
+    const job = await service.get(id, ADMIN);
+    if (job.status === 'completed' || job.status === 'failed') return job;
+    await new Promise((resolve) => setTimeout(resolve, 5));
+  }
+  throw new Error(`Export job ${id} did not finish`);
+}
+
+describe('ExportJobService', () => {
+  it('moves a job through queued, running and completed and writes the file', async () => {
+    const { service, emitted } = setup();
+
+    const submitted = await service.submit(
+      ExportReportType.CONSUMPTION,
+      ExportFormat.CSV,
+      range,
+      ADMIN,
+    );
+    expect(submitted).toMatchObject({ progress: 0, rowsWritten: 0 });
+
+    const job = await settle(service, submitted.id);
+    expect(job).toMatchObject({
+      status: 'completed',
+      progress: 100,
+      rowsWritten: 2,
+      fileName: 'consumption_report.csv',
+      error: null,
+    });
+    expect(job.expiresAt).not.toBeNull();
+    expect(emitted.map((j) => j.status)).toEqual([
+      'queued',
+      'running',
+      'running',
+      'completed',
+    ]);
+    expect(emitted[2].progress).toBe(99);
+
+    const download = await service.resolveDownload(job.id, ADMIN);
+    const csv = await fs.readFile(download.path, 'utf8');
+    expect(csv.trim().split('\n')).toEqual([
+      '"tanggal","totalPesanan"',
+      '"2025-01-01",3',
+      '"2025-01-02",5',
+    ]);
+    expect(job.size).toBe(Buffer.byteLength(csv));
+    expect(await fs.readdir(dir)).not.toContain(`${job.id}.csv.part`);
+  });
+
+  it('marks a job failed, keeps the error and removes the partial file', async () => {
+    const { service, reportsService } = setup();
+    reportsService.getConsumptionReport.mockRejectedValueOnce(
+      new Error('replica unavailable'),
+    );
+
+    const { id } = await service.submit(
+      ExportReportType.CONSUMPTION,
+      ExportFormat.CSV,
+      range,
+      ADMIN,
+    );
+    const job = await settle(service, id);
+
+    expect(job).toMatchObject({
+      status: 'failed',
+      error: 'replica unavailable',
+    });
+    expect(await fs.readdir(dir)).toEqual([`${id}.json`]);
+    await expect(service.resolveDownload(id, ADMIN)).rejects.toThrow(
+      ConflictException,
+    );
+  });
+
+  it('rejects submissions beyond the queue limit with 503', async () => {
+    const { service, reportsService } = setup({
+      EXPORT_WORKERS: '1',
+      EXPORT_QUEUE_LIMIT: '1',
+    });
+    // Keep the only worker busy
+    reportsService.getConsumptionReport.mockReturnValue(
+      new Promise(() => undefined),
+    );
+    const submit = () =>
+      service.submit(
+        ExportReportType.CONSUMPTION,
+        ExportFormat.CSV,
+        range,
+        ADMIN,
+      );
+
+    const running = await submit();
+    const queued = await submit();
+
+    await expect(submit()).rejects.toThrow(ServiceUnavailableException);
+    expect((await service.get(running.id, ADMIN)).status).toBe('running');
+    expect((await service.get(queued.id, ADMIN)).status).toBe('queued');
+  });
+
+  it('serves status, listing and downloads from the sidecar on another instance', async () => {
+    const { service } = setup();
+    const { id } = await service.submit(
+      ExportReportType.CONSUMPTION,
+      ExportFormat.CSV,
+      range,
+      ADMIN,
+    );
+    await settle(service, id);
+
+    // Same EXPORT_DIR, empty in-memory job map
+    const other = setup().service;
+
+    expect(await other.get(id, ADMIN)).toMatchObject({
+      id,
+      status: 'completed',
+    });
+    expect((await other.list(ADMIN)).map((j) => j.id)).toEqual([id]);
+    expect(await other.list(ADMIN + 1)).toEqual([]);
+    await expect(other.get(id, ADMIN + 1)).rejects.toThrow(NotFoundException);
+    await expect(other.resolveDownload(id, ADMIN)).resolves.toMatchObject({
+      fileName: 'consumption_report.csv',
+    });
+  });
+
+  it('answers 410 once the file has expired or is gone', async () => {
+    const { service } = setup({ EXPORT_TTL_MINUTES: '1' });
+    const { id } = await service.submit(
+      ExportReportType.CONSUMPTION,
+      ExportFormat.CSV,
+      range,
+      ADMIN,
+    );
+    const job = await settle(service, id);
+
+    const afterTtl = Date.parse(job.expiresAt!) + 1;
+    jest.spyOn(Date, 'now').mockReturnValue(afterTtl);
+    await expect(service.resolveDownload(id, ADMIN)).rejects.toThrow(
+      GoneException,
+    );
+
+    jest.restoreAllMocks();
+    await fs.unlink(path.join(dir, `${id}.csv`));
+    await expect(service.resolveDownload(id, ADMIN)).rejects.toThrow(
+      GoneException,
+    );
+  });
+
+  it('exports the audit trail from keyset batches with the job batch size', async () => {
+    const { service, auditTrailService } = setup({ EXPORT_BATCH_SIZE: '2' });
+    // Numeric ids: the BigInt toJSON patch lives in main.ts
+    const log = (id: number) => ({
+      id,
+      userId: null,
+      aksi: 'LOGIN_SUCCESS',
+      detail: null,
+      timestamp: new Date(Date.UTC(2025, 0, 1, 8, id)),
+      user: null,
+    });
+    auditTrailService.iterateAuditTrail.mockImplementation(async function* () {
+      yield { data: [log(3), log(2)], total: 3 };
+      yield { data: [log(1)], total: 3 };
+    });
+
+    const { id } = await service.submit(
+      ExportReportType.AUDIT_TRAIL,
+      ExportFormat.CSV,
+      { aksi: 'LOGIN_SUCCESS' },
+      ADMIN,
+    );
+    const job = await settle(service, id);
+
+    expect(auditTrailService.iterateAuditTrail).toHaveBeenCalledWith(
+      { aksi: 'LOGIN_SUCCESS' },
+      2,
+    );
+    expect(job).toMatchObject({ status: 'completed', rowsWritten: 3 });
+    const csv = await fs.readFile(path.join(dir, `${id}.csv`), 'utf8');
+    const ids = csv
+      .trim()
+      .split('\n')
+      .slice(1)
+      .map((line) => line.split(',')[0]);
+    expect(ids).toEqual(['3', '2', '1']);
+  });
+});
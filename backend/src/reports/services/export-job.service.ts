@@ -0,0 +1,501 @@
+import {
+  BadRequestException,
+  ConflictException,
+  GoneException,
+  Injectable,
+  Logger,
+  NotFoundException,
+  OnModuleDestroy,
+  OnModuleInit,
+  Optional,
+  ServiceUnavailableException,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { EventEmitter2 } from '@nestjs/event-emitter';
+import { randomUUID } from 'crypto';
+import { createWriteStream, promises as fs } from 'fs';
+import type { WriteStream } from 'fs';
+import { once } from 'events';
+import { finished } from 'stream/promises';
+import * as os from 'os';
+import * as path from 'path';
+import { ReportsService } from './reports.service';
+import { ExportService } from './export.service';
+import { AuditTrailService } from '../../common/services/audit-trail.service';
+import { MetricsService } from '../../metrics/metrics.service';
+import {
+  AuditTrailQueryDto,
+  ConsumptionReportQueryDto,
+  DepartmentReportQueryDto,
+  ExportFormat,
+  ExportReportType,
+  PerformanceReportQueryDto,
+  RejectionReportQueryDto,
+} from '../dto';
+import { readInt } from '../../common/utils';
+
+/**
+ * ExportJobService
+ *
+ * Background CSV/PDF exports so a large range never holds an HTTP request open.
+ *
+ * - submit() queues the job (parameters already validated by the route DTO) and
+ *   returns at once.
+ * - At most EXPORT_WORKERS jobs run per instance; up to EXPORT_QUEUE_LIMIT wait behind
+ *   them (beyond that → 503).
+ * - Paginated reports (rejections, audit trail) are read EXPORT_BATCH_SIZE rows at a time
+ *   and each batch is appended to a file in EXPORT_DIR, so memory stays flat.
+ * - Rejections bypass ReportCacheService and use keyset batches (ReportsService
+ *   .iterateRejections), so an export neither floods the report cache nor shifts when
+ *   requests arrive mid-export. Audit trail exports use the same scheme
+ *   (AuditTrailService.iterateAuditTrail), bounded by the newest entry at job start.
+ * - Every state/progress change is written to a `<id>.json` sidecar next to the file
+ *   and emitted as 'export.job.updated' (pushed by NotificationsGateway to the requester).
+ * - Finished files are downloadable for EXPORT_TTL_MINUTES, then removed by the sweep.
+ *
+ * Cluster note:
+ * - PM2 instances on one host share EXPORT_DIR, so status and download requests served by
+ *   another instance read the sidecar. Websocket progress is emitted by the instance
+ *   running the job; clients on another instance fall back to GET /reports/exports/:id.
+ */
+
+export type ExportJobStatus = 'queued' | 'running' | 'completed' | 'failed';
+
+export type ExportJob = {
+  id: string;
+  report: ExportReportType;
+  format: ExportFormat;
+  status: ExportJobStatus;
+  progress: number;
+  rowsWritten: number;
+  requestedBy: number;
+  fileName: string;
+  size: number | null;
+  error: string | null;
+  createdAt: string;
+  startedAt: string | null;
+  finishedAt: string | null;
+  expiresAt: string | null;
+  updatedAt: string;
+};
+
+type ExportParams =
+  | ConsumptionReportQueryDto
+  | DepartmentReportQueryDto
+  | PerformanceReportQueryDto
+  | RejectionReportQueryDto
+  | AuditTrailQueryDto;
+
+type QueuedJob = { job: ExportJob; params: ExportParams };
+
+type RowBatch = { rows: Array<Record<string, any>>; total: number };
+
+const FILE_NAMES: Record<ExportReportType, string> = {
+  [ExportReportType.CONSUMPTION]: 'consumption_report',
+  [ExportReportType.DEPARTMENT]: 'department_report',
+  [ExportReportType.PERFORMANCE]: 'performance_report',
+  [ExportReportType.REJECTIONS]: 'rejections_report',
+  [ExportReportType.AUDIT_TRAIL]: 'audit_trail',
+};
+
+const PDF_TITLES: Record<ExportReportType, string> = {
+  [ExportReportType.CONSUMPTION]: 'Consumption Report',
+  [ExportReportType.DEPARTMENT]: 'Department Report',
+  [ExportReportType.PERFORMANCE]: 'Performance Report',
+  [ExportReportType.REJECTIONS]: 'Rejections Report',
+  [ExportReportType.AUDIT_TRAIL]: 'Audit Trail',
+};
+
+const SWEEP_INTERVAL_MS = 5 * 60 * 1000;
+// Running/queued jobs without a sidecar update for this long belong to a dead process
+const STALE_JOB_MS = 30 * 60 * 1000;
+
+@Injectable()
+export class ExportJobService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(ExportJobService.name);
+  private readonly dir: string;
+  private readonly workers: number;
+  private readonly queueLimit: number;
+  private readonly ttlMs: number;
+  private readonly batchSize: number;
+
+  private readonly jobs = new Map<string, ExportJob>();
+  private readonly queue: QueuedJob[] = [];
+  private active = 0;
+  private sweepTimer?: NodeJS.Timeout;
+
+  constructor(
+    private readonly reportsService: ReportsService,
+    private readonly exportService: ExportService,
+    private readonly auditTrailService: AuditTrailService,
+    private readonly configService: ConfigService,
+    private readonly eventEmitter: EventEmitter2,
+    @Optional() metrics?: MetricsService,
+  ) {
+    this.dir = path.resolve(
+      this.configService.get<string>('EXPORT_DIR') ||
+        path.join(os.tmpdir(), 'bebang-pack-meal-exports'),
+    );
+    this.workers = readInt(this.configService, 'EXPORT_WORKERS', 2);
+    this.queueLimit = readInt(this.configService, 'EXPORT_QUEUE_LIMIT', 20);
+    this.ttlMs =
+      readInt(this.configService, 'EXPORT_TTL_MINUTES', 60) * 60 * 1000;
+    this.batchSize = readInt(this.configService, 'EXPORT_BATCH_SIZE', 500);
+
+    metrics?.registerGauge(
+      'export_jobs',
+      'Export jobs on this instance by state',
+      () => [
+        { labels: { state: 'queued' }, value: this.queue.length },
+        { labels: { state: 'running' }, value: this.active },
+      ],
+    );
+  }
+
+  async onModuleInit(): Promise<void> {
+    await fs.mkdir(this.dir, { recursive: true });
+    this.sweepTimer = setInterval(() => {
+      void this.sweep().catch((err) =>
+        this.logger.error(`Export sweep failed: ${String(err)}`),
+      );
+    }, SWEEP_INTERVAL_MS);
+    this.sweepTimer.unref();
+  }
+
+  onModuleDestroy(): void {
+    if (this.sweepTimer) clearInterval(this.sweepTimer);
+  }
+
+  /**
+   * submit
+   * Queue an export and return the job (status 'queued') immediately.
+   */
+  async submit(
+    report: ExportReportType,
+    format: ExportFormat,
+    params: ExportParams,
+    karyawanId: number,
+  ): Promise<ExportJob> {
+    if (this.queue.length >= this.queueLimit) {
+      throw new ServiceUnavailableException(
+        'Export queue is full, please try again later',
+      );
+    }
+
+    const now = new Date().toISOString();
+    const job: ExportJob = {
+      id: randomUUID(),
+      report,
+      format,
+      status: 'queued',
+      progress: 0,
+      rowsWritten: 0,
+      requestedBy: karyawanId,
+      fileName:
+        FILE_NAMES[report] + this.exportService.getFileExtension(format),
+      size: null,
+      error: null,
+      createdAt: now,
+      startedAt: null,
+      finishedAt: null,
+      expiresAt: null,
+      updatedAt: now,
+    };
+    this.jobs.set(job.id, job);
+    await this.update(job);
+
+    this.queue.push({ job, params });
+    this.pump();
+    return { ...job };
+  }
+
+  /**
+   * get
+   * Job of the requester, from memory or from the sidecar written by another instance.
+   */
+  async get(id: string, karyawanId: number): Promise<ExportJob> {
+    const job = this.jobs.get(id) ?? (await this.readSidecar(id));
+    if (!job || job.requestedBy !== karyawanId) {
+      throw new NotFoundException('Export job not found');
+    }
+    return { ...job };
+  }
+
+  /**
+   * list
+   * Jobs of the requester on this host that have not been swept yet, newest first.
+   */
+  async list(karyawanId: number): Promise<ExportJob[]> {
+    const ids = new Set(this.jobs.keys());
+    for (const name of await fs.readdir(this.dir)) {
+      if (name.endsWith('.json')) ids.add(name.slice(0, -'.json'.length));
+    }
+
+    const jobs: ExportJob[] = [];
+    for (const id of ids) {
+      const job = this.jobs.get(id) ?? (await this.readSidecar(id));
+      if (job && job.requestedBy === karyawanId) jobs.push({ ...job });
+    }
+    return jobs.sort((a, b) => b.createdAt.localeCompare(a.createdAt));
+  }
+
+  /**
+   * resolveDownload
+   * Path of a finished, unexpired export file for the requester.
+   */
+  async resolveDownload(
+    id: string,
+    karyawanId: number,
+  ): Promise<{ path: string; fileName: string; format: ExportFormat }> {
+    const job = await this.get(id, karyawanId);
+    if (job.status !== 'completed') {
+      throw new ConflictException(`Export job is ${job.status}`);
+    }
+    const filePath = this.filePath(job.id, job.format);
+    const expired = !job.expiresAt || Date.parse(job.expiresAt) <= Date.now();
+    if (expired || !(await this.exists(filePath))) {
+      throw new GoneException('Export file has expired');
+    }
+    return { path: filePath, fileName: job.fileName, format: job.format };
+  }
+
+  // Worker pool
+
+  private pump(): void {
+    while (this.active < this.workers && this.queue.length > 0) {
+      const next = this.queue.shift()!;
+      this.active += 1;
+      void this.run(next)
+        .catch((err) =>
+          this.logger.error(`Export job ${next.job.id} failed: ${String(err)}`),
+        )
+        .finally(() => {
+          this.active -= 1;
+          this.pump();
+        });
+    }
+  }
+
+  private async run({ job, params }: QueuedJob): Promise<void> {
+    job.status = 'running';
+    job.startedAt = new Date().toISOString();
+    await this.update(job);
+
+    const target = this.filePath(job.id, job.format);
+    const partial = `${target}.part`;
+    const stream = createWriteStream(partial);
+    // Surfaced through once('drain') / finished(); keeps the process alive on disk errors
+    stream.on('error', () => undefined);
+
+    try {
+      if (job.format === ExportFormat.CSV) {
+        await this.writeCsv(job, params, stream);
+      } else {
+        await this.writePdf(job, params, stream);
+      }
+      stream.end();
+      await finished(stream);
+      await fs.rename(partial, target);
+
+      const finishedAt = new Date();
+      job.status = 'completed';
+      job.progress = 100;
+      job.size = (await fs.stat(target)).size;
+      job.finishedAt = finishedAt.toISOString();
+      job.expiresAt = new Date(finishedAt.getTime() + this.ttlMs).toISOString();
+    } catch (err: any) {
+      // Wait for the fd to close so a still-opening stream cannot recreate the file
+      stream.destroy();
+      await finished(stream).catch(() => undefined);
+      await fs.unlink(partial).catch(() => undefined);
+
+      const finishedAt = new Date();
+      job.status = 'failed';
+      job.error = err?.message ?? String(err);
+      job.finishedAt = finishedAt.toISOString();
+      job.expiresAt = new Date(finishedAt.getTime() + this.ttlMs).toISOString();
+      this.logger.warn(`Export job ${job.id} failed: ${job.error}`);
+    }
+    await this.update(job);
+  }
+
+  private async writeCsv(
+    job: ExportJob,
+    params: ExportParams,
+    stream: WriteStream,
+  ): Promise<void> {
+    let fields: string[] | null = null;
+    for await (const batch of this.batches(job.report, params)) {
+      if (batch.rows.length > 0) {
+        const header = fields === null;
+        fields ??= Object.keys(batch.rows[0]);
+        const chunk = this.exportService.formatCSVBatch(
+          batch.rows,
+          fields,
+          header,
+        );
+        if (!stream.write(chunk)) await once(stream, 'drain');
+      }
+      await this.advance(job, batch);
+    }
+    if (fields === null) {
+      throw new BadRequestException('No data provided for CSV export');
+    }
+  }
+
+  private async writePdf(
+    job: ExportJob,
+    params: ExportParams,
+    stream: WriteStream,
+  ): Promise<void> {
+    // Pages are written as batches arrive; only the page being filled is in memory
+    await this.exportService.exportToPDF(
+      this.trackedRows(job, params),
+      PDF_TITLES[job.report],
+      stream,
+    );
+  }
+
+  /**
+   * Row batches that advance job progress once the consumer has taken each batch.
+   */
+  private async *trackedRows(
+    job: ExportJob,
+    params: ExportParams,
+  ): AsyncGenerator<Array<Record<string, any>>> {
+    for await (const batch of this.batches(job.report, params)) {
+      yield batch.rows;
+      await this.advance(job, batch);
+    }
+  }
+
+  /**
+   * Row batches of a report. Aggregated reports are one batch; paginated ones are
+   * read batch by batch with the caller's filters.
+   */
+  private async *batches(
+    report: ExportReportType,
+    params: ExportParams,
+  ): AsyncGenerator<RowBatch> {
+    switch (report) {
+      case ExportReportType.CONSUMPTION: {
+        const rows = await this.reportsService.getConsumptionReport(
+          params as ConsumptionReportQueryDto,
+        );
+        yield { rows, total: rows.length };
+        return;
+      }
+      case ExportReportType.DEPARTMENT: {
+        const rows = await this.reportsService.getDepartmentReport(
+          params as DepartmentReportQueryDto,
+        );
+        yield { rows, total: rows.length };
+        return;
+      }
+      case ExportReportType.PERFORMANCE: {
+        const report = await this.reportsService.getPerformanceReport(
+          params as PerformanceReportQueryDto,
+        );
+        const rows = this.exportService.toPerformanceRows(report);
+        yield { rows, total: rows.length };
+        return;
+      }
+      case ExportReportType.REJECTIONS: {
+        // Uncached keyset batches: pages are single-use and must not shift
+        for await (const batch of this.reportsService.iterateRejections(
+          params as RejectionReportQueryDto,
+          this.batchSize,
+        )) {
+          const rows = this.exportService.toRejectionRows(batch.data);
+          yield { rows, total: batch.total };
+        }
+        return;
+      }
+      case ExportReportType.AUDIT_TRAIL: {
+        // Keyset batches bounded by the newest entry when the job starts
+        for await (const batch of this.auditTrailService.iterateAuditTrail(
+          params as AuditTrailQueryDto,
+          this.batchSize,
+        )) {
+          const rows = this.exportService.toAuditTrailRows(batch.data);
+          yield { rows, total: batch.total };
+        }
+        return;
+      }
+    }
+  }
+
+  private async advance(job: ExportJob, batch: RowBatch): Promise<void> {
+    job.rowsWritten += batch.rows.length;
+    // 100 is reserved for the finished file
+    const progress =
+      batch.total > 0
+        ? Math.min(99, Math.floor((job.rowsWritten / batch.total) * 100))
+        : 99;
+    if (progress !== job.progress) {
+      job.progress = progress;
+      await this.update(job);
+    }
+  }
+
+  // Sidecar & sweep
+
+  private async update(job: ExportJob): Promise<void> {
+    job.updatedAt = new Date().toISOString();
+    const sidecar = this.sidecarPath(job.id);
+    // Write-then-rename so readers on other instances never see a partial file
+    await fs.writeFile(`${sidecar}.tmp`, JSON.stringify(job));
+    await fs.rename(`${sidecar}.tmp`, sidecar);
+    this.eventEmitter.emit('export.job.updated', { ...job });
+  }
+
+  private async sweep(): Promise<void> {
+    const now = Date.now();
+    for (const name of await fs.readdir(this.dir)) {
+      if (!name.endsWith('.json')) continue;
+      const id = name.slice(0, -'.json'.length);
+      const job = this.jobs.get(id) ?? (await this.readSidecar(id));
+      if (!job) continue;
+
+      const expired = job.expiresAt
+        ? Date.parse(job.expiresAt) <= now
+        : !this.jobs.has(id) && Date.parse(job.updatedAt) + STALE_JOB_MS <= now;
+      if (!expired) continue;
+
+      this.jobs.delete(id);
+      const file = this.filePath(id, job.format);
+      for (const p of [file, `${file}.part`, this.sidecarPath(id)]) {
+        await fs.unlink(p).catch(() => undefined);
+      }
+      this.logger.debug(`Removed export job ${id} (${job.status})`);
+    }
+  }
+
+  private async readSidecar(id: string): Promise<ExportJob | null> {
+    try {
+      return JSON.parse(
+        await fs.readFile(this.sidecarPath(id), 'utf8'),
+      ) as ExportJob;
+    } catch {
+      return null;
+    }
+  }
+
+  private async exists(filePath: string): Promise<boolean> {
+    try {
+      await fs.access(filePath);
+      return true;
+    } catch {
+      return false;
+    }
+  }
+
+  private filePath(id: string, format: ExportFormat): string {
+    const ext = this.exportService.getFileExtension(format);
+    return path.join(this.dir, `${id}${ext}`);
+  }
+
+  private sidecarPath(id: string): string {
+    return path.join(this.dir, `${id}.json`);
+  }
+}
@@ -1,5 +1,11 @@
 import { Injectable, BadRequestException } from '@nestjs/common';
 import { Parser } from 'json2csv';
+import type { Writable } from 'stream';
+import { PdfTableWriter } from './pdf-table-writer';
+import type {
+  PerformanceReportResult,
+  RejectionItem,
+} from './reports.service';
 
 @Injectable()
 export class ExportService {
@@ -31,16 +37,140 @@ export class ExportService {
   }
 
   /**
-   * Stub for PDF export.
-   * Logs a warning and returns a mock Buffer.
-   * TODO: Implement real PDF export using pdfkit or puppeteer in the future.
+   * Format one batch of rows for a CSV written incrementally (export jobs).
+   * - fields fixed by the first batch so every batch lines up with the header
+   * - header only for the first batch; each batch ends with a newline
    */
-  async exportToPDF<T>(data: T[], title: string): Promise<Buffer> {
-    // TODO: Implement real PDF export using pdfkit atau puppeteer/Playwright untuk generate dari HTML template
-    // Stub implementation for now:
-    // eslint-disable-next-line no-console
-    console.warn('PDF export not yet implemented');
-    return Buffer.from('PDF export coming soon');
+  formatCSVBatch<T>(data: T[], fields: string[], header: boolean): string {
+    if (data.length === 0) return '';
+    try {
+      const parser = new Parser({ fields, header });
+      return `${parser.parse(data as any[])}\n`;
+    } catch (error: any) {
+      throw new BadRequestException(
+        `Failed to export CSV: ${error?.message ?? 'Unknown error'}`,
+      );
+    }
+  }
+
+  /**
+   * Flatten the performance report (overall + breakdowns) into export rows.
+   */
+  toPerformanceRows(
+    report: PerformanceReportResult,
+  ): Array<Record<string, any>> {
+    const rows: Array<Record<string, any>> = [];
+
+    // Overall
+    rows.push({
+      section: 'overall',
+      groupType: 'overall',
+      groupId: '',
+      groupName: '',
+      count: report.overall.count,
+      avgTotalDurationMinutes: report.overall.avgTotalDurationMinutes ?? '',
+      avgProcessingTimeMinutes: report.overall.avgProcessingTimeMinutes ?? '',
+      avgPreparationTimeMinutes: report.overall.avgPreparationTimeMinutes ?? '',
+      avgDeliveryTimeMinutes: report.overall.avgDeliveryTimeMinutes ?? '',
+    });
+
+    // By Department
+    for (const d of report.byDepartment) {
+      rows.push({
+        section: 'byDepartment',
+        groupType: 'department',
+        groupId: d.departmentId,
+        groupName: d.departmentName,
+        count: d.count,
+        avgTotalDurationMinutes: d.avgTotalDurationMinutes ?? '',
+        avgProcessingTimeMinutes: d.avgProcessingTimeMinutes ?? '',
+        avgPreparationTimeMinutes: d.avgPreparationTimeMinutes ?? '',
+        avgDeliveryTimeMinutes: d.avgDeliveryTimeMinutes ?? '',
+      });
+    }
+
+    // By Shift
+    for (const s of report.byShift) {
+      rows.push({
+        section: 'byShift',
+        groupType: 'shift',
+        groupId: s.shiftId,
+        groupName: s.shiftName,
+        count: s.count,
+        avgTotalDurationMinutes: s.avgTotalDurationMinutes ?? '',
+        avgProcessingTimeMinutes: s.avgProcessingTimeMinutes ?? '',
+        avgPreparationTimeMinutes: s.avgPreparationTimeMinutes ?? '',
+        avgDeliveryTimeMinutes: s.avgDeliveryTimeMinutes ?? '',
+      });
+    }
+
+    return rows;
+  }
+
+  /**
+   * Map rejection/edit request items to export rows.
+   */
+  toRejectionRows(items: RejectionItem[]): Array<Record<string, any>> {
+    return items.map((r) => ({
+      id: r.id,
+      kodePesanan: r.kodePesanan,
+      departmentId: r.departmentId,
+      departmentName: r.departmentName,
+      karyawanPemesanId: r.karyawanPemesanId,
+      shiftId: r.shiftId,
+      shiftName: r.shiftName,
+      jumlahPesanan: r.jumlahPesanan,
+      jumlahPesananAwal: r.jumlahPesananAwal ?? '',
+      statusPesanan: r.statusPesanan,
+      requiresApproval: r.requiresApproval,
+      approvalStatus: r.approvalStatus ?? '',
+      catatanDapur: r.catatanDapur ?? '',
+      catatanAdmin: r.catatanAdmin ?? '',
+      waktuDibuat: r.waktuDibuat ? new Date(r.waktuDibuat).toISOString() : '',
+      requestType: r.requestType,
+    }));
+  }
+
+  /**
+   * Map audit trail logs (with user relation) to export rows.
+   */
+  toAuditTrailRows(logs: any[]): Array<Record<string, any>> {
+    return logs.map((log: any) => ({
+      id: log.id,
+      timestamp: log.timestamp ? new Date(log.timestamp).toISOString() : '',
+      aksi: log.aksi,
+      detail: log.detail ?? '',
+      user_id: log.user?.id ?? '',
+      user_nik: log.user?.nomorIndukKaryawan ?? '',
+      user_nama: log.user?.namaLengkap ?? '',
+      user_role: log.user?.roleAccess ?? '',
+      user_departmentId: log.user?.departmentId ?? '',
+      user_jabatanId: log.user?.jabatanId ?? '',
+    }));
+  }
+
+  /**
+   * Render rows as a paginated PDF table written page by page to `out`.
+   * - rows: one array, or an async iterable of row batches (export jobs)
+   * - only the page being filled is kept in memory; `out` is not ended here
+   * - columns come from the first row, header repeated on every page
+   */
+  async exportToPDF(
+    rows:
+      | Array<Record<string, any>>
+      | AsyncIterable<Array<Record<string, any>>>,
+    title: string,
+    out: Writable,
+  ): Promise<void> {
+    const writer = new PdfTableWriter(out, title);
+    if (Array.isArray(rows)) {
+      await writer.writeRows(rows);
+    } else {
+      for await (const batch of rows) {
+        await writer.writeRows(batch);
+      }
+    }
+    await writer.end();
   }
 
   /**
@@ -0,0 +1,133 @@
+import { PassThrough } from 'stream';
+import { inflateSync } from 'zlib';
+import { PdfTableWriter } from './pdf-table-writer';
+
+type Row = Record<string, unknown>;
+
+async function render(batches: Row[][], title = 'Report'): Promise<Buffer> {
+  const out = new PassThrough();
+  const chunks: Buffer[] = [];
+  out.on('data', (chunk: Buffer) => chunks.push(chunk));
+
+  const writer = new PdfTableWriter(out, title);
+  for (const batch of batches) {
+    await writer.writeRows(batch);
+  }
+  await writer.end();
+  return Buffer.concat(chunks);
+}
+
+// Decompressed content streams, one per page, in file order
+function pageContents(pdf: Buffer): string[] {
+  const text = pdf.toString('latin1');
+  const re = /<< \/Length (\d+) \/Filter \/FlateDecode >>\nstream\n/g;
+  const pages: string[] = [];
+  let m: RegExpExecArray | null;
+  while ((m = re.exec(text)) !== null) {
+    const start = m.index + m[0].length;
+    const data = pdf.subarray(start, start + Number(m[1]));
+    pages.push(inflateSync(data).toString('latin1'));
+  }
+  return pages;
+}
+
+function pageCount(pdf: Buffer): number {
+  const tree = /\/Type \/Pages \/Kids \[[^\]]*\] \/Count (\d+)/;
+  return Number(tree.exec(pdf.toString('latin1'))![1]);
+}
+
+const rows = (from: number, count: number): Row[] =>
+  Array.from({ length: count }, (_, i) => ({
+    kode: `K-${from + i}`,
+    nama: 'Budi',
+    jumlah: from + i,
+  }));
+
+describe('PdfTableWriter', () => {
+  it('writes an xref whose offsets all point at their objects', async () => {
+    const pdf = await render([rows(1, 30), rows(31, 25), rows(56, 30)]);
+    const text = pdf.toString('latin1');
+
+    expect(text.startsWith('%PDF-1.4\n')).toBe(true);
+    expect(text.endsWith('%%EOF\n')).toBe(true);
+    const xrefOffset = Number(/startxref\n(\d+)\n%%EOF\n$/.exec(text)![1]);
+    const xref = /^xref\n0 (\d+)\n/.exec(text.slice(xrefOffset));
+    expect(xref).not.toBeNull();
+
+    const size = Number(xref![1]);
+    const entries = text
+      .slice(xrefOffset + xref![0].length)
+      .split('\n')
+      .slice(0, size);
+    expect(entries[0]).toBe('0000000000 65535 f ');
+    for (let n = 1; n < size; n++) {
+      const offset = Number(entries[n].slice(0, 10));
+      expect(text.slice(offset, offset + `${n} 0 obj\n`.length)).toBe(
+        `${n} 0 obj\n`,
+      );
+    }
+    expect(text).toContain(`/Size ${size} /Root 1 0 R`);
+  });
+
+  it('counts every page across batches and repeats the header on each', async () => {
+    // 85 rows in uneven batches, 40 rows per page
+    const pdf = await render([rows(1, 30), rows(31, 25), rows(56, 30)]);
+    const pages = pageContents(pdf);
+
+    expect(pageCount(pdf)).toBe(3);
+    expect(pages).toHaveLength(3);
+    pages.forEach((content, i) => {
+      for (const column of ['kode', 'nama', 'jumlah']) {
+        expect(content).toMatch(
+          new RegExp(`/F2 [\\d.]+ Tf [\\d.]+ [\\d.]+ Td \\(${column}\\) Tj`),
+        );
+      }
+      expect(content).toContain(`(Page ${i + 1}) Tj`);
+    });
+
+    const written = pages.flatMap((content) =>
+      Array.from(content.matchAll(/\((K-\d+)\) Tj/g), (m) => m[1]),
+    );
+    expect(written).toEqual(rows(1, 85).map((r) => r.kode));
+    expect(pages.map((c) => c.match(/\(K-\d+\) Tj/g)!.length)).toEqual([
+      40, 40, 5,
+    ]);
+  });
+
+  it('escapes PDF string delimiters and replaces text WinAnsi cannot show', async () => {
+    const pdf = await render(
+      [[{ nama: 'a(b)c\\d', kota: 'José', catatan: 'Ōsaka 日本\nbaris' }]],
+      'Laporan (Q1)',
+    );
+    const [content] = pageContents(pdf);
+
+    expect(content).toContain('(a\\(b\\)c\\\\d) Tj');
+    expect(content).toContain('(Jos\xe9) Tj');
+    expect(content).toContain('(?saka ?? baris) Tj');
+    expect(content).toContain('(Laporan \\(Q1\\)) Tj');
+    expect(pdf.toString('latin1')).toContain('/Title (Laporan \\(Q1\\))');
+  });
+
+  it('writes a single "no data" page when there are no rows', async () => {
+    const pdf = await render([[], []]);
+    const pages = pageContents(pdf);
+
+    expect(pageCount(pdf)).toBe(1);
+    expect(pages).toHaveLength(1);
+    expect(pages[0]).toContain('(No data for the selected filters) Tj');
+  });
+
+  it('rejects when the stream is closed mid-write', async () => {
+    // Nobody reads, so the writer soon waits for 'drain'
+    const out = new PassThrough({ highWaterMark: 16 });
+    const writer = new PdfTableWriter(out, 'Report');
+
+    const pending = writer.writeRows(rows(1, 100));
+    await new Promise((resolve) => setImmediate(resolve));
+    expect(out.writableNeedDrain).toBe(true);
+    out.destroy();
+
+    await expect(pending).rejects.toThrow('PDF output stream closed');
+    await expect(writer.end()).rejects.toThrow('PDF output stream closed');
+  });
+});
@@ -0,0 +1,411 @@
+import type { Writable } from 'stream';
+import { deflateSync } from 'zlib';
+
+/**
+ * PdfTableWriter
+ *
+ * Minimal PDF 1.4 writer for tabular reports, written page by page to a stream.
+ *
+ * - A4 landscape, standard Helvetica / Helvetica-Bold (no font embedding), WinAnsi text.
+ * - Only the page being filled is held in memory. Finished pages are deflated and
+ *   written immediately; the page tree and xref table are written by end(), which
+ *   only needs byte offsets and page object numbers.
+ * - Column widths come from the header and the first batch of rows; cells that do
+ *   not fit are truncated with "...". The header row repeats on every page.
+ * - Honours backpressure: writes wait for 'drain' and fail if the stream closes.
+ */
+
+type Row = Record<string, unknown>;
+
+const PAGE_WIDTH = 842;
+const PAGE_HEIGHT = 595;
+const MARGIN = 28;
+const TITLE_SIZE = 12;
+const FONT_SIZE = 7.5;
+const MIN_FONT_SIZE = 5.5;
+const ROW_HEIGHT = 12;
+const CELL_PADDING = 3;
+const MIN_COLUMN_WIDTH = 20;
+const MAX_COLUMN_WIDTH = 180;
+const WIDTH_SAMPLE_ROWS = 200;
+
+const TABLE_TOP = PAGE_HEIGHT - MARGIN - 30;
+const TABLE_BOTTOM = MARGIN + 16;
+const ROWS_PER_PAGE = Math.floor((TABLE_TOP - TABLE_BOTTOM) / ROW_HEIGHT) - 1;
+
+// Fixed object numbers; pages and their content streams follow from 5
+const CATALOG_OBJ = 1;
+const PAGES_OBJ = 2;
+const FONT_REGULAR_OBJ = 3;
+const FONT_BOLD_OBJ = 4;
+
+// Advance widths (1/1000 em) of ASCII 32..126 from the standard Helvetica AFM files
+const HELVETICA_WIDTHS = [
+  278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278,
+  278, 556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584,
+  584, 556, 1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556,
+  833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278,
+  278, 278, 469, 556, 333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222,
+  500, 222, 833, 556, 556, 556, 556, 333, 500, 278, 556, 500, 722, 500, 500,
+  500, 334, 260, 334, 584,
+];
+const HELVETICA_BOLD_WIDTHS = [
+  278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278,
+  278, 556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584,
+  584, 611, 975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611,
+  833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333,
+  278, 333, 584, 556, 333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278,
+  556, 278, 889, 611, 611, 611, 611, 389, 556, 333, 611, 556, 778, 556, 556,
+  500, 389, 280, 389, 584,
+];
+// Latin-1 letters outside ASCII are close to the average lowercase width
+const DEFAULT_WIDTH = 556;
+
+export class PdfTableWriter {
+  private offset = 0;
+  private readonly objectOffsets: number[] = [];
+  private readonly pageObjects: number[] = [];
+  private nextObject = FONT_BOLD_OBJ + 1;
+
+  private columns: string[] | null = null;
+  private widths: number[] = [];
+  private fontSize = FONT_SIZE;
+  private pageOps: string[] = [];
+  private rowsOnPage = 0;
+  private started = false;
+  private readonly createdAt = new Date();
+
+  constructor(
+    private readonly out: Writable,
+    private readonly title: string,
+  ) {}
+
+  /**
+   * Append a batch of rows. The first non-empty batch fixes columns and widths.
+   */
+  async writeRows(rows: Row[]): Promise<void> {
+    await this.start();
+    if (rows.length === 0) return;
+    if (!this.columns) this.layoutColumns(rows);
+
+    for (const row of rows) {
+      if (this.rowsOnPage === ROWS_PER_PAGE) await this.flushPage();
+      if (this.rowsOnPage === 0) this.beginPage();
+      this.drawRow(
+        this.columns!.map((c) => this.cellText(row[c])),
+        this.rowsOnPage + 1,
+        false,
+      );
+      this.rowsOnPage += 1;
+    }
+  }
+
+  /**
+   * Write the last page, page tree, info, xref and trailer. Does not end the stream.
+   */
+  async end(): Promise<void> {
+    await this.start();
+    if (this.rowsOnPage > 0) {
+      await this.flushPage();
+    } else if (this.pageObjects.length === 0) {
+      this.beginPage(false);
+      this.text('No data for the selected filters', MARGIN, TABLE_TOP - 14, {
+        size: 9,
+      });
+      await this.flushPage();
+    }
+
+    const kids = this.pageObjects.map((n) => `${n} 0 R`).join(' ');
+    await this.writeObject(
+      PAGES_OBJ,
+      `<< /Type /Pages /Kids [${kids}] /Count ${this.pageObjects.length} >>`,
+    );
+
+    const infoObj = this.nextObject++;
+    await this.writeObject(
+      infoObj,
+      `<< /Title (${this.escape(this.title)})` +
+        ' /Producer (Bebang Pack Meal Portal)' +
+        ` /CreationDate (D:${this.pdfDate(this.createdAt)}) >>`,
+    );
+
+    const xrefOffset = this.offset;
+    const entries = ['0000000000 65535 f \n'];
+    for (let n = 1; n < this.nextObject; n++) {
+      const offset = String(this.objectOffsets[n]).padStart(10, '0');
+      entries.push(`${offset} 00000 n \n`);
+    }
+    await this.write(
+      `xref\n0 ${this.nextObject}\n${entries.join('')}` +
+        `trailer\n<< /Size ${this.nextObject} /Root ${CATALOG_OBJ} 0 R` +
+        ` /Info ${infoObj} 0 R >>\nstartxref\n${xrefOffset}\n%%EOF\n`,
+    );
+  }
+
+  // Document structure
+
+  private async start(): Promise<void> {
+    if (this.started) return;
+    this.started = true;
+    // Binary comment marks the file as binary for transfer tools
+    await this.write(
+      Buffer.concat([
+        Buffer.from('%PDF-1.4\n%', 'latin1'),
+        Buffer.from([0xe2, 0xe3, 0xcf, 0xd3, 0x0a]),
+      ]),
+    );
+    await this.writeObject(
+      CATALOG_OBJ,
+      `<< /Type /Catalog /Pages ${PAGES_OBJ} 0 R >>`,
+    );
+    await this.writeObject(FONT_REGULAR_OBJ, this.fontDict('Helvetica'));
+    await this.writeObject(FONT_BOLD_OBJ, this.fontDict('Helvetica-Bold'));
+  }
+
+  private beginPage(withHeader = true): void {
+    this.pageOps = [];
+    const pageNo = this.pageObjects.length + 1;
+    this.text(this.title, MARGIN, PAGE_HEIGHT - MARGIN - TITLE_SIZE, {
+      size: TITLE_SIZE,
+      bold: true,
+    });
+    this.text(
+      `Generated ${this.createdAt.toISOString()}`,
+      MARGIN,
+      PAGE_HEIGHT - MARGIN - TITLE_SIZE - 12,
+      { size: 7 },
+    );
+    const footer = `Page ${pageNo}`;
+    this.text(
+      footer,
+      PAGE_WIDTH - MARGIN - this.measure(footer, 7, false),
+      MARGIN,
+      { size: 7 },
+    );
+    if (withHeader && this.columns) {
+      this.drawRow(this.columns, 0, true);
+    }
+  }
+
+  private async flushPage(): Promise<void> {
+    const content = deflateSync(Buffer.from(this.pageOps.join('\n'), 'latin1'));
+    const contentObj = this.nextObject++;
+    const pageObj = this.nextObject++;
+
+    await this.writeObject(
+      contentObj,
+      Buffer.concat([
+        Buffer.from(
+          `<< /Length ${content.length} /Filter /FlateDecode >>\nstream\n`,
+          'latin1',
+        ),
+        content,
+        Buffer.from('\nendstream', 'latin1'),
+      ]),
+    );
+    await this.writeObject(
+      pageObj,
+      `<< /Type /Page /Parent ${PAGES_OBJ} 0 R` +
+        ` /MediaBox [0 0 ${PAGE_WIDTH} ${PAGE_HEIGHT}]` +
+        ` /Resources << /Font << /F1 ${FONT_REGULAR_OBJ} 0 R` +
+        ` /F2 ${FONT_BOLD_OBJ} 0 R >> >> /Contents ${contentObj} 0 R >>`,
+    );
+    this.pageObjects.push(pageObj);
+    this.pageOps = [];
+    this.rowsOnPage = 0;
+  }
+
+  private fontDict(baseFont: string): string {
+    return (
+      `<< /Type /Font /Subtype /Type1 /BaseFont /${baseFont}` +
+      ' /Encoding /WinAnsiEncoding >>'
+    );
+  }
+
+  // Table layout
+
+  private layoutColumns(sample: Row[]): void {
+    const columns = Object.keys(sample[0]);
+    const rows = sample.slice(0, WIDTH_SAMPLE_ROWS);
+    const available = PAGE_WIDTH - MARGIN * 2;
+    const sum = (values: number[]) => values.reduce((a, b) => a + b, 0);
+    const clamp = (w: number) =>
+      Math.min(MAX_COLUMN_WIDTH, Math.max(MIN_COLUMN_WIDTH, w));
+    const pad = CELL_PADDING * 2;
+
+    // Wide tables get a smaller font (in 0.25pt steps) so the headers still fit
+    const headerWidths = (size: number) =>
+      columns.map((c) => clamp(this.measure(c, size, true) + pad));
+    this.fontSize = FONT_SIZE;
+    while (
+      this.fontSize > MIN_FONT_SIZE &&
+      sum(headerWidths(this.fontSize)) > available
+    ) {
+      this.fontSize -= 0.25;
+    }
+
+    const headers = headerWidths(this.fontSize);
+    const natural = columns.map((c, i) => {
+      let width = 0;
+      for (const row of rows) {
+        width = Math.max(
+          width,
+          this.measure(this.cellText(row[c]), this.fontSize, false),
+        );
+      }
+      return Math.max(headers[i], clamp(width + pad));
+    });
+
+    // Still too wide: shrink content beyond the header width first, and scale
+    // everything only when the headers alone do not fit
+    const excess = sum(natural) - available;
+    const shrinkable = sum(natural) - sum(headers);
+    this.columns = columns;
+    if (excess <= 0) {
+      this.widths = natural;
+    } else if (shrinkable >= excess) {
+      this.widths = natural.map(
+        (w, i) => w - ((w - headers[i]) * excess) / shrinkable,
+      );
+    } else {
+      this.widths = headers.map((w) => (w * available) / sum(headers));
+    }
+  }
+
+  private drawRow(cells: string[], index: number, header: boolean): void {
+    const y = TABLE_TOP - index * ROW_HEIGHT;
+    const width = this.widths.reduce((a, b) => a + b, 0);
+    // Header band and zebra striping
+    if (header || index % 2 === 0) {
+      this.pageOps.push(
+        `${header ? '0.85' : '0.95'} g ${MARGIN} ${y - 3} ${width.toFixed(2)}` +
+          ` ${ROW_HEIGHT} re f 0 g`,
+      );
+    }
+
+    let x = MARGIN;
+    cells.forEach((cell, i) => {
+      const fit = this.fitText(cell, this.widths[i] - CELL_PADDING * 2, header);
+      if (fit) {
+        this.text(fit, x + CELL_PADDING, y, {
+          size: this.fontSize,
+          bold: header,
+        });
+      }
+      x += this.widths[i];
+    });
+  }
+
+  private fitText(value: string, maxWidth: number, bold: boolean): string {
+    // Small tolerance: columns sized to their header are an exact fit
+    if (this.measure(value, this.fontSize, bold) <= maxWidth + 0.01) {
+      return value;
+    }
+    const ellipsis = '...';
+    const room = maxWidth - this.measure(ellipsis, this.fontSize, bold);
+    let width = 0;
+    let end = 0;
+    while (end < value.length) {
+      const w =
+        (this.charWidth(value.charCodeAt(end), bold) * this.fontSize) / 1000;
+      if (width + w > room) break;
+      width += w;
+      end += 1;
+    }
+    return end > 0 ? value.slice(0, end) + ellipsis : '';
+  }
+
+  private cellText(value: unknown): string {
+    if (value === null || value === undefined) return '';
+    if (value instanceof Date) return value.toISOString();
+    // Single line per cell; characters outside Latin-1 cannot be shown by WinAnsi
+    return String(value)
+      .replace(/[\r\n\t]+/g, ' ')
+      .replace(/[^\x20-\x7e\xa0-\xff]/g, '?');
+  }
+
+  // Drawing primitives
+
+  private text(
+    value: string,
+    x: number,
+    y: number,
+    opts: { size: number; bold?: boolean },
+  ): void {
+    const font = opts.bold ? 'F2' : 'F1';
+    this.pageOps.push(
+      `BT /${font} ${opts.size} Tf ${x.toFixed(2)} ${y.toFixed(2)} Td` +
+        ` (${this.escape(value)}) Tj ET`,
+    );
+  }
+
+  private measure(value: string, size: number, bold: boolean): number {
+    let units = 0;
+    for (let i = 0; i < value.length; i++) {
+      units += this.charWidth(value.charCodeAt(i), bold);
+    }
+    return (units * size) / 1000;
+  }
+
+  private charWidth(code: number, bold: boolean): number {
+    const table = bold ? HELVETICA_BOLD_WIDTHS : HELVETICA_WIDTHS;
+    return code >= 32 && code <= 126 ? table[code - 32] : DEFAULT_WIDTH;
+  }
+
+  private escape(value: string): string {
+    return this.cellText(value).replace(/[\\()]/g, (c) => `\\${c}`);
+  }
+
+  private pdfDate(d: Date): string {
+    return d
+      .toISOString()
+      .replace(/[-:T]/g, '')
+      .replace(/\.\d+Z$/, 'Z');
+  }
+
+  // Output
+
+  private async writeObject(num: number, body: string | Buffer): Promise<void> {
+    this.objectOffsets[num] = this.offset;
+    await this.write(
+      Buffer.concat([
+        Buffer.from(`${num} 0 obj\n`, 'latin1'),
+        typeof body === 'string' ? Buffer.from(body, 'latin1') : body,
+        Buffer.from('\nendobj\n', 'latin1'),
+      ]),
+    );
+  }
+
+  private async write(chunk: string | Buffer): Promise<void> {
+    const buf =
+      typeof chunk === 'string' ? Buffer.from(chunk, 'latin1') : chunk;
+    if (this.out.destroyed) {
+      throw new Error('PDF output stream closed');
+    }
+    this.offset += buf.length;
+    if (this.out.write(buf)) return;
+
+    await new Promise<void>((resolve, reject) => {
+      const cleanup = () => {
+        this.out.off('drain', onDrain);
+        this.out.off('close', onClose);
+        this.out.off('error', onError);
+      };
+      const onDrain = () => {
+        cleanup();
+        resolve();
+      };
+      const onClose = () => {
+        cleanup();
+        reject(new Error('PDF output stream closed'));
+      };
+      const onError = (err: Error) => {
+        cleanup();
+        reject(err);
+      };
+      this.out.on('drain', onDrain);
+      this.out.on('close', onClose);
+      this.out.on('error', onError);
+    });
+  }
+}
@@ -0,0 +1,382 @@
+import {
+  Injectable,
+  Logger,
+  OnApplicationBootstrap,
+  OnModuleDestroy,
+  Optional,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { OnEvent } from '@nestjs/event-emitter';
+import { Prisma } from '@prisma/client';
+import {
+  ReadClient,
+  ReadReplicaService,
+} from '../../prisma/read-replica.service';
+import { MetricsService } from '../../metrics/metrics.service';
+import { readInt } from '../../common/utils';
+
+/**
+ * ReportCacheService
+ *
+ * Result cache for report ranges made only of closed days (every day before today).
+ * Orders of past days almost never change, so those results are kept for
+ * REPORT_CACHE_TTL_SECONDS (default 24h) and ReportsService only recomputes the open
+ * part of a range (today and later) before merging.
+ *
+ * - Keyed by report type, filters and the closed date range.
+ * - Each report type ranges over one date basis: tanggalPesanan (consumption,
+ *   department) or a timestamp (performance: waktuDibuat/waktuSelesai, rejections:
+ *   requestedAt). Invalidation drops entries whose range contains an affected day.
+ * - Affected days are read from orders whose change_version moved (see
+ *   GET /orders/changes), every REPORT_CACHE_SYNC_SECONDS and shortly after local order
+ *   events. Deleted orders (tombstones) clear the whole cache.
+ * - The change poll uses the same client as the reports (replica or primary), so an
+ *   entry is only dropped once the change is visible to the recompute. Switching
+ *   between replica and primary clears the cache.
+ *
+ * Cluster note:
+ * - Each instance keeps its own cache and polls change_version itself, so writes handled
+ *   by other instances invalidate within one sync interval.
+ */
+
+export type ReportType =
+  | 'consumption'
+  | 'department'
+  | 'performance'
+  | 'rejections';
+
+type RangeBasis = 'tanggal' | 'timestamp';
+
+const RANGE_BASIS: Record<ReportType, RangeBasis> = {
+  consumption: 'tanggal',
+  department: 'tanggal',
+  performance: 'timestamp',
+  rejections: 'timestamp',
+};
+
+type CacheEntry = {
+  type: ReportType;
+  from: string;
+  to: string;
+  value: unknown;
+  expiresAt: number;
+};
+
+type Computation = {
+  type: ReportType;
+  from: string;
+  to: string;
+  promise: Promise<unknown>;
+  // Set when an invalidation hits the range while computing: result is not stored
+  stale: boolean;
+};
+
+type ChangedRow = {
+  id: number;
+  change_version: number;
+  deleted: boolean;
+  settled: boolean;
+  tanggal_pesanan: Date | null;
+  waktu_dibuat: Date | null;
+  waktu_selesai: Date | null;
+};
+
+const SYNC_BATCH_SIZE = 1000;
+const EVENT_SYNC_DELAY_MS = 500;
+
+@Injectable()
+export class ReportCacheService
+  implements OnApplicationBootstrap, OnModuleDestroy
+{
+  private readonly logger = new Logger(ReportCacheService.name);
+  private readonly ttlMs: number;
+  private readonly maxEntries: number;
+  private readonly syncIntervalMs: number;
+
+  // Map order doubles as LRU order: hits are moved to the end
+  private readonly entries = new Map<string, CacheEntry>();
+  private readonly inflight = new Map<string, Computation>();
+
+  private source?: ReadClient;
+  private since = 0;
+  private syncing: Promise<void> | null = null;
+  private syncTimer?: NodeJS.Timeout;
+  private eventSyncTimer?: NodeJS.Timeout;
+
+  constructor(
+    private readonly readReplica: ReadReplicaService,
+    private readonly configService: ConfigService,
+    @Optional() private readonly metrics?: MetricsService,
+  ) {
+    this.ttlMs =
+      readInt(this.configService, 'REPORT_CACHE_TTL_SECONDS', 86400) * 1000;
+    this.maxEntries = readInt(
+      this.configService,
+      'REPORT_CACHE_MAX_ENTRIES',
+      200,
+    );
+    this.syncIntervalMs =
+      readInt(this.configService, 'REPORT_CACHE_SYNC_SECONDS', 15) * 1000;
+
+    metrics?.registerGauge(
+      'report_cache_entries',
+      'Closed-day report results held in memory',
+      () => this.entries.size,
+    );
+  }
+
+  async onApplicationBootstrap(): Promise<void> {
+    try {
+      await this.sync();
+    } catch (err) {
+      this.logger.error(`Initial report cache sync failed: ${String(err)}`);
+    }
+    this.syncTimer = setInterval(() => {
+      void this.sync().catch((err) =>
+        this.logger.error(`Report cache sync failed: ${String(err)}`),
+      );
+    }, this.syncIntervalMs);
+    this.syncTimer.unref();
+  }
+
+  onModuleDestroy(): void {
+    if (this.syncTimer) clearInterval(this.syncTimer);
+    if (this.eventSyncTimer) clearTimeout(this.eventSyncTimer);
+  }
+
+  /**
+   * getOrCompute
+   * Cached result for a range of closed days [from, to] (local day starts).
+   * Concurrent misses for the same key share one computation.
+   */
+  async getOrCompute<T>(
+    type: ReportType,
+    params: Record<string, unknown>,
+    from: Date,
+    to: Date,
+    compute: () => Promise<T>,
+  ): Promise<T> {
+    const basis = RANGE_BASIS[type];
+    const range = {
+      from: this.dayKey(from, basis),
+      to: this.dayKey(to, basis),
+    };
+    const key = JSON.stringify([type, range.from, range.to, params]);
+
+    const cached = this.entries.get(key);
+    if (cached && cached.expiresAt > Date.now()) {
+      this.entries.delete(key);
+      this.entries.set(key, cached);
+      this.metrics?.increment(
+        'report_cache_requests_total',
+        { report: type, result: 'hit' },
+        1,
+        'Report cache lookups by report type and result',
+      );
+      return cached.value as T;
+    }
+    this.metrics?.increment(
+      'report_cache_requests_total',
+      { report: type, result: 'miss' },
+      1,
+      'Report cache lookups by report type and result',
+    );
+
+    const pending = this.inflight.get(key);
+    if (pending) return pending.promise as Promise<T>;
+
+    const computation: Computation = {
+      type,
+      ...range,
+      promise: Promise.resolve(),
+      stale: false,
+    };
+    const promise = compute()
+      .then((value) => {
+        if (!computation.stale) {
+          this.store(key, { type, ...range, value, expiresAt: 0 });
+        }
+        return value;
+      })
+      .finally(() => {
+        this.inflight.delete(key);
+      });
+    computation.promise = promise;
+    this.inflight.set(key, computation);
+    return promise;
+  }
+
+  @OnEvent('order.created')
+  @OnEvent('order.status.changed')
+  @OnEvent('order.approval.requested')
+  @OnEvent('order.approval.decided')
+  @OnEvent('orders.materialized')
+  handleOrderChanged(): void {
+    // Local writes are picked up by the next poll; this only shortens the wait
+    if (this.eventSyncTimer) return;
+    this.eventSyncTimer = setTimeout(() => {
+      this.eventSyncTimer = undefined;
+      void this.sync().catch((err) =>
+        this.logger.error(`Report cache sync failed: ${String(err)}`),
+      );
+    }, EVENT_SYNC_DELAY_MS);
+    this.eventSyncTimer.unref();
+  }
+
+  // Helpers
+
+  private store(key: string, entry: CacheEntry): void {
+    entry.expiresAt = Date.now() + this.ttlMs;
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value as string;
+      this.entries.delete(oldest);
+    }
+  }
+
+  private sync(): Promise<void> {
+    // Timer and event nudges share one poll
+    if (!this.syncing) {
+      this.syncing = this.pollChanges().finally(() => {
+        this.syncing = null;
+      });
+    }
+    return this.syncing;
+  }
+
+  private async pollChanges(): Promise<void> {
+    const db = this.readReplica.reader();
+    if (db !== this.source) {
+      // Replica and primary may be at different points: start over on the new source
+      const rows = await db.$queryRaw<Array<{ version: number | null }>>`
+        SELECT GREATEST(
+          (SELECT MAX(change_version) FROM transaction_pesanan),
+          (SELECT MAX(change_version) FROM transaction_pesanan_tombstone)
+        ) AS version
+      `;
+      this.source = db;
+      this.since = Number(rows[0]?.version ?? 0);
+      this.clear();
+      return;
+    }
+
+    for (;;) {
+      const rows = await db.$queryRaw<ChangedRow[]>(Prisma.sql`
+        WITH horizon AS (
+          SELECT ((pg_snapshot_xmin(pg_current_snapshot())::text::bigint
+                   % 4294967296)::text)::xid AS xmin
+        )
+        SELECT c.id, c.change_version, c.deleted,
+               age(c.writer) > age(h.xmin) AS settled,
+               c.tanggal_pesanan, c.waktu_dibuat, c.waktu_selesai
+        FROM (
+          (SELECT id, change_version, false AS deleted, xmin AS writer,
+                  tanggal_pesanan, waktu_dibuat, waktu_selesai
+           FROM transaction_pesanan
+           WHERE change_version > ${this.since}
+           ORDER BY change_version
+           LIMIT ${SYNC_BATCH_SIZE})
+          UNION ALL
+          (SELECT pesanan_id, change_version, true, xmin, NULL, NULL, NULL
+           FROM transaction_pesanan_tombstone
+           WHERE change_version > ${this.since}
+           ORDER BY change_version
+           LIMIT ${SYNC_BATCH_SIZE})
+        ) c
+        CROSS JOIN horizon h
+        ORDER BY c.change_version
+        LIMIT ${SYNC_BATCH_SIZE}
+      `);
+      if (rows.length === 0) return;
+
+      if (rows.some((row) => row.deleted)) {
+        this.clear();
+      } else {
+        await this.invalidateRows(db, rows);
+      }
+
+      // Same holdback as GET /orders/changes: a version is passed only once no older
+      // transaction can still commit below it. Unsettled rows are seen again.
+      const before = this.since;
+      for (const row of rows) {
+        if (!row.settled) break;
+        this.since = row.change_version;
+      }
+      if (rows.length < SYNC_BATCH_SIZE || this.since === before) return;
+    }
+  }
+
+  private async invalidateRows(
+    db: ReadClient,
+    rows: ChangedRow[],
+  ): Promise<void> {
+    const tanggal = new Set<string>();
+    const timestamp = new Set<string>();
+    for (const row of rows) {
+      if (row.tanggal_pesanan) {
+        tanggal.add(this.dayKey(row.tanggal_pesanan, 'tanggal'));
+      }
+      for (const value of [row.waktu_dibuat, row.waktu_selesai]) {
+        if (value) timestamp.add(this.localDayKey(value));
+      }
+    }
+
+    // Approval decisions change rejection-report rows dated by requestedAt
+    const requests = await db.permintaanPersetujuan.findMany({
+      where: { pesananId: { in: rows.map((row) => row.id) } },
+      select: { requestedAt: true },
+    });
+    for (const request of requests) {
+      timestamp.add(this.localDayKey(request.requestedAt));
+    }
+
+    const days: Record<RangeBasis, string[]> = {
+      tanggal: Array.from(tanggal),
+      timestamp: Array.from(timestamp),
+    };
+    const affected = (range: { type: ReportType; from: string; to: string }) =>
+      days[RANGE_BASIS[range.type]].some(
+        (day) => day >= range.from && day <= range.to,
+      );
+
+    let removed = 0;
+    for (const [key, entry] of this.entries) {
+      if (affected(entry)) {
+        this.entries.delete(key);
+        removed += 1;
+      }
+    }
+    for (const computation of this.inflight.values()) {
+      if (affected(computation)) computation.stale = true;
+    }
+    if (removed > 0) {
+      this.logger.debug(`Invalidated ${removed} cached report result(s)`);
+    }
+  }
+
+  private clear(): void {
+    this.entries.clear();
+    for (const computation of this.inflight.values()) {
+      computation.stale = true;
+    }
+  }
+
+  /**
+   * Day key of a range boundary or stored value.
+   * - tanggal: DATE column; ReportsService sends local midnight, which the column stores
+   *   as its UTC date, and values read back are UTC midnight of that date.
+   * - timestamp: local calendar day, matching getDateRange boundaries.
+   */
+  private dayKey(date: Date, basis: RangeBasis): string {
+    if (basis === 'timestamp') return this.localDayKey(date);
+    return date.toISOString().slice(0, 10);
+  }
+
+  private localDayKey(date: Date): string {
+    const yyyy = date.getFullYear();
+    const mm = (date.getMonth() + 1).toString().padStart(2, '0');
+    const dd = date.getDate().toString().padStart(2, '0');
+    return `${yyyy}-${mm}-${dd}`;
+  }
+}
@@ -0,0 +1,159 @@
+import type { ReadReplicaService } from '../../prisma/read-replica.service';
+import type { OrderArchiveService } from '../../orders/order-archive.service';
+import type { ReportCacheService } from './report-cache.service';
+import { inMemoryTable } from '../../common/testing/in-memory-table';
+import { ReportsService } from './reports.service';
+
+type Row = Record<string, unknown> & { id: number };
+
+const day = (d: number, minute = 0) => new Date(2025, 0, d, 8, minute);
+
+function request(id: number, requestedAt: Date): Row {
+  return {
+    id,
+    requestedAt,
+    approvalStatus: 'APPROVED',
+    requestType: 'EDIT',
+    jumlahPesananAwal: 1,
+    jumlahPesananBaru: 2,
+    catatanDapur: null,
+    catatanAdmin: null,
+    requestedById: 1,
+    decidedAt: null,
+    pesanan: {
+      id: 1000 + id,
+      kodePesanan: `PM-${id}`,
+      departmentPemesanId: 1,
+      karyawanPemesanId: 1,
+      shiftId: 1,
+      jumlahPesanan: 1,
+      statusPesanan: 'COMPLETE',
+      waktuDibuat: requestedAt,
+      departemen: { namaDivisi: 'IT' },
+      shift: { namaShift: 'Pagi' },
+    },
+  };
+}
+
+function setup(hot: Row[], archived: Row[] = []) {
+  const db = {
+    permintaanPersetujuan: inMemoryTable(hot),
+    permintaanPersetujuanArchive: inMemoryTable(archived),
+  };
+  const reportCache = { getOrCompute: jest.fn() };
+  const service = new ReportsService(
+    { reader: () => db } as unknown as ReadReplicaService,
+    reportCache as unknown as ReportCacheService,
+    {
+      needsArchive: () => archived.length > 0,
+    } as unknown as OrderArchiveService,
+  );
+  return { service, db, reportCache };
+}
+
+const range = { tanggalMulai: '2025-01-01', tanggalAkhir: '2025-01-31' };
+
+async function collect(
+  service: ReportsService,
+  batchSize: number,
+): Promise<number[][]> {
+  const batches: number[][] = [];
+  for await (const batch of service.iterateRejections(range, batchSize)) {
+    batches.push(batch.data.map((item) => item.requestId));
+  }
+  return batches;
+}
+
+describe('ReportsService.iterateRejections', () => {
+  it('reads keyset batches newest first without the report cache', async () => {
+    // Requests 2 and 3 share a timestamp: id breaks the tie
+    const { service, reportCache } = setup([
+      request(1, day(1)),
+      request(2, day(2)),
+      request(3, day(2)),
+      request(4, day(3)),
+      request(5, day(4)),
+    ]);
+
+    expect(await collect(service, 2)).toEqual([[5, 4], [3, 2], [1]]);
+    expect(reportCache.getOrCompute).not.toHaveBeenCalled();
+  });
+
+  it('does not shift batches when requests arrive mid-export', async () => {
+    const hot = [request(1, day(1)), request(2, day(2)), request(3, day(3))];
+    const { service } = setup(hot);
+
+    const seen: number[] = [];
+    let total = 0;
+    for await (const batch of service.iterateRejections(range, 2)) {
+      total = batch.total;
+      seen.push(...batch.data.map((item) => item.requestId));
+      hot.push(request(10 + seen.length, day(5)));
+    }
+
+    expect(seen).toEqual([3, 2, 1]);
+    expect(total).toBe(3);
+  });
+
+  it('merges hot and archived requests by requestedAt and id', async () => {
+    const { service } = setup(
+      [request(5, day(5)), request(3, day(3)), request(4, day(3))],
+      [request(1, day(1)), request(2, day(3)), request(6, day(2))],
+    );
+
+    expect(await collect(service, 2)).toEqual([[5, 4], [3, 2], [6, 1]]);
+  });
+
+  it('yields nothing for an empty range', async () => {
+    const { service } = setup([]);
+    expect(await collect(service, 2)).toEqual([]);
+  });
+});
+
+describe('ReportsService.getRejectionReport across the archive', () => {
+  // Ranges reaching today are computed directly (not cached)
+  const hoursAgo = (h: number) => new Date(Date.now() - h * 3_600_000);
+  const query = {
+    tanggalMulai: new Date(Date.now() - 10 * 86_400_000).toISOString(),
+    tanggalAkhir: new Date().toISOString(),
+  };
+
+  function setupArchive() {
+    const tie = hoursAgo(30);
+    return setup(
+      [request(6, hoursAgo(1)), request(4, tie), request(2, hoursAgo(50))],
+      [request(5, hoursAgo(20)), request(3, tie), request(1, hoursAgo(60))],
+    );
+  }
+
+  it('pages merged hot and archived requests without overlap', async () => {
+    const { service, reportCache } = setupArchive();
+
+    const pages = await Promise.all(
+      [1, 2, 3].map((page) =>
+        service.getRejectionReport({ ...query, page, limit: 2 }),
+      ),
+    );
+
+    expect(pages.map((p) => p.data.map((item) => item.requestId))).toEqual([
+      [6, 5],
+      [4, 3],
+      [2, 1],
+    ]);
+    expect(pages[0]).toMatchObject({ total: 6, totalPages: 3 });
+    expect(reportCache.getOrCompute).not.toHaveBeenCalled();
+  });
+
+  it('loads relations only for the rows of the requested page', async () => {
+    const { service, db } = setupArchive();
+
+    await service.getRejectionReport({ ...query, page: 3, limit: 2 });
+
+    const rowReads = (table: { findMany: jest.Mock }) =>
+      table.findMany.mock.calls
+        .map(([args]: [{ where: { id?: { in: number[] } } }]) => args.where.id)
+        .filter(Boolean);
+    expect(rowReads(db.permintaanPersetujuan)).toEqual([{ in: [2] }]);
+    expect(rowReads(db.permintaanPersetujuanArchive)).toEqual([{ in: [1] }]);
+  });
+});
@@ -1,5 +1,10 @@
 import { Injectable, BadRequestException } from '@nestjs/common';
-import { PrismaService } from '../../prisma/prisma.service';
+import {
+  ReadClient,
+  ReadReplicaService,
+} from '../../prisma/read-replica.service';
+import { ReportCacheService, ReportType } from './report-cache.service';
+import { OrderArchiveService } from '../../orders/order-archive.service';
 import {
   ConsumptionReportQueryDto,
   DepartmentReportQueryDto,
@@ -15,7 +20,7 @@ type ConsumptionResult = {
   totalMeals: number;
 };
 
-type DepartmentResult = {
+export type DepartmentResult = {
   departmentId: number;
   departmentName: string;
   totalOrders: number;
@@ -41,14 +46,34 @@ type PerformanceBreakdownShift = PerformanceMetrics & {
   shiftName: string;
 };
 
-type PerformanceReportResult = {
+// Duration sums/counts: averages are taken only after closed and open parts merge
+type DurationTotals = {
+  count: number;
+  totalDurationSum: number;
+  totalDurationCount: number;
+  processingTimeSum: number;
+  processingTimeCount: number;
+  preparationTimeSum: number;
+  preparationTimeCount: number;
+  deliveryTimeSum: number;
+  deliveryTimeCount: number;
+};
+
+type PerformanceTotals = {
+  overall: DurationTotals;
+  byDepartment: Map<number, DurationTotals>;
+  byShift: Map<number, DurationTotals>;
+};
+
+export type PerformanceReportResult = {
   overall: PerformanceMetrics;
   byDepartment: PerformanceBreakdownDepartment[];
   byShift: PerformanceBreakdownShift[];
 };
 
-type RejectionItem = {
+export type RejectionItem = {
   id: number;
+  requestId: number;
   kodePesanan: string;
   departmentId: number;
   departmentName: string;
@@ -64,8 +89,29 @@ type RejectionItem = {
   catatanAdmin: string | null;
   waktuDibuat: Date;
   requestType: 'EDIT' | 'REJECT';
+  requestedById: number | null;
+  requestedAt: Date;
+  decidedAt: Date | null;
 };
 
+const REJECTION_INCLUDE = {
+  pesanan: { include: { departemen: true, shift: true } },
+} as const;
+
+type RejectionRequestRow =
+  | Prisma.PermintaanPersetujuanGetPayload<{
+      include: typeof REJECTION_INCLUDE;
+    }>
+  | Prisma.PermintaanPersetujuanArchiveGetPayload<{
+      include: typeof REJECTION_INCLUDE;
+    }>;
+
+// Newest request first; id breaks ties so keyset pagination is total
+const REJECTION_ORDER = [
+  { requestedAt: 'desc' },
+  { id: 'desc' },
+] as const satisfies readonly Prisma.PermintaanPersetujuanOrderByWithRelationInput[];
+
 type PaginatedRejectionReport = {
   data: RejectionItem[];
   total: number;
@@ -76,7 +122,19 @@ type PaginatedRejectionReport = {
 
 @Injectable()
 export class ReportsService {
-  constructor(private readonly prisma: PrismaService) {}
+  constructor(
+    private readonly readReplica: ReadReplicaService,
+    private readonly reportCache: ReportCacheService,
+    private readonly orderArchive: OrderArchiveService,
+  ) {}
+
+  /**
+   * Reports are read-only aggregations: route them to the replica pool when
+   * DATABASE_REPLICA_URL is configured and healthy, otherwise to the primary.
+   */
+  private get db(): ReadClient {
+    return this.readReplica.reader();
+  }
 
   /**
    * Helper: getDateRange
@@ -147,12 +205,48 @@ export class ReportsService {
     return `${yyyy}-${mm}`;
   }
 
+  /**
+   * Helper: withClosedDays
+   * - Days before today are closed: their result comes from ReportCacheService
+   * - Today and later are recomputed on every call and merged into the closed part
+   * - startDay/endDay are local day starts (normalizeDateOnly)
+   */
+  private async withClosedDays<T>(
+    type: ReportType,
+    params: Record<string, unknown>,
+    startDay: Date,
+    endDay: Date,
+    compute: (from: Date, to: Date) => Promise<T>,
+    merge: (closed: T, open: T) => T,
+  ): Promise<T> {
+    const today = this.normalizeDateOnly(new Date());
+    if (startDay.getTime() >= today.getTime()) {
+      return compute(startDay, endDay);
+    }
+    if (endDay.getTime() < today.getTime()) {
+      return this.reportCache.getOrCompute(type, params, startDay, endDay, () =>
+        compute(startDay, endDay),
+      );
+    }
+
+    const yesterday = new Date(today);
+    yesterday.setDate(yesterday.getDate() - 1);
+    const [closed, open] = await Promise.all([
+      this.reportCache.getOrCompute(type, params, startDay, yesterday, () =>
+        compute(startDay, yesterday),
+      ),
+      compute(today, endDay),
+    ]);
+    return merge(closed, open);
+  }
+
   /**
    * Consumption Report
    * - Group by DAILY via Prisma groupBy on tanggalPesanan
    * - Group by WEEKLY/MONTHLY via raw SQL using date_trunc
    * - Exclude DITOLAK
    * - Optional filter: shiftId
+   * - Closed days cached; a week/month bucket spanning today sums both parts
    */
   async getConsumptionReport(
     queryDto: ConsumptionReportQueryDto,
@@ -168,54 +262,114 @@ export class ReportsService {
       tanggalAkhir,
     );
 
+    return this.withClosedDays(
+      'consumption',
+      { groupBy, shiftId },
+      this.normalizeDateOnly(startDate),
+      this.normalizeDateOnly(endDate),
+      (from, to) => this.computeConsumption(groupBy, shiftId, from, to),
+      (closed, open) => {
+        const byPeriod = new Map<string, ConsumptionResult>();
+        for (const row of [...closed, ...open]) {
+          const current = byPeriod.get(row.period);
+          byPeriod.set(
+            row.period,
+            current
+              ? {
+                  period: row.period,
+                  totalOrders: current.totalOrders + row.totalOrders,
+                  totalMeals: current.totalMeals + row.totalMeals,
+                }
+              : row,
+          );
+        }
+        // Closed periods precede open ones, so insertion order is date order
+        return Array.from(byPeriod.values());
+      },
+    );
+  }
+
+  private async computeConsumption(
+    groupBy: ConsumptionGroupBy,
+    shiftId: number | undefined,
+    startDateParam: Date,
+    endDateParam: Date,
+  ): Promise<ConsumptionResult[]> {
     // Build base where clause for Prisma (DAILY only)
     const whereDaily: any = {
       statusPesanan: { not: 'DITOLAK' as any },
       tanggalPesanan: {
-        gte: this.normalizeDateOnly(startDate),
-        lte: this.normalizeDateOnly(endDate),
+        gte: startDateParam,
+        lte: endDateParam,
       },
     };
     if (typeof shiftId === 'number') {
       whereDaily.shiftId = shiftId;
     }
 
-    if (groupBy === ConsumptionGroupBy.DAILY) {
-      const grouped = await this.prisma.pesanan.groupBy({
-        by: ['tanggalPesanan'],
-        where: whereDaily,
-        _sum: { jumlahPesanan: true },
-        _count: { id: true },
-        orderBy: { tanggalPesanan: 'asc' },
-      });
+    const readsArchive = this.orderArchive.needsArchive(startDateParam);
 
-      const results: ConsumptionResult[] = grouped.map((row) => {
-        const date = new Date(row.tanggalPesanan);
-        const period = this.formatDateYYYYMMDD(date);
-        const totalOrders = row._count.id ?? 0;
-        const totalMeals = row._sum.jumlahPesanan ?? 0;
-        return { period, totalOrders, totalMeals };
-      });
+    if (groupBy === ConsumptionGroupBy.DAILY) {
+      const [grouped, groupedArchive] = await Promise.all([
+        this.db.pesanan.groupBy({
+          by: ['tanggalPesanan'],
+          where: whereDaily,
+          _sum: { jumlahPesanan: true },
+          _count: { id: true },
+          orderBy: { tanggalPesanan: 'asc' },
+        }),
+        readsArchive
+          ? this.db.pesananArchive.groupBy({
+              by: ['tanggalPesanan'],
+              where: whereDaily,
+              _sum: { jumlahPesanan: true },
+              _count: { id: true },
+              orderBy: { tanggalPesanan: 'asc' },
+            })
+          : [],
+      ]);
+
+      // Archived days come first; a day can only be split across both tables at the horizon
+      const byPeriod = new Map<string, ConsumptionResult>();
+      for (const row of [...groupedArchive, ...grouped]) {
+        const period = this.formatDateYYYYMMDD(new Date(row.tanggalPesanan));
+        const current = byPeriod.get(period);
+        byPeriod.set(period, {
+          period,
+          totalOrders: (current?.totalOrders ?? 0) + (row._count.id ?? 0),
+          totalMeals:
+            (current?.totalMeals ?? 0) + (row._sum.jumlahPesanan ?? 0),
+        });
+      }
 
-      // Already ordered by date asc
-      return results;
+      return Array.from(byPeriod.values()).sort((a, b) =>
+        a.period.localeCompare(b.period),
+      );
     }
 
     // WEEKLY or MONTHLY via raw SQL
     const truncUnit = groupBy === ConsumptionGroupBy.WEEKLY ? 'week' : 'month';
-    const startDateParam = this.normalizeDateOnly(startDate);
-    const endDateParam = this.normalizeDateOnly(endDate);
 
     const dynamicShiftFilter =
       typeof shiftId === 'number'
         ? Prisma.sql` AND shift_id = ${shiftId} `
         : Prisma.empty;
 
+    const source = readsArchive
+      ? Prisma.sql`(
+          SELECT id, tanggal_pesanan, jumlah_pesanan, status_pesanan, shift_id
+          FROM transaction_pesanan
+          UNION ALL
+          SELECT id, tanggal_pesanan, jumlah_pesanan, status_pesanan, shift_id
+          FROM transaction_pesanan_archive
+        ) AS pesanan`
+      : Prisma.sql`transaction_pesanan`;
+
     const rows: Array<{
       period: Date;
       total_orders: bigint | number | null;
       total_meals: bigint | number | null;
-    }> = await this.prisma.$queryRaw<
+    }> = await this.db.$queryRaw<
       Array<{
         period: Date;
         total_orders: bigint | number | null;
@@ -226,7 +380,7 @@ export class ReportsService {
         date_trunc(${Prisma.sql`'${truncUnit}'`}, tanggal_pesanan) AS period,
         COUNT(id) AS total_orders,
         SUM(jumlah_pesanan) AS total_meals
-      FROM transaction_pesanan
+      FROM ${source}
       WHERE status_pesanan <> 'DITOLAK'
         AND tanggal_pesanan BETWEEN ${startDateParam} AND ${endDateParam}
         ${dynamicShiftFilter}
@@ -253,6 +407,7 @@ export class ReportsService {
    * - Group by departmentPemesanId
    * - Optional filters: departmentId, status, shiftId
    * - Date range based on tanggalPesanan
+   * - Closed days cached; totals merged per department, percentages recomputed
    */
   async getDepartmentReport(
     queryDto: DepartmentReportQueryDto,
@@ -264,10 +419,46 @@ export class ReportsService {
       tanggalAkhir,
     );
 
+    return this.withClosedDays(
+      'department',
+      { departmentId, status, shiftId },
+      this.normalizeDateOnly(startDate),
+      this.normalizeDateOnly(endDate),
+      (from, to) =>
+        this.computeDepartments({ departmentId, status, shiftId }, from, to),
+      (closed, open) => {
+        const byDepartment = new Map<number, DepartmentResult>();
+        for (const row of [...closed, ...open]) {
+          const current = byDepartment.get(row.departmentId);
+          byDepartment.set(
+            row.departmentId,
+            current
+              ? {
+                  ...current,
+                  totalOrders: current.totalOrders + row.totalOrders,
+                  totalMeals: current.totalMeals + row.totalMeals,
+                }
+              : { ...row },
+          );
+        }
+        return this.withPercentages(Array.from(byDepartment.values()));
+      },
+    );
+  }
+
+  private async computeDepartments(
+    filters: Pick<
+      DepartmentReportQueryDto,
+      'departmentId' | 'status' | 'shiftId'
+    >,
+    from: Date,
+    to: Date,
+  ): Promise<DepartmentResult[]> {
+    const { departmentId, status, shiftId } = filters;
     const where: any = {
       tanggalPesanan: {
-        gte: this.normalizeDateOnly(startDate),
-        lte: this.normalizeDateOnly(endDate),
+        gte: from,
+        lte: to,
       },
     };
 
@@ -282,19 +473,39 @@ export class ReportsService {
       where.statusPesanan = status as any;
     }
 
-    const grouped = await this.prisma.pesanan.groupBy({
-      by: ['departmentPemesanId'],
-      where,
-      _sum: { jumlahPesanan: true },
-      _count: { id: true },
-    });
+    const [hot, archived] = await Promise.all([
+      this.db.pesanan.groupBy({
+        by: ['departmentPemesanId'],
+        where,
+        _sum: { jumlahPesanan: true },
+        _count: { id: true },
+      }),
+      this.orderArchive.needsArchive(from)
+        ? this.db.pesananArchive.groupBy({
+            by: ['departmentPemesanId'],
+            where,
+            _sum: { jumlahPesanan: true },
+            _count: { id: true },
+          })
+        : [],
+    ]);
+
+    const totalsByDepartment = new Map<
+      number,
+      { totalOrders: number; totalMeals: number }
+    >();
+    for (const g of [...hot, ...archived]) {
+      const current = totalsByDepartment.get(g.departmentPemesanId);
+      totalsByDepartment.set(g.departmentPemesanId, {
+        totalOrders: (current?.totalOrders ?? 0) + (g._count.id ?? 0),
+        totalMeals: (current?.totalMeals ?? 0) + (g._sum.jumlahPesanan ?? 0),
+      });
+    }
 
-    const departmentIds = grouped
-      .map((g) => g.departmentPemesanId)
-      .filter((id) => typeof id === 'number');
+    const departmentIds = Array.from(totalsByDepartment.keys());
 
     const departments = departmentIds.length
-      ? await this.prisma.department.findMany({
+      ? await this.db.department.findMany({
           where: { id: { in: departmentIds } },
           select: { id: true, namaDivisi: true },
         })
@@ -304,29 +515,31 @@ export class ReportsService {
       departments.map((d) => [d.id, d.namaDivisi]),
     );
 
-    const totalMealsSum = grouped.reduce(
-      (acc, g) => acc + (g._sum.jumlahPesanan ?? 0),
-      0,
+    const results: DepartmentResult[] = Array.from(
+      totalsByDepartment,
+      ([deptId, totals]) => ({
+        departmentId: deptId,
+        departmentName: nameMap.get(deptId) ?? 'Unknown Department',
+        totalOrders: totals.totalOrders,
+        totalMeals: totals.totalMeals,
+        percentage: 0,
+      }),
     );
 
-    const results: DepartmentResult[] = grouped.map((g) => {
-      const meals = g._sum.jumlahPesanan ?? 0;
-      const orders = g._count.id ?? 0;
-      const deptId = g.departmentPemesanId;
-      const deptName = nameMap.get(deptId) ?? 'Unknown Department';
-      const percentage =
-        totalMealsSum > 0
-          ? Number(((meals / totalMealsSum) * 100).toFixed(2))
-          : 0;
+    return this.withPercentages(results);
+  }
 
-      return {
-        departmentId: deptId,
-        departmentName: deptName,
-        totalOrders: orders,
-        totalMeals: meals,
-        percentage,
-      };
-    });
+  // Share of meals per department, sorted by totalMeals desc
+  private withPercentages(rows: DepartmentResult[]): DepartmentResult[] {
+    const totalMealsSum = rows.reduce((acc, r) => acc + r.totalMeals, 0);
+
+    const results = rows.map((r) => ({
+      ...r,
+      percentage:
+        totalMealsSum > 0
+          ? Number(((r.totalMeals / totalMealsSum) * 100).toFixed(2))
+          : 0,
+    }));
 
     // Sort by totalMeals desc
     results.sort((a, b) => b.totalMeals - a.totalMeals);
@@ -341,6 +554,8 @@ export class ReportsService {
    * - Optional filters: departmentId, shiftId
    * - Compute avg durations in minutes across all orders
    * - Provide breakdown by department and by shift
+   * - Duration sums/counts of orders completed before today are cached; orders
+   *   completed today are added before the averages are taken
    */
   async getPerformanceReport(
     queryDto: PerformanceReportQueryDto,
@@ -350,11 +565,54 @@ export class ReportsService {
       tanggalMulai,
       tanggalAkhir,
     );
+    const startDay = this.normalizeDateOnly(startDate);
+
+    const totals = await this.withClosedDays(
+      'performance',
+      { departmentId, shiftId },
+      startDay,
+      this.normalizeDateOnly(endDate),
+      (from, to) => {
+        const selesaiTo = new Date(to);
+        selesaiTo.setHours(23, 59, 59, 999);
+        // The open part starts today; the closed part keeps the original bounds
+        const selesaiFrom = from.getTime() > startDay.getTime() ? from : null;
+        return this.computePerformanceTotals(
+          { departmentId, shiftId },
+          startDate,
+          selesaiFrom,
+          selesaiTo,
+        );
+      },
+      (closed, open) => ({
+        overall: this.addDurationTotals(this.emptyDurationTotals(), [
+          closed.overall,
+          open.overall,
+        ]),
+        byDepartment: this.mergeDurationTotals(
+          closed.byDepartment,
+          open.byDepartment,
+        ),
+        byShift: this.mergeDurationTotals(closed.byShift, open.byShift),
+      }),
+    );
+
+    return this.finalizePerformance(totals);
+  }
 
+  private async computePerformanceTotals(
+    filters: Pick<PerformanceReportQueryDto, 'departmentId' | 'shiftId'>,
+    dibuatFrom: Date,
+    selesaiFrom: Date | null,
+    selesaiTo: Date,
+  ): Promise<PerformanceTotals> {
+    const { departmentId, shiftId } = filters;
     const where: any = {
       statusPesanan: 'COMPLETE' as any,
-      waktuDibuat: { gte: startDate },
-      waktuSelesai: { lte: endDate },
+      waktuDibuat: { gte: dibuatFrom },
+      waktuSelesai: selesaiFrom
+        ? { gte: selesaiFrom, lte: selesaiTo }
+        : { lte: selesaiTo },
     };
 
     if (typeof departmentId === 'number') {
@@ -364,20 +622,32 @@ export class ReportsService {
       where.shiftId = shiftId;
     }
 
-    const orders = await this.prisma.pesanan.findMany({
-      where,
-      select: {
-        id: true,
-        departmentPemesanId: true,
-        shiftId: true,
-        waktuDibuat: true,
-        waktuDiproses: true,
-        waktuSiap: true,
-        waktuDiantar: true,
-        waktuSelesai: true,
-      },
-      orderBy: { waktuSelesai: 'asc' },
-    });
+    const select = {
+      id: true,
+      departmentPemesanId: true,
+      shiftId: true,
+      waktuDibuat: true,
+      waktuDiproses: true,
+      waktuSiap: true,
+      waktuDiantar: true,
+      waktuSelesai: true,
+    } as const;
+    const [hotOrders, archivedOrders] = await Promise.all([
+      this.db.pesanan.findMany({
+        where,
+        select,
+        orderBy: { waktuSelesai: 'asc' },
+      }),
+      this.orderArchive.needsArchive(dibuatFrom)
+        ? this.db.pesananArchive.findMany({
+            where,
+            select,
+            orderBy: { waktuSelesai: 'asc' },
+          })
+        : [],
+    ]);
+    // Only sums and counts are taken, so order across the two tables does not matter
+    const orders = [...archivedOrders, ...hotOrders];
 
     const diffMinutes = (a?: Date | null, b?: Date | null): number | null => {
       if (!a || !b) return null;
@@ -386,50 +656,11 @@ export class ReportsService {
       return Math.max(0, Math.round(ms / 60000));
     };
 
-    // Overall aggregation counters
-    const count = orders.length;
-    let totalDurationSum = 0;
-    let totalDurationCount = 0;
-
-    let processingTimeSum = 0;
-    let processingTimeCount = 0;
-
-    let preparationTimeSum = 0;
-    let preparationTimeCount = 0;
-
-    let deliveryTimeSum = 0;
-    let deliveryTimeCount = 0;
-
-    // For breakdowns
-    const deptAgg = new Map<
-      number,
-      {
-        count: number;
-        totalDurationSum: number;
-        totalDurationCount: number;
-        processingTimeSum: number;
-        processingTimeCount: number;
-        preparationTimeSum: number;
-        preparationTimeCount: number;
-        deliveryTimeSum: number;
-        deliveryTimeCount: number;
-      }
-    >();
-
-    const shiftAgg = new Map<
-      number,
-      {
-        count: number;
-        totalDurationSum: number;
-        totalDurationCount: number;
-        processingTimeSum: number;
-        processingTimeCount: number;
-        preparationTimeSum: number;
-        preparationTimeCount: number;
-        deliveryTimeSum: number;
-        deliveryTimeCount: number;
-      }
-    >();
+    const totals: PerformanceTotals = {
+      overall: this.emptyDurationTotals(),
+      byDepartment: new Map(),
+      byShift: new Map(),
+    };
 
     for (const o of orders) {
       const totalDuration = diffMinutes(o.waktuSelesai, o.waktuDibuat);
@@ -437,117 +668,87 @@ export class ReportsService {
       const preparationTime = diffMinutes(o.waktuSiap, o.waktuDiproses);
       const deliveryTime = diffMinutes(o.waktuSelesai, o.waktuDiantar);
 
-      if (totalDuration != null) {
-        totalDurationSum += totalDuration;
-        totalDurationCount += 1;
-      }
-      if (processingTime != null) {
-        processingTimeSum += processingTime;
-        processingTimeCount += 1;
-      }
-      if (preparationTime != null) {
-        preparationTimeSum += preparationTime;
-        preparationTimeCount += 1;
-      }
-      if (deliveryTime != null) {
-        deliveryTimeSum += deliveryTime;
-        deliveryTimeCount += 1;
-      }
-
+      const targets = [totals.overall];
       // Department aggregation
       if (typeof o.departmentPemesanId === 'number') {
-        const d = deptAgg.get(o.departmentPemesanId) ?? {
-          count: 0,
-          totalDurationSum: 0,
-          totalDurationCount: 0,
-          processingTimeSum: 0,
-          processingTimeCount: 0,
-          preparationTimeSum: 0,
-          preparationTimeCount: 0,
-          deliveryTimeSum: 0,
-          deliveryTimeCount: 0,
-        };
-        d.count += 1;
-        if (totalDuration != null) {
-          d.totalDurationSum += totalDuration;
-          d.totalDurationCount += 1;
-        }
-        if (processingTime != null) {
-          d.processingTimeSum += processingTime;
-          d.processingTimeCount += 1;
-        }
-        if (preparationTime != null) {
-          d.preparationTimeSum += preparationTime;
-          d.preparationTimeCount += 1;
-        }
-        if (deliveryTime != null) {
-          d.deliveryTimeSum += deliveryTime;
-          d.deliveryTimeCount += 1;
-        }
-        deptAgg.set(o.departmentPemesanId, d);
+        const d =
+          totals.byDepartment.get(o.departmentPemesanId) ??
+          this.emptyDurationTotals();
+        totals.byDepartment.set(o.departmentPemesanId, d);
+        targets.push(d);
       }
-
       // Shift aggregation
       if (typeof o.shiftId === 'number') {
-        const s = shiftAgg.get(o.shiftId) ?? {
-          count: 0,
-          totalDurationSum: 0,
-          totalDurationCount: 0,
-          processingTimeSum: 0,
-          processingTimeCount: 0,
-          preparationTimeSum: 0,
-          preparationTimeCount: 0,
-          deliveryTimeSum: 0,
-          deliveryTimeCount: 0,
-        };
-        s.count += 1;
+        const s = totals.byShift.get(o.shiftId) ?? this.emptyDurationTotals();
+        totals.byShift.set(o.shiftId, s);
+        targets.push(s);
+      }
+
+      for (const t of targets) {
+        t.count += 1;
         if (totalDuration != null) {
-          s.totalDurationSum += totalDuration;
-          s.totalDurationCount += 1;
+          t.totalDurationSum += totalDuration;
+          t.totalDurationCount += 1;
         }
         if (processingTime != null) {
-          s.processingTimeSum += processingTime;
-          s.processingTimeCount += 1;
+          t.processingTimeSum += processingTime;
+          t.processingTimeCount += 1;
         }
         if (preparationTime != null) {
-          s.preparationTimeSum += preparationTime;
-          s.preparationTimeCount += 1;
+          t.preparationTimeSum += preparationTime;
+          t.preparationTimeCount += 1;
         }
         if (deliveryTime != null) {
-          s.deliveryTimeSum += deliveryTime;
-          s.deliveryTimeCount += 1;
+          t.deliveryTimeSum += deliveryTime;
+          t.deliveryTimeCount += 1;
         }
-        shiftAgg.set(o.shiftId, s);
       }
     }
 
+    return totals;
+  }
+
+  private async finalizePerformance(
+    totals: PerformanceTotals,
+  ): Promise<PerformanceReportResult> {
     const safeAvg = (sum: number, cnt: number): number | null =>
       cnt > 0 ? Number((sum / cnt).toFixed(2)) : null;
 
-    const overall: PerformanceMetrics = {
-      count,
-      avgTotalDurationMinutes: safeAvg(totalDurationSum, totalDurationCount),
-      avgProcessingTimeMinutes: safeAvg(processingTimeSum, processingTimeCount),
+    const toMetrics = (agg: DurationTotals): PerformanceMetrics => ({
+      count: agg.count,
+      avgTotalDurationMinutes: safeAvg(
+        agg.totalDurationSum,
+        agg.totalDurationCount,
+      ),
+      avgProcessingTimeMinutes: safeAvg(
+        agg.processingTimeSum,
+        agg.processingTimeCount,
+      ),
       avgPreparationTimeMinutes: safeAvg(
-        preparationTimeSum,
-        preparationTimeCount,
+        agg.preparationTimeSum,
+        agg.preparationTimeCount,
       ),
-      avgDeliveryTimeMinutes: safeAvg(deliveryTimeSum, deliveryTimeCount),
-    };
+      avgDeliveryTimeMinutes: safeAvg(
+        agg.deliveryTimeSum,
+        agg.deliveryTimeCount,
+      ),
+    });
+
+    const overall = toMetrics(totals.overall);
 
     // Resolve names
-    const deptIds = Array.from(deptAgg.keys());
-    const shiftIds = Array.from(shiftAgg.keys());
+    const deptIds = Array.from(totals.byDepartment.keys());
+    const shiftIds = Array.from(totals.byShift.keys());
 
     const [deptRows, shiftRows] = await Promise.all([
       deptIds.length
-        ? this.prisma.department.findMany({
+        ? this.db.department.findMany({
             where: { id: { in: deptIds } },
             select: { id: true, namaDivisi: true },
           })
         : Promise.resolve([]),
       shiftIds.length
-        ? this.prisma.shift.findMany({
+        ? this.db.shift.findMany({
             where: { id: { in: shiftIds } },
             select: { id: true, namaShift: true },
           })
@@ -561,55 +762,19 @@ export class ReportsService {
       shiftRows.map((s) => [s.id, s.namaShift]),
     );
 
-    const byDepartment: PerformanceBreakdownDepartment[] = deptIds.map((id) => {
-      const agg = deptAgg.get(id)!;
-      return {
+    const byDepartment: PerformanceBreakdownDepartment[] = deptIds.map(
+      (id) => ({
         departmentId: id,
         departmentName: deptNameMap.get(id) ?? 'Unknown Department',
-        count: agg.count,
-        avgTotalDurationMinutes: safeAvg(
-          agg.totalDurationSum,
-          agg.totalDurationCount,
-        ),
-        avgProcessingTimeMinutes: safeAvg(
-          agg.processingTimeSum,
-          agg.processingTimeCount,
-        ),
-        avgPreparationTimeMinutes: safeAvg(
-          agg.preparationTimeSum,
-          agg.preparationTimeCount,
-        ),
-        avgDeliveryTimeMinutes: safeAvg(
-          agg.deliveryTimeSum,
-          agg.deliveryTimeCount,
-        ),
-      };
-    });
+        ...toMetrics(totals.byDepartment.get(id)!),
+      }),
+    );
 
-    const byShift: PerformanceBreakdownShift[] = shiftIds.map((id) => {
-      const agg = shiftAgg.get(id)!;
-      return {
-        shiftId: id,
-        shiftName: shiftNameMap.get(id) ?? 'Unknown Shift',
-        count: agg.count,
-        avgTotalDurationMinutes: safeAvg(
-          agg.totalDurationSum,
-          agg.totalDurationCount,
-        ),
-        avgProcessingTimeMinutes: safeAvg(
-          agg.processingTimeSum,
-          agg.processingTimeCount,
-        ),
-        avgPreparationTimeMinutes: safeAvg(
-          agg.preparationTimeSum,
-          agg.preparationTimeCount,
-        ),
-        avgDeliveryTimeMinutes: safeAvg(
-          agg.deliveryTimeSum,
-          agg.deliveryTimeCount,
-        ),
-      };
-    });
+    const byShift: PerformanceBreakdownShift[] = shiftIds.map((id) => ({
+      shiftId: id,
+      shiftName: shiftNameMap.get(id) ?? 'Unknown Shift',
+      ...toMetrics(totals.byShift.get(id)!),
+    }));
 
     // Sort breakdowns for readability
     byDepartment.sort((a, b) => (a.departmentName > b.departmentName ? 1 : -1));
@@ -618,14 +783,58 @@ export class ReportsService {
     return { overall, byDepartment, byShift };
   }
 
+  private emptyDurationTotals(): DurationTotals {
+    return {
+      count: 0,
+      totalDurationSum: 0,
+      totalDurationCount: 0,
+      processingTimeSum: 0,
+      processingTimeCount: 0,
+      preparationTimeSum: 0,
+      preparationTimeCount: 0,
+      deliveryTimeSum: 0,
+      deliveryTimeCount: 0,
+    };
+  }
+
+  // Sums into target; cached totals are only ever read
+  private addDurationTotals(
+    target: DurationTotals,
+    sources: DurationTotals[],
+  ): DurationTotals {
+    for (const source of sources) {
+      for (const key of Object.keys(target) as Array<keyof DurationTotals>) {
+        target[key] += source[key];
+      }
+    }
+    return target;
+  }
+
+  private mergeDurationTotals(
+    closed: Map<number, DurationTotals>,
+    open: Map<number, DurationTotals>,
+  ): Map<number, DurationTotals> {
+    const merged = new Map<number, DurationTotals>();
+    for (const [id, agg] of [...closed, ...open]) {
+      merged.set(
+        id,
+        this.addDurationTotals(merged.get(id) ?? this.emptyDurationTotals(), [
+          agg,
+        ]),
+      );
+    }
+    return merged;
+  }
+
   /**
    * Rejection/Edit Requests Report
-   * - Where: requiresApproval = true
-   * - Date range
-   * - Optional filters: departmentId, approvalStatus
+   * - One row per approval request (transaction_permintaan_persetujuan)
+   * - Date range on requestedAt
+   * - Optional filters: departmentId (order), approvalStatus (request decision)
    * - Pagination
-   * - Include relations
-   * - Determine request type
+   * - Request type, requester and decision come from the request row
+   * - Pages of fully closed ranges are cached; ranges reaching today are paginated
+   *   from newest requests first, so they are always read directly
    */
   async getRejectionReport(
     queryDto: RejectionReportQueryDto,
@@ -643,84 +852,55 @@ export class ReportsService {
       tanggalAkhir,
     );
 
-    const where: any = {
-      requiresApproval: true,
-      waktuDibuat: { gte: startDate },
-      // Some historical approvals may be decided later; include up to endDate for dibuka
-      // and rely on waktuDibuat to represent when the request was initiated.
-      waktuSelesai: { lte: endDate },
-    };
+    const compute = () =>
+      this.computeRejections(
+        { departmentId, approvalStatus, page, limit },
+        startDate,
+        endDate,
+      );
 
-    // transaksi yang masih pending atau sudah diputuskan
-    if (approvalStatus) {
-      where.approvalStatus = approvalStatus as any;
-    }
-    if (typeof departmentId === 'number') {
-      where.departmentPemesanId = departmentId;
+    const startDay = this.normalizeDateOnly(startDate);
+    const endDay = this.normalizeDateOnly(endDate);
+    if (endDay.getTime() < this.normalizeDateOnly(new Date()).getTime()) {
+      return this.reportCache.getOrCompute(
+        'rejections',
+        { departmentId, approvalStatus, page, limit },
+        startDay,
+        endDay,
+        compute,
+      );
     }
+    return compute();
+  }
+
+  private async computeRejections(
+    filters: Pick<
+      RejectionReportQueryDto,
+      'departmentId' | 'approvalStatus'
+    > & { page: number; limit: number },
+    startDate: Date,
+    endDate: Date,
+  ): Promise<PaginatedRejectionReport> {
+    const { page, limit } = filters;
+    const where = this.rejectionWhere(filters, startDate, endDate);
 
     const skip = (page - 1) * limit;
     const take = limit;
 
-    const [dataRows, total] = await Promise.all([
-      this.prisma.pesanan.findMany({
-        where,
-        orderBy: { waktuDibuat: 'desc' },
-        skip,
-        take,
-        include: {
-          pemesan: true,
-          departemen: true,
-          shift: true,
-        },
-      }),
-      this.prisma.pesanan.count({ where }),
-    ]);
-
-    const determineRequestType = (row: {
-      jumlahPesananAwal: number | null;
-      jumlahPesanan: number;
-      catatanDapur: string | null;
-    }): 'EDIT' | 'REJECT' => {
-      if (
-        row.jumlahPesananAwal != null &&
-        row.jumlahPesananAwal !== row.jumlahPesanan
-      ) {
-        return 'EDIT';
-      }
-      const note = (row.catatanDapur ?? '').toLowerCase();
-      if (note.includes('edit') || note.includes('ubah')) {
-        return 'EDIT';
-      }
-      if (
-        note.includes('reject') ||
-        note.includes('tolak') ||
-        note.includes('rejek')
-      ) {
-        return 'REJECT';
-      }
-      // Default to REJECT when ambiguous (matches service heuristic)
-      return 'REJECT';
-    };
-
-    const items: RejectionItem[] = dataRows.map((r) => ({
-      id: r.id,
-      kodePesanan: r.kodePesanan,
-      departmentId: r.departmentPemesanId,
-      departmentName: r.departemen?.namaDivisi ?? 'Unknown Department',
-      karyawanPemesanId: r.karyawanPemesanId,
-      shiftId: r.shiftId,
-      shiftName: r.shift?.namaShift ?? 'Unknown Shift',
-      jumlahPesanan: r.jumlahPesanan,
-      jumlahPesananAwal: r.jumlahPesananAwal ?? null,
-      statusPesanan: r.statusPesanan,
-      requiresApproval: r.requiresApproval,
-      approvalStatus: r.approvalStatus ?? null,
-      catatanDapur: r.catatanDapur ?? null,
-      catatanAdmin: r.catatanAdmin ?? null,
-      waktuDibuat: r.waktuDibuat,
-      requestType: determineRequestType(r),
-    }));
+    const { requests, total } = this.orderArchive.needsArchive(startDate)
+      ? await this.findRejectionsAcrossArchive(where, skip, take)
+      : await Promise.all([
+          this.db.permintaanPersetujuan.findMany({
+            where,
+            orderBy: [...REJECTION_ORDER],
+            skip,
+            take,
+            include: REJECTION_INCLUDE,
+          }),
+          this.db.permintaanPersetujuan.count({ where }),
+        ]).then(([requests, total]) => ({ requests, total }));
+
+    const items = requests.map((r) => this.toRejectionItem(r));
 
     const totalPages = Math.ceil(total / limit);
 
@@ -732,4 +912,235 @@ export class ReportsService {
       totalPages,
     };
   }
+
+  /**
+   * Rejection report rows for exports, newest request first, `batchSize` per batch.
+   * - Never cached: single-use export pages would evict the report entries the cache
+   *   is for
+   * - Keyset pagination on (requestedAt, id) instead of offsets: requests created while
+   *   the export runs sort before the first batch, so later batches do not shift and
+   *   no row is duplicated or dropped
+   * - `total` is counted once, when the export starts
+   */
+  async *iterateRejections(
+    queryDto: RejectionReportQueryDto,
+    batchSize: number,
+  ): AsyncGenerator<{ data: RejectionItem[]; total: number }> {
+    const { startDate, endDate } = this.getDateRange(
+      queryDto.tanggalMulai,
+      queryDto.tanggalAkhir,
+    );
+    const where = this.rejectionWhere(queryDto, startDate, endDate);
+    const withArchive = this.orderArchive.needsArchive(startDate);
+    const archiveWhere = where as Prisma.PermintaanPersetujuanArchiveWhereInput;
+
+    const [hotTotal, archivedTotal] = await Promise.all([
+      this.db.permintaanPersetujuan.count({ where }),
+      withArchive
+        ? this.db.permintaanPersetujuanArchive.count({ where: archiveWhere })
+        : 0,
+    ]);
+    const total = hotTotal + archivedTotal;
+
+    let after: { requestedAt: Date; id: number } | undefined;
+    for (;;) {
+      const cursor: Prisma.PermintaanPersetujuanWhereInput = after
+        ? {
+            OR: [
+              { requestedAt: { lt: after.requestedAt } },
+              { requestedAt: after.requestedAt, id: { lt: after.id } },
+            ],
+          }
+        : {};
+      const requests = withArchive
+        ? await this.findRejectionBatchAcrossArchive(
+            { AND: [where, cursor] },
+            batchSize,
+          )
+        : await this.db.permintaanPersetujuan.findMany({
+            where: { AND: [where, cursor] },
+            orderBy: [...REJECTION_ORDER],
+            take: batchSize,
+            include: REJECTION_INCLUDE,
+          });
+      if (requests.length === 0) return;
+
+      yield { data: requests.map((r) => this.toRejectionItem(r)), total };
+      if (requests.length < batchSize) return;
+
+      const last = requests[requests.length - 1];
+      after = { requestedAt: last.requestedAt, id: last.id };
+    }
+  }
+
+  private rejectionWhere(
+    filters: Pick<RejectionReportQueryDto, 'departmentId' | 'approvalStatus'>,
+    startDate: Date,
+    endDate: Date,
+  ): Prisma.PermintaanPersetujuanWhereInput {
+    const { departmentId, approvalStatus } = filters;
+    const where: Prisma.PermintaanPersetujuanWhereInput = {
+      requestedAt: { gte: startDate, lte: endDate },
+    };
+    if (approvalStatus) {
+      where.approvalStatus = approvalStatus;
+    }
+    if (typeof departmentId === 'number') {
+      where.pesanan = { departmentPemesanId: departmentId };
+    }
+    return where;
+  }
+
+  private toRejectionItem(r: RejectionRequestRow): RejectionItem {
+    return {
+      id: r.pesanan.id,
+      requestId: r.id,
+      kodePesanan: r.pesanan.kodePesanan,
+      departmentId: r.pesanan.departmentPemesanId,
+      departmentName: r.pesanan.departemen?.namaDivisi ?? 'Unknown Department',
+      karyawanPemesanId: r.pesanan.karyawanPemesanId,
+      shiftId: r.pesanan.shiftId,
+      shiftName: r.pesanan.shift?.namaShift ?? 'Unknown Shift',
+      jumlahPesanan: r.jumlahPesananBaru ?? r.pesanan.jumlahPesanan,
+      jumlahPesananAwal: r.jumlahPesananAwal,
+      statusPesanan: r.pesanan.statusPesanan,
+      requiresApproval: r.approvalStatus === 'PENDING',
+      approvalStatus: r.approvalStatus,
+      catatanDapur: r.catatanDapur,
+      catatanAdmin: r.catatanAdmin ?? null,
+      waktuDibuat: r.pesanan.waktuDibuat,
+      requestType: r.requestType,
+      requestedById: r.requestedById ?? null,
+      requestedAt: r.requestedAt,
+      decidedAt: r.decidedAt ?? null,
+    };
+  }
+
+  /**
+   * Page through hot and archived approval requests merged by (requestedAt, id), newest
+   * first: keys from both tables first, then only the rows of the requested page.
+   */
+  private async findRejectionsAcrossArchive(
+    where: Prisma.PermintaanPersetujuanWhereInput,
+    skip: number,
+    take: number,
+  ) {
+    // Same columns and relation names, so the filter applies to both tables
+    const archiveWhere = where as Prisma.PermintaanPersetujuanArchiveWhereInput;
+    const keys = { id: true, requestedAt: true } as const;
+
+    const [hotKeys, archivedKeys, hotTotal, archivedTotal] = await Promise.all([
+      this.db.permintaanPersetujuan.findMany({
+        where,
+        orderBy: [...REJECTION_ORDER],
+        take: skip + take,
+        select: keys,
+      }),
+      this.db.permintaanPersetujuanArchive.findMany({
+        where: archiveWhere,
+        orderBy: [...REJECTION_ORDER],
+        take: skip + take,
+        select: keys,
+      }),
+      this.db.permintaanPersetujuan.count({ where }),
+      this.db.permintaanPersetujuanArchive.count({ where: archiveWhere }),
+    ]);
+
+    const pageKeys = [
+      ...hotKeys.map((key) => ({ ...key, archived: false })),
+      ...archivedKeys.map((key) => ({ ...key, archived: true })),
+    ]
+      .sort(
+        (a, b) =>
+          b.requestedAt.getTime() - a.requestedAt.getTime() || b.id - a.id,
+      )
+      .slice(skip, skip + take);
+
+    const hotIds = pageKeys.filter((k) => !k.archived).map((k) => k.id);
+    const archivedIds = pageKeys.filter((k) => k.archived).map((k) => k.id);
+    const [hotRows, archivedRows] = await Promise.all([
+      hotIds.length > 0
+        ? this.db.permintaanPersetujuan.findMany({
+            where: { id: { in: hotIds } },
+            include: REJECTION_INCLUDE,
+          })
+        : [],
+      archivedIds.length > 0
+        ? this.db.permintaanPersetujuanArchive.findMany({
+            where: { id: { in: archivedIds } },
+            include: REJECTION_INCLUDE,
+          })
+        : [],
+    ]);
+
+    const hotById = new Map(hotRows.map((row) => [row.id, row]));
+    const archivedById = new Map(archivedRows.map((row) => [row.id, row]));
+    const requests = pageKeys
+      .map((k) => (k.archived ? archivedById.get(k.id) : hotById.get(k.id)))
+      .filter((row): row is NonNullable<typeof row> => row !== undefined);
+
+    return { requests, total: hotTotal + archivedTotal };
+  }
+
+  /**
+   * Next keyset batch of hot and archived approval requests: keys from both tables
+   * first, merged by (requestedAt, id), then only the rows of the batch.
+   */
+  private async findRejectionBatchAcrossArchive(
+    where: Prisma.PermintaanPersetujuanWhereInput,
+    take: number,
+  ): Promise<RejectionRequestRow[]> {
+    const archiveWhere = where as Prisma.PermintaanPersetujuanArchiveWhereInput;
+    const keys = { id: true, requestedAt: true } as const;
+
+    const [hotKeys, archivedKeys] = await Promise.all([
+      this.db.permintaanPersetujuan.findMany({
+        where,
+        orderBy: [...REJECTION_ORDER],
+        take,
+        select: keys,
+      }),
+      this.db.permintaanPersetujuanArchive.findMany({
+        where: archiveWhere,
+        orderBy: [...REJECTION_ORDER],
+        take,
+        select: keys,
+      }),
+    ]);
+
+    const batchKeys = [
+      ...hotKeys.map((key) => ({ ...key, archived: false })),
+      ...archivedKeys.map((key) => ({ ...key, archived: true })),
+    ]
+      .sort(
+        (a, b) =>
+          b.requestedAt.getTime() - a.requestedAt.getTime() || b.id - a.id,
+      )
+      .slice(0, take);
+
+    const hotIds = batchKeys.filter((k) => !k.archived).map((k) => k.id);
+    const archivedIds = batchKeys.filter((k) => k.archived).map((k) => k.id);
+    const [hotRows, archivedRows] = await Promise.all([
+      hotIds.length > 0
+        ? this.db.permintaanPersetujuan.findMany({
+            where: { id: { in: hotIds } },
+            include: REJECTION_INCLUDE,
+          })
+        : [],
+      archivedIds.length > 0
+        ? this.db.permintaanPersetujuanArchive.findMany({
+            where: { id: { in: archivedIds } },
+            include: REJECTION_INCLUDE,
+          })
+        : [],
+    ]);
+
+    const hotById = new Map(hotRows.map((row) => [row.id, row]));
+    const archivedById = new Map(archivedRows.map((row) => [row.id, row]));
+    return batchKeys
+      .map((k): RejectionRequestRow | undefined =>
+        k.archived ? archivedById.get(k.id) : hotById.get(k.id),
+      )
+      .filter((row): row is RejectionRequestRow => row !== undefined);
+  }
 }
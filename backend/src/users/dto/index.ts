@@ -2,3 +2,6 @@ export { CreateUserDto } from './create-user.dto';
 export { UpdateUserStatusDto } from './update-user-status.dto';
 export { UpdateUserRoleDto } from './update-user-role.dto';
 export { UpdateUserProfileDto } from './update-user-profile.dto';
+export { QueryUsersDto } from './query-users.dto';
+export { KARYAWAN_LIST_SELECT, serializeKaryawanList } from './user-response.dto';
+export type { KaryawanListItem } from './user-response.dto';
@@ -0,0 +1,88 @@
+import 'reflect-metadata';
+import { ArgumentMetadata, ValidationPipe } from '@nestjs/common';
+import type { EventEmitter2 } from '@nestjs/event-emitter';
+import type { PrismaService } from '../../prisma/prisma.service';
+import type { AuditTrailService } from '../../common/services/audit-trail.service';
+import { UsersService } from '../users.service';
+import { QueryUsersDto } from './query-users.dto';
+
+// Opsi yang sama dengan ValidationPipe global di main.ts
+const pipe = new ValidationPipe({
+  whitelist: true,
+  transform: true,
+  forbidNonWhitelisted: true,
+  transformOptions: { enableImplicitConversion: true },
+});
+
+const metadata: ArgumentMetadata = { type: 'query', metatype: QueryUsersDto };
+
+const parse = (query: Record<string, string>): Promise<QueryUsersDto> =>
+  pipe.transform(query, metadata) as Promise<QueryUsersDto>;
+
+describe('QueryUsersDto', () => {
+  it.each([
+    ['true', true],
+    ['false', false],
+  ])('parses isActive=%s as %s', async (raw, expected) => {
+    const dto = await parse({ isActive: raw });
+    expect(dto.isActive).toBe(expected);
+  });
+
+  it('leaves isActive undefined when absent', async () => {
+    const dto = await parse({});
+    expect(dto.isActive).toBeUndefined();
+  });
+
+  it('rejects values other than true/false', async () => {
+    await expect(parse({ isActive: 'yes' })).rejects.toThrow();
+  });
+
+  it('converts page and limit to numbers', async () => {
+    const dto = await parse({ page: '2', limit: '50' });
+    expect(dto).toMatchObject({ page: 2, limit: 50 });
+  });
+
+  it('filters GET /users?isActive=false to inactive karyawan', async () => {
+    const findMany = jest.fn().mockResolvedValue([]);
+    const count = jest.fn().mockResolvedValue(0);
+    const prisma = {
+      karyawan: { findMany, count },
+    } as unknown as PrismaService;
+    const service = new UsersService(
+      prisma,
+      {} as AuditTrailService,
+      {} as EventEmitter2,
+    );
+
+    await service.findAll(await parse({ isActive: 'false' }));
+
+    expect(findMany).toHaveBeenCalledWith(
+      expect.objectContaining({ where: { AND: [{ isActive: false }] } }),
+    );
+  });
+
+  it('paginates GET /users even without page and limit', async () => {
+    const findMany = jest.fn().mockResolvedValue([]);
+    const count = jest.fn().mockResolvedValue(45);
+    const prisma = {
+      karyawan: { findMany, count },
+    } as unknown as PrismaService;
+    const service = new UsersService(
+      prisma,
+      {} as AuditTrailService,
+      {} as EventEmitter2,
+    );
+
+    const result = await service.findAll(await parse({}));
+
+    expect(findMany).toHaveBeenCalledWith(
+      expect.objectContaining({ skip: 0, take: 20 }),
+    );
+    expect(result).toMatchObject({
+      total: 45,
+      page: 1,
+      limit: 20,
+      totalPages: 3,
+    });
+  });
+});
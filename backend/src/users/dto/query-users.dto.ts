@@ -0,0 +1,57 @@
+import {
+  IsBoolean,
+  IsEnum,
+  IsInt,
+  IsOptional,
+  IsString,
+  Max,
+  MaxLength,
+  Min,
+} from 'class-validator';
+import { Transform, Type } from 'class-transformer';
+import { RoleAccessEnum, RoleAccessType } from './create-user.dto';
+
+export class QueryUsersDto {
+  // Pencarian NIK atau nama lengkap (case-insensitive, sebagian kata)
+  @IsString()
+  @IsOptional()
+  @MaxLength(100)
+  search?: string;
+
+  @IsInt()
+  @IsOptional()
+  @Type(() => Number)
+  departmentId?: number;
+
+  @IsEnum(RoleAccessEnum)
+  @IsOptional()
+  roleAccess?: RoleAccessType;
+
+  // Query string 'true'/'false' → boolean. Nilai dibaca dari objek mentah (obj[key]):
+  // enableImplicitConversion sudah menjalankan Boolean('false') === true sebelum @Transform,
+  // sehingga `value` tidak bisa dipakai.
+  @IsBoolean()
+  @IsOptional()
+  @Transform(({ obj, key }: { obj: Record<string, unknown>; key: string }) => {
+    const raw = obj[key];
+    return raw === 'true' || raw === true
+      ? true
+      : raw === 'false' || raw === false
+        ? false
+        : raw;
+  })
+  isActive?: boolean;
+
+  @IsInt()
+  @Min(1)
+  @IsOptional()
+  @Type(() => Number)
+  page?: number;
+
+  @IsInt()
+  @Min(1)
+  @Max(100)
+  @IsOptional()
+  @Type(() => Number)
+  limit?: number;
+}
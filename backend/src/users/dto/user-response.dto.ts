@@ -0,0 +1,85 @@
+import type { Prisma } from '@prisma/client';
+import {
+  compileSerializer,
+  JsonSchema,
+} from '../../common/serializers';
+
+/**
+ * Proyeksi kolom untuk daftar karyawan.
+ * Hanya field yang ditampilkan di halaman manajemen user; passwordHash tidak pernah dimuat.
+ * KARYAWAN_LIST_ITEM_SCHEMA adalah skema serializer yang sama persis: ubah keduanya bersamaan.
+ */
+export const KARYAWAN_LIST_SELECT = {
+  id: true,
+  userId: true,
+  nomorIndukKaryawan: true,
+  namaLengkap: true,
+  departmentId: true,
+  jabatanId: true,
+  roleAccess: true,
+  isActive: true,
+  keterangan: true,
+  createdAt: true,
+  updatedAt: true,
+  user: { select: { id: true, username: true, role: true } },
+  department: { select: { id: true, namaDivisi: true } },
+  jabatan: { select: { id: true, namaJabatan: true } },
+} satisfies Prisma.KaryawanSelect;
+
+export type KaryawanListItem = Prisma.KaryawanGetPayload<{
+  select: typeof KARYAWAN_LIST_SELECT;
+}>;
+
+const int = { type: 'integer' } as const;
+const nullableInt = { type: 'integer', nullable: true } as const;
+const str = { type: 'string' } as const;
+
+export const KARYAWAN_LIST_ITEM_SCHEMA: JsonSchema = {
+  type: 'object',
+  properties: {
+    id: int,
+    userId: nullableInt,
+    nomorIndukKaryawan: str,
+    namaLengkap: str,
+    departmentId: nullableInt,
+    jabatanId: nullableInt,
+    roleAccess: str,
+    isActive: { type: 'boolean' },
+    keterangan: { type: 'string', nullable: true },
+    createdAt: { type: 'date' },
+    updatedAt: { type: 'date' },
+    user: {
+      type: 'object',
+      nullable: true,
+      properties: { id: int, username: str, role: str },
+    },
+    department: {
+      type: 'object',
+      nullable: true,
+      properties: { id: int, namaDivisi: str },
+    },
+    jabatan: {
+      type: 'object',
+      nullable: true,
+      properties: { id: int, namaJabatan: str },
+    },
+  },
+};
+
+// GET /users: selalu { data, total, page, limit, totalPages }
+export const serializeKaryawanList = compileSerializer<{
+  data: KaryawanListItem[];
+  total: number;
+  page: number;
+  limit: number;
+  totalPages: number;
+}>({
+  type: 'object',
+  properties: {
+    data: { type: 'array', items: KARYAWAN_LIST_ITEM_SCHEMA },
+    total: int,
+    page: int,
+    limit: int,
+    totalPages: int,
+  },
+});
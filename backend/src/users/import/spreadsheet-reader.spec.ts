@@ -0,0 +1,246 @@
+import { deflateRawSync } from 'zlib';
+import { readSpreadsheetRows, SpreadsheetRow } from './spreadsheet-reader';
+
+type ZipFile = {
+  name: string;
+  data: string;
+  method?: number;
+  dataDescriptor?: boolean;
+};
+
+// Minimal ZIP writer (CRC tidak dihitung; reader tidak memeriksanya)
+function zip(files: ZipFile[]): Buffer {
+  const locals: Buffer[] = [];
+  const centrals: Buffer[] = [];
+  let offset = 0;
+
+  for (const file of files) {
+    const method = file.method ?? 8;
+    const raw = Buffer.from(file.data, 'utf8');
+    const body = method === 8 ? deflateRawSync(raw) : raw;
+    const name = Buffer.from(file.name, 'utf8');
+    const flags = file.dataDescriptor ? 0x8 : 0;
+
+    const local = Buffer.alloc(30);
+    local.writeUInt32LE(0x04034b50, 0);
+    local.writeUInt16LE(20, 4);
+    local.writeUInt16LE(flags, 6);
+    local.writeUInt16LE(method, 8);
+    // Dengan data descriptor, ukuran di local header dibiarkan 0
+    local.writeUInt32LE(file.dataDescriptor ? 0 : body.length, 18);
+    local.writeUInt32LE(file.dataDescriptor ? 0 : raw.length, 22);
+    local.writeUInt16LE(name.length, 26);
+
+    const parts = [local, name, body];
+    if (file.dataDescriptor) {
+      const descriptor = Buffer.alloc(16);
+      descriptor.writeUInt32LE(0x08074b50, 0);
+      descriptor.writeUInt32LE(body.length, 8);
+      descriptor.writeUInt32LE(raw.length, 12);
+      parts.push(descriptor);
+    }
+
+    const central = Buffer.alloc(46);
+    central.writeUInt32LE(0x02014b50, 0);
+    central.writeUInt16LE(20, 4);
+    central.writeUInt16LE(20, 6);
+    central.writeUInt16LE(flags, 8);
+    central.writeUInt16LE(method, 10);
+    central.writeUInt32LE(body.length, 20);
+    central.writeUInt32LE(raw.length, 24);
+    central.writeUInt16LE(name.length, 28);
+    central.writeUInt32LE(offset, 42);
+    centrals.push(central, name);
+
+    const entry = Buffer.concat(parts);
+    locals.push(entry);
+    offset += entry.length;
+  }
+
+  const directory = Buffer.concat(centrals);
+  const eocd = Buffer.alloc(22);
+  eocd.writeUInt32LE(0x06054b50, 0);
+  eocd.writeUInt16LE(files.length, 8);
+  eocd.writeUInt16LE(files.length, 10);
+  eocd.writeUInt32LE(directory.length, 12);
+  eocd.writeUInt32LE(offset, 16);
+  return Buffer.concat([...locals, directory, eocd]);
+}
+
+const sheet = (rows: string) =>
+  `<?xml version="1.0" encoding="UTF-8"?><worksheet><sheetData>${rows}</sheetData></worksheet>`;
+
+const read = (buffer: Buffer, filename?: string): SpreadsheetRow[] =>
+  Array.from(readSpreadsheetRows(buffer, filename));
+
+describe('readSpreadsheetRows (CSV)', () => {
+  it('reads quoted, multiline and escaped fields with spreadsheet row numbers', () => {
+    const csv =
+      'nik,namaLengkap,keterangan\r\n' +
+      'EMP001,"Budi, S.Kom","Catatan ""penting"""\r\n' +
+      'EMP002,Sari,"baris satu\nbaris dua"\r\n' +
+      'EMP003,Andi,\r\n';
+
+    expect(read(Buffer.from(csv), 'users.csv')).toEqual([
+      {
+        rowNumber: 2,
+        values: {
+          nik: 'EMP001',
+          namaLengkap: 'Budi, S.Kom',
+          keterangan: 'Catatan "penting"',
+        },
+      },
+      {
+        rowNumber: 3,
+        values: {
+          nik: 'EMP002',
+          namaLengkap: 'Sari',
+          keterangan: 'baris satu\nbaris dua',
+        },
+      },
+      // Baris sebelumnya memakan dua baris fisik
+      {
+        rowNumber: 5,
+        values: { nik: 'EMP003', namaLengkap: 'Andi', keterangan: '' },
+      },
+    ]);
+  });
+
+  it('strips a UTF-8 BOM and detects the semicolon delimiter', () => {
+    const csv = '\uFEFFnik;nama\nEMP001;Budi\n\n;\nEMP002;Sari';
+
+    expect(read(Buffer.from(csv, 'utf8'))).toEqual([
+      { rowNumber: 2, values: { nik: 'EMP001', nama: 'Budi' } },
+      { rowNumber: 5, values: { nik: 'EMP002', nama: 'Sari' } },
+    ]);
+  });
+});
+
+describe('readSpreadsheetRows (XLSX)', () => {
+  const workbookFiles = (sheetXml: string, sharedStrings?: string) => {
+    const files: ZipFile[] = [
+      {
+        name: 'xl/workbook.xml',
+        data: '<workbook><sheets><sheet name="Data" sheetId="1" r:id="rId7"/></sheets></workbook>',
+      },
+      {
+        name: 'xl/_rels/workbook.xml.rels',
+        data:
+          '<Relationships>' +
+          '<Relationship Id="rId1" Type="styles" Target="styles.xml"/>' +
+          '<Relationship Id="rId7" Type="worksheet" Target="worksheets/data.xml"/>' +
+          '</Relationships>',
+      },
+      { name: 'xl/worksheets/data.xml', data: sheetXml },
+    ];
+    if (sharedStrings !== undefined) {
+      files.push({ name: 'xl/sharedStrings.xml', data: sharedStrings });
+    }
+    return files;
+  };
+
+  it('reads shared, rich, inline, numeric and boolean cells from the sheet named in rels', () => {
+    const buffer = zip(
+      workbookFiles(
+        sheet(
+          '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>' +
+            '<c r="C1" t="inlineStr"><is><t>aktif</t></is></c></row>' +
+            '<row r="2"><c r="A2" t="s"><v>2</v></c>' +
+            '<c r="B2" t="inlineStr"><is><t>Budi &amp; Sari &#x263A;</t></is></c>' +
+            '<c r="C2" t="b"><v>1</v></c></row>' +
+            '<row r="3"><c r="A3"><v>12345</v></c><c r="B3" t="s"><v>3</v></c>' +
+            '<c r="C3" t="b"><v>0</v></c></row>',
+        ),
+        '<sst><si><t>nik</t></si><si><t>nama</t></si><si><t>EMP001</t></si>' +
+          '<si><r><t>An</t></r><r><t xml:space="preserve">di </t></r>' +
+          '<rPh><t>x</t></rPh></si></sst>',
+      ),
+    );
+
+    expect(read(buffer, 'users.xlsx')).toEqual([
+      {
+        rowNumber: 2,
+        values: { nik: 'EMP001', nama: 'Budi & Sari ☺', aktif: 'true' },
+      },
+      {
+        rowNumber: 3,
+        values: { nik: '12345', nama: 'Andi', aktif: 'false' },
+      },
+    ]);
+  });
+
+  it('fills sparse cells and keeps row numbers across skipped rows', () => {
+    const buffer = zip(
+      workbookFiles(
+        sheet(
+          '<row r="1"><c r="A1" t="inlineStr"><is><t>nik</t></is></c>' +
+            '<c r="B1" t="inlineStr"><is><t>nama</t></is></c>' +
+            '<c r="C1" t="inlineStr"><is><t>keterangan</t></is></c></row>' +
+            '<row r="4"><c r="A4" t="inlineStr"><is><t>EMP009</t></is></c>' +
+            '<c r="C4" t="inlineStr"><is><t>cuti</t></is></c></row>' +
+            '<row r="5" spans="1:3"/>',
+        ),
+      ),
+    );
+
+    expect(read(buffer)).toEqual([
+      {
+        rowNumber: 4,
+        values: { nik: 'EMP009', nama: '', keterangan: 'cuti' },
+      },
+    ]);
+  });
+
+  it('reads stored entries and entries written with a data descriptor', () => {
+    const buffer = zip([
+      {
+        name: 'xl/worksheets/sheet1.xml',
+        method: 0,
+        data: sheet(
+          '<row r="1"><c r="A1" t="s"><v>0</v></c></row>' +
+            '<row r="2"><c r="A2"><v>7</v></c></row>',
+        ),
+      },
+      {
+        name: 'xl/sharedStrings.xml',
+        dataDescriptor: true,
+        data: '<sst><si><t>nik</t></si></sst>',
+      },
+    ]);
+
+    expect(read(buffer)).toEqual([{ rowNumber: 2, values: { nik: '7' } }]);
+  });
+
+  it('rejects unsupported compression methods', () => {
+    const buffer = zip([
+      { name: 'xl/worksheets/sheet1.xml', method: 12, data: sheet('') },
+    ]);
+
+    expect(() => read(buffer)).toThrow(
+      'Unsupported XLSX compression method 12',
+    );
+  });
+
+  it('rejects entries whose offsets point outside the file', () => {
+    const buffer = zip([
+      { name: 'xl/worksheets/sheet1.xml', method: 0, data: sheet('') },
+    ]);
+    // Local header offset entri pertama di central directory
+    const directoryOffset = buffer.readUInt32LE(buffer.length - 22 + 16);
+    buffer.writeUInt32LE(buffer.length, directoryOffset + 42);
+
+    expect(() => read(buffer)).toThrow('Invalid XLSX file');
+  });
+
+  it('rejects ZIP64 archives and files without a zip directory', () => {
+    const buffer = zip([
+      { name: 'xl/worksheets/sheet1.xml', method: 0, data: sheet('') },
+    ]);
+    buffer.writeUInt32LE(0xffffffff, buffer.length - 22 + 16);
+
+    expect(() => read(buffer)).toThrow('Unsupported XLSX file (ZIP64)');
+    expect(() => read(Buffer.from('PK\x03\x04 not really a zip'))).toThrow(
+      'Invalid XLSX file (zip directory not found)',
+    );
+  });
+});
@@ -0,0 +1,350 @@
+import { inflateRawSync } from 'zlib';
+
+/**
+ * Spreadsheet Reader — pembaca CSV/XLSX tanpa dependensi tambahan
+ *
+ * Dipakai oleh UserImportService untuk bulk import karyawan.
+ * - CSV: delimiter ',' atau ';' (dideteksi dari baris header), field ber-quote, BOM UTF-8
+ * - XLSX: sheet pertama workbook; shared strings, inline strings, angka, dan boolean
+ *
+ * Baris dihasilkan satu per satu (generator) sehingga pemanggil dapat memproses dan
+ * membuang baris secara bertahap. Setiap baris membawa nomor baris spreadsheet
+ * (header = baris 1) untuk laporan error per baris.
+ *
+ * Batasan (disengaja; cukup untuk file hasil Excel/LibreOffice/Google Sheets):
+ * - Seluruh file dibaca dari buffer di memori (upload dibatasi 10 MB di controller).
+ * - ZIP: hanya metode stored (0) dan deflate (8); ZIP64 dan entri terenkripsi ditolak.
+ *   Ukuran dan offset diambil dari central directory (data descriptor tidak dibaca)
+ *   dan selalu dicek terhadap panjang buffer.
+ * - XML dibaca dengan regex, bukan parser XML penuh: hanya elemen row/c/v/is/t/si,
+ *   entity standar dan numeric character reference. Formula tidak dievaluasi (nilai
+ *   cache <v> yang dipakai); tanggal tetap berupa serial number Excel.
+ */
+
+export type SpreadsheetRow = {
+  rowNumber: number;
+  values: Record<string, string>;
+};
+
+// Batas ukuran XML hasil dekompresi (melindungi dari zip bomb)
+const MAX_XLSX_ENTRY_BYTES = 64 * 1024 * 1024;
+
+export function isXlsx(buffer: Buffer, filename?: string): boolean {
+  // Signature ZIP "PK\x03\x04"
+  const zipMagic =
+    buffer.length > 4 &&
+    buffer[0] === 0x50 &&
+    buffer[1] === 0x4b &&
+    buffer[2] === 0x03 &&
+    buffer[3] === 0x04;
+  return zipMagic || /\.xlsx$/i.test(filename ?? '');
+}
+
+/**
+ * readSpreadsheetRows
+ * Menghasilkan baris data (tanpa header) dari file CSV atau XLSX.
+ * Key pada `values` adalah teks header apa adanya (sudah di-trim).
+ */
+export function* readSpreadsheetRows(
+  buffer: Buffer,
+  filename?: string,
+): Generator<SpreadsheetRow> {
+  const records = isXlsx(buffer, filename)
+    ? readXlsxRecords(buffer)
+    : readCsvRecords(buffer);
+
+  let header: string[] | null = null;
+  for (const { rowNumber, cells } of records) {
+    if (!header) {
+      header = cells.map((c) => c.trim());
+      continue;
+    }
+    if (cells.every((c) => c.trim() === '')) continue;
+
+    const values: Record<string, string> = {};
+    header.forEach((name, idx) => {
+      if (name) values[name] = (cells[idx] ?? '').trim();
+    });
+    yield { rowNumber, values };
+  }
+}
+
+// ===== CSV =====
+
+function* readCsvRecords(
+  buffer: Buffer,
+): Generator<{ rowNumber: number; cells: string[] }> {
+  let text = buffer.toString('utf8');
+  if (text.charCodeAt(0) === 0xfeff) text = text.slice(1);
+
+  const firstLineEnd = text.search(/\r?\n/);
+  const firstLine = firstLineEnd === -1 ? text : text.slice(0, firstLineEnd);
+  const delimiter =
+    (firstLine.match(/;/g)?.length ?? 0) > (firstLine.match(/,/g)?.length ?? 0)
+      ? ';'
+      : ',';
+
+  let cells: string[] = [];
+  let field = '';
+  let inQuotes = false;
+  let line = 1;
+  let recordStart = 1;
+
+  for (let i = 0; i < text.length; i++) {
+    const ch = text[i];
+
+    if (inQuotes) {
+      if (ch === '"') {
+        if (text[i + 1] === '"') {
+          field += '"';
+          i++;
+        } else {
+          inQuotes = false;
+        }
+      } else {
+        if (ch === '\n') line++;
+        field += ch;
+      }
+      continue;
+    }
+
+    if (ch === '"' && field === '') {
+      inQuotes = true;
+    } else if (ch === delimiter) {
+      cells.push(field);
+      field = '';
+    } else if (ch === '\n' || ch === '\r') {
+      if (ch === '\r' && text[i + 1] === '\n') i++;
+      cells.push(field);
+      yield { rowNumber: recordStart, cells };
+      cells = [];
+      field = '';
+      line++;
+      recordStart = line;
+    } else {
+      field += ch;
+    }
+  }
+
+  if (field !== '' || cells.length > 0) {
+    cells.push(field);
+    yield { rowNumber: recordStart, cells };
+  }
+}
+
+// ===== XLSX =====
+
+type ZipEntry = {
+  method: number;
+  compressedSize: number;
+  localHeaderOffset: number;
+};
+
+function* readXlsxRecords(
+  buffer: Buffer,
+): Generator<{ rowNumber: number; cells: string[] }> {
+  const entries = readZipDirectory(buffer);
+  const sheetPath = resolveFirstSheetPath(buffer, entries);
+  const sharedStrings = entries.has('xl/sharedStrings.xml')
+    ? parseSharedStrings(readZipEntry(buffer, entries, 'xl/sharedStrings.xml'))
+    : [];
+  const sheetXml = readZipEntry(buffer, entries, sheetPath);
+
+  const rowRe = /<row\b([^>]*?)(?:\/>|>([\s\S]*?)<\/row>)/g;
+  const cellRe = /<c\b([^>]*?)(?:\/>|>([\s\S]*?)<\/c>)/g;
+  let fallbackRow = 0;
+  let rowMatch: RegExpExecArray | null;
+
+  while ((rowMatch = rowRe.exec(sheetXml)) !== null) {
+    const rowAttr = /\br="(\d+)"/.exec(rowMatch[1]);
+    const rowNumber = rowAttr ? Number(rowAttr[1]) : fallbackRow + 1;
+    fallbackRow = rowNumber;
+
+    const cells: string[] = [];
+    const body = rowMatch[2] ?? '';
+    let cellMatch: RegExpExecArray | null;
+    let nextCol = 0;
+    cellRe.lastIndex = 0;
+
+    while ((cellMatch = cellRe.exec(body)) !== null) {
+      const attrs = cellMatch[1];
+      const ref = /\br="([A-Z]+)\d*"/.exec(attrs);
+      const col = ref ? columnIndex(ref[1]) : nextCol;
+      nextCol = col + 1;
+
+      const type = /\bt="(\w+)"/.exec(attrs)?.[1];
+      const inner = cellMatch[2] ?? '';
+      let value = '';
+      if (type === 's') {
+        const idx = Number(/<v>([\s\S]*?)<\/v>/.exec(inner)?.[1]);
+        value = sharedStrings[idx] ?? '';
+      } else if (type === 'inlineStr') {
+        value = collectText(inner);
+      } else {
+        value = decodeXml(/<v>([\s\S]*?)<\/v>/.exec(inner)?.[1] ?? '');
+        if (type === 'b') value = value === '1' ? 'true' : 'false';
+      }
+
+      while (cells.length < col) cells.push('');
+      cells[col] = value;
+    }
+
+    yield { rowNumber, cells };
+  }
+}
+
+function readZipDirectory(buffer: Buffer): Map<string, ZipEntry> {
+  // End of central directory: signature 0x06054b50, dicari dari akhir file
+  let eocd = -1;
+  const minOffset = Math.max(0, buffer.length - 22 - 0xffff);
+  for (let i = buffer.length - 22; i >= minOffset; i--) {
+    if (buffer.readUInt32LE(i) === 0x06054b50) {
+      eocd = i;
+      break;
+    }
+  }
+  if (eocd === -1) {
+    throw new Error('Invalid XLSX file (zip directory not found)');
+  }
+
+  const count = buffer.readUInt16LE(eocd + 10);
+  let offset = buffer.readUInt32LE(eocd + 16);
+  if (count === 0xffff || offset === 0xffffffff) {
+    throw new Error('Unsupported XLSX file (ZIP64)');
+  }
+  const entries = new Map<string, ZipEntry>();
+
+  for (let i = 0; i < count; i++) {
+    if (offset + 46 > eocd || buffer.readUInt32LE(offset) !== 0x02014b50) {
+      throw new Error('Invalid XLSX file (corrupt zip directory)');
+    }
+    const flags = buffer.readUInt16LE(offset + 8);
+    const method = buffer.readUInt16LE(offset + 10);
+    const compressedSize = buffer.readUInt32LE(offset + 20);
+    const nameLength = buffer.readUInt16LE(offset + 28);
+    const extraLength = buffer.readUInt16LE(offset + 30);
+    const commentLength = buffer.readUInt16LE(offset + 32);
+    const localHeaderOffset = buffer.readUInt32LE(offset + 42);
+    const name = buffer.toString('utf8', offset + 46, offset + 46 + nameLength);
+    if (compressedSize === 0xffffffff || localHeaderOffset === 0xffffffff) {
+      throw new Error('Unsupported XLSX file (ZIP64)');
+    }
+    if (flags & 0x1) {
+      throw new Error(`Unsupported XLSX file (encrypted entry ${name})`);
+    }
+    entries.set(name, { method, compressedSize, localHeaderOffset });
+    offset += 46 + nameLength + extraLength + commentLength;
+  }
+
+  return entries;
+}
+
+function readZipEntry(
+  buffer: Buffer,
+  entries: Map<string, ZipEntry>,
+  name: string,
+): string {
+  const entry = entries.get(name);
+  if (!entry) {
+    throw new Error(`Invalid XLSX file (missing ${name})`);
+  }
+  const local = entry.localHeaderOffset;
+  if (local + 30 > buffer.length || buffer.readUInt32LE(local) !== 0x04034b50) {
+    throw new Error(`Invalid XLSX file (corrupt entry ${name})`);
+  }
+  const nameLength = buffer.readUInt16LE(local + 26);
+  const extraLength = buffer.readUInt16LE(local + 28);
+  const start = local + 30 + nameLength + extraLength;
+  if (start + entry.compressedSize > buffer.length) {
+    throw new Error(`Invalid XLSX file (truncated entry ${name})`);
+  }
+  const data = buffer.subarray(start, start + entry.compressedSize);
+
+  if (entry.method === 0) return data.toString('utf8');
+  if (entry.method === 8) {
+    return inflateRawSync(data, {
+      maxOutputLength: MAX_XLSX_ENTRY_BYTES,
+    }).toString('utf8');
+  }
+  throw new Error(`Unsupported XLSX compression method ${entry.method}`);
+}
+
+function resolveFirstSheetPath(
+  buffer: Buffer,
+  entries: Map<string, ZipEntry>,
+): string {
+  const fallback = 'xl/worksheets/sheet1.xml';
+  if (
+    !entries.has('xl/workbook.xml') ||
+    !entries.has('xl/_rels/workbook.xml.rels')
+  ) {
+    return fallback;
+  }
+  const workbook = readZipEntry(buffer, entries, 'xl/workbook.xml');
+  const relId = /<sheet\b[^>]*\br:id="([^"]+)"/.exec(workbook)?.[1];
+  if (!relId) return fallback;
+
+  const rels = readZipEntry(buffer, entries, 'xl/_rels/workbook.xml.rels');
+  const relRe = /<Relationship\b([^>]*)\/?>/g;
+  let m: RegExpExecArray | null;
+  while ((m = relRe.exec(rels)) !== null) {
+    if (new RegExp(`\\bId="${relId}"`).test(m[1])) {
+      const target = /\bTarget="([^"]+)"/.exec(m[1])?.[1];
+      if (!target) break;
+      const path = target.startsWith('/')
+        ? target.slice(1)
+        : `xl/${target.replace(/^\.\//, '')}`;
+      return entries.has(path) ? path : fallback;
+    }
+  }
+  return fallback;
+}
+
+function parseSharedStrings(xml: string): string[] {
+  const out: string[] = [];
+  const siRe = /<si\b[^>]*>([\s\S]*?)<\/si>/g;
+  let m: RegExpExecArray | null;
+  while ((m = siRe.exec(xml)) !== null) {
+    out.push(collectText(m[1]));
+  }
+  return out;
+}
+
+// Menggabungkan seluruh <t> (termasuk rich text run), mengabaikan phonetic run <rPh>
+function collectText(xml: string): string {
+  const withoutPhonetic = xml.replace(/<rPh\b[\s\S]*?<\/rPh>/g, '');
+  let text = '';
+  const tRe = /<t\b[^>]*>([\s\S]*?)<\/t>/g;
+  let m: RegExpExecArray | null;
+  while ((m = tRe.exec(withoutPhonetic)) !== null) {
+    text += decodeXml(m[1]);
+  }
+  return text;
+}
+
+function columnIndex(letters: string): number {
+  let n = 0;
+  for (const ch of letters) n = n * 26 + (ch.charCodeAt(0) - 64);
+  return n - 1;
+}
+
+function decodeXml(s: string): string {
+  return s.replace(/&(#x[0-9a-fA-F]+|#\d+|amp|lt|gt|quot|apos);/g, (_, e) => {
+    switch (e) {
+      case 'amp':
+        return '&';
+      case 'lt':
+        return '<';
+      case 'gt':
+        return '>';
+      case 'quot':
+        return '"';
+      case 'apos':
+        return "'";
+      default:
+        return String.fromCodePoint(
+          e[1] === 'x' ? parseInt(e.slice(2), 16) : parseInt(e.slice(1), 10),
+        );
+    }
+  });
+}
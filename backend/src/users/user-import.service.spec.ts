@@ -0,0 +1,181 @@
+import { BadRequestException } from '@nestjs/common';
+import type { EventEmitter2 } from '@nestjs/event-emitter';
+import type { PrismaService } from '../prisma/prisma.service';
+import type { AuditTrailService } from '../common/services/audit-trail.service';
+import { UserImportService } from './user-import.service';
+
+type Rows = Array<Record<string, unknown>>;
+
+function setup(takenNiks: string[] = []) {
+  const tx = {
+    user: {
+      createManyAndReturn: jest.fn(({ data }: { data: Rows }) =>
+        Promise.resolve(
+          data.map((u, idx) => ({ id: 100 + idx, username: u.username })),
+        ),
+      ),
+    },
+    karyawan: {
+      createManyAndReturn: jest.fn(({ data }: { data: Rows }) =>
+        Promise.resolve(
+          data.map((k, idx) => ({
+            id: 200 + idx,
+            nomorIndukKaryawan: k.nomorIndukKaryawan,
+          })),
+        ),
+      ),
+    },
+  };
+  const prisma = {
+    $queryRaw: jest.fn().mockResolvedValue(takenNiks.map((nik) => ({ nik }))),
+    // Hanya department 1 yang ada
+    department: {
+      findMany: jest.fn(({ where }: { where: { id: { in: number[] } } }) =>
+        Promise.resolve(
+          where.id.in.filter((id) => id === 1).map((id) => ({ id })),
+        ),
+      ),
+    },
+    jabatan: { findMany: jest.fn().mockResolvedValue([]) },
+    $transaction: jest.fn(async (fn: (client: typeof tx) => unknown) =>
+      fn(tx),
+    ),
+  };
+  const auditTrail = {
+    log: jest.fn().mockResolvedValue(undefined),
+    logUsersCreated: jest.fn().mockResolvedValue(undefined),
+  };
+  const eventEmitter = { emit: jest.fn() };
+  const service = new UserImportService(
+    prisma as unknown as PrismaService,
+    auditTrail as unknown as AuditTrailService,
+    eventEmitter as unknown as EventEmitter2,
+  );
+  return { service, prisma, tx, auditTrail, eventEmitter };
+}
+
+const csvFile = (lines: string[]) => ({
+  originalname: 'users.csv',
+  buffer: Buffer.from(lines.join('\n'), 'utf8'),
+});
+
+describe('UserImportService.importUsers', () => {
+  it('creates valid rows and reports every rejected row with its reason', async () => {
+    const { service, prisma, tx, auditTrail, eventEmitter } = setup([
+      'EMP002',
+    ]);
+
+    const report = await service.importUsers(
+      1,
+      csvFile([
+        'NIK,Nama,Password,Role,Department ID',
+        'EMP001,Budi,rahasia1,employee,1',
+        'EMP002,Sari,rahasia2,employee,',
+        'EMP001,Budi Lagi,rahasia3,employee,',
+        'EMP004,Andi,123,employee,',
+        'EMP005,Dewi,rahasia5,dapur,9',
+        'EMP006,Eko,rahasia6,Delivery,',
+      ]),
+    );
+
+    expect(report).toEqual({
+      totalRows: 6,
+      created: 2,
+      failed: 4,
+      errors: [
+        { row: 3, nik: 'EMP002', errors: ['NIK already exists'] },
+        {
+          row: 4,
+          nik: 'EMP001',
+          errors: ['Duplicate NIK in file (first seen on row 2)'],
+        },
+        {
+          row: 5,
+          nik: 'EMP004',
+          errors: [expect.stringContaining('password')],
+        },
+        { row: 6, nik: 'EMP005', errors: ['Department 9 not found'] },
+      ],
+    });
+
+    // Keunikan NIK dicek sekali untuk seluruh file
+    expect(prisma.$queryRaw).toHaveBeenCalledTimes(1);
+    expect(prisma.$queryRaw.mock.calls[0]).toContainEqual([
+      'EMP001',
+      'EMP002',
+      'EMP005',
+      'EMP006',
+    ]);
+
+    const [{ data: users }] = tx.user.createManyAndReturn.mock.calls[0];
+    expect(users.map((u) => [u.username, u.role])).toEqual([
+      ['EMP001', 'employee'],
+      ['EMP006', 'delivery'],
+    ]);
+    expect(users[0].passwordHash).not.toBe('rahasia1');
+    const [{ data: karyawan }] = tx.karyawan.createManyAndReturn.mock.calls[0];
+    expect(karyawan).toEqual([
+      expect.objectContaining({
+        userId: 100,
+        nomorIndukKaryawan: 'EMP001',
+        departmentId: 1,
+      }),
+      expect.objectContaining({
+        userId: 101,
+        nomorIndukKaryawan: 'EMP006',
+        departmentId: null,
+      }),
+    ]);
+
+    expect(auditTrail.logUsersCreated).toHaveBeenCalledWith(1, [
+      'EMP001',
+      'EMP006',
+    ]);
+    expect(auditTrail.log).toHaveBeenCalledWith(
+      expect.objectContaining({ aksi: 'USER_BULK_IMPORT' }),
+    );
+    expect(eventEmitter.emit).toHaveBeenCalledTimes(2);
+  });
+
+  it('reports every row of a batch whose transaction fails', async () => {
+    const { service, prisma, auditTrail } = setup();
+    prisma.$transaction.mockRejectedValueOnce(new Error('unique violation'));
+
+    const report = await service.importUsers(
+      1,
+      csvFile(['nik,nama,password,role', 'EMP001,Budi,rahasia1,employee']),
+    );
+
+    expect(report).toEqual({
+      totalRows: 1,
+      created: 0,
+      failed: 1,
+      errors: [
+        {
+          row: 2,
+          nik: 'EMP001',
+          errors: ['Batch insert failed; row was not imported'],
+        },
+      ],
+    });
+    expect(auditTrail.log).not.toHaveBeenCalled();
+  });
+
+  it('rejects a missing file, a header-only file and an unreadable XLSX', async () => {
+    const { service, prisma } = setup();
+
+    await expect(service.importUsers(1, undefined)).rejects.toThrow(
+      BadRequestException,
+    );
+    await expect(
+      service.importUsers(1, csvFile(['nik,nama,password,role'])),
+    ).rejects.toThrow('Import file has no data rows');
+    await expect(
+      service.importUsers(1, {
+        originalname: 'users.xlsx',
+        buffer: Buffer.from('not a zip file'),
+      }),
+    ).rejects.toThrow('Failed to read import file: Invalid XLSX file');
+    expect(prisma.$transaction).not.toHaveBeenCalled();
+  });
+});
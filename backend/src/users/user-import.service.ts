@@ -0,0 +1,395 @@
+import { BadRequestException, Injectable, Logger } from '@nestjs/common';
+import { EventEmitter2 } from '@nestjs/event-emitter';
+import { plainToInstance } from 'class-transformer';
+import { validate, ValidationError } from 'class-validator';
+import bcrypt from 'bcrypt';
+import type { Prisma } from '@prisma/client';
+import { PrismaService } from '../prisma/prisma.service';
+import { AuditTrailService } from '../common/services/audit-trail.service';
+import { CreateUserDto } from './dto';
+import { readSpreadsheetRows } from './import/spreadsheet-reader';
+
+/**
+ * UserImportService — Bulk import karyawan dari CSV/XLSX
+ *
+ * Alur:
+ * 1. Baris file dibaca satu per satu (CSV/XLSX) dan divalidasi dengan aturan CreateUserDto.
+ * 2. NIK duplikat di dalam file ditolak per baris.
+ * 3. Keunikan NIK/username terhadap database dicek sekali untuk seluruh file (satu query
+ *    set-based), begitu juga keberadaan departmentId/jabatanId yang dirujuk.
+ * 4. Password di-hash dengan konkurensi terbatas. bcrypt (native) menjalankan hashing di
+ *    threadpool libuv, sehingga event loop tetap bebas; konkurensi disesuaikan dengan
+ *    ukuran threadpool agar request lain yang butuh threadpool tidak kelaparan.
+ * 5. User + Karyawan disisipkan per batch dalam satu transaksi (dua INSERT multi-baris via
+ *    createManyAndReturn). Audit USER_CREATED ditulis per batch dalam satu INSERT multi-baris.
+ *
+ * Hasil: laporan per baris (nomor baris spreadsheet, NIK, daftar pesan error).
+ *
+ * Format kolom (header baris pertama, tidak case-sensitive):
+ * - nik (alias: nomorIndukKaryawan), namaLengkap (alias: nama), password,
+ *   roleAccess (alias: role), departmentId?, jabatanId?, keterangan?
+ */
+
+export type UploadedSpreadsheetFile = {
+  originalname?: string;
+  mimetype?: string;
+  size?: number;
+  buffer: Buffer;
+};
+
+export type UserImportRowError = {
+  row: number;
+  nik: string | null;
+  errors: string[];
+};
+
+export type UserImportReport = {
+  totalRows: number;
+  created: number;
+  failed: number;
+  errors: UserImportRowError[];
+};
+
+type ImportCandidate = {
+  row: number;
+  dto: CreateUserDto;
+};
+
+const MAX_IMPORT_ROWS = 5000;
+const IMPORT_BATCH_SIZE = 250;
+const SALT_ROUNDS = 10;
+
+// Header (dinormalisasi: lowercase, tanpa spasi/tanda baca) → properti CreateUserDto
+const HEADER_ALIASES: Record<string, keyof CreateUserDto> = {
+  nik: 'nik',
+  nomorindukkaryawan: 'nik',
+  namalengkap: 'namaLengkap',
+  nama: 'namaLengkap',
+  password: 'password',
+  roleaccess: 'roleAccess',
+  role: 'roleAccess',
+  departmentid: 'departmentId',
+  jabatanid: 'jabatanId',
+  keterangan: 'keterangan',
+};
+
+@Injectable()
+export class UserImportService {
+  private readonly logger = new Logger(UserImportService.name);
+  private readonly hashConcurrency: number;
+
+  constructor(
+    private readonly prisma: PrismaService,
+    private readonly auditTrail: AuditTrailService,
+    private readonly eventEmitter: EventEmitter2,
+  ) {
+    // Sisakan satu thread libuv untuk fs/dns/crypto lain selama import berjalan
+    const poolSize = parseInt(process.env.UV_THREADPOOL_SIZE ?? '4', 10);
+    this.hashConcurrency = Math.max(
+      1,
+      (Number.isFinite(poolSize) ? poolSize : 4) - 1,
+    );
+  }
+
+  /**
+   * importUsers
+   * Memproses file CSV/XLSX dan membuat akun untuk setiap baris valid.
+   *
+   * Error:
+   * - BadRequestException jika file kosong, tidak bisa dibaca, atau melebihi MAX_IMPORT_ROWS.
+   *   Kesalahan per baris tidak menggagalkan import; dilaporkan di `errors`.
+   */
+  async importUsers(
+    adminKaryawanId: number,
+    file: UploadedSpreadsheetFile | undefined,
+  ): Promise<UserImportReport> {
+    if (!file?.buffer || file.buffer.length === 0) {
+      throw new BadRequestException(
+        'File is required (multipart field "file")',
+      );
+    }
+
+    const errors: UserImportRowError[] = [];
+    const candidates: ImportCandidate[] = [];
+    const seenNiks = new Map<string, number>();
+    let totalRows = 0;
+
+    try {
+      for (const { rowNumber, values } of readSpreadsheetRows(
+        file.buffer,
+        file.originalname,
+      )) {
+        totalRows++;
+        if (totalRows > MAX_IMPORT_ROWS) {
+          throw new BadRequestException(
+            `Import is limited to ${MAX_IMPORT_ROWS} rows per file`,
+          );
+        }
+
+        const plain = this.mapRow(values);
+        const nik = typeof plain.nik === 'string' ? plain.nik : null;
+        const dto = plainToInstance(CreateUserDto, plain);
+        const validationErrors = await validate(dto, {
+          whitelist: true,
+          forbidNonWhitelisted: true,
+        });
+        if (validationErrors.length > 0) {
+          errors.push({
+            row: rowNumber,
+            nik,
+            errors: this.flattenValidationErrors(validationErrors),
+          });
+          continue;
+        }
+
+        const firstRow = seenNiks.get(dto.nik);
+        if (firstRow !== undefined) {
+          errors.push({
+            row: rowNumber,
+            nik: dto.nik,
+            errors: [`Duplicate NIK in file (first seen on row ${firstRow})`],
+          });
+          continue;
+        }
+        seenNiks.set(dto.nik, rowNumber);
+        candidates.push({ row: rowNumber, dto });
+      }
+    } catch (err) {
+      if (err instanceof BadRequestException) throw err;
+      throw new BadRequestException(
+        `Failed to read import file: ${(err as Error)?.message ?? 'Unknown error'}`,
+      );
+    }
+
+    if (totalRows === 0) {
+      throw new BadRequestException('Import file has no data rows');
+    }
+
+    const accepted = await this.rejectConflicts(candidates, errors);
+
+    let created = 0;
+    for (let i = 0; i < accepted.length; i += IMPORT_BATCH_SIZE) {
+      const batch = accepted.slice(i, i + IMPORT_BATCH_SIZE);
+      created += await this.insertBatch(adminKaryawanId, batch, errors);
+    }
+
+    if (created > 0) {
+      await this.auditTrail.log({
+        userId: adminKaryawanId,
+        aksi: 'USER_BULK_IMPORT',
+        detail: `Admin imported ${created} of ${totalRows} users from ${file.originalname ?? 'upload'}`,
+      });
+    }
+
+    errors.sort((a, b) => a.row - b.row);
+    return { totalRows, created, failed: errors.length, errors };
+  }
+
+  // Helpers
+
+  /**
+   * Satu query set-based untuk NIK/username yang sudah terpakai, plus cek master data
+   * yang dirujuk. Baris yang bentrok dipindahkan ke daftar error.
+   */
+  private async rejectConflicts(
+    candidates: ImportCandidate[],
+    errors: UserImportRowError[],
+  ): Promise<ImportCandidate[]> {
+    if (candidates.length === 0) return [];
+
+    const niks = candidates.map((c) => c.dto.nik);
+    const departmentIds = this.distinctIds(candidates, 'departmentId');
+    const jabatanIds = this.distinctIds(candidates, 'jabatanId');
+
+    const [taken, departments, jabatans] = await Promise.all([
+      this.prisma.$queryRaw<Array<{ nik: string }>>`
+        SELECT nomor_induk_karyawan AS nik FROM master_karyawan
+        WHERE nomor_induk_karyawan = ANY(${niks})
+        UNION
+        SELECT username AS nik FROM users
+        WHERE username = ANY(${niks})
+      `,
+      departmentIds.length > 0
+        ? this.prisma.department.findMany({
+            where: { id: { in: departmentIds } },
+            select: { id: true },
+          })
+        : Promise.resolve([]),
+      jabatanIds.length > 0
+        ? this.prisma.jabatan.findMany({
+            where: { id: { in: jabatanIds } },
+            select: { id: true },
+          })
+        : Promise.resolve([]),
+    ]);
+
+    const takenNiks = new Set(taken.map((t) => t.nik));
+    const knownDepartments = new Set(departments.map((d) => d.id));
+    const knownJabatans = new Set(jabatans.map((j) => j.id));
+
+    const accepted: ImportCandidate[] = [];
+    for (const candidate of candidates) {
+      const { dto, row } = candidate;
+      const rowErrors: string[] = [];
+      if (takenNiks.has(dto.nik)) {
+        rowErrors.push('NIK already exists');
+      }
+      if (
+        typeof dto.departmentId === 'number' &&
+        !knownDepartments.has(dto.departmentId)
+      ) {
+        rowErrors.push(`Department ${dto.departmentId} not found`);
+      }
+      if (
+        typeof dto.jabatanId === 'number' &&
+        !knownJabatans.has(dto.jabatanId)
+      ) {
+        rowErrors.push(`Jabatan ${dto.jabatanId} not found`);
+      }
+
+      if (rowErrors.length > 0) {
+        errors.push({ row, nik: dto.nik, errors: rowErrors });
+      } else {
+        accepted.push(candidate);
+      }
+    }
+    return accepted;
+  }
+
+  /**
+   * Hash password batch lalu sisipkan User + Karyawan dalam satu transaksi.
+   * Jika transaksi gagal (mis. NIK dibuat bersamaan oleh admin lain), seluruh baris batch
+   * dilaporkan gagal dan import berlanjut ke batch berikutnya.
+   */
+  private async insertBatch(
+    adminKaryawanId: number,
+    batch: ImportCandidate[],
+    errors: UserImportRowError[],
+  ): Promise<number> {
+    const hashes = await this.mapWithConcurrency(
+      batch,
+      this.hashConcurrency,
+      (c) => bcrypt.hash(c.dto.password, SALT_ROUNDS),
+    );
+
+    let createdKaryawan: Array<{ id: number; nomorIndukKaryawan: string }>;
+    try {
+      createdKaryawan = await this.prisma.$transaction(
+        async (tx: Prisma.TransactionClient) => {
+          const users = await tx.user.createManyAndReturn({
+            data: batch.map((c, idx) => ({
+              username: c.dto.nik,
+              passwordHash: hashes[idx],
+              role: c.dto.roleAccess as any,
+            })),
+            select: { id: true, username: true },
+          });
+          const userIdByNik = new Map(users.map((u) => [u.username, u.id]));
+
+          return tx.karyawan.createManyAndReturn({
+            data: batch.map(({ dto }) => ({
+              userId: userIdByNik.get(dto.nik) ?? null,
+              nomorIndukKaryawan: dto.nik,
+              namaLengkap: dto.namaLengkap,
+              departmentId: dto.departmentId ?? null,
+              jabatanId: dto.jabatanId ?? null,
+              roleAccess: dto.roleAccess as any,
+              isActive: true,
+              keterangan: dto.keterangan ?? null,
+            })),
+            select: { id: true, nomorIndukKaryawan: true },
+          });
+        },
+      );
+    } catch (err) {
+      const message = (err as Error)?.message ?? 'Unknown error';
+      this.logger.warn(`User import batch failed: ${message}`);
+      for (const { row, dto } of batch) {
+        errors.push({
+          row,
+          nik: dto.nik,
+          errors: ['Batch insert failed; row was not imported'],
+        });
+      }
+      return 0;
+    }
+
+    const niks = createdKaryawan.map((k) => k.nomorIndukKaryawan);
+    try {
+      await this.auditTrail.logUsersCreated(adminKaryawanId, niks);
+    } catch (err) {
+      this.logger.error(
+        `Failed to write audit for imported users: ${String(err)}`,
+      );
+    }
+
+    const timestamp = new Date();
+    for (const k of createdKaryawan) {
+      this.eventEmitter.emit('user.created', {
+        karyawanId: k.id,
+        nik: k.nomorIndukKaryawan,
+        timestamp,
+      });
+    }
+
+    return createdKaryawan.length;
+  }
+
+  private mapRow(values: Record<string, string>): Record<string, unknown> {
+    const plain: Record<string, unknown> = {};
+    for (const [header, raw] of Object.entries(values)) {
+      const normalized = header.toLowerCase().replace(/[^a-z0-9]/g, '');
+      const key = HEADER_ALIASES[normalized];
+      if (!key || raw === '') continue;
+
+      if (key === 'departmentId' || key === 'jabatanId') {
+        plain[key] = /^\d+$/.test(raw) ? Number(raw) : raw;
+      } else if (key === 'roleAccess') {
+        plain[key] = raw.toLowerCase();
+      } else {
+        plain[key] = raw;
+      }
+    }
+    return plain;
+  }
+
+  private flattenValidationErrors(
+    validationErrors: ValidationError[],
+  ): string[] {
+    return validationErrors.flatMap((e) =>
+      Object.values(e.constraints ?? {}).map(String),
+    );
+  }
+
+  private distinctIds(
+    candidates: ImportCandidate[],
+    key: 'departmentId' | 'jabatanId',
+  ): number[] {
+    const ids = new Set<number>();
+    for (const { dto } of candidates) {
+      const id = dto[key];
+      if (typeof id === 'number') ids.add(id);
+    }
+    return Array.from(ids);
+  }
+
+  private async mapWithConcurrency<T, R>(
+    items: T[],
+    limit: number,
+    fn: (item: T) => Promise<R>,
+  ): Promise<R[]> {
+    const results = new Array<R>(items.length);
+    let next = 0;
+    const workers = Array.from(
+      { length: Math.min(limit, items.length) },
+      async () => {
+        while (next < items.length) {
+          const idx = next++;
+          results[idx] = await fn(items[idx]);
+        }
+      },
+    );
+    await Promise.all(workers);
+    return results;
+  }
+}
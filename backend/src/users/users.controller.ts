@@ -5,23 +5,43 @@ import {
   Patch,
   Body,
   Param,
+  Query,
   ParseIntPipe,
   UseGuards,
   HttpCode,
   HttpStatus,
+  UploadedFile,
+  UseInterceptors,
 } from '@nestjs/common';
 import { AuthGuard } from '@nestjs/passport';
+import { FileInterceptor } from '@nestjs/platform-express';
 import { UsersService } from './users.service';
+import {
+  UserImportService,
+  UserImportReport,
+  UploadedSpreadsheetFile,
+} from './user-import.service';
 import { Roles, CurrentUser } from '../common/decorators';
 import { RolesGuard } from '../common/guards';
+import { SerializeWith } from '../common/serializers';
 import { JwtPayload } from '../common/interfaces/jwt-payload.interface';
-import { CreateUserDto, UpdateUserStatusDto, UpdateUserRoleDto, UpdateUserProfileDto } from './dto';
+import {
+  CreateUserDto,
+  UpdateUserStatusDto,
+  UpdateUserRoleDto,
+  UpdateUserProfileDto,
+  QueryUsersDto,
+  serializeKaryawanList,
+} from './dto';
 import { CreateUserAliasPipe } from '../common/pipes/alias-transform.pipes';
 
 @Controller('users')
 @UseGuards(AuthGuard('jwt'), RolesGuard)
 export class UsersController {
-  constructor(private readonly usersService: UsersService) {}
+  constructor(
+    private readonly usersService: UsersService,
+    private readonly userImportService: UserImportService,
+  ) {}
 
   // POST /api/users
   @Post()
@@ -34,11 +54,26 @@ export class UsersController {
     return this.usersService.createUser(admin.karyawanId, createUserDto);
   }
 
-  // GET /api/users
+  // POST /api/users/import (multipart/form-data, field "file": CSV atau XLSX)
+  @Post('import')
+  @Roles('administrator')
+  @HttpCode(HttpStatus.OK)
+  @UseInterceptors(
+    FileInterceptor('file', { limits: { fileSize: 10 * 1024 * 1024 } }),
+  )
+  async importUsers(
+    @UploadedFile() file: UploadedSpreadsheetFile | undefined,
+    @CurrentUser() admin: JwtPayload,
+  ): Promise<UserImportReport> {
+    return this.userImportService.importUsers(admin.karyawanId, file);
+  }
+
+  // GET /api/users?search=&departmentId=&roleAccess=&isActive=&page=&limit=
   @Get()
   @Roles('administrator')
-  async findAll(): Promise<any[]> {
-    return this.usersService.findAll();
+  @SerializeWith(serializeKaryawanList)
+  async findAll(@Query() query: QueryUsersDto): Promise<any> {
+    return this.usersService.findAll(query);
   }
 
   // GET /api/users/:id
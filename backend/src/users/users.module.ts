@@ -1,11 +1,12 @@
 import { Module } from '@nestjs/common';
 import { UsersController } from './users.controller';
 import { UsersService } from './users.service';
+import { UserImportService } from './user-import.service';
 import { RolesGuard } from '../common/guards';
 
 @Module({
   controllers: [UsersController],
-  providers: [UsersService, RolesGuard],
+  providers: [UsersService, UserImportService, RolesGuard],
   exports: [UsersService],
 })
 export class UsersModule {}
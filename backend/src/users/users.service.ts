@@ -3,7 +3,8 @@
  *
  * Lingkup Tanggung Jawab:
  * - Penciptaan akun (User + Karyawan) secara transaksi atomik dengan validasi konflik
- * - Pembacaan data karyawan (list/detail) termasuk relasi (user, department, jabatan)
+ * - Pembacaan data karyawan (list/detail) termasuk relasi (user, department, jabatan);
+ *   list mendukung paginasi, pencarian NIK/nama, filter, dan proyeksi kolom
  * - Perubahan status aktif/non-aktif karyawan disertai audit log
  * - Perubahan role akses (User.role + Karyawan.roleAccess) dalam transaksi yang konsisten
  * - Reset password user dengan password sementara (dikembalikan ke admin), disertai audit
@@ -28,19 +29,29 @@ import {
   NotFoundException,
   BadRequestException,
 } from '@nestjs/common';
+import { EventEmitter2 } from '@nestjs/event-emitter';
 import { PrismaService } from '../prisma/prisma.service';
 import { AuditTrailService } from '../common/services/audit-trail.service';
 import bcrypt from 'bcrypt';
-import { CreateUserDto, UpdateUserStatusDto, UpdateUserRoleDto, UpdateUserProfileDto } from './dto';
+import {
+  CreateUserDto,
+  UpdateUserStatusDto,
+  UpdateUserRoleDto,
+  UpdateUserProfileDto,
+  QueryUsersDto,
+  KARYAWAN_LIST_SELECT,
+} from './dto';
 import type { Prisma } from '@prisma/client';
 
 const SALT_ROUNDS = 10;
+const DEFAULT_PAGE_SIZE = 20;
 
 @Injectable()
 export class UsersService {
   constructor(
     private readonly prisma: PrismaService,
     private readonly auditTrail: AuditTrailService,
+    private readonly eventEmitter: EventEmitter2,
   ) {}
 
   /**
@@ -49,6 +60,7 @@ export class UsersService {
    * - Hashes password with bcrypt
    * - Creates User then Karyawan in a transaction
    * - Logs audit trail
+   * - Emits 'user.created' (mis. untuk membersihkan cache negatif NIK di LoginThrottleService)
    */
   async createUser(adminKaryawanId: number, createUserDto: CreateUserDto) {
     const {
@@ -110,6 +122,12 @@ export class UsersService {
 
     await this.auditTrail.logUserCreated(adminKaryawanId, nik);
 
+    this.eventEmitter.emit('user.created', {
+      karyawanId: createdKaryawan.id,
+      nik,
+      timestamp: new Date(),
+    });
+
     // Return with relations
     return this.prisma.karyawan.findUnique({
       where: { id: createdKaryawan.id },
@@ -118,12 +136,63 @@ export class UsersService {
   }
 
   /**
-   * Get all karyawan including relations
+   * List karyawan dengan filter, pencarian, dan paginasi server-side
+   * - search: NIK atau nama lengkap (ILIKE, didukung index trigram)
+   * - filter: departmentId, roleAccess, isActive
+   * - Kolom diproyeksikan via KARYAWAN_LIST_SELECT (tanpa passwordHash)
+   * - Selalu dipaginasi (default halaman 1, DEFAULT_PAGE_SIZE baris):
+   *   { data, total, page, limit, totalPages }
    */
-  async findAll() {
-    return this.prisma.karyawan.findMany({
-      include: { user: true, department: true, jabatan: true },
-    });
+  async findAll(queryDto: QueryUsersDto = {}) {
+    const { search, departmentId, roleAccess, isActive, page, limit } =
+      queryDto;
+
+    const andFilters: Prisma.KaryawanWhereInput[] = [];
+
+    const q = search?.trim();
+    if (q) {
+      andFilters.push({
+        OR: [
+          { nomorIndukKaryawan: { contains: q, mode: 'insensitive' } },
+          { namaLengkap: { contains: q, mode: 'insensitive' } },
+        ],
+      });
+    }
+    if (typeof departmentId === 'number') {
+      andFilters.push({ departmentId });
+    }
+    if (roleAccess) {
+      andFilters.push({ roleAccess: roleAccess as any });
+    }
+    if (typeof isActive === 'boolean') {
+      andFilters.push({ isActive });
+    }
+
+    const where: Prisma.KaryawanWhereInput =
+      andFilters.length > 0 ? { AND: andFilters } : {};
+    const orderBy: Prisma.KaryawanOrderByWithRelationInput[] = [
+      { namaLengkap: 'asc' },
+      { id: 'asc' },
+    ];
+
+    const currentPage = page ?? 1;
+    const take = limit ?? DEFAULT_PAGE_SIZE;
+    const skip = (currentPage - 1) * take;
+
+    const [data, total] = await Promise.all([
+      this.prisma.karyawan.findMany({
+        where,
+        orderBy,
+        skip,
+        take,
+        select: KARYAWAN_LIST_SELECT,
+      }),
+      this.prisma.karyawan.count({ where }),
+    ]);
+
+    const totalPages = Math.ceil(total / take);
+
+    return { data, total, page: currentPage, limit: take, totalPages };
   }
 
   /**
@@ -172,6 +241,13 @@ export class UsersService {
       updateStatusDto.isActive,
     );
 
+    this.eventEmitter.emit('user.status.changed', {
+      karyawanId: id,
+      nik: target.nomorIndukKaryawan,
+      isActive: updateStatusDto.isActive,
+      timestamp: new Date(),
+    });
+
     return this.prisma.karyawan.findUnique({
       where: { id },
       include: { user: true, department: true, jabatan: true },
@@ -220,6 +296,13 @@ export class UsersService {
       detail: `Admin changed role of user ${target.nomorIndukKaryawan} to ${updateRoleDto.roleAccess}`,
     });
 
+    this.eventEmitter.emit('user.role.changed', {
+      karyawanId: id,
+      nik: target.nomorIndukKaryawan,
+      roleAccess: updateRoleDto.roleAccess,
+      timestamp: new Date(),
+    });
+
     return this.prisma.karyawan.findUnique({
       where: { id },
       include: { user: true, department: true, jabatan: true },
@@ -259,6 +342,12 @@ export class UsersService {
       target.nomorIndukKaryawan,
     );
 
+    this.eventEmitter.emit('user.password.reset', {
+      karyawanId: id,
+      nik: target.nomorIndukKaryawan,
+      timestamp: new Date(),
+    });
+
     return {
       message: 'Temporary password generated and set successfully',
       tempPassword,
@@ -0,0 +1,168 @@
+import type { OrderStatusChangedEvent } from '../common/events/order-status-changed.event';
+import type { OrderApprovalRequestedEvent } from '../common/events/order-approval-requested.event';
+import type { OrderApprovalDecidedEvent } from '../common/events/order-approval-decided.event';
+import type { OrdersMaterializedEvent } from '../common/events/orders-materialized.event';
+
+/**
+ * Skema wire ringkas untuk event order.* di namespace /notifications.
+ *
+ * - `v`: versi skema wire; naikkan bila bentuk payload berubah tidak kompatibel
+ * - `version`: versi baris pesanan setelah perubahan (kolom `version`)
+ * - `changes`: field pesanan yang ditulis oleh perubahan (tanggal dalam ISO)
+ *
+ * Klien menerapkan `changes` ke state lokal bila `version` lebih baru dari versi
+ * yang dimilikinya, sehingga tidak perlu refetch REST. Data pelaku (NIK/role pengubah)
+ * dan id yang hanya dipakai untuk routing room tidak ikut dikirim.
+ */
+export const ORDER_WIRE_VERSION = 1;
+
+export type OrderPatch = Record<string, string | number | boolean | null>;
+
+export interface OrderWireBase {
+  v: typeof ORDER_WIRE_VERSION;
+  orderId: number;
+  kodePesanan: string;
+  version?: number;
+  changes?: OrderPatch;
+  timestamp: string;
+}
+
+export interface OrderCreatedWire extends OrderWireBase {
+  departmentId?: number;
+  shiftId?: number;
+  jumlahPesanan?: number;
+  tanggalPesanan?: string;
+}
+
+export interface OrderStatusChangedWire extends OrderWireBase {
+  oldStatus: string | null;
+  newStatus: string;
+  karyawanPemesanId: number;
+}
+
+export interface OrderApprovalRequestedWire extends OrderWireBase {
+  requestType: 'REJECT' | 'EDIT';
+  catatanDapur: string;
+  jumlahPesananBaru?: number;
+  departmentId: number;
+  karyawanPemesanId: number;
+}
+
+export interface OrderApprovalDecidedWire extends OrderWireBase {
+  decision: string;
+  originalRequest: 'REJECT' | 'EDIT';
+  catatanAdmin: string | null;
+  requestedBy: number;
+}
+
+export function toOrderCreatedWire(event: any): OrderCreatedWire {
+  return {
+    v: ORDER_WIRE_VERSION,
+    orderId: event?.orderId,
+    kodePesanan: event?.kodePesanan,
+    departmentId: event?.departmentId ?? event?.deptId,
+    shiftId: event?.shiftId,
+    jumlahPesanan: event?.jumlahPesanan,
+    tanggalPesanan: toIso(event?.tanggalPesanan) ?? undefined,
+    version: event?.version,
+    timestamp: toIso(event?.timestamp) ?? new Date().toISOString(),
+  };
+}
+
+export function toOrderStatusChangedWire(
+  event: OrderStatusChangedEvent,
+): OrderStatusChangedWire {
+  return {
+    v: ORDER_WIRE_VERSION,
+    orderId: event.orderId,
+    kodePesanan: event.kodePesanan,
+    oldStatus: event.oldStatus,
+    newStatus: event.newStatus,
+    karyawanPemesanId: event.karyawanPemesanId,
+    version: event.version,
+    changes: toPatch(event.changes),
+    timestamp: toIso(event.timestamp) ?? new Date().toISOString(),
+  };
+}
+
+export function toOrderApprovalRequestedWire(
+  event: OrderApprovalRequestedEvent,
+): OrderApprovalRequestedWire {
+  return {
+    v: ORDER_WIRE_VERSION,
+    orderId: event.orderId,
+    kodePesanan: event.kodePesanan,
+    requestType: event.requestType,
+    catatanDapur: event.catatanDapur,
+    jumlahPesananBaru: event.jumlahPesananBaru,
+    departmentId: event.departmentId,
+    karyawanPemesanId: event.karyawanPemesanId,
+    version: event.version,
+    changes: toPatch(event.changes),
+    timestamp: toIso(event.timestamp) ?? new Date().toISOString(),
+  };
+}
+
+export function toOrderApprovalDecidedWire(
+  event: OrderApprovalDecidedEvent,
+): OrderApprovalDecidedWire {
+  return {
+    v: ORDER_WIRE_VERSION,
+    orderId: event.orderId,
+    kodePesanan: event.kodePesanan,
+    decision: event.decision,
+    originalRequest: event.originalRequest,
+    catatanAdmin: event.catatanAdmin,
+    requestedBy: event.requestedBy,
+    version: event.version,
+    changes: toPatch(event.changes),
+    timestamp: toIso(event.timestamp) ?? new Date().toISOString(),
+  };
+}
+
+// Ringkasan pesanan massal dari standing order; dengan `departmentId` hanya angka department itu
+export interface OrdersMaterializedWire {
+  v: typeof ORDER_WIRE_VERSION;
+  tanggalPesanan: string;
+  orders: number;
+  meals: number;
+  departmentId?: number;
+  timestamp: string;
+}
+
+export function toOrdersMaterializedWire(
+  event: OrdersMaterializedEvent,
+  departmentId?: number,
+): OrdersMaterializedWire {
+  const cell =
+    typeof departmentId === 'number'
+      ? event.byDepartment.find((d) => d.departmentId === departmentId)
+      : undefined;
+  return {
+    v: ORDER_WIRE_VERSION,
+    tanggalPesanan: event.tanggalPesanan,
+    orders: cell ? cell.orders : event.totalOrders,
+    meals: cell ? cell.meals : event.totalMeals,
+    ...(cell ? { departmentId } : {}),
+    timestamp: toIso(event.timestamp) ?? new Date().toISOString(),
+  };
+}
+
+function toPatch(changes?: Record<string, unknown>): OrderPatch | undefined {
+  if (!changes) return undefined;
+  const patch: OrderPatch = {};
+  for (const [key, value] of Object.entries(changes)) {
+    if (value === undefined) continue;
+    patch[key] =
+      value instanceof Date
+        ? value.toISOString()
+        : (value as string | number | boolean | null);
+  }
+  return patch;
+}
+
+function toIso(value: unknown): string | null {
+  if (value instanceof Date) return value.toISOString();
+  if (typeof value === 'string' && value.length > 0) return value;
+  return null;
+}
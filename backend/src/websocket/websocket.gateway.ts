@@ -1,7 +1,13 @@
 import { JwtService } from '@nestjs/jwt';
-import { UseGuards, Injectable, Logger } from '@nestjs/common';
+import { UseGuards, Injectable, Logger, Optional } from '@nestjs/common';
 import { ConfigService } from '@nestjs/config';
-import { WebSocketGateway, WebSocketServer } from '@nestjs/websockets';
+import {
+  ConnectedSocket,
+  MessageBody,
+  SubscribeMessage,
+  WebSocketGateway,
+  WebSocketServer,
+} from '@nestjs/websockets';
 import type {
   OnGatewayInit,
   OnGatewayConnection,
@@ -11,24 +17,46 @@ import { Server, Socket } from 'socket.io';
 import { OnEvent } from '@nestjs/event-emitter';
 
 import { WsJwtGuard } from './websocket.guard';
+import { MetricsService, GaugeSample } from '../metrics/metrics.service';
 import type { JwtPayload } from '../common/interfaces/jwt-payload.interface';
 import type { OrderStatusChangedEvent } from '../common/events/order-status-changed.event';
 import type { OrderApprovalRequestedEvent } from '../common/events/order-approval-requested.event';
 import type { OrderApprovalDecidedEvent } from '../common/events/order-approval-decided.event';
+import type { OrdersMaterializedEvent } from '../common/events/orders-materialized.event';
+import type { OrderCountersSummary } from '../orders/order-status-counters.service';
+import type { ExportJob } from '../reports/services/export-job.service';
+import {
+  toOrderApprovalDecidedWire,
+  toOrderApprovalRequestedWire,
+  toOrderCreatedWire,
+  toOrderStatusChangedWire,
+  toOrdersMaterializedWire,
+} from './order-event-wire';
+import { readInt } from '../common/utils';
+
+// Batas delay setTimeout (~24,8 hari); expiry yang lebih jauh dijadwalkan ulang bertahap.
+const MAX_TIMER_MS = 2 ** 31 - 1;
 
 /**
  * WebSocket Gateway untuk real-time notifications.
  *
  * Spesifikasi:
  * - Namespace: /notifications
- * - Guard: WsJwtGuard (autentikasi JWT via handshake)
+ * - Autentikasi: JWT diverifikasi sekali saat handshake (middleware namespace);
+ *   WsJwtGuard pada message handler hanya memeriksa payload yang sudah di-cache
  * - Lifecycle: init, connection, disconnect
- * - Event listeners: order.created, order.status.changed, order.approval.requested, order.approval.decided
+ * - Event listeners: order.created, order.status.changed, order.approval.requested, order.approval.decided,
+ *   order.counters.updated, export.job.updated
  * - Room management: role, department, user/karyawan
+ * - Payload order.*: skema wire ringkas dan berversi (lihat order-event-wire.ts)
  * - CORS: dikonfigurasi via ConfigService (CORS_ORIGIN)
  *
  * Catatan:
- * - WsJwtGuard akan menempelkan JwtPayload ke client.data.user jika token valid.
+ * - Middleware handshake menempelkan JwtPayload ke client.data.user dan expiry token
+ *   ke client.data.authExpiresAt. Koneksi dengan token tidak valid ditolak (connect_error).
+ * - WS_REAUTH_LEAD_SECONDS (default 60) sebelum expiry, server mengirim 'auth.expiring'.
+ *   Klien mengirim access token baru lewat 'auth.refresh' tanpa reconnect; jika tidak,
+ *   server mengirim 'auth.expired' lalu memutus socket saat token kedaluwarsa.
  * - DepartmentId diambil dari handshake (auth/query) karena tidak tersedia di JwtPayload.
  *   Klien dapat mengirimkan departmentId melalui:
  *     - socket(auth: { token, departmentId })
@@ -44,19 +72,54 @@ export class NotificationsGateway
   implements OnGatewayInit, OnGatewayConnection, OnGatewayDisconnect
 {
   private readonly logger = new Logger(NotificationsGateway.name);
+  private readonly reauthLeadMs: number;
 
   constructor(
     private readonly configService: ConfigService,
     private readonly jwtService: JwtService,
-  ) {}
+    @Optional() private readonly metrics?: MetricsService,
+  ) {
+    this.reauthLeadMs =
+      readInt(this.configService, 'WS_REAUTH_LEAD_SECONDS', 60) * 1000;
+    metrics?.registerGauge(
+      'websocket_connections',
+      'Connected sockets on the /notifications namespace',
+      () => (this.server as any)?.sockets?.size ?? 0,
+    );
+    metrics?.registerGauge(
+      'websocket_room_members',
+      'Socket memberships per room prefix (numeric ids collapsed to *)',
+      () => this.collectRoomMembership(),
+    );
+  }
 
   @WebSocketServer()
   server!: Server;
 
   /**
-   * Gateway initialization: refine CORS menggunakan ConfigService.
+   * Gateway initialization:
+   * - Pasang middleware autentikasi handshake (verifikasi JWT sekali per koneksi)
+   * - Log konfigurasi CORS
    */
   afterInit(server: Server): void {
+    server.use((client, next) => {
+      const token = this.getTokenFromHandshake(client);
+      const payload = token ? this.verifyToken(token) : undefined;
+      if (!payload) {
+        this.countAuth('rejected');
+        this.logger.warn(`Unauthorized connection attempt from ${client.id}`);
+        next(
+          new Error(
+            token ? 'Invalid or expired token' : 'Missing authentication token',
+          ),
+        );
+        return;
+      }
+      this.setAuth(client, payload);
+      this.countAuth('accepted');
+      next();
+    });
+
     // CORS sudah dikonfigurasi melalui DedicatedSocketIoAdapter (global adapter).
     // Tidak perlu mutasi runtime terhadap server.opts.
     const origin = this.resolveCorsOrigin();
@@ -69,40 +132,24 @@ export class NotificationsGateway
 
   /**
    * Ketika client terkoneksi:
-   * - Validasi payload user (hasil guard)
+   * - Ambil payload user hasil verifikasi handshake
+   * - Jadwalkan pengingat/pemutusan saat token kedaluwarsa
    * - Ekstrak departmentId dari handshake
    * - Gabungkan client ke rooms: role, department, user (sub), karyawanId, dan kombinasi dept+role
    */
   handleConnection(client: Socket): void {
     try {
-      let user = this.getUserFromClient(client);
-      // Fallback manual verification using token from handshake
-      if (!user) {
-        const token = this.getTokenFromHandshake(client);
-        if (token) {
-          try {
-            const secret =
-              this.configService.get<string>('JWT_SECRET') || 'supersecretjwt';
-            const payload = this.jwtService.verify<JwtPayload>(token, {
-              secret,
-            });
-            (client as any).data = (client as any).data ?? {};
-            (client as any).data.user = payload;
-            user = payload;
-          } catch (e) {
-            this.logger.warn(
-              `Unauthorized connection attempt (verify failed) from ${client.id}`,
-            );
-          }
-        }
-      }
+      const user = this.getUserFromClient(client);
       if (!user) {
         this.logger.warn(`Unauthorized connection attempt from ${client.id}`);
         client.disconnect(true);
         return;
       }
 
+      this.scheduleAuthExpiry(client);
+
       const departmentId = this.extractDepartmentId(client);
+      (client as any).data.departmentId = departmentId;
       this.joinRooms(client, user, departmentId);
 
       this.logger.log(
@@ -120,6 +167,7 @@ export class NotificationsGateway
    * Lifecycle disconnect.
    */
   handleDisconnect(client: Socket): void {
+    this.clearAuthTimer(client);
     const user = this.getUserFromClient(client);
     this.logger.log(
       `Client disconnected: id=${client.id}, user.sub=${user?.sub ?? 'unknown'}`,
@@ -128,6 +176,48 @@ export class NotificationsGateway
     // Tidak membutuhkan pembersihan manual.
   }
 
+  /**
+   * Message: perbarui token in-band tanpa reconnect.
+   * - Payload: { token } berisi access token baru (hasil POST /api/auth/refresh)
+   * - Token harus milik user yang sama (sub); rooms disusun ulang bila role/karyawan berubah
+   * - Ack: { ok: true, expiresAt } atau { ok: false, error }
+   */
+  @SubscribeMessage('auth.refresh')
+  handleAuthRefresh(
+    @ConnectedSocket() client: Socket,
+    @MessageBody() body: { token?: unknown } | undefined,
+  ): { ok: boolean; expiresAt?: string | null; error?: string } {
+    const current = this.getUserFromClient(client);
+    const token =
+      typeof body?.token === 'string' && body.token.trim().length > 0
+        ? body.token.trim()
+        : null;
+    const payload = token ? this.verifyToken(token) : undefined;
+    if (!current || !payload || payload.sub !== current.sub) {
+      this.countAuth('refresh_rejected');
+      return { ok: false, error: 'Invalid or expired token' };
+    }
+
+    this.setAuth(client, payload);
+    if (
+      payload.role !== current.role ||
+      payload.karyawanId !== current.karyawanId
+    ) {
+      for (const room of Array.from(client.rooms)) {
+        if (room !== client.id) client.leave(room);
+      }
+      this.joinRooms(client, payload, (client as any).data.departmentId);
+    }
+    this.scheduleAuthExpiry(client);
+    this.countAuth('refreshed');
+
+    const expiresAt: number | undefined = (client as any).data.authExpiresAt;
+    return {
+      ok: true,
+      expiresAt: expiresAt ? new Date(expiresAt).toISOString() : null,
+    };
+  }
+
   /**
    * Listener: Pesanan baru dibuat.
    * Audience utama: Dapur (per-department) dan Administrator (global).
@@ -144,7 +234,7 @@ export class NotificationsGateway
       }
       rooms.push('role:administrator');
 
-      this.emitToRooms(rooms, 'order.created', event);
+      this.emitToRooms(rooms, 'order.created', toOrderCreatedWire(event));
       this.logger.debug(
         `Broadcast order.created → rooms=${JSON.stringify(
           rooms,
@@ -205,7 +295,11 @@ export class NotificationsGateway
       // Selalu informasikan karyawan pemesan secara langsung
       rooms.push(`karyawan:${event.karyawanPemesanId}`);
 
-      this.emitToRooms(rooms, 'order.status.changed', event);
+      this.emitToRooms(
+        rooms,
+        'order.status.changed',
+        toOrderStatusChangedWire(event),
+      );
       this.logger.debug(
         `Broadcast order.status.changed → rooms=${JSON.stringify(
           rooms,
@@ -230,7 +324,11 @@ export class NotificationsGateway
         `dept:${event.departmentId}:role:administrator`,
         `karyawan:${event.karyawanPemesanId}`,
       ];
-      this.emitToRooms(rooms, 'order.approval.requested', event);
+      this.emitToRooms(
+        rooms,
+        'order.approval.requested',
+        toOrderApprovalRequestedWire(event),
+      );
       this.logger.debug(
         `Broadcast order.approval.requested → rooms=${JSON.stringify(
           rooms,
@@ -255,7 +353,11 @@ export class NotificationsGateway
         'role:administrator',
         `karyawan:${event.requestedBy}`,
       ];
-      this.emitToRooms(rooms, 'order.approval.decided', event);
+      this.emitToRooms(
+        rooms,
+        'order.approval.decided',
+        toOrderApprovalDecidedWire(event),
+      );
       this.logger.debug(
         `Broadcast order.approval.decided → rooms=${JSON.stringify(
           rooms,
@@ -268,6 +370,159 @@ export class NotificationsGateway
     }
   }
 
+  /**
+   * Listener: Pesanan massal dari standing order dibuat (satu event per run, bukan per pesanan).
+   * Audience: Administrator (total) dan Dapur per department (angka department-nya).
+   */
+  @OnEvent('orders.materialized')
+  handleOrdersMaterialized(event: OrdersMaterializedEvent): void {
+    try {
+      this.emitToRooms(
+        ['role:administrator'],
+        'orders.materialized',
+        toOrdersMaterializedWire(event),
+      );
+      for (const { departmentId } of event.byDepartment) {
+        this.emitToRooms(
+          [`dept:${departmentId}:role:dapur`],
+          'orders.materialized',
+          toOrdersMaterializedWire(event, departmentId),
+        );
+      }
+      this.logger.debug(
+        `Broadcast orders.materialized → date=${event.tanggalPesanan} orders=${event.totalOrders}`,
+      );
+    } catch (err) {
+      this.logger.error(`orders.materialized broadcast failed: ${String(err)}`);
+    }
+  }
+
+  /**
+   * Listener: Ringkasan counter pesanan hari ini berubah (sudah di-coalesce per detik).
+   * Audience: dashboard Administrator, Dapur, dan Delivery.
+   */
+  @OnEvent('order.counters.updated')
+  handleCountersUpdated(summary: OrderCountersSummary): void {
+    try {
+      const rooms = ['role:administrator', 'role:dapur', 'role:delivery'];
+      this.emitToRooms(rooms, 'order.counters.updated', summary);
+      this.logger.debug(
+        `Broadcast order.counters.updated → version=${summary.version}`,
+      );
+    } catch (err) {
+      this.logger.error(
+        `order.counters.updated broadcast failed: ${String(err)}`,
+      );
+    }
+  }
+
+  /**
+   * Listener: Status/progres export job berubah.
+   * Audience: hanya karyawan yang mengajukan export.
+   */
+  @OnEvent('export.job.updated')
+  handleExportJobUpdated(job: ExportJob): void {
+    try {
+      this.emitToRooms(
+        [`karyawan:${job.requestedBy}`],
+        'export.job.updated',
+        job,
+      );
+      this.logger.debug(
+        `Broadcast export.job.updated → job=${job.id}, status=${job.status}, progress=${job.progress}`,
+      );
+    } catch (err) {
+      this.logger.error(`export.job.updated broadcast failed: ${String(err)}`);
+    }
+  }
+
+  /**
+   * Helper: verifikasi access token. Undefined bila tidak valid/kedaluwarsa.
+   */
+  private verifyToken(token: string): JwtPayload | undefined {
+    try {
+      const secret =
+        this.configService.get<string>('JWT_SECRET') || 'supersecretjwt';
+      return this.jwtService.verify<JwtPayload>(token, { secret });
+    } catch {
+      return undefined;
+    }
+  }
+
+  /**
+   * Helper: cache payload dan expiry token di client.data.
+   */
+  private setAuth(client: Socket, payload: JwtPayload): void {
+    const data = ((client as any).data = (client as any).data ?? {});
+    data.user = payload;
+    data.authExpiresAt =
+      typeof payload.exp === 'number' ? payload.exp * 1000 : undefined;
+    data.authWarned = false;
+  }
+
+  /**
+   * Helper: satu timer per socket.
+   * - WS_REAUTH_LEAD_SECONDS sebelum expiry → emit 'auth.expiring'
+   * - saat expiry → emit 'auth.expired' lalu disconnect
+   */
+  private scheduleAuthExpiry(client: Socket): void {
+    this.clearAuthTimer(client);
+    const data = (client as any).data;
+    const expiresAt: number | undefined = data?.authExpiresAt;
+    if (typeof expiresAt !== 'number') return;
+
+    const remaining = expiresAt - Date.now();
+    const target =
+      !data.authWarned && remaining > this.reauthLeadMs
+        ? remaining - this.reauthLeadMs
+        : remaining;
+    data.authTimer = setTimeout(
+      () => this.onAuthTimer(client),
+      Math.min(Math.max(target, 0), MAX_TIMER_MS),
+    ).unref();
+  }
+
+  private onAuthTimer(client: Socket): void {
+    const data = (client as any).data;
+    data.authTimer = undefined;
+    const expiresAt: number | undefined = data?.authExpiresAt;
+    if (typeof expiresAt !== 'number' || !client.connected) return;
+
+    const remaining = expiresAt - Date.now();
+    if (remaining <= 0) {
+      this.countAuth('expired');
+      client.emit('auth.expired', {
+        expiresAt: new Date(expiresAt).toISOString(),
+      });
+      client.disconnect(true);
+      return;
+    }
+    if (!data.authWarned && remaining <= this.reauthLeadMs) {
+      data.authWarned = true;
+      client.emit('auth.expiring', {
+        expiresAt: new Date(expiresAt).toISOString(),
+      });
+    }
+    this.scheduleAuthExpiry(client);
+  }
+
+  private clearAuthTimer(client: Socket): void {
+    const data = (client as any).data;
+    if (data?.authTimer) {
+      clearTimeout(data.authTimer);
+      data.authTimer = undefined;
+    }
+  }
+
+  private countAuth(result: string): void {
+    this.metrics?.increment(
+      'websocket_auth_total',
+      { result },
+      1,
+      'WebSocket token verifications by result',
+    );
+  }
+
   /**
    * Helper: gabungkan client ke rooms berdasarkan role, department, user, karyawan.
    */
@@ -303,6 +558,28 @@ export class NotificationsGateway
     );
   }
 
+  /**
+   * Helper: jumlah anggota per prefix room untuk metrik.
+   * Contoh: 'dept:3:role:dapur' → 'dept:*:role:dapur', 'user:12' → 'user:*'.
+   * Room privat per socket (id socket) tidak dihitung.
+   */
+  private collectRoomMembership(): GaugeSample[] {
+    const nsp: any = this.server;
+    const rooms: Map<string, Set<string>> | undefined = nsp?.adapter?.rooms;
+    if (!rooms) return [];
+
+    const totals = new Map<string, number>();
+    for (const [room, members] of rooms) {
+      if (nsp.sockets?.has(room)) continue;
+      const prefix = room.replace(/:\d+(?=:|$)/g, ':*');
+      totals.set(prefix, (totals.get(prefix) ?? 0) + members.size);
+    }
+    return Array.from(totals, ([room, value]) => ({
+      labels: { room },
+      value,
+    }));
+  }
+
   /**
    * Helper: emit ke rooms (union semantics).
    */
@@ -317,7 +594,7 @@ export class NotificationsGateway
   }
 
   /**
-   * Ambil JwtPayload hasil WsJwtGuard dari client.
+   * Ambil JwtPayload hasil verifikasi handshake dari client.
    */
   private getUserFromClient(client: Socket): JwtPayload | undefined {
     const data: any = (client as any).data;
@@ -326,8 +603,10 @@ export class NotificationsGateway
   }
 
   /**
-   * Fallback: Ekstrak token dari handshake untuk verifikasi manual pada tahap koneksi.
-   * Guard WsJwtGuard tidak selalu menempel pada event connection, sehingga kita validasi di sini.
+   * Ekstrak token dari Socket.IO handshake (hanya dipakai sekali, oleh middleware handshake):
+   * - handshake.auth.token
+   * - handshake.headers.authorization: "Bearer <token>"
+   * - handshake.query.token
    */
   private getTokenFromHandshake(client: Socket): string | null {
     // 1) Prefer dari handshake.auth.token (Socket.IO v4)
@@ -361,6 +640,7 @@ export class NotificationsGateway
 
     return null;
   }
+
   /**
    * Ekstrak departmentId dari handshake (auth atau query).
    */
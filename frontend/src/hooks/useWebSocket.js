@@ -6,7 +6,8 @@ import { useAuthStore } from '@/stores/auth.store';
  * Custom hook: useWebSocket
  * - Mengelola koneksi Socket.IO ke namespace /notifications
  * - Autentikasi dengan JWT accessToken dari auth store
- * - Auto re-connect saat accessToken berubah
+ * - accessToken baru dikirim in-band ke koneksi aktif (re-connect hanya saat department berubah)
+ * - Refresh token otomatis saat server mengirim 'auth.expiring'/'auth.expired'
  * - Mendaftarkan handler untuk event tertentu
  * - Cleanup otomatis saat unmount
  *
@@ -29,6 +30,10 @@ export function useWebSocket(event, handler, deps = []) {
         const unsubscribe = socketManager.subscribeStatus(setStatus);
         return () => unsubscribe();
     }, []);
+    // Refresh token atas permintaan server; token baru kembali lewat effect di bawah
+    useEffect(() => {
+        socketManager.setAuthRefresher(() => useAuthStore.getState().refreshAuth?.());
+    }, []);
     // Kelola koneksi berdasarkan accessToken/departmentId
     useEffect(() => {
         let cancelled = false;
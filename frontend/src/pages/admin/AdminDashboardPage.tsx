@@ -18,20 +18,11 @@ import {
   YAxis,
   CartesianGrid,
 } from 'recharts';
-import { toISODateOnly, formatDateTime } from '@/utils/date.utils';
+import { formatDateTime } from '@/utils/date.utils';
 import { getStatusBadgeVariant, getStatusLabel } from '@/utils/status.utils';
-import {
-  getOrders,
-  getPendingApprovals,
-} from '@/services/api/orders.api';
-import {
-  getDepartmentReport,
-  getConsumptionReport,
-} from '@/services/api/reports.api';
-import type { Order } from '@/types/order.types';
-import type { DepartmentReportItem, ConsumptionReportItem } from '@/types/report.types';
+import { getDashboard } from '@/services/api/dashboard.api';
+import type { AdminDashboard, DashboardOrder } from '@/types/dashboard.types';
 import { StatusPesanan } from '@/types/order.types';
-import { addDays } from 'date-fns';
 
 const CHART_COLORS = ['#10B981', '#F59E0B', '#3B82F6', '#8B5CF6', '#0EA5E9', '#64748B', '#C084FC', '#14B8A6'];
 
@@ -43,15 +34,9 @@ interface StatusCount {
 export default function AdminDashboardPage() {
   const navigate = useNavigate();
   const [isLoading, setIsLoading] = useState(true);
-  const [todayOrders, setTodayOrders] = useState<Order[]>([]);
-  const [deptReport, setDeptReport] = useState<DepartmentReportItem[]>([]);
-  const [, setConsumption] = useState<ConsumptionReportItem[]>([]);
-  const [pendingApprovals, setPendingApprovals] = useState<Order[]>([]);
+  const [dashboard, setDashboard] = useState<AdminDashboard | null>(null);
   const [, setError] = useState<string | null>(null);
 
-  const todayISO = toISODateOnly(new Date());
-  const weekStartISO = toISODateOnly(addDays(new Date(), -6));
-
   useEffect(() => {
     let mounted = true;
 
@@ -59,24 +44,10 @@ export default function AdminDashboardPage() {
       setIsLoading(true);
       setError(null);
       try {
-        const [
-          todayOrdersPage,
-          deptItems,
-          consumptionItems,
-          pendingApprovalItems,
-        ] = await Promise.all([
-          getOrders({ tanggalMulai: todayISO, tanggalAkhir: todayISO, page: 1, limit: 1000 }),
-          getDepartmentReport({ tanggalMulai: todayISO, tanggalAkhir: todayISO }),
-          getConsumptionReport({ tanggalMulai: weekStartISO, tanggalAkhir: todayISO, groupBy: 'DAILY' }),
-          getPendingApprovals(),
-        ]);
-
+        // Satu request: counter, persetujuan tertunda, pesanan terbaru dan laporan departemen hari ini
+        const data = await getDashboard<AdminDashboard>();
         if (!mounted) return;
-
-        setTodayOrders(todayOrdersPage.data ?? []);
-        setDeptReport(deptItems ?? []);
-        setConsumption(consumptionItems ?? []);
-        setPendingApprovals(pendingApprovalItems ?? []);
+        setDashboard(data);
       } catch (e: any) {
         const message: string = e?.message || 'Gagal memuat data dashboard';
         setError(message);
@@ -91,64 +62,28 @@ export default function AdminDashboardPage() {
     return () => {
       mounted = false;
     };
-  }, [todayISO, weekStartISO]);
-
-  const totalOrdersToday = todayOrders.length;
-  const inProgressCount = useMemo(
-    () => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.IN_PROGRESS).length,
-    [todayOrders],
+  }, []);
+
+  const byStatus = dashboard?.counters.byStatus;
+  const totalOrdersToday = dashboard?.counters.totals.orders ?? 0;
+  const inProgressCount = byStatus?.[StatusPesanan.IN_PROGRESS]?.orders ?? 0;
+  const completedTodayCount = byStatus?.[StatusPesanan.COMPLETE]?.orders ?? 0;
+  const pendingApprovalsCount = dashboard?.pendingApprovals ?? 0;
+  const deptReport = dashboard?.departments ?? [];
+  // Sudah diurutkan terbaru lebih dulu oleh server
+  const recentOrders: DashboardOrder[] = dashboard?.recentOrders ?? [];
+
+  const statusCounts: StatusCount[] = useMemo(
+    () => [
+      { name: 'Menunggu', value: byStatus?.[StatusPesanan.MENUNGGU]?.orders ?? 0 },
+      { name: 'Diproses', value: byStatus?.[StatusPesanan.IN_PROGRESS]?.orders ?? 0 },
+      { name: 'Siap', value: byStatus?.[StatusPesanan.READY]?.orders ?? 0 },
+      { name: 'Diantar', value: byStatus?.[StatusPesanan.ON_DELIVERY]?.orders ?? 0 },
+      { name: 'Selesai', value: byStatus?.[StatusPesanan.COMPLETE]?.orders ?? 0 },
+      { name: 'Ditolak', value: byStatus?.[StatusPesanan.DITOLAK]?.orders ?? 0 },
+    ],
+    [byStatus],
   );
-  const completedTodayCount = useMemo(
-    () => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.COMPLETE).length,
-    [todayOrders],
-  );
-  const pendingApprovalsCount = pendingApprovals.length;
-
-  const statusCounts: StatusCount[] = useMemo(() => {
-    const statuses: StatusCount[] = [
-      { name: 'Menunggu', value: 0 },
-      { name: 'Diproses', value: 0 },
-      { name: 'Siap', value: 0 },
-      { name: 'Diantar', value: 0 },
-      { name: 'Selesai', value: 0 },
-      { name: 'Ditolak', value: 0 },
-    ];
-    for (const o of todayOrders) {
-      switch (o.statusPesanan) {
-        case StatusPesanan.MENUNGGU:
-          statuses[0].value += 1;
-          break;
-        case StatusPesanan.IN_PROGRESS:
-          statuses[1].value += 1;
-          break;
-        case StatusPesanan.READY:
-          statuses[2].value += 1;
-          break;
-        case StatusPesanan.ON_DELIVERY:
-          statuses[3].value += 1;
-          break;
-        case StatusPesanan.COMPLETE:
-          statuses[4].value += 1;
-          break;
-        case StatusPesanan.DITOLAK:
-          statuses[5].value += 1;
-          break;
-        default:
-          break;
-      }
-    }
-    return statuses;
-  }, [todayOrders]);
-
-  const recentOrders = useMemo(() => {
-    const copy = [...todayOrders];
-    copy.sort((a, b) => {
-      const ta = a.waktuDibuat ?? a.tanggalPesanan;
-      const tb = b.waktuDibuat ?? b.tanggalPesanan;
-      return (tb || '').localeCompare(ta || '');
-    });
-    return copy.slice(0, 10);
-  }, [todayOrders]);
 
   return (
     <div className="px-6 py-6 space-y-6">
@@ -260,7 +195,7 @@ export default function AdminDashboardPage() {
             <h2 className="text-lg font-semibold text-slate-900 dark:text-white mb-4">
               Aktivitas Terbaru (10 Pesanan)
             </h2>
-            <Table<Order>
+            <Table<DashboardOrder>
               ariaLabel="Aktivitas pesanan terbaru"
               dense
               columns={[
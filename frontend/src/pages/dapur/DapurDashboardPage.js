@@ -5,31 +5,26 @@ import { Card, Button, Badge, Table } from '@/components/ui';
 import Spinner from '@/components/ui/Spinner';
 import { showError } from '@/components/ui/Toast';
 import { useNavigate } from 'react-router-dom';
-import { getOrders, getPendingApprovals } from '@/services/api/orders.api';
+import { getDashboard } from '@/services/api/dashboard.api';
 import { StatusPesanan } from '@/types/order.types';
-import { formatDateTime, toISODateOnly } from '@/utils/date.utils';
+import { formatDateTime } from '@/utils/date.utils';
 import { getStatusBadgeVariant, getStatusLabel } from '@/utils/status.utils';
 export default function DapurDashboardPage() {
     const navigate = useNavigate();
     const [isLoading, setIsLoading] = useState(true);
-    const [todayOrders, setTodayOrders] = useState([]);
-    const [pendingApprovals, setPendingApprovals] = useState([]);
+    const [dashboard, setDashboard] = useState(null);
     const [, setError] = useState(null);
-    const todayISO = toISODateOnly(new Date());
     useEffect(() => {
         let mounted = true;
         async function load() {
             setIsLoading(true);
             setError(null);
             try {
-                const [ordersPage, approvals] = await Promise.all([
-                    getOrders({ tanggalMulai: todayISO, tanggalAkhir: todayISO, page: 1, limit: 1000 }),
-                    getPendingApprovals(),
-                ]);
+                // Satu request: counter hari ini, jumlah persetujuan tertunda dan cuplikan antrian
+                const data = await getDashboard();
                 if (!mounted)
                     return;
-                setTodayOrders(ordersPage.data ?? []);
-                setPendingApprovals(approvals ?? []);
+                setDashboard(data);
             }
             catch (e) {
                 const message = e?.message || 'Gagal memuat data dashboard dapur';
@@ -45,17 +40,15 @@ export default function DapurDashboardPage() {
         return () => {
             mounted = false;
         };
-    }, [todayISO]);
-    const menungguCount = useMemo(() => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.MENUNGGU).length, [todayOrders]);
-    const inProgressCount = useMemo(() => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.IN_PROGRESS).length, [todayOrders]);
-    const readyCount = useMemo(() => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.READY).length, [todayOrders]);
-    const pendingApprovalsCount = pendingApprovals.length;
+    }, []);
+    const byStatus = dashboard?.counters.byStatus;
+    const menungguCount = byStatus?.[StatusPesanan.MENUNGGU]?.orders ?? 0;
+    const inProgressCount = byStatus?.[StatusPesanan.IN_PROGRESS]?.orders ?? 0;
+    const readyCount = byStatus?.[StatusPesanan.READY]?.orders ?? 0;
+    const pendingApprovalsCount = dashboard?.pendingApprovals ?? 0;
     const queuePreview = useMemo(() => {
-        const items = todayOrders
-            .filter((o) => o.statusPesanan === StatusPesanan.MENUNGGU ||
-            o.statusPesanan === StatusPesanan.IN_PROGRESS ||
-            o.statusPesanan === StatusPesanan.READY)
-            .slice(0, 8);
+        // Server mengirim maksimal 8 pesanan MENUNGGU/IN_PROGRESS/READY hari ini
+        const items = [...(dashboard?.queue ?? [])];
         // sort by status and time
         items.sort((a, b) => {
             const statusOrder = (s) => {
@@ -79,7 +72,7 @@ export default function DapurDashboardPage() {
             return (ta || '').localeCompare(tb || '');
         });
         return items;
-    }, [todayOrders]);
+    }, [dashboard]);
     return (_jsxs("div", { className: "px-4 py-4 sm:px-6 sm:py-6 space-y-6", children: [_jsxs("div", { className: "flex items-center justify-between", children: [_jsx("h1", { className: "text-2xl sm:text-3xl font-display font-bold text-slate-900 dark:text-white", children: "Dashboard Dapur" }), _jsxs("div", { className: "flex gap-2", children: [_jsx(Button, { variant: "primary", size: "md", onClick: () => navigate('/orders/queue'), className: "whitespace-nowrap", children: "Lihat Antrian" }), _jsx(Button, { variant: "secondary", size: "md", onClick: () => navigate('/orders/pending-approvals'), className: "whitespace-nowrap", children: "Persetujuan Tertunda" })] })] }), isLoading ? (_jsx("div", { className: "flex items-center justify-center py-16", children: _jsx(Spinner, { variant: "primary", size: "lg", label: "Memuat dashboard dapur..." }) })) : (_jsxs(_Fragment, { children: [_jsxs("div", { className: "grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-4 sm:gap-6", children: [_jsxs(Card, { hover: true, padding: "lg", children: [_jsx("h2", { className: "text-base sm:text-lg font-semibold text-slate-900 dark:text-white", children: "Menunggu" }), _jsx("p", { className: "mt-2 sm:mt-4 text-3xl sm:text-4xl font-bold text-amber-600 dark:text-amber-400", children: menungguCount }), _jsx("p", { className: "mt-1 text-xs text-slate-500 dark:text-slate-400", children: "Siap ditindaklanjuti" })] }), _jsxs(Card, { hover: true, padding: "lg", children: [_jsx("h2", { className: "text-base sm:text-lg font-semibold text-slate-900 dark:text-white", children: "Diproses" }), _jsx("p", { className: "mt-2 sm:mt-4 text-3xl sm:text-4xl font-bold text-sky-600 dark:text-sky-400", children: inProgressCount }), _jsx("p", { className: "mt-1 text-xs text-slate-500 dark:text-slate-400", children: "Sedang dikerjakan" })] }), _jsxs(Card, { hover: true, padding: "lg", children: [_jsx("h2", { className: "text-base sm:text-lg font-semibold text-slate-900 dark:text-white", children: "Siap" }), _jsx("p", { className: "mt-2 sm:mt-4 text-3xl sm:text-4xl font-bold text-violet-600 dark:text-violet-400", children: readyCount }), _jsx("p", { className: "mt-1 text-xs text-slate-500 dark:text-slate-400", children: "Siap untuk diantar" })] }), _jsxs(Card, { hover: true, padding: "lg", children: [_jsx("h2", { className: "text-base sm:text-lg font-semibold text-slate-900 dark:text-white", children: "Menunggu Persetujuan" }), _jsx("p", { className: "mt-2 sm:mt-4 text-3xl sm:text-4xl font-bold text-amber-600 dark:text-amber-400", children: pendingApprovalsCount }), _jsx("p", { className: "mt-1 text-xs text-slate-500 dark:text-slate-400", children: "Permintaan dari dapur" })] })] }), _jsxs(Card, { hover: true, padding: "lg", children: [_jsx("h2", { className: "text-lg font-semibold text-slate-900 dark:text-white mb-4", children: "Preview Antrian Hari Ini" }), _jsx(Table, { ariaLabel: "Antrian pesanan dapur", dense: true, columns: [
                                     { id: 'kode', header: 'Kode', field: 'kodePesanan', width: 'w-28' },
                                     {
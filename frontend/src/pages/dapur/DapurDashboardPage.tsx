@@ -5,21 +5,18 @@ import { Card, Button, Badge, Table } from '@/components/ui';
 import Spinner from '@/components/ui/Spinner';
 import { showError } from '@/components/ui/Toast';
 import { useNavigate } from 'react-router-dom';
-import { getOrders, getPendingApprovals } from '@/services/api/orders.api';
-import type { Order } from '@/types/order.types';
+import { getDashboard } from '@/services/api/dashboard.api';
+import type { DapurDashboard, DashboardOrder } from '@/types/dashboard.types';
 import { StatusPesanan } from '@/types/order.types';
-import { formatDateTime, toISODateOnly } from '@/utils/date.utils';
+import { formatDateTime } from '@/utils/date.utils';
 import { getStatusBadgeVariant, getStatusLabel } from '@/utils/status.utils';
 
 export default function DapurDashboardPage() {
   const navigate = useNavigate();
   const [isLoading, setIsLoading] = useState(true);
-  const [todayOrders, setTodayOrders] = useState<Order[]>([]);
-  const [pendingApprovals, setPendingApprovals] = useState<Order[]>([]);
+  const [dashboard, setDashboard] = useState<DapurDashboard | null>(null);
   const [, setError] = useState<string | null>(null);
 
-  const todayISO = toISODateOnly(new Date());
-
   useEffect(() => {
     let mounted = true;
 
@@ -27,15 +24,10 @@ export default function DapurDashboardPage() {
       setIsLoading(true);
       setError(null);
       try {
-        const [ordersPage, approvals] = await Promise.all([
-          getOrders({ tanggalMulai: todayISO, tanggalAkhir: todayISO, page: 1, limit: 1000 }),
-          getPendingApprovals(),
-        ]);
-
+        // Satu request: counter hari ini, jumlah persetujuan tertunda dan cuplikan antrian
+        const data = await getDashboard<DapurDashboard>();
         if (!mounted) return;
-
-        setTodayOrders(ordersPage.data ?? []);
-        setPendingApprovals(approvals ?? []);
+        setDashboard(data);
       } catch (e: any) {
         const message: string = e?.message || 'Gagal memuat data dashboard dapur';
         setError(message);
@@ -49,31 +41,17 @@ export default function DapurDashboardPage() {
     return () => {
       mounted = false;
     };
-  }, [todayISO]);
+  }, []);
 
-  const menungguCount = useMemo(
-    () => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.MENUNGGU).length,
-    [todayOrders],
-  );
-  const inProgressCount = useMemo(
-    () => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.IN_PROGRESS).length,
-    [todayOrders],
-  );
-  const readyCount = useMemo(
-    () => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.READY).length,
-    [todayOrders],
-  );
-  const pendingApprovalsCount = pendingApprovals.length;
+  const byStatus = dashboard?.counters.byStatus;
+  const menungguCount = byStatus?.[StatusPesanan.MENUNGGU]?.orders ?? 0;
+  const inProgressCount = byStatus?.[StatusPesanan.IN_PROGRESS]?.orders ?? 0;
+  const readyCount = byStatus?.[StatusPesanan.READY]?.orders ?? 0;
+  const pendingApprovalsCount = dashboard?.pendingApprovals ?? 0;
 
   const queuePreview = useMemo(() => {
-    const items = todayOrders
-      .filter(
-        (o) =>
-          o.statusPesanan === StatusPesanan.MENUNGGU ||
-          o.statusPesanan === StatusPesanan.IN_PROGRESS ||
-          o.statusPesanan === StatusPesanan.READY,
-      )
-      .slice(0, 8);
+    // Server mengirim maksimal 8 pesanan MENUNGGU/IN_PROGRESS/READY hari ini
+    const items = [...(dashboard?.queue ?? [])];
     // sort by status and time
     items.sort((a, b) => {
       const statusOrder = (s: string) => {
@@ -96,7 +74,7 @@ export default function DapurDashboardPage() {
       return (ta || '').localeCompare(tb || '');
     });
     return items;
-  }, [todayOrders]);
+  }, [dashboard]);
 
   return (
     <div className="px-4 py-4 sm:px-6 sm:py-6 space-y-6">
@@ -162,7 +140,7 @@ export default function DapurDashboardPage() {
           {/* Queue Preview */}
           <Card hover padding="lg">
             <h2 className="text-lg font-semibold text-slate-900 dark:text-white mb-4">Preview Antrian Hari Ini</h2>
-            <Table<Order>
+            <Table<DashboardOrder>
               ariaLabel="Antrian pesanan dapur"
               dense
               columns={[
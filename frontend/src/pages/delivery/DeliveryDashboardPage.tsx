@@ -1,24 +1,22 @@
 // frontend/src/pages/delivery/DeliveryDashboardPage.tsx
 
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useState } from 'react';
 import { Card, Button, Badge, Table } from '@/components/ui';
 import Spinner from '@/components/ui/Spinner';
 import { showError } from '@/components/ui/Toast';
 import { useNavigate } from 'react-router-dom';
-import { getOrders } from '@/services/api/orders.api';
-import type { Order } from '@/types/order.types';
+import { getDashboard } from '@/services/api/dashboard.api';
+import type { DashboardOrder, DeliveryDashboard } from '@/types/dashboard.types';
 import { StatusPesanan } from '@/types/order.types';
-import { formatDateTime, toISODateOnly } from '@/utils/date.utils';
+import { formatDateTime } from '@/utils/date.utils';
 import { getStatusBadgeVariant, getStatusLabel } from '@/utils/status.utils';
 
 export default function DeliveryDashboardPage() {
   const navigate = useNavigate();
   const [isLoading, setIsLoading] = useState(true);
-  const [todayOrders, setTodayOrders] = useState<Order[]>([]);
+  const [dashboard, setDashboard] = useState<DeliveryDashboard | null>(null);
   const [, setError] = useState<string | null>(null);
 
-  const todayISO = toISODateOnly(new Date());
-
   useEffect(() => {
     let mounted = true;
 
@@ -26,10 +24,10 @@ export default function DeliveryDashboardPage() {
       setIsLoading(true);
       setError(null);
       try {
-        // Ambil pesanan hari ini; delivery fokus pada READY/ON_DELIVERY/COMPLETE
-        const page = await getOrders({ tanggalMulai: todayISO, tanggalAkhir: todayISO, page: 1, limit: 1000 });
+        // Satu request: counter hari ini (READY/ON_DELIVERY/COMPLETE) dan cuplikan pesanan siap
+        const data = await getDashboard<DeliveryDashboard>();
         if (!mounted) return;
-        setTodayOrders(page.data ?? []);
+        setDashboard(data);
       } catch (e: any) {
         const message: string = e?.message || 'Gagal memuat data dashboard delivery';
         setError(message);
@@ -43,20 +41,14 @@ export default function DeliveryDashboardPage() {
     return () => {
       mounted = false;
     };
-  }, [todayISO]);
+  }, []);
 
-  const readyOrders = useMemo(
-    () => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.READY),
-    [todayOrders],
-  );
-  const onDeliveryOrders = useMemo(
-    () => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.ON_DELIVERY),
-    [todayOrders],
-  );
-  const completedTodayOrders = useMemo(
-    () => todayOrders.filter((o) => o.statusPesanan === StatusPesanan.COMPLETE),
-    [todayOrders],
-  );
+  const byStatus = dashboard?.counters.byStatus;
+  const readyCount = byStatus?.[StatusPesanan.READY]?.orders ?? 0;
+  const onDeliveryCount = byStatus?.[StatusPesanan.ON_DELIVERY]?.orders ?? 0;
+  const completedTodayCount = byStatus?.[StatusPesanan.COMPLETE]?.orders ?? 0;
+  // Maksimal 8 pesanan READY hari ini, terbaru lebih dulu
+  const readyOrders: DashboardOrder[] = dashboard?.ready ?? [];
 
   return (
     <div className="px-4 py-4 space-y-6 sm:px-6 sm:py-6">
@@ -92,20 +84,20 @@ export default function DeliveryDashboardPage() {
           <div className="grid grid-cols-1 sm:grid-cols-3 gap-4 sm:gap-6">
             <Card hover padding="lg">
               <h2 className="text-lg font-semibold text-slate-900 dark:text-white">Siap Diantar</h2>
-              <p className="mt-4 text-4xl font-bold text-violet-600 dark:text-violet-400">{readyOrders.length}</p>
+              <p className="mt-4 text-4xl font-bold text-violet-600 dark:text-violet-400">{readyCount}</p>
               <p className="mt-1 text-xs text-slate-500 dark:text-slate-400">Status READY</p>
             </Card>
 
             <Card hover padding="lg">
               <h2 className="text-lg font-semibold text-slate-900 dark:text-white">Dalam Pengantaran</h2>
-              <p className="mt-4 text-4xl font-bold text-blue-600 dark:text-blue-400">{onDeliveryOrders.length}</p>
+              <p className="mt-4 text-4xl font-bold text-blue-600 dark:text-blue-400">{onDeliveryCount}</p>
               <p className="mt-1 text-xs text-slate-500 dark:text-slate-400">Status ON_DELIVERY</p>
             </Card>
 
             <Card hover padding="lg">
               <h2 className="text-lg font-semibold text-slate-900 dark:text-white">Selesai Hari Ini</h2>
               <p className="mt-4 text-4xl font-bold text-emerald-600 dark:text-emerald-400">
-                {completedTodayOrders.length}
+                {completedTodayCount}
               </p>
               <p className="mt-1 text-xs text-slate-500 dark:text-slate-400">Status COMPLETE</p>
             </Card>
@@ -114,7 +106,7 @@ export default function DeliveryDashboardPage() {
           {/* List ringkas (mobile-friendly) pesanan siap */}
           <Card hover padding="lg" className="w-full">
             <h2 className="text-lg font-semibold text-slate-900 dark:text-white mb-4">Pesanan Siap</h2>
-            <Table<Order>
+            <Table<DashboardOrder>
               ariaLabel="Pesanan siap diantar"
               dense
               columns={[
@@ -135,7 +127,7 @@ export default function DeliveryDashboardPage() {
                   width: 'w-48',
                 },
               ]}
-              data={readyOrders.slice(0, 8)}
+              data={readyOrders}
               getRowId={(row) => row.id}
               emptyLabel="Tidak ada pesanan siap saat ini"
             />
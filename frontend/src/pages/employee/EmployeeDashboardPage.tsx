@@ -1,29 +1,24 @@
 // frontend/src/pages/employee/EmployeeDashboardPage.tsx
 
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useState } from 'react';
 import { Card, Button, Badge, Table } from '@/components/ui';
 import Spinner from '@/components/ui/Spinner';
 import { showError } from '@/components/ui/Toast';
 import { useNavigate } from 'react-router-dom';
-import { getOrders } from '@/services/api/orders.api';
-import type { Order } from '@/types/order.types';
+import { getDashboard } from '@/services/api/dashboard.api';
+import type { DashboardOrder, EmployeeDashboard } from '@/types/dashboard.types';
 import { StatusPesanan } from '@/types/order.types';
-import { formatDateTime, toISODateOnly } from '@/utils/date.utils';
+import { formatDateTime } from '@/utils/date.utils';
 import { getStatusBadgeVariant, getStatusLabel } from '@/utils/status.utils';
-import { addDays } from 'date-fns';
 import { useAuthStore } from '@/stores/auth.store';
 
 export default function EmployeeDashboardPage() {
   const navigate = useNavigate();
   const { user } = useAuthStore();
   const [isLoading, setIsLoading] = useState(true);
-  const [orders, setOrders] = useState<Order[]>([]);
+  const [dashboard, setDashboard] = useState<EmployeeDashboard | null>(null);
   const [, setError] = useState<string | null>(null);
 
-  // Ambil 7 hari terakhir agar statistik lebih bermakna
-  const todayISO = toISODateOnly(new Date());
-  const weekStartISO = toISODateOnly(addDays(new Date(), -6));
-
   useEffect(() => {
     let mounted = true;
 
@@ -31,15 +26,10 @@ export default function EmployeeDashboardPage() {
       setIsLoading(true);
       setError(null);
       try {
-        // Untuk role employee, endpoint GET /orders mengembalikan pesanan milik user
-        const page = await getOrders({
-          tanggalMulai: weekStartISO,
-          tanggalAkhir: todayISO,
-          page: 1,
-          limit: 200,
-        });
+        // Satu request: ringkasan pesanan milik user 7 hari terakhir dan 5 pesanan terbaru
+        const data = await getDashboard<EmployeeDashboard>();
         if (!mounted) return;
-        setOrders(page.data ?? []);
+        setDashboard(data);
       } catch (e: any) {
         const message: string = e?.message || 'Gagal memuat pesanan';
         setError(message);
@@ -53,32 +43,16 @@ export default function EmployeeDashboardPage() {
     return () => {
       mounted = false;
     };
-  }, [todayISO, weekStartISO]);
-
-  const totalCount = orders.length;
-  const pendingInProgressCount = useMemo(
-    () =>
-      orders.filter(
-        (o) =>
-          o.statusPesanan === StatusPesanan.MENUNGGU ||
-          o.statusPesanan === StatusPesanan.IN_PROGRESS,
-      ).length,
-    [orders],
-  );
-  const completedCount = useMemo(
-    () => orders.filter((o) => o.statusPesanan === StatusPesanan.COMPLETE).length,
-    [orders],
-  );
+  }, []);
 
-  const recentOrders = useMemo(() => {
-    const copy = [...orders];
-    copy.sort((a, b) => {
-      const ta = a.waktuDibuat ?? a.tanggalPesanan;
-      const tb = b.waktuDibuat ?? b.tanggalPesanan;
-      return (tb || '').localeCompare(ta || '');
-    });
-    return copy.slice(0, 5);
-  }, [orders]);
+  const byStatus = dashboard?.byStatus;
+  const totalCount = dashboard?.totals.orders ?? 0;
+  const pendingInProgressCount =
+    (byStatus?.[StatusPesanan.MENUNGGU]?.orders ?? 0) +
+    (byStatus?.[StatusPesanan.IN_PROGRESS]?.orders ?? 0);
+  const completedCount = byStatus?.[StatusPesanan.COMPLETE]?.orders ?? 0;
+  // Sudah diurutkan terbaru lebih dulu oleh server
+  const recentOrders: DashboardOrder[] = dashboard?.recentOrders ?? [];
 
   return (
     <div className="px-6 py-6 space-y-6">
@@ -159,7 +133,7 @@ export default function EmployeeDashboardPage() {
             <h2 className="text-lg font-semibold text-slate-900 dark:text-white mb-4">
               Pesanan Terakhir (5)
             </h2>
-            <Table<Order>
+            <Table<DashboardOrder>
               ariaLabel="Pesanan terakhir"
               dense
               columns={[
@@ -1,5 +1,5 @@
 // frontend/src/pages/orders/CreateOrderPage.tsx
-import { useCallback, useEffect, useMemo, useState } from 'react';
+import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Button } from '@/components/ui/Button';
 import Select from '@/components/ui/Select';
@@ -8,7 +8,7 @@ import DatePicker from '@/components/ui/DatePicker';
 import Spinner from '@/components/ui/Spinner';
 import EmptyState from '@/components/ui/EmptyState';
 import { getShifts } from '@/services/api/master.api';
-import { createOrder } from '@/services/api/orders.api';
+import { createOrder, newIdempotencyKey } from '@/services/api/orders.api';
 import { toISODateOnly, isValidDateOnlyString } from '@/utils/date.utils';
 import { showError, showSuccess } from '@/components/ui/Toast';
 import { useAuthStore } from '@/stores/auth.store';
@@ -54,6 +54,8 @@ export default function CreateOrderPage() {
     
     const [errors, setErrors] = useState<OrderFormErrors>({});
     const [submitting, setSubmitting] = useState(false);
+    // Idempotency-Key untuk isi form yang sedang dikirim (dibuang setelah berhasil)
+    const idempotencyRef = useRef<{ payload: string; key: string } | null>(null);
 
     // Load shifts
     useEffect(() => {
@@ -130,9 +132,19 @@ export default function CreateOrderPage() {
             tanggalPesanan: form.tanggalPesanan,
         };
         
+        // Submit ulang isi form yang sama (setelah timeout/error jaringan) memakai key yang sama,
+        // sehingga server memutar ulang respons pertama alih-alih membuat pesanan ganda
+        const payloadKey = JSON.stringify(payload);
+        const pending =
+            idempotencyRef.current?.payload === payloadKey
+                ? idempotencyRef.current
+                : { payload: payloadKey, key: newIdempotencyKey() };
+        idempotencyRef.current = pending;
+
         setSubmitting(true);
         try {
-            const order = await createOrder(payload);
+            const order = await createOrder(payload, pending.key);
+            idempotencyRef.current = null;
             showSuccess(`Pesanan berhasil dibuat${order?.kodePesanan ? `: ${order.kodePesanan}` : ''}`);
             navigate('/orders');
         } catch (error: any) {
@@ -1,6 +1,6 @@
 import { jsx as _jsx, jsxs as _jsxs, Fragment as _Fragment } from "react/jsx-runtime";
 // frontend/src/pages/orders/DeliveryListPage.tsx
-import { useCallback, useEffect, useMemo, useState } from 'react';
+import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import Spinner from '@/components/ui/Spinner';
 import EmptyState from '@/components/ui/EmptyState';
 import { Button } from '@/components/ui/Button';
@@ -9,6 +9,7 @@ import { getOrders, updateOrderStatus } from '@/services/api/orders.api';
 import { StatusPesanan, } from '@/types/order.types';
 import { getStatusBadgeVariant, getStatusLabel } from '@/utils/status.utils';
 import { formatDate } from '@/utils/date.utils';
+import { applyOrderPatchToGroups } from '@/utils/order-patch.utils';
 import { showError, showSuccess, showInfo } from '@/components/ui/Toast';
 import useWebSocket from '@/hooks/useWebSocket';
 import { useAuthStore } from '@/stores/auth.store';
@@ -19,13 +20,22 @@ export default function DeliveryListPage() {
     const [activeTab, setActiveTab] = useState('READY');
     const [readyOrders, setReadyOrders] = useState([]);
     const [onDeliveryOrders, setOnDeliveryOrders] = useState([]);
+    const listsRef = useRef({ READY: readyOrders, ON_DELIVERY: onDeliveryOrders });
+    listsRef.current = { READY: readyOrders, ON_DELIVERY: onDeliveryOrders };
     const [loading, setLoading] = useState(true);
     const [loadError, setLoadError] = useState(null);
     const [submitting, setSubmitting] = useState(false);
-    // WebSocket: refetch on status change
+    // WebSocket: patch daftar lokal saat status berubah
     const wsStatusChanged = useWebSocket('order.status.changed', useCallback((payload) => {
         showInfo(`Status ${payload.kodePesanan ?? '#' + payload.orderId} berubah menjadi ${getStatusLabel(payload.newStatus)}`);
-        void refetch();
+        const next = applyOrderPatchToGroups(listsRef.current, payload);
+        if (!next) {
+            void refetch();
+        }
+        else if (next !== listsRef.current) {
+            setReadyOrders(next.READY);
+            setOnDeliveryOrders(next.ON_DELIVERY);
+        }
     }, []), []);
     const refetch = useCallback(async () => {
         setLoading(true);
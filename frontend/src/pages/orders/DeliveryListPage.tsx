@@ -1,6 +1,6 @@
 // frontend/src/pages/orders/DeliveryListPage.tsx
 
-import { useCallback, useEffect, useMemo, useState } from 'react';
+import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 
 import Spinner from '@/components/ui/Spinner';
 import EmptyState from '@/components/ui/EmptyState';
@@ -18,6 +18,7 @@ import type { Role } from '@/types/auth.types';
 
 import { getStatusBadgeVariant, getStatusLabel } from '@/utils/status.utils';
 import { formatDate } from '@/utils/date.utils';
+import { applyOrderPatchToGroups } from '@/utils/order-patch.utils';
 import { showError, showSuccess, showInfo } from '@/components/ui/Toast';
 
 import useWebSocket from '@/hooks/useWebSocket';
@@ -31,7 +32,8 @@ import { useAuthStore } from '@/stores/auth.store';
  *   - READY → Pickup (ubah ke ON_DELIVERY)
  *   - ON_DELIVERY → Complete (ubah ke COMPLETE)
  * - Order cards dengan large touch targets
- * - Real-time updates via WebSocket (order.status.changed)
+ * - Real-time updates via WebSocket (order.status.changed): patch lokal berdasarkan version,
+ *   refetch hanya bila pesanan belum dimuat
  */
 
 type TabKey = 'READY' | 'ON_DELIVERY';
@@ -45,13 +47,15 @@ export default function DeliveryListPage() {
 
   const [readyOrders, setReadyOrders] = useState<Order[]>([]);
   const [onDeliveryOrders, setOnDeliveryOrders] = useState<Order[]>([]);
+  const listsRef = useRef({ READY: readyOrders, ON_DELIVERY: onDeliveryOrders });
+  listsRef.current = { READY: readyOrders, ON_DELIVERY: onDeliveryOrders };
 
   const [loading, setLoading] = useState<boolean>(true);
   const [loadError, setLoadError] = useState<string | null>(null);
 
   const [submitting, setSubmitting] = useState<boolean>(false);
 
-  // WebSocket: refetch on status change
+  // WebSocket: patch daftar lokal saat status berubah
   const wsStatusChanged = useWebSocket(
     'order.status.changed',
     useCallback((payload) => {
@@ -60,7 +64,13 @@ export default function DeliveryListPage() {
           payload.newStatus,
         )}`,
       );
-      void refetch();
+      const next = applyOrderPatchToGroups(listsRef.current, payload);
+      if (!next) {
+        void refetch();
+      } else if (next !== listsRef.current) {
+        setReadyOrders(next.READY);
+        setOnDeliveryOrders(next.ON_DELIVERY);
+      }
     }, []),
     [],
   );
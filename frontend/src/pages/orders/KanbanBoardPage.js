@@ -1,6 +1,6 @@
 import { jsx as _jsx, jsxs as _jsxs } from "react/jsx-runtime";
 // frontend/src/pages/orders/KanbanBoardPage.tsx
-import { useCallback, useEffect, useState } from 'react';
+import { useCallback, useEffect, useRef, useState } from 'react';
 import { DragDropContext, Droppable, Draggable } from '@hello-pangea/dnd';
 import Spinner from '@/components/ui/Spinner';
 import EmptyState from '@/components/ui/EmptyState';
@@ -11,6 +11,7 @@ import { getOrders, updateOrderStatus, requestRejection, requestEdit, } from '@/
 import { StatusPesanan, } from '@/types/order.types';
 import { getStatusLabel, getStatusBadgeVariant, getAllowedTransitionsByRole } from '@/utils/status.utils';
 import { formatDate } from '@/utils/date.utils';
+import { applyOrderPatchToGroups } from '@/utils/order-patch.utils';
 import { showError, showSuccess, showInfo } from '@/components/ui/Toast';
 import useWebSocket from '@/hooks/useWebSocket';
 import { useAuthStore } from '@/stores/auth.store';
@@ -23,6 +24,8 @@ export default function KanbanBoardPage() {
         IN_PROGRESS: [],
         READY: [],
     });
+    const columnsRef = useRef(columns);
+    columnsRef.current = columns;
     const [loading, setLoading] = useState(true);
     const [loadError, setLoadError] = useState(null);
     // Selected order for actions
@@ -41,7 +44,14 @@ export default function KanbanBoardPage() {
     const wsStatusChanged = useWebSocket('order.status.changed', useCallback((payload) => {
         // Update posisi kartu sesuai status baru
         showInfo(`Status ${payload.kodePesanan ?? '#' + payload.orderId} → ${getStatusLabel(payload.newStatus)}`);
-        void refetch();
+        const next = applyOrderPatchToGroups(columnsRef.current, payload);
+        if (next) {
+            if (next !== columnsRef.current)
+                setColumns(next);
+        }
+        else {
+            void refetch();
+        }
     }, []), []);
     const refetch = useCallback(async () => {
         setLoading(true);
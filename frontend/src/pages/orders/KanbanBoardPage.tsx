@@ -1,6 +1,6 @@
 // frontend/src/pages/orders/KanbanBoardPage.tsx
 
-import { useCallback, useEffect, useState } from 'react';
+import { useCallback, useEffect, useRef, useState } from 'react';
 import { DragDropContext, Droppable, Draggable, type DropResult } from '@hello-pangea/dnd';
 
 import Spinner from '@/components/ui/Spinner';
@@ -26,6 +26,7 @@ import type { Role } from '@/types/auth.types';
 
 import { getStatusLabel, getStatusBadgeVariant, getAllowedTransitionsByRole } from '@/utils/status.utils';
 import { formatDate } from '@/utils/date.utils';
+import { applyOrderPatchToGroups } from '@/utils/order-patch.utils';
 import { showError, showSuccess, showInfo } from '@/components/ui/Toast';
 
 import useWebSocket from '@/hooks/useWebSocket';
@@ -36,7 +37,8 @@ import { useAuthStore } from '@/stores/auth.store';
  * - Columns: MENUNGGU, IN_PROGRESS, READY
  * - Drag-and-drop untuk transisi status (validasi MENUNGGU → IN_PROGRESS → READY)
  * - Action buttons pada kartu: Reject, Edit
- * - Real-time updates via WebSocket: order.created, order.status.changed
+ * - Real-time updates via WebSocket: order.created (refetch), order.status.changed
+ *   (patch lokal berdasarkan version; refetch hanya bila kartu belum dimuat)
  * - Mobile responsive (horizontal scroll untuk kolom)
  */
 
@@ -67,6 +69,8 @@ export default function KanbanBoardPage() {
     IN_PROGRESS: [],
     READY: [],
   });
+  const columnsRef = useRef(columns);
+  columnsRef.current = columns;
 
   const [loading, setLoading] = useState<boolean>(true);
   const [loadError, setLoadError] = useState<string | null>(null);
@@ -96,7 +100,12 @@ export default function KanbanBoardPage() {
     useCallback((payload) => {
       // Update posisi kartu sesuai status baru
       showInfo(`Status ${payload.kodePesanan ?? '#' + payload.orderId} → ${getStatusLabel(payload.newStatus)}`);
-      void refetch();
+      const next = applyOrderPatchToGroups(columnsRef.current, payload);
+      if (next) {
+        if (next !== columnsRef.current) setColumns(next);
+      } else {
+        void refetch();
+      }
     }, []),
     [],
   );
@@ -13,6 +13,7 @@ import { getOrderById, updateOrderStatus, requestRejection, requestEdit, approve
 import { StatusPesanan, } from '@/types/order.types';
 import { getStatusLabel, getStatusBadgeVariant, getAllowedTransitionsByRole, } from '@/utils/status.utils';
 import { formatDate } from '@/utils/date.utils';
+import { applyOrderPatch } from '@/utils/order-patch.utils';
 import { useAuthStore } from '@/stores/auth.store';
 import useWebSocket from '@/hooks/useWebSocket';
 import { showError, showInfo, showSuccess } from '@/components/ui/Toast';
@@ -29,19 +30,37 @@ export default function OrderDetailPage() {
     const wsStatusChanged = useWebSocket('order.status.changed', useCallback((payload) => {
         if (payload?.orderId === id) {
             showInfo(`Status ${payload.kodePesanan ?? '#' + payload.orderId} berubah menjadi ${getStatusLabel(payload.newStatus)}`);
-            void refetch();
+            // Patch lokal dari event (berversi); refetch hanya bila event tanpa patch
+            if (payload.changes) {
+                setOrder((prev) => (prev ? applyOrderPatch(prev, payload) : prev));
+            }
+            else {
+                void refetch();
+            }
         }
     }, [id]), [id]);
     useWebSocket('order.approval.requested', useCallback((payload) => {
         if (payload?.orderId === id) {
             showInfo(`Permintaan approval untuk pesanan ${payload.kodePesanan} dikirim ke admin`);
-            void refetch();
+            // Patch lokal dari event (berversi); refetch hanya bila event tanpa patch
+            if (payload.changes) {
+                setOrder((prev) => (prev ? applyOrderPatch(prev, payload) : prev));
+            }
+            else {
+                void refetch();
+            }
         }
     }, [id]), [id]);
     useWebSocket('order.approval.decided', useCallback((payload) => {
         if (payload?.orderId === id) {
             showInfo(`Keputusan admin untuk ${payload.kodePesanan}: ${payload.decision}`);
-            void refetch();
+            // Patch lokal dari event (berversi); refetch hanya bila event tanpa patch
+            if (payload.changes) {
+                setOrder((prev) => (prev ? applyOrderPatch(prev, payload) : prev));
+            }
+            else {
+                void refetch();
+            }
         }
     }, [id]), [id]);
     // Modals state
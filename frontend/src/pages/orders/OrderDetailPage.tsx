@@ -33,6 +33,7 @@ import {
   getAllowedTransitionsByRole,
 } from '@/utils/status.utils';
 import { formatDate } from '@/utils/date.utils';
+import { applyOrderPatch } from '@/utils/order-patch.utils';
 
 import { useAuthStore } from '@/stores/auth.store';
 import useWebSocket from '@/hooks/useWebSocket';
@@ -87,7 +88,12 @@ export default function OrderDetailPage() {
               payload.newStatus,
             )}`,
           );
-          void refetch();
+          // Patch lokal dari event (berversi); refetch hanya bila event tanpa patch
+          if (payload.changes) {
+            setOrder((prev) => (prev ? applyOrderPatch(prev, payload) : prev));
+          } else {
+            void refetch();
+          }
         }
       },
       [id],
@@ -101,7 +107,12 @@ export default function OrderDetailPage() {
       (payload) => {
         if (payload?.orderId === id) {
           showInfo(`Permintaan approval untuk pesanan ${payload.kodePesanan} dikirim ke admin`);
-          void refetch();
+          // Patch lokal dari event (berversi); refetch hanya bila event tanpa patch
+          if (payload.changes) {
+            setOrder((prev) => (prev ? applyOrderPatch(prev, payload) : prev));
+          } else {
+            void refetch();
+          }
         }
       },
       [id],
@@ -115,7 +126,12 @@ export default function OrderDetailPage() {
       (payload) => {
         if (payload?.orderId === id) {
           showInfo(`Keputusan admin untuk ${payload.kodePesanan}: ${payload.decision}`);
-          void refetch();
+          // Patch lokal dari event (berversi); refetch hanya bila event tanpa patch
+          if (payload.changes) {
+            setOrder((prev) => (prev ? applyOrderPatch(prev, payload) : prev));
+          } else {
+            void refetch();
+          }
         }
       },
       [id],
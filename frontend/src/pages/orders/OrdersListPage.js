@@ -18,7 +18,7 @@ import { StatusPesanan, } from '@/types/order.types';
 import { formatDate, toISODateOnly, isValidDateOnlyString, } from '@/utils/date.utils';
 import { getStatusLabel, getStatusBadgeVariant, } from '@/utils/status.utils';
 // Offline caching helpers (IndexedDB)
-import { saveOrdersToCache, getOrdersFromCache } from '@/utils';
+import { saveOrdersToCache, getOrdersFromCache, applyOrderPatchToList } from '@/utils';
 // Icon for offline indicator banner
 import { SignalSlashIcon } from '@heroicons/react/24/outline';
 import useWebSocket from '@/hooks/useWebSocket';
@@ -37,7 +37,17 @@ export default function OrdersListPage() {
     }, []));
     const wsStatusChanged = useWebSocket('order.status.changed', useCallback((payload) => {
         showInfo(`Status ${payload.kodePesanan ?? '#' + payload.orderId} berubah menjadi ${getStatusLabel(payload.newStatus)}`);
-        refetch();
+        if (!payload.changes) {
+            refetch();
+            return;
+        }
+        // Patch baris di halaman aktif (berversi) tanpa refetch
+        setDataSet((prev) => {
+            if (!prev)
+                return prev;
+            const data = applyOrderPatchToList(prev.data, payload);
+            return data && data !== prev.data ? { ...prev, data } : prev;
+        });
     }, []));
     const [filters, setFilters] = useState({
         status: '',
@@ -43,7 +43,7 @@ import {
 } from '@/utils/status.utils';
 
 // Offline caching helpers (IndexedDB)
-import { saveOrdersToCache, getOrdersFromCache } from '@/utils';
+import { saveOrdersToCache, getOrdersFromCache, applyOrderPatchToList } from '@/utils';
 // Icon for offline indicator banner
 import { SignalSlashIcon } from '@heroicons/react/24/outline';
 
@@ -96,7 +96,16 @@ export default function OrdersListPage() {
   }, []));
   const wsStatusChanged = useWebSocket('order.status.changed', useCallback((payload) => {
     showInfo(`Status ${payload.kodePesanan ?? '#'+payload.orderId} berubah menjadi ${getStatusLabel(payload.newStatus)}`);
-    refetch();
+    if (!payload.changes) {
+      refetch();
+      return;
+    }
+    // Patch baris di halaman aktif (berversi) tanpa refetch
+    setDataSet((prev) => {
+      if (!prev) return prev;
+      const data = applyOrderPatchToList(prev.data, payload);
+      return data && data !== prev.data ? { ...prev, data } : prev;
+    });
   }, []));
 
   const [filters, setFilters] = useState<FiltersState>({
@@ -1,6 +1,6 @@
 import { jsx as _jsx, jsxs as _jsxs, Fragment as _Fragment } from "react/jsx-runtime";
 // frontend/src/pages/users/UsersManagementPage.tsx
-import { useCallback, useEffect, useMemo, useState } from 'react';
+import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { Table } from '@/components/ui/Table';
 import Modal from '@/components/ui/Modal';
 import Input from '@/components/ui/Input';
@@ -13,7 +13,7 @@ import Pagination from '@/components/ui/Pagination';
 import Card from '@/components/ui/Card';
 import { showError, showSuccess, showInfo } from '@/components/ui/Toast';
 import { formatDateTime } from '@/utils/date.utils';
-import { getUsers, createUser, updateUserStatus, updateUserRole, resetUserPassword, updateUserProfile, } from '@/services/api/users.api';
+import { getUsersPage, createUser, updateUserStatus, updateUserRole, resetUserPassword, updateUserProfile, } from '@/services/api/users.api';
 import { getDepartments, getJabatan } from '@/services/api/master.api';
 // Role options for Select
 const ROLE_OPTIONS = [
@@ -28,13 +28,17 @@ const STATUS_OPTIONS = [
     { label: 'Nonaktif', value: 'inactive' },
 ];
 const DEFAULT_PAGE_SIZE = 10;
+// Delay before the search text is sent to the server
+const SEARCH_DEBOUNCE_MS = 300;
 export default function UsersManagementPage() {
-    // Data and derived state
+    // Data: rows of the current page only; paging, search and filters run on the server
     const [users, setUsers] = useState([]);
+    const [totalPages, setTotalPages] = useState(1);
     const [isLoading, setIsLoading] = useState(false);
     const [loadError, setLoadError] = useState(null);
     // Filters
     const [searchText, setSearchText] = useState('');
+    const [debouncedSearch, setDebouncedSearch] = useState('');
     const [filterRole, setFilterRole] = useState('');
     const [filterStatus, setFilterStatus] = useState('');
     // Pagination
@@ -71,23 +75,37 @@ export default function UsersManagementPage() {
     });
     const [editErrors, setEditErrors] = useState({});
     const [isEditing, setIsEditing] = useState(false);
-    // Data loading
+    // Data loading (responses for superseded queries are ignored)
+    const requestSeq = useRef(0);
     const loadUsers = useCallback(async () => {
+        const seq = ++requestSeq.current;
         setIsLoading(true);
         setLoadError(null);
         try {
-            const list = await getUsers();
-            setUsers(list ?? []);
+            const result = await getUsersPage({
+                page: currentPage,
+                limit: pageSize,
+                search: debouncedSearch.trim() || undefined,
+                roleAccess: filterRole || undefined,
+                isActive: filterStatus ? filterStatus === 'active' : undefined,
+            });
+            if (seq !== requestSeq.current)
+                return;
+            setUsers(result.data ?? []);
+            setTotalPages(Math.max(1, result.totalPages ?? 1));
         }
         catch (e) {
+            if (seq !== requestSeq.current)
+                return;
             const msg = e?.message ?? String(e);
             setLoadError(msg);
             showError(`Gagal memuat pengguna: ${msg}`);
         }
         finally {
-            setIsLoading(false);
+            if (seq === requestSeq.current)
+                setIsLoading(false);
         }
-    }, []);
+    }, [currentPage, pageSize, debouncedSearch, filterRole, filterStatus]);
     const loadMasterData = useCallback(async () => {
         try {
             const [deptList, jabList] = await Promise.all([getDepartments(), getJabatan()]);
@@ -100,33 +118,18 @@ export default function UsersManagementPage() {
     }, []);
     useEffect(() => {
         loadUsers();
+    }, [loadUsers]);
+    useEffect(() => {
         loadMasterData();
-    }, [loadUsers, loadMasterData]);
-    // Client-side filtering
-    const filteredUsers = useMemo(() => {
-        const q = searchText.trim().toLowerCase();
-        return (users ?? []).filter((u) => {
-            const matchesText = !q ||
-                u.nomorIndukKaryawan.toLowerCase().includes(q) ||
-                u.namaLengkap.toLowerCase().includes(q);
-            const matchesRole = !filterRole || u.roleAccess === filterRole;
-            const matchesStatus = !filterStatus ||
-                (filterStatus === 'active' ? u.isActive === true : u.isActive === false);
-            return matchesText && matchesRole && matchesStatus;
-        });
-    }, [users, searchText, filterRole, filterStatus]);
-    // Pagination slicing
-    const totalPages = useMemo(() => {
-        return Math.max(1, Math.ceil(filteredUsers.length / pageSize));
-    }, [filteredUsers.length, pageSize]);
-    const paginatedUsers = useMemo(() => {
-        const startIdx = (currentPage - 1) * pageSize;
-        return filteredUsers.slice(startIdx, startIdx + pageSize);
-    }, [filteredUsers, currentPage, pageSize]);
+    }, [loadMasterData]);
+    useEffect(() => {
+        const timer = setTimeout(() => setDebouncedSearch(searchText), SEARCH_DEBOUNCE_MS);
+        return () => clearTimeout(timer);
+    }, [searchText]);
     useEffect(() => {
         // Reset to page 1 when filters change to keep UX consistent
         setCurrentPage(1);
-    }, [searchText, filterRole, filterStatus, pageSize]);
+    }, [debouncedSearch, filterRole, filterStatus, pageSize]);
     // Helpers
     function getRoleBadgeVariant(role) {
         switch (role) {
@@ -239,9 +242,10 @@ export default function UsersManagementPage() {
         };
         setIsCreating(true);
         try {
-            const created = await createUser(payload);
+            await createUser(payload);
             showSuccess('Pengguna baru berhasil dibuat');
-            setUsers((prev) => [created, ...prev]);
+            // Reload so ordering and totals come from the server
+            loadUsers();
             setOpenCreateModal(false);
             setCreateForm({
                 nik: '',
@@ -387,7 +391,8 @@ export default function UsersManagementPage() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
     []);
     return (_jsxs("div", { className: "space-y-6", children: [_jsxs("header", { className: "flex flex-col sm:flex-row sm:items-center sm:justify-between gap-4", children: [_jsxs("div", { children: [_jsx("h1", { className: "text-xl font-semibold text-slate-900 dark:text-slate-100", children: "Manajemen Pengguna" }), _jsx("p", { className: "mt-1 text-sm text-slate-600 dark:text-slate-300", children: "Kelola pengguna: role, status, dan reset password. Tambah pengguna baru melalui modal." })] }), _jsxs("div", { className: "flex items-center gap-2", children: [_jsx(Button, { variant: "primary", onClick: () => setOpenCreateModal(true), children: "Buat Pengguna Baru" }), _jsx(Button, { variant: "outline", onClick: () => loadUsers(), children: "Muat Ulang" })] })] }), _jsx(Card, { padding: "md", children: _jsxs("div", { className: "grid grid-cols-1 md:grid-cols-4 gap-4", children: [_jsx(Input, { label: "Cari (NIK atau Nama)", placeholder: "Masukkan NIK atau nama...", value: searchText, onChange: (e) => setSearchText(e.target.value) }), _jsx(Select, { label: "Role", placeholder: "Pilih role", options: ROLE_OPTIONS, value: filterRole || '', onChange: (e) => setFilterRole(e.target.value || '') }), _jsx(Select, { label: "Status", placeholder: "Pilih status", options: STATUS_OPTIONS, value: filterStatus || '', onChange: (e) => setFilterStatus(e.target.value || '') }), _jsxs("div", { className: "flex items-end gap-2", children: [_jsx(Button, { variant: "secondary", onClick: () => {
-                                        // Apply: do nothing, filters already reactive
+                                        // Send the search text now instead of waiting for the debounce
+                                        setDebouncedSearch(searchText);
                                         showInfo('Filter diterapkan');
                                     }, children: "Terapkan" }), _jsx(Button, { variant: "ghost", onClick: () => {
                                         setSearchText('');
@@ -397,11 +402,11 @@ export default function UsersManagementPage() {
                     label: 'Coba lagi',
                     variant: 'outline',
                     onClick: () => loadUsers(),
-                } })) : filteredUsers.length === 0 ? (_jsx(EmptyState, { title: "Tidak ada pengguna", description: "Coba ubah filter atau buat pengguna baru.", action: {
+                } })) : users.length === 0 ? (_jsx(EmptyState, { title: "Tidak ada pengguna", description: "Coba ubah filter atau buat pengguna baru.", action: {
                     label: 'Buat Pengguna Baru',
                     variant: 'primary',
                     onClick: () => setOpenCreateModal(true),
-                } })) : (_jsxs(_Fragment, { children: [_jsx(Table, { columns: columns, data: paginatedUsers, ariaLabel: "Tabel Pengguna", emptyLabel: "Tidak ada data" }), filteredUsers.length > pageSize && (_jsx("div", { className: "flex justify-end", children: _jsx(Pagination, { currentPage: currentPage, totalPages: totalPages, onPageChange: (p) => setCurrentPage(p), ariaLabel: "Navigasi halaman pengguna" }) }))] })), _jsxs(Modal, { open: openCreateModal, onClose: () => {
+                } })) : (_jsxs(_Fragment, { children: [_jsx(Table, { columns: columns, data: users, ariaLabel: "Tabel Pengguna", emptyLabel: "Tidak ada data" }), totalPages > 1 && (_jsx("div", { className: "flex justify-end", children: _jsx(Pagination, { currentPage: currentPage, totalPages: totalPages, onPageChange: (p) => setCurrentPage(p), ariaLabel: "Navigasi halaman pengguna" }) }))] })), _jsxs(Modal, { open: openCreateModal, onClose: () => {
                     if (!isCreating)
                         setOpenCreateModal(false);
                 }, title: "Buat Pengguna Baru", description: "Lengkapi form berikut untuk menambahkan pengguna baru.", size: "lg", children: [_jsxs("div", { className: "grid grid-cols-1 md:grid-cols-2 gap-4", children: [_jsx(Input, { label: "NIK", placeholder: "Contoh: EMP001", value: createForm.nik, onChange: (e) => handleCreateFormChange('nik', e.target.value), error: createErrors.nik }), _jsx(Input, { label: "Nama Lengkap", placeholder: "Nama lengkap pengguna", value: createForm.namaLengkap, onChange: (e) => handleCreateFormChange('namaLengkap', e.target.value), error: createErrors.namaLengkap }), _jsx(Input, { label: "Password", type: "password", placeholder: "Password sementara", value: createForm.password, onChange: (e) => handleCreateFormChange('password', e.target.value), error: createErrors.password }), _jsx(Select, { label: "Role", placeholder: "Pilih role", options: ROLE_OPTIONS, value: createForm.roleAccess || '', onChange: (e) => handleCreateFormChange('roleAccess', e.target.value || '') }), _jsx(Select, { label: "Department (opsional)", placeholder: "Pilih department", options: [
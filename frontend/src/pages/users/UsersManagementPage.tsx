@@ -1,5 +1,5 @@
 // frontend/src/pages/users/UsersManagementPage.tsx
-import React, { useCallback, useEffect, useMemo, useState } from 'react';
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 
 import { Table, type Column } from '@/components/ui/Table';
 import Modal from '@/components/ui/Modal';
@@ -17,7 +17,7 @@ import { showError, showSuccess, showInfo } from '@/components/ui/Toast';
 import { formatDateTime } from '@/utils/date.utils';
 
 import {
-  getUsers,
+  getUsersPage,
   createUser,
   updateUserStatus,
   updateUserRole,
@@ -52,6 +52,8 @@ const STATUS_OPTIONS: SelectOption[] = [
 ];
 
 const DEFAULT_PAGE_SIZE = 10;
+// Delay before the search text is sent to the server
+const SEARCH_DEBOUNCE_MS = 300;
 
 interface CreateUserFormState {
   nik: string;
@@ -64,13 +66,15 @@ interface CreateUserFormState {
 }
 
 export default function UsersManagementPage() {
-  // Data and derived state
+  // Data: rows of the current page only; paging, search and filters run on the server
   const [users, setUsers] = useState<KaryawanProfile[]>([]);
+  const [totalPages, setTotalPages] = useState(1);
   const [isLoading, setIsLoading] = useState(false);
   const [loadError, setLoadError] = useState<string | null>(null);
 
   // Filters
   const [searchText, setSearchText] = useState('');
+  const [debouncedSearch, setDebouncedSearch] = useState('');
   const [filterRole, setFilterRole] = useState<Role | ''>('');
   const [filterStatus, setFilterStatus] = useState<'active' | 'inactive' | ''>('');
 
@@ -117,21 +121,32 @@ const [editForm, setEditForm] = useState<EditUserFormState>({
 const [editErrors, setEditErrors] = useState<Record<string, string>>({});
 const [isEditing, setIsEditing] = useState(false);
 
-  // Data loading
+  // Data loading (responses for superseded queries are ignored)
+  const requestSeq = useRef(0);
   const loadUsers = useCallback(async () => {
+    const seq = ++requestSeq.current;
     setIsLoading(true);
     setLoadError(null);
     try {
-      const list = await getUsers();
-      setUsers(list ?? []);
+      const result = await getUsersPage({
+        page: currentPage,
+        limit: pageSize,
+        search: debouncedSearch.trim() || undefined,
+        roleAccess: filterRole || undefined,
+        isActive: filterStatus ? filterStatus === 'active' : undefined,
+      });
+      if (seq !== requestSeq.current) return;
+      setUsers(result.data ?? []);
+      setTotalPages(Math.max(1, result.totalPages ?? 1));
     } catch (e: any) {
+      if (seq !== requestSeq.current) return;
       const msg = e?.message ?? String(e);
       setLoadError(msg);
       showError(`Gagal memuat pengguna: ${msg}`);
     } finally {
-      setIsLoading(false);
+      if (seq === requestSeq.current) setIsLoading(false);
     }
-  }, []);
+  }, [currentPage, pageSize, debouncedSearch, filterRole, filterStatus]);
 
   const loadMasterData = useCallback(async () => {
     try {
@@ -145,42 +160,21 @@ const [isEditing, setIsEditing] = useState(false);
 
   useEffect(() => {
     loadUsers();
-    loadMasterData();
-  }, [loadUsers, loadMasterData]);
-
-  // Client-side filtering
-  const filteredUsers = useMemo(() => {
-    const q = searchText.trim().toLowerCase();
-    return (users ?? []).filter((u) => {
-      const matchesText =
-        !q ||
-        u.nomorIndukKaryawan.toLowerCase().includes(q) ||
-        u.namaLengkap.toLowerCase().includes(q);
-
-      const matchesRole = !filterRole || u.roleAccess === filterRole;
+  }, [loadUsers]);
 
-      const matchesStatus =
-        !filterStatus ||
-        (filterStatus === 'active' ? u.isActive === true : u.isActive === false);
-
-      return matchesText && matchesRole && matchesStatus;
-    });
-  }, [users, searchText, filterRole, filterStatus]);
-
-  // Pagination slicing
-  const totalPages = useMemo(() => {
-    return Math.max(1, Math.ceil(filteredUsers.length / pageSize));
-  }, [filteredUsers.length, pageSize]);
+  useEffect(() => {
+    loadMasterData();
+  }, [loadMasterData]);
 
-  const paginatedUsers = useMemo(() => {
-    const startIdx = (currentPage - 1) * pageSize;
-    return filteredUsers.slice(startIdx, startIdx + pageSize);
-  }, [filteredUsers, currentPage, pageSize]);
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedSearch(searchText), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [searchText]);
 
   useEffect(() => {
     // Reset to page 1 when filters change to keep UX consistent
     setCurrentPage(1);
-  }, [searchText, filterRole, filterStatus, pageSize]);
+  }, [debouncedSearch, filterRole, filterStatus, pageSize]);
 
   // Helpers
   function getRoleBadgeVariant(role: Role): BadgeProps['variant'] {
@@ -305,9 +299,10 @@ const [isEditing, setIsEditing] = useState(false);
 
     setIsCreating(true);
     try {
-      const created = await createUser(payload);
+      await createUser(payload);
       showSuccess('Pengguna baru berhasil dibuat');
-      setUsers((prev) => [created, ...prev]);
+      // Reload so ordering and totals come from the server
+      loadUsers();
       setOpenCreateModal(false);
       setCreateForm({
         nik: '',
@@ -573,7 +568,8 @@ async function submitEditUser() {
             <Button
               variant="secondary"
               onClick={() => {
-                // Apply: do nothing, filters already reactive
+                // Send the search text now instead of waiting for the debounce
+                setDebouncedSearch(searchText);
                 showInfo('Filter diterapkan');
               }}
             >
@@ -608,7 +604,7 @@ async function submitEditUser() {
             onClick: () => loadUsers(),
           }}
         />
-      ) : filteredUsers.length === 0 ? (
+      ) : users.length === 0 ? (
         <EmptyState
           title="Tidak ada pengguna"
           description="Coba ubah filter atau buat pengguna baru."
@@ -622,11 +618,11 @@ async function submitEditUser() {
         <>
           <Table
             columns={columns}
-            data={paginatedUsers}
+            data={users}
             ariaLabel="Tabel Pengguna"
             emptyLabel="Tidak ada data"
           />
-          {filteredUsers.length > pageSize && (
+          {totalPages > 1 && (
             <div className="flex justify-end">
               <Pagination
                 currentPage={currentPage}
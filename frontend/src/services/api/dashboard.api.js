@@ -0,0 +1,26 @@
+// frontend/src/services/api/dashboard.api.ts
+import apiClient from '@/lib/axios';
+// Error extraction helper
+function extractErrorMessage(error) {
+    const err = error;
+    const data = err?.response?.data;
+    if (data) {
+        if (typeof data === 'string')
+            return data;
+        if (typeof data.message === 'string')
+            return data.message;
+        if (Array.isArray(data.message))
+            return data.message.join(', ');
+    }
+    return err?.message ?? 'Unknown error';
+}
+// GET /api/dashboard — data awal dashboard untuk role user yang login (satu request)
+export async function getDashboard() {
+    try {
+        const res = await apiClient.get('/dashboard');
+        return res.data;
+    }
+    catch (error) {
+        throw new Error(extractErrorMessage(error));
+    }
+}
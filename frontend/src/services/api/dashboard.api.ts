@@ -0,0 +1,26 @@
+// frontend/src/services/api/dashboard.api.ts
+import apiClient from '@/lib/axios';
+import type { AxiosError } from 'axios';
+import type { DashboardPayload } from '@/types/dashboard.types';
+
+// Error extraction helper
+function extractErrorMessage(error: unknown): string {
+  const err = error as AxiosError<any>;
+  const data = err?.response?.data as any;
+  if (data) {
+    if (typeof data === 'string') return data;
+    if (typeof data.message === 'string') return data.message;
+    if (Array.isArray(data.message)) return data.message.join(', ');
+  }
+  return err?.message ?? 'Unknown error';
+}
+
+// GET /api/dashboard — data awal dashboard untuk role user yang login (satu request)
+export async function getDashboard<T extends DashboardPayload = DashboardPayload>(): Promise<T> {
+  try {
+    const res = await apiClient.get('/dashboard');
+    return res.data as T;
+  } catch (error) {
+    throw new Error(extractErrorMessage(error));
+  }
+}
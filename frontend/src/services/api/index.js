@@ -3,3 +3,4 @@ export * from './orders.api';
 export * from './users.api';
 export * from './reports.api';
 export * from './master.api.ts';
+export * from './dashboard.api';
@@ -2,4 +2,5 @@
 export * from './orders.api';
 export * from './users.api';
 export * from './reports.api';
-export * from './master.api';
\ No newline at end of file
+export * from './master.api';
+export * from './dashboard.api';
@@ -14,6 +14,20 @@ function extractErrorMessage(error) {
     }
     return err && err.message ? err.message : 'Unknown error';
 }
+// ===================== Idempotency =====================
+// Key unik per aksi tulis. Retry dengan key yang sama (mis. setelah timeout di Wi-Fi gudang)
+// mendapat respons yang tersimpan di server, bukan membuat pesanan/transisi ganda.
+export function newIdempotencyKey() {
+    const c = globalThis.crypto;
+    if (typeof c?.randomUUID === 'function')
+        return c.randomUUID();
+    // randomUUID hanya tersedia di secure context; getRandomValues tersedia juga di HTTP biasa
+    const bytes = c.getRandomValues(new Uint8Array(16));
+    return Array.from(bytes, (b) => b.toString(16).padStart(2, '0')).join('');
+}
+function idempotencyHeaders(key) {
+    return { headers: { 'Idempotency-Key': key } };
+}
 // ===================== Orders API =====================
 // List orders (paginated)
 export async function getOrders(params = {}) {
@@ -35,10 +49,10 @@ export async function getOrderById(id) {
         throw new Error(extractErrorMessage(error));
     }
 }
-// Create order
-export async function createOrder(payload) {
+// Create order (kirim ulang `idempotencyKey` yang sama saat retry submit form yang sama)
+export async function createOrder(payload, idempotencyKey = newIdempotencyKey()) {
     try {
-        const res = await apiClient.post('/orders', payload);
+        const res = await apiClient.post('/orders', payload, idempotencyHeaders(idempotencyKey));
         return res.data;
     }
     catch (error) {
@@ -48,7 +62,7 @@ export async function createOrder(payload) {
 export async function updateOrderStatus(id, arg) {
     try {
         const payload = typeof arg === 'string' ? { status: arg } : arg;
-        const res = await apiClient.patch(`/orders/${id}/status`, payload);
+        const res = await apiClient.patch(`/orders/${id}/status`, payload, idempotencyHeaders(newIdempotencyKey()));
         return res.data;
     }
     catch (error) {
@@ -58,7 +72,7 @@ export async function updateOrderStatus(id, arg) {
 export async function requestRejection(id, arg) {
     try {
         const payload = typeof arg === 'string' ? { catatanDapur: arg } : arg;
-        const res = await apiClient.post(`/orders/${id}/request-rejection`, payload);
+        const res = await apiClient.post(`/orders/${id}/request-rejection`, payload, idempotencyHeaders(newIdempotencyKey()));
         return res.data;
     }
     catch (error) {
@@ -73,7 +87,7 @@ export async function requestEdit(id, arg1, arg2) {
                 catatanDapur: arg2 ?? '',
             }
             : arg1;
-        const res = await apiClient.post(`/orders/${id}/request-edit`, payload);
+        const res = await apiClient.post(`/orders/${id}/request-edit`, payload, idempotencyHeaders(newIdempotencyKey()));
         return res.data;
     }
     catch (error) {
@@ -88,7 +102,7 @@ export async function approveRejectOrder(id, arg1, arg2) {
                 ...(arg2 ? { catatanAdmin: arg2 } : {}),
             }
             : arg1;
-        const res = await apiClient.post(`/orders/${id}/approve-reject`, payload);
+        const res = await apiClient.post(`/orders/${id}/approve-reject`, payload, idempotencyHeaders(newIdempotencyKey()));
         return res.data;
     }
     catch (error) {
@@ -105,3 +119,34 @@ export async function getPendingApprovals() {
         throw new Error(extractErrorMessage(error));
     }
 }
+export async function getOrderCounters() {
+    try {
+        const res = await apiClient.get('/orders/counters');
+        return res.data;
+    }
+    catch (error) {
+        throw new Error(extractErrorMessage(error));
+    }
+}
+export async function getOrderChanges(since = 0, limit) {
+    try {
+        const res = await apiClient.get('/orders/changes', {
+            params: { since, limit },
+        });
+        return res.data;
+    }
+    catch (error) {
+        throw new Error(extractErrorMessage(error));
+    }
+}
+export async function getPendingApprovalChanges(since, epoch) {
+    try {
+        const res = await apiClient.get('/orders/pending-approvals/changes', {
+            params: { since, epoch },
+        });
+        return res.data;
+    }
+    catch (error) {
+        throw new Error(extractErrorMessage(error));
+    }
+}
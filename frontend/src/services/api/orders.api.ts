@@ -12,6 +12,7 @@ import type {
   ApprovalDecision,
   StatusPesanan,
   OrdersListResponse,
+  OrderCountersSummary,
 } from '@/types/order.types';
 
 // Error extraction helper
@@ -26,6 +27,22 @@ function extractErrorMessage(error: unknown): string {
   return err && err.message ? err.message : 'Unknown error';
 }
 
+// ===================== Idempotency =====================
+
+// Key unik per aksi tulis. Retry dengan key yang sama (mis. setelah timeout di Wi-Fi gudang)
+// mendapat respons yang tersimpan di server, bukan membuat pesanan/transisi ganda.
+export function newIdempotencyKey(): string {
+  const c = globalThis.crypto;
+  if (typeof c?.randomUUID === 'function') return c.randomUUID();
+  // randomUUID hanya tersedia di secure context; getRandomValues tersedia juga di HTTP biasa
+  const bytes = c.getRandomValues(new Uint8Array(16));
+  return Array.from(bytes, (b) => b.toString(16).padStart(2, '0')).join('');
+}
+
+function idempotencyHeaders(key: string) {
+  return { headers: { 'Idempotency-Key': key } };
+}
+
 // ===================== Orders API =====================
 
 // List orders (paginated)
@@ -50,10 +67,17 @@ export async function getOrderById(id: number): Promise<Order> {
   }
 }
 
-// Create order
-export async function createOrder(payload: CreateOrderDto): Promise<Order> {
+// Create order (kirim ulang `idempotencyKey` yang sama saat retry submit form yang sama)
+export async function createOrder(
+  payload: CreateOrderDto,
+  idempotencyKey: string = newIdempotencyKey(),
+): Promise<Order> {
   try {
-    const res = await apiClient.post('/orders', payload);
+    const res = await apiClient.post(
+      '/orders',
+      payload,
+      idempotencyHeaders(idempotencyKey),
+    );
     return res.data as Order;
   } catch (error) {
     throw new Error(extractErrorMessage(error));
@@ -70,7 +94,11 @@ export async function updateOrderStatus(
   try {
     const payload: UpdateOrderStatusDto =
       typeof arg === 'string' ? { status: arg } : arg;
-    const res = await apiClient.patch(`/orders/${id}/status`, payload);
+    const res = await apiClient.patch(
+      `/orders/${id}/status`,
+      payload,
+      idempotencyHeaders(newIdempotencyKey()),
+    );
     return res.data as Order;
   } catch (error) {
     throw new Error(extractErrorMessage(error));
@@ -87,7 +115,11 @@ export async function requestRejection(
   try {
     const payload: RejectOrderDto =
       typeof arg === 'string' ? { catatanDapur: arg } : arg;
-    const res = await apiClient.post(`/orders/${id}/request-rejection`, payload);
+    const res = await apiClient.post(
+      `/orders/${id}/request-rejection`,
+      payload,
+      idempotencyHeaders(newIdempotencyKey()),
+    );
     return res.data as Order;
   } catch (error) {
     throw new Error(extractErrorMessage(error));
@@ -114,7 +146,11 @@ export async function requestEdit(
             catatanDapur: arg2 ?? '',
           }
         : arg1;
-    const res = await apiClient.post(`/orders/${id}/request-edit`, payload);
+    const res = await apiClient.post(
+      `/orders/${id}/request-edit`,
+      payload,
+      idempotencyHeaders(newIdempotencyKey()),
+    );
     return res.data as Order;
   } catch (error) {
     throw new Error(extractErrorMessage(error));
@@ -144,7 +180,11 @@ export async function approveRejectOrder(
             ...(arg2 ? { catatanAdmin: arg2 } : {}),
           }
         : arg1;
-    const res = await apiClient.post(`/orders/${id}/approve-reject`, payload);
+    const res = await apiClient.post(
+      `/orders/${id}/approve-reject`,
+      payload,
+      idempotencyHeaders(newIdempotencyKey()),
+    );
     return res.data as Order;
   } catch (error) {
     throw new Error(extractErrorMessage(error));
@@ -159,4 +199,60 @@ export async function getPendingApprovals(): Promise<Order[]> {
   } catch (error) {
     throw new Error(extractErrorMessage(error));
   }
+}
+
+// Counter pesanan hari ini (dilayani dari memori server; juga dipush via WS 'order.counters.updated')
+export async function getOrderCounters(): Promise<OrderCountersSummary> {
+  try {
+    const res = await apiClient.get('/orders/counters');
+    return res.data as OrderCountersSummary;
+  } catch (error) {
+    throw new Error(extractErrorMessage(error));
+  }
+}
+
+// Delta pesanan sejak `version` sebelumnya (changes = baris berubah, removed = id yang hilang dari tampilan)
+// hasMore: true → panggil lagi segera dengan version baru; false → tunggu polling berikutnya
+export interface OrderChanges {
+  version: number;
+  hasMore: boolean;
+  changes: Order[];
+  removed: number[];
+}
+
+export async function getOrderChanges(
+  since = 0,
+  limit?: number,
+): Promise<OrderChanges> {
+  try {
+    const res = await apiClient.get('/orders/changes', {
+      params: { since, limit },
+    });
+    return res.data as OrderChanges;
+  } catch (error) {
+    throw new Error(extractErrorMessage(error));
+  }
+}
+
+// Pending approvals delta (since = version, epoch dari respons sebelumnya)
+export interface PendingApprovalChanges {
+  epoch: string;
+  version: number;
+  full: boolean;
+  upserts: Order[];
+  removed: number[];
+}
+
+export async function getPendingApprovalChanges(
+  since?: number,
+  epoch?: string,
+): Promise<PendingApprovalChanges> {
+  try {
+    const res = await apiClient.get('/orders/pending-approvals/changes', {
+      params: { since, epoch },
+    });
+    return res.data as PendingApprovalChanges;
+  } catch (error) {
+    throw new Error(extractErrorMessage(error));
+  }
 }
\ No newline at end of file
@@ -84,3 +84,46 @@ export async function getAuditTrailActionTypes() {
         throw new Error(extractErrorMessage(error));
     }
 }
+// POST /api/reports/exports/:report/:format
+// Export di background; parameter sama dengan endpoint laporan (semua halaman untuk rejections/audit-trail)
+export async function createExportJob(report, format, query = {}) {
+    try {
+        const res = await apiClient.post(`/reports/exports/${report}/${format}`, null, {
+            params: query,
+        });
+        return res.data;
+    }
+    catch (error) {
+        throw new Error(extractErrorMessage(error));
+    }
+}
+// GET /api/reports/exports
+export async function getExportJobs() {
+    try {
+        const res = await apiClient.get('/reports/exports');
+        return res.data;
+    }
+    catch (error) {
+        throw new Error(extractErrorMessage(error));
+    }
+}
+// GET /api/reports/exports/:id
+export async function getExportJob(id) {
+    try {
+        const res = await apiClient.get(`/reports/exports/${encodeURIComponent(id)}`);
+        return res.data;
+    }
+    catch (error) {
+        throw new Error(extractErrorMessage(error));
+    }
+}
+// GET /api/reports/exports/:id/download (409 bila belum selesai, 410 bila kedaluwarsa)
+export async function downloadExportJob(id) {
+    try {
+        const res = await apiClient.get(`/reports/exports/${encodeURIComponent(id)}/download`, { responseType: 'blob' });
+        return res.data;
+    }
+    catch (error) {
+        throw new Error(extractErrorMessage(error));
+    }
+}
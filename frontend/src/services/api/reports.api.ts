@@ -13,6 +13,9 @@ import type {
   AuditTrailQuery,
   AuditTrailPage,
   AuditTrailEntry,
+  ExportJob,
+  ExportReportType,
+  ExportFormat,
 } from '@/types/report.types';
 
 // Error extraction helper
@@ -107,4 +110,54 @@ export async function getAuditTrailActionTypes(): Promise<string[]> {
   } catch (error) {
     throw new Error(extractErrorMessage(error));
   }
-}
\ No newline at end of file
+}
+
+// POST /api/reports/exports/:report/:format
+// Export di background; parameter sama dengan endpoint laporan (semua halaman untuk rejections/audit-trail)
+export async function createExportJob(
+  report: ExportReportType,
+  format: ExportFormat,
+  query: Record<string, unknown> = {},
+): Promise<ExportJob> {
+  try {
+    const res = await apiClient.post(`/reports/exports/${report}/${format}`, null, {
+      params: query,
+    });
+    return res.data as ExportJob;
+  } catch (error) {
+    throw new Error(extractErrorMessage(error));
+  }
+}
+
+// GET /api/reports/exports
+export async function getExportJobs(): Promise<ExportJob[]> {
+  try {
+    const res = await apiClient.get('/reports/exports');
+    return res.data as ExportJob[];
+  } catch (error) {
+    throw new Error(extractErrorMessage(error));
+  }
+}
+
+// GET /api/reports/exports/:id
+export async function getExportJob(id: string): Promise<ExportJob> {
+  try {
+    const res = await apiClient.get(`/reports/exports/${encodeURIComponent(id)}`);
+    return res.data as ExportJob;
+  } catch (error) {
+    throw new Error(extractErrorMessage(error));
+  }
+}
+
+// GET /api/reports/exports/:id/download (409 bila belum selesai, 410 bila kedaluwarsa)
+export async function downloadExportJob(id: string): Promise<Blob> {
+  try {
+    const res = await apiClient.get(
+      `/reports/exports/${encodeURIComponent(id)}/download`,
+      { responseType: 'blob' },
+    );
+    return res.data as Blob;
+  } catch (error) {
+    throw new Error(extractErrorMessage(error));
+  }
+}
@@ -15,9 +15,11 @@ function extractErrorMessage(error) {
     return err?.message ? err.message : 'Unknown error';
 }
 // API: Users (Administrator scope)
-export async function getUsers() {
+// Server-side paging + search (NIK/nama) + filter; response berupa envelope Paginated
+export async function getUsersPage(params = {}) {
     try {
-        const res = await apiClient.get('/users');
+        const query = { page: 1, limit: 20, ...params };
+        const res = await apiClient.get('/users', { params: query });
         return res.data;
     }
     catch (error) {
@@ -42,6 +44,20 @@ export async function createUser(payload) {
         throw new Error(extractErrorMessage(error));
     }
 }
+// Bulk import karyawan dari file CSV/XLSX (multipart field "file")
+export async function importUsers(file) {
+    try {
+        const form = new FormData();
+        form.append('file', file);
+        const res = await apiClient.post('/users/import', form, {
+            headers: { 'Content-Type': 'multipart/form-data' },
+        });
+        return res.data;
+    }
+    catch (error) {
+        throw new Error(extractErrorMessage(error));
+    }
+}
 export async function updateUserStatus(payload) {
     try {
         const { userId: karyawanId, status } = payload;
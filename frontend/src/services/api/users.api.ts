@@ -8,6 +8,7 @@ import type {
   UpdateUserProfilePayload,
 } from '@/types/user.types';
 import type { Role } from '@/types/auth.types';
+import type { Paginated } from '@/types/report.types';
 
 // Local payload type aligned with backend CreateUserDto
 export interface CreateUserPayload {
@@ -20,6 +21,24 @@ export interface CreateUserPayload {
   keterangan?: string | null;
 }
 
+// Query params for server-side paginated user listing (GET /users)
+export interface UsersQueryParams {
+  search?: string;
+  departmentId?: number;
+  roleAccess?: Role;
+  isActive?: boolean;
+  page?: number;
+  limit?: number;
+}
+
+// Per-row report returned by POST /users/import
+export interface UserImportReport {
+  totalRows: number;
+  created: number;
+  failed: number;
+  errors: { row: number; nik: string | null; errors: string[] }[];
+}
+
 // Error extraction helper (consistent across API layer)
 function extractErrorMessage(error: unknown): string {
   const err = error as AxiosError<any>;
@@ -33,10 +52,14 @@ function extractErrorMessage(error: unknown): string {
 }
 
 // API: Users (Administrator scope)
-export async function getUsers(): Promise<KaryawanProfile[]> {
+// Server-side paging + search (NIK/nama) + filter; response berupa envelope Paginated
+export async function getUsersPage(
+  params: UsersQueryParams = {},
+): Promise<Paginated<KaryawanProfile>> {
   try {
-    const res = await apiClient.get('/users');
-    return res.data as KaryawanProfile[];
+    const query: UsersQueryParams = { page: 1, limit: 20, ...params };
+    const res = await apiClient.get('/users', { params: query });
+    return res.data as Paginated<KaryawanProfile>;
   } catch (error) {
     throw new Error(extractErrorMessage(error));
   }
@@ -60,6 +83,20 @@ export async function createUser(payload: CreateUserPayload): Promise<KaryawanPr
   }
 }
 
+// Bulk import karyawan dari file CSV/XLSX (multipart field "file")
+export async function importUsers(file: File): Promise<UserImportReport> {
+  try {
+    const form = new FormData();
+    form.append('file', file);
+    const res = await apiClient.post('/users/import', form, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return res.data as UserImportReport;
+  } catch (error) {
+    throw new Error(extractErrorMessage(error));
+  }
+}
+
 export async function updateUserStatus(payload: UpdateUserStatusPayload): Promise<KaryawanProfile> {
   try {
     const { userId: karyawanId, status } = payload;
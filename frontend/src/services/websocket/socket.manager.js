@@ -7,7 +7,8 @@ function buildNamespaceUrl(baseUrl) {
 /**
  * SocketManager
  * - Singleton pengelola koneksi Socket.IO (namespace /notifications)
- * - Autentikasi JWT via handshake auth.token
+ * - Autentikasi JWT via handshake auth.token; token baru dikirim in-band ('auth.refresh')
+ *   tanpa reconnect, dan 'auth.expiring'/'auth.expired' dari server memicu refresh token
  * - Auto-reconnection dengan batas attempt
  * - Pendaftaran handler event type-safe
  * - API: connect, disconnect, on, off, emit, getConnectionStatus, subscribeStatus
@@ -62,6 +63,12 @@ class SocketManager {
             writable: true,
             value: void 0
         });
+        Object.defineProperty(this, "authRefresher", {
+            enumerable: true,
+            configurable: true,
+            writable: true,
+            value: null
+        });
         Object.defineProperty(this, "namespaceUrl", {
             enumerable: true,
             configurable: true,
@@ -74,6 +81,8 @@ class SocketManager {
             'order.status.changed',
             'order.approval.requested',
             'order.approval.decided',
+            'order.counters.updated',
+            'export.job.updated',
         ].forEach((evt) => {
             if (!this.handlers.has(evt))
                 this.handlers.set(evt, new Set());
@@ -144,10 +153,49 @@ class SocketManager {
         this.socket.on('error', () => {
             this.setStatus('error');
         });
+        // Server meminta token baru sebelum/saat access token kedaluwarsa
+        this.socket.on('auth.expiring', () => this.requestAuthRefresh());
+        this.socket.on('auth.expired', () => this.requestAuthRefresh());
+    }
+    /**
+     * Daftarkan fungsi refresh token (mis. authStore.refreshAuth).
+     * Token baru kembali ke connect() dan dikirim in-band.
+     */
+    setAuthRefresher(fn) {
+        this.authRefresher = fn;
+    }
+    requestAuthRefresh() {
+        if (!this.authRefresher)
+            return;
+        Promise.resolve()
+            .then(() => this.authRefresher?.())
+            .catch(() => {
+            // abaikan error refresh; server akan memutus socket saat token kedaluwarsa
+        });
+    }
+    /**
+     * Kirim token baru lewat koneksi yang sudah ada. Reconnect hanya jika ditolak server.
+     */
+    refreshInBand(token) {
+        const socket = this.socket;
+        if (!socket)
+            return;
+        socket
+            .timeout(10000)
+            .emit('auth.refresh', { token }, (err, res) => {
+            if (!err && res?.ok)
+                return;
+            if (this.socket !== socket || this.currentToken !== token)
+                return;
+            socket.disconnect();
+            this.setStatus('connecting');
+            socket.connect();
+        });
     }
     /**
      * Connect (or reconnect) menggunakan accessToken terbaru.
-     * - Jika token/department berubah, akan melakukan reconnect ringan.
+     * - Jika hanya token berubah saat connected, token dikirim in-band ('auth.refresh').
+     * - Jika department berubah, akan melakukan reconnect ringan.
      * - Hanya memanggil socket.connect() jika belum connected.
      */
     connect(token, departmentId) {
@@ -161,6 +209,10 @@ class SocketManager {
             return;
         // Update auth payload sebelum connect
         this.socket.auth = { token, departmentId };
+        if (tokenChanged && !deptChanged && this.socket.connected) {
+            this.refreshInBand(token);
+            return;
+        }
         if (tokenChanged || deptChanged) {
             // Force a clean reconnect cycle to apply new auth
             if (this.socket.connected) {
@@ -243,6 +295,8 @@ class SocketManager {
             'order.status.changed',
             'order.approval.requested',
             'order.approval.decided',
+            'order.counters.updated',
+            'export.job.updated',
         ];
         // Bersihkan dulu semua listener business di socket
         for (const evt of businessEvents) {
@@ -17,7 +17,8 @@ function buildNamespaceUrl(baseUrl: string | undefined): string {
 /**
  * SocketManager
  * - Singleton pengelola koneksi Socket.IO (namespace /notifications)
- * - Autentikasi JWT via handshake auth.token
+ * - Autentikasi JWT via handshake auth.token; token baru dikirim in-band ('auth.refresh')
+ *   tanpa reconnect, dan 'auth.expiring'/'auth.expired' dari server memicu refresh token
  * - Auto-reconnection dengan batas attempt
  * - Pendaftaran handler event type-safe
  * - API: connect, disconnect, on, off, emit, getConnectionStatus, subscribeStatus
@@ -33,6 +34,7 @@ class SocketManager {
 
   private currentToken: string | undefined;
   private currentDepartmentId: number | undefined;
+  private authRefresher: (() => Promise<void> | void) | null = null;
 
   private readonly namespaceUrl = buildNamespaceUrl(import.meta.env.VITE_WS_URL);
 
@@ -43,6 +45,8 @@ class SocketManager {
       'order.status.changed',
       'order.approval.requested',
       'order.approval.decided',
+      'order.counters.updated',
+      'export.job.updated',
     ] as WebSocketEventName[]).forEach((evt) => {
       if (!this.handlers.has(evt)) this.handlers.set(evt, new Set());
     });
@@ -120,11 +124,50 @@ class SocketManager {
     this.socket.on('error', () => {
       this.setStatus('error');
     });
+
+    // Server meminta token baru sebelum/saat access token kedaluwarsa
+    this.socket.on('auth.expiring', () => this.requestAuthRefresh());
+    this.socket.on('auth.expired', () => this.requestAuthRefresh());
+  }
+
+  /**
+   * Daftarkan fungsi refresh token (mis. authStore.refreshAuth).
+   * Token baru kembali ke connect() dan dikirim in-band.
+   */
+  setAuthRefresher(fn: (() => Promise<void> | void) | null) {
+    this.authRefresher = fn;
+  }
+
+  private requestAuthRefresh() {
+    if (!this.authRefresher) return;
+    Promise.resolve()
+      .then(() => this.authRefresher?.())
+      .catch(() => {
+        // abaikan error refresh; server akan memutus socket saat token kedaluwarsa
+      });
+  }
+
+  /**
+   * Kirim token baru lewat koneksi yang sudah ada. Reconnect hanya jika ditolak server.
+   */
+  private refreshInBand(token: string) {
+    const socket = this.socket;
+    if (!socket) return;
+    socket
+      .timeout(10000)
+      .emit('auth.refresh', { token }, (err: unknown, res?: { ok?: boolean }) => {
+        if (!err && res?.ok) return;
+        if (this.socket !== socket || this.currentToken !== token) return;
+        socket.disconnect();
+        this.setStatus('connecting');
+        socket.connect();
+      });
   }
 
   /**
    * Connect (or reconnect) menggunakan accessToken terbaru.
-   * - Jika token/department berubah, akan melakukan reconnect ringan.
+   * - Jika hanya token berubah saat connected, token dikirim in-band ('auth.refresh').
+   * - Jika department berubah, akan melakukan reconnect ringan.
    * - Hanya memanggil socket.connect() jika belum connected.
    */
   connect(token: string, departmentId?: number) {
@@ -142,6 +185,11 @@ class SocketManager {
     // Update auth payload sebelum connect
     (this.socket as any).auth = { token, departmentId };
 
+    if (tokenChanged && !deptChanged && this.socket.connected) {
+      this.refreshInBand(token);
+      return;
+    }
+
     if (tokenChanged || deptChanged) {
       // Force a clean reconnect cycle to apply new auth
       if (this.socket.connected) {
@@ -233,6 +281,8 @@ class SocketManager {
       'order.status.changed',
       'order.approval.requested',
       'order.approval.decided',
+      'order.counters.updated',
+      'export.job.updated',
     ];
 
     // Bersihkan dulu semua listener business di socket
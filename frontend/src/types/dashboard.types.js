@@ -0,0 +1,2 @@
+// frontend/src/types/dashboard.types.ts
+export {};
@@ -0,0 +1,59 @@
+// frontend/src/types/dashboard.types.ts
+import type { Order, OrderCountersSummary, OrderCounterCell, StatusPesanan } from './order.types';
+import type { DepartmentReportItem } from './report.types';
+
+/**
+ * Respons GET /dashboard: data tampilan awal dashboard sesuai role pemanggil (satu request).
+ * Payload di-cache singkat di server (DASHBOARD_CACHE_TTL_SECONDS); `generatedAt` = waktu disusun.
+ */
+
+// Pesanan ringkas: hanya kolom yang ditampilkan tabel dashboard
+export type DashboardOrder = Pick<
+  Order,
+  | 'id'
+  | 'kodePesanan'
+  | 'statusPesanan'
+  | 'jumlahPesanan'
+  | 'tanggalPesanan'
+  | 'waktuDibuat'
+  | 'waktuDiproses'
+  | 'waktuSiap'
+>;
+
+// Counter pesanan hari ini tanpa rincian departemen/shift
+export type DashboardCounters = Pick<OrderCountersSummary, 'date' | 'version' | 'totals' | 'byStatus'>;
+
+export interface AdminDashboard {
+  role: 'administrator';
+  generatedAt: string;
+  counters: DashboardCounters;
+  pendingApprovals: number;
+  recentOrders: DashboardOrder[];
+  departments: DepartmentReportItem[];
+}
+
+export interface DapurDashboard {
+  role: 'dapur';
+  generatedAt: string;
+  counters: DashboardCounters;
+  pendingApprovals: number;
+  queue: DashboardOrder[]; // MENUNGGU / IN_PROGRESS hari ini
+}
+
+export interface DeliveryDashboard {
+  role: 'delivery';
+  generatedAt: string;
+  counters: DashboardCounters;
+  ready: DashboardOrder[]; // READY hari ini
+}
+
+export interface EmployeeDashboard {
+  role: 'employee';
+  generatedAt: string;
+  from: string; // awal jendela 7 hari (YYYY-MM-DD)
+  totals: OrderCounterCell;
+  byStatus: Record<StatusPesanan, OrderCounterCell>;
+  recentOrders: DashboardOrder[];
+}
+
+export type DashboardPayload = AdminDashboard | DapurDashboard | DeliveryDashboard | EmployeeDashboard;
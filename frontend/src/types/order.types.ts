@@ -88,6 +88,8 @@ export interface Order {
   waktuSiap?: string
   waktuDiantar?: string
   waktuSelesai?: string
+  version?: number
+  changeVersion?: number
 
   // Relasi terpopulasi (opsional tergantung endpoint)
   pemesan?: Karyawan
@@ -121,6 +123,8 @@ export interface CreateOrderDto {
  */
 export interface UpdateOrderStatusDto {
   status: StatusPesanan
+  // Versi pesanan terakhir yang dilihat; server membalas 409 bila sudah berubah
+  expectedVersion?: number
 }
 
 /**
@@ -197,14 +201,64 @@ export const ApprovalStatus = {
  */
 export type OrderRequestType = 'REJECT' | 'EDIT'
 
-export interface OrderStatusChangedEventPayload {
+/**
+ * Field pesanan yang ditulis oleh sebuah perubahan (tanggal dalam ISO string).
+ */
+export type OrderPatch = Partial<
+  Pick<
+    Order,
+    | 'statusPesanan'
+    | 'jumlahPesanan'
+    | 'jumlahPesananAwal'
+    | 'requiresApproval'
+    | 'approvalStatus'
+    | 'catatanDapur'
+    | 'catatanAdmin'
+    | 'approvedById'
+    | 'waktuDiproses'
+    | 'waktuSiap'
+    | 'waktuDiantar'
+    | 'waktuSelesai'
+  >
+>
+
+/**
+ * Bidang bersama skema wire ringkas event order.* (backend: websocket/order-event-wire.ts).
+ * - v: versi skema wire
+ * - version: versi baris pesanan setelah perubahan
+ * - changes: patch untuk state lokal (terapkan hanya bila version lebih baru)
+ */
+export interface OrderWireBase {
+  v: number
   orderId: number
   kodePesanan: string
-  oldStatus?: StatusPesanan
+  version?: number
+  changes?: OrderPatch
+  timestamp: string // ISO datetime
+}
+
+export interface OrderStatusChangedEventPayload extends OrderWireBase {
+  oldStatus?: StatusPesanan | null
   newStatus: StatusPesanan
-  changedBy: string // NIK pengubah status
-  changedByRole: Role
   karyawanPemesanId: number
-  departmentId?: number
-  timestamp: string // ISO datetime
+}
+
+/**
+ * Counter pesanan hari ini (GET /orders/counters dan event WS 'order.counters.updated').
+ */
+export interface OrderCounterCell {
+  orders: number
+  meals: number
+}
+
+export interface OrderStatusCounters {
+  totals: OrderCounterCell
+  byStatus: Record<StatusPesanan, OrderCounterCell>
+}
+
+export interface OrderCountersSummary extends OrderStatusCounters {
+  date: string // YYYY-MM-DD
+  version: number
+  byDepartment: Array<{ departmentId: number } & OrderStatusCounters>
+  byShift: Array<{ shiftId: number } & OrderStatusCounters>
 }
@@ -52,7 +52,8 @@ export interface PerformanceReport {
 export type RejectionRequestType = 'REJECT' | 'EDIT';
 
 export interface RejectionReportItem {
-  id: number;
+  id: number; // id pesanan
+  requestId: number; // id permintaan persetujuan (satu pesanan bisa punya beberapa)
   kodePesanan: string;
   departmentId: number;
   departmentName: string;
@@ -68,6 +69,9 @@ export interface RejectionReportItem {
   catatanAdmin?: string;
   waktuDibuat: string; // ISO datetime
   requestType: RejectionRequestType;
+  requestedById?: number | null;
+  requestedAt: string; // ISO datetime
+  decidedAt?: string | null;
 }
 
 export interface RejectionReportResponse {
@@ -150,6 +154,38 @@ export interface AuditTrailQueryDto {
   limit?: number;
 }
 
+// ===================== Export Jobs =====================
+// POST /reports/exports/:report/:format → job (202); progres via WS 'export.job.updated'
+
+export type ExportReportType =
+  | 'consumption'
+  | 'department'
+  | 'performance'
+  | 'rejections'
+  | 'audit-trail';
+
+export type ExportFormat = 'csv' | 'pdf';
+
+export type ExportJobStatus = 'queued' | 'running' | 'completed' | 'failed';
+
+export interface ExportJob {
+  id: string;
+  report: ExportReportType;
+  format: ExportFormat;
+  status: ExportJobStatus;
+  progress: number; // 0..100
+  rowsWritten: number;
+  requestedBy: number; // karyawanId
+  fileName: string;
+  size: number | null; // bytes, setelah selesai
+  error: string | null;
+  createdAt: string; // ISO datetime
+  startedAt: string | null;
+  finishedAt: string | null;
+  expiresAt: string | null; // file tidak dapat diunduh setelah waktu ini
+  updatedAt: string;
+}
+
 // ===================== Backward-compatibility Aliases =====================
 // These aliases keep existing pages compiling without edits by mapping legacy names
 // to the new DTOs and interfaces defined above.
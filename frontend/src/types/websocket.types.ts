@@ -2,7 +2,8 @@
  * WebSocket (Socket.IO) types untuk frontend.
  * Diselaraskan dengan gateway dan event backend:
  * - Gateway: backend/src/websocket/websocket.gateway.ts
- *   Listeners: 'order.created', 'order.status.changed', 'order.approval.requested', 'order.approval.decided'
+ *   Listeners: 'order.created', 'order.status.changed', 'order.approval.requested', 'order.approval.decided',
+ *   'order.counters.updated', 'export.job.updated'
  * - Events:
  *   - OrderStatusChangedEvent: backend/src/common/events/order-status-changed.event.ts
  *   - OrderApprovalRequestedEvent: backend/src/common/events/order-approval-requested.event.ts
@@ -10,7 +11,14 @@
  */
 
 import type { Role } from './auth.types';
-import type { OrderStatusChangedEventPayload, ApprovalDecision, OrderRequestType } from './order.types';
+import type {
+  OrderStatusChangedEventPayload,
+  OrderWireBase,
+  ApprovalDecision,
+  OrderRequestType,
+  OrderCountersSummary,
+} from './order.types';
+import type { ExportJob } from './report.types';
 
 /**
  * Nama event yang di-broadcast oleh server.
@@ -19,7 +27,9 @@ export type WebSocketEventName =
   | 'order.created'
   | 'order.status.changed'
   | 'order.approval.requested'
-  | 'order.approval.decided';
+  | 'order.approval.decided'
+  | 'order.counters.updated'
+  | 'export.job.updated';
 
 /**
  * Opsi koneksi Socket.IO untuk namespace /notifications.
@@ -38,18 +48,13 @@ export interface SocketConnectOptions {
 
 /**
  * Payload untuk event 'order.created'.
- * Catatan: backend menggunakan `any` dan minimal mengandung departmentId/deptId dan orderId.
- * Tambahkan field lainnya sesuai kebutuhan UI (dari service-emitted payload).
+ * Skema wire ringkas (lihat OrderWireBase); relasi (pemesan/shift) tidak disertakan.
  */
-export interface OrderCreatedEventPayload {
-  orderId: number;
-  kodePesanan?: string;
-  departmentId?: number; // prefer departmentId
-  deptId?: number; // fallback compatibility
-  karyawanPemesanId?: number;
-  jumlahPesanan?: number;
+export interface OrderCreatedEventPayload extends OrderWireBase {
+  departmentId?: number;
   shiftId?: number;
-  timestamp?: string; // ISO
+  jumlahPesanan?: number;
+  tanggalPesanan?: string; // ISO
 }
 
 /**
@@ -62,35 +67,23 @@ export type OrderStatusChangedWS = OrderStatusChangedEventPayload;
  * Payload untuk event 'order.approval.requested'.
  * Referensi: OrderApprovalRequestedEvent di backend.
  */
-export interface OrderApprovalRequestedEventPayload {
-  orderId: number;
-  kodePesanan: string;
+export interface OrderApprovalRequestedEventPayload extends OrderWireBase {
   requestType: OrderRequestType; // 'REJECT' | 'EDIT'
-  requestedBy: number;
-  requestedByNik: string;
   catatanDapur: string;
-  jumlahPesananAwal: number;
   departmentId: number;
   karyawanPemesanId: number;
   jumlahPesananBaru?: number;
-  timestamp: string; // ISO
 }
 
 /**
  * Payload untuk event 'order.approval.decided'.
  * Referensi: OrderApprovalDecidedEvent di backend.
  */
-export interface OrderApprovalDecidedEventPayload {
-  orderId: number;
-  kodePesanan: string;
+export interface OrderApprovalDecidedEventPayload extends OrderWireBase {
   decision: ApprovalDecision; // 'PENDING' | 'APPROVED' | 'REJECTED'
-  decidedBy: number;
-  decidedByNik: string;
   catatanAdmin: string | null;
   originalRequest: OrderRequestType; // 'REJECT' | 'EDIT'
-  departmentId: number;
   requestedBy: number;
-  timestamp: string; // ISO
 }
 
 /**
@@ -101,6 +94,8 @@ export interface NotificationsEventMap {
   'order.status.changed': OrderStatusChangedWS;
   'order.approval.requested': OrderApprovalRequestedEventPayload;
   'order.approval.decided': OrderApprovalDecidedEventPayload;
+  'order.counters.updated': OrderCountersSummary;
+  'export.job.updated': ExportJob;
 }
 
 /**
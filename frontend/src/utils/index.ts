@@ -1,4 +1,5 @@
 export * from './status.utils';
 export * from './date.utils';
 export * from './download.utils';
-export * from './offline-storage.utils';
\ No newline at end of file
+export * from './offline-storage.utils';
+export * from './order-patch.utils';
\ No newline at end of file
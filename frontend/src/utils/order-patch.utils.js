@@ -0,0 +1,66 @@
+/**
+ * Utilitas patch pesanan dari event WebSocket order.* (skema wire ringkas).
+ * - Patch (`changes`) hanya diterapkan bila `version` event lebih baru dari versi pesanan lokal
+ * - Event lama/duplikat (mis. echo aksi sendiri yang sudah memakai respons REST) diabaikan
+ * - Relasi (pemesan/departemen/shift) pada pesanan lokal dipertahankan
+ */
+/**
+ * true bila event membawa patch untuk pesanan ini dan lebih baru dari versi lokal.
+ */
+export function isNewerOrderPatch(order, event) {
+    if (order.id !== event.orderId || !event.changes)
+        return false;
+    if (typeof event.version !== 'number' || typeof order.version !== 'number')
+        return true;
+    return event.version > order.version;
+}
+/**
+ * Terapkan patch ke satu pesanan. Mengembalikan objek yang sama bila tidak ada perubahan.
+ */
+export function applyOrderPatch(order, event) {
+    if (!isNewerOrderPatch(order, event))
+        return order;
+    return { ...order, ...event.changes, version: event.version ?? order.version };
+}
+/**
+ * Terapkan patch ke daftar pesanan (posisi tetap).
+ * Mengembalikan null bila pesanan tidak ada di daftar.
+ */
+export function applyOrderPatchToList(list, event) {
+    const index = list.findIndex((o) => o.id === event.orderId);
+    if (index < 0)
+        return null;
+    const patched = applyOrderPatch(list[index], event);
+    if (patched === list[index])
+        return list;
+    const next = list.slice();
+    next[index] = patched;
+    return next;
+}
+/**
+ * Terapkan patch ke daftar yang dikelompokkan per status (kolom kanban/tab).
+ * - Pesanan dipindah ke grup sesuai statusPesanan baru (urut waktuDibuat terbaru),
+ *   atau dibuang bila status barunya tidak ditampilkan
+ * - null bila event tanpa patch, atau pesanan belum dimuat padahal status barunya
+ *   ditampilkan → pemanggil perlu refetch
+ */
+export function applyOrderPatchToGroups(groups, event) {
+    if (!event.changes)
+        return null;
+    const keys = Object.keys(groups);
+    const isShown = (status) => !!status && keys.includes(status);
+    const from = keys.find((key) => groups[key].some((o) => o.id === event.orderId));
+    if (from === undefined) {
+        return isShown(event.newStatus ?? event.changes.statusPesanan) ? null : groups;
+    }
+    const current = groups[from].find((o) => o.id === event.orderId);
+    if (!isNewerOrderPatch(current, event))
+        return groups;
+    const patched = applyOrderPatch(current, event);
+    const next = { ...groups, [from]: groups[from].filter((o) => o.id !== event.orderId) };
+    const to = patched.statusPesanan;
+    if (isShown(to)) {
+        next[to] = [patched, ...next[to]].sort((a, b) => Date.parse(b.waktuDibuat) - Date.parse(a.waktuDibuat));
+    }
+    return next;
+}
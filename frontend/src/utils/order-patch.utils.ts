@@ -0,0 +1,78 @@
+/**
+ * Utilitas patch pesanan dari event WebSocket order.* (skema wire ringkas).
+ * - Patch (`changes`) hanya diterapkan bila `version` event lebih baru dari versi pesanan lokal
+ * - Event lama/duplikat (mis. echo aksi sendiri yang sudah memakai respons REST) diabaikan
+ * - Relasi (pemesan/departemen/shift) pada pesanan lokal dipertahankan
+ */
+
+import type { Order, OrderWireBase } from '@/types/order.types';
+
+export type OrderPatchEvent = Pick<OrderWireBase, 'orderId' | 'version' | 'changes'> & {
+  newStatus?: string;
+};
+
+/**
+ * true bila event membawa patch untuk pesanan ini dan lebih baru dari versi lokal.
+ */
+export function isNewerOrderPatch(order: Order, event: OrderPatchEvent): boolean {
+  if (order.id !== event.orderId || !event.changes) return false;
+  if (typeof event.version !== 'number' || typeof order.version !== 'number') return true;
+  return event.version > order.version;
+}
+
+/**
+ * Terapkan patch ke satu pesanan. Mengembalikan objek yang sama bila tidak ada perubahan.
+ */
+export function applyOrderPatch<T extends Order>(order: T, event: OrderPatchEvent): T {
+  if (!isNewerOrderPatch(order, event)) return order;
+  return { ...order, ...event.changes, version: event.version ?? order.version };
+}
+
+/**
+ * Terapkan patch ke daftar pesanan (posisi tetap).
+ * Mengembalikan null bila pesanan tidak ada di daftar.
+ */
+export function applyOrderPatchToList<T extends Order>(list: T[], event: OrderPatchEvent): T[] | null {
+  const index = list.findIndex((o) => o.id === event.orderId);
+  if (index < 0) return null;
+  const patched = applyOrderPatch(list[index], event);
+  if (patched === list[index]) return list;
+  const next = list.slice();
+  next[index] = patched;
+  return next;
+}
+
+/**
+ * Terapkan patch ke daftar yang dikelompokkan per status (kolom kanban/tab).
+ * - Pesanan dipindah ke grup sesuai statusPesanan baru (urut waktuDibuat terbaru),
+ *   atau dibuang bila status barunya tidak ditampilkan
+ * - null bila event tanpa patch, atau pesanan belum dimuat padahal status barunya
+ *   ditampilkan → pemanggil perlu refetch
+ */
+export function applyOrderPatchToGroups<K extends string, T extends Order>(
+  groups: Record<K, T[]>,
+  event: OrderPatchEvent,
+): Record<K, T[]> | null {
+  if (!event.changes) return null;
+  const keys = Object.keys(groups) as K[];
+  const isShown = (status: string | undefined): status is K =>
+    !!status && keys.includes(status as K);
+
+  const from = keys.find((key) => groups[key].some((o) => o.id === event.orderId));
+  if (from === undefined) {
+    return isShown(event.newStatus ?? event.changes.statusPesanan) ? null : groups;
+  }
+
+  const current = groups[from].find((o) => o.id === event.orderId) as T;
+  if (!isNewerOrderPatch(current, event)) return groups;
+  const patched = applyOrderPatch(current, event);
+
+  const next = { ...groups, [from]: groups[from].filter((o) => o.id !== event.orderId) };
+  const to = patched.statusPesanan;
+  if (isShown(to)) {
+    next[to] = [patched, ...next[to]].sort(
+      (a, b) => Date.parse(b.waktuDibuat) - Date.parse(a.waktuDibuat),
+    );
+  }
+  return next;
+}
@@ -0,0 +1,911 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression suite for the backend's database queries.
+
+Runs EXPLAIN (ANALYZE, BUFFERS) for every query shape the services issue (same
+predicates, ordering and limits as the Prisma / raw SQL in the service) with
+representative parameters taken from the data, and flags:
+
+  - sequential scans on large tables
+  - sorts, hashes and hash aggregates that spill to disk
+  - row-estimate errors (q-error = max(estimate, actual) / min(estimate, actual))
+  - against a stored baseline: new findings, indexes no longer used and
+    buffer usage that grew by more than --buffer-factor
+
+  seed  fill a scratch database with a large synthetic dataset (orders, archive,
+        approval requests, audit trail, templates) and ANALYZE it
+  run   explain every query shape, write a markdown report and optionally a
+        baseline; exit code 1 when something regressed
+
+Every statement runs inside BEGIN ... ROLLBACK, so write shapes (standing order
+materialisation, archive batch) leave the data untouched.
+
+Only the standard library is used (Python 3.8+); queries go through the `psql`
+client, which must be on PATH.
+
+Examples:
+  python loadtest/query_plans.py seed --db postgresql://postgres@localhost/bebang_plans --yes
+  python loadtest/query_plans.py run --db postgresql://postgres@localhost/bebang_plans \\
+      --write-baseline loadtest/plan_baseline.json
+  python loadtest/query_plans.py run --baseline loadtest/plan_baseline.json -o loadtest/runs/plans.md
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+STATEMENT_TIMEOUT = "120s"
+
+# Prisma-only URL parameters that libpq (psql) rejects
+PRISMA_URL_PARAMS = {
+    "schema",
+    "connection_limit",
+    "pool_timeout",
+    "pgbouncer",
+    "statement_cache_size",
+    "socket_timeout",
+}
+
+# Representative parameters, resolved once per run from the data itself
+PARAMS_SQL = """
+SELECT json_build_object(
+  'karyawan_id', (SELECT karyawan_pemesan_id FROM transaction_pesanan
+                  GROUP BY 1 ORDER BY count(*) DESC LIMIT 1),
+  'department_id', (SELECT department_pemesan_id FROM transaction_pesanan
+                    GROUP BY 1 ORDER BY count(*) DESC LIMIT 1),
+  'shift_id', (SELECT shift_id FROM transaction_pesanan
+               GROUP BY 1 ORDER BY count(*) DESC LIMIT 1),
+  'audit_user_id', (SELECT user_id FROM log_audit_trail WHERE user_id IS NOT NULL
+                    GROUP BY 1 ORDER BY count(*) DESC LIMIT 1),
+  'audit_aksi', (SELECT aksi FROM log_audit_trail GROUP BY 1 ORDER BY count(*) DESC LIMIT 1),
+  'name_fragment', (SELECT lower(substr(nama_lengkap, 6, 4)) FROM master_karyawan
+                    ORDER BY id DESC LIMIT 1),
+  'since_version', (SELECT greatest(coalesce(max(change_version), 0) - 500, 0)
+                    FROM transaction_pesanan),
+  'today', CURRENT_DATE,
+  'tomorrow', CURRENT_DATE + 1,
+  'tomorrow_isodow', extract(isodow FROM CURRENT_DATE + 1)::int,
+  'tomorrow_code', 'PM-' || to_char(CURRENT_DATE + 1, 'YYYYMMDD') || '-',
+  'week_ago', CURRENT_DATE - 7,
+  'month_ago', CURRENT_DATE - 30,
+  'year_ago', CURRENT_DATE - 365,
+  'archive_cutoff', CURRENT_DATE - 180
+)
+"""
+
+# One entry per query shape. `sql` is formatted with the parameters above;
+# `allow_seq_scan` lists tables a full scan is expected on (with the reason in `note`).
+QUERIES = [
+    # OrdersService.findAll: page 1 + count, one entry per role filter
+    {
+        "name": "orders.findAll.employee",
+        "source": "OrdersService.findAll (employee)",
+        "sql": """
+            SELECT * FROM transaction_pesanan
+            WHERE karyawan_pemesan_id = {karyawan_id}
+            ORDER BY waktu_dibuat DESC LIMIT 10 OFFSET 0""",
+    },
+    {
+        "name": "orders.findAll.employee.count",
+        "source": "OrdersService.findAll (employee)",
+        "sql": """
+            SELECT count(*) FROM transaction_pesanan
+            WHERE karyawan_pemesan_id = {karyawan_id}""",
+    },
+    {
+        "name": "orders.findAll.employee.range",
+        "source": "OrdersService.findAll (employee, tanggalMulai/tanggalAkhir)",
+        "sql": """
+            SELECT * FROM transaction_pesanan
+            WHERE karyawan_pemesan_id = {karyawan_id}
+              AND tanggal_pesanan >= '{month_ago}' AND tanggal_pesanan <= '{today}'
+            ORDER BY waktu_dibuat DESC LIMIT 10 OFFSET 0""",
+    },
+    {
+        "name": "orders.findAll.employee.archive",
+        "source": "OrdersService.findAllAcrossArchive (archive keys)",
+        "sql": """
+            SELECT id, waktu_dibuat FROM transaction_pesanan_archive
+            WHERE karyawan_pemesan_id = {karyawan_id}
+            ORDER BY waktu_dibuat DESC LIMIT 10""",
+    },
+    {
+        "name": "orders.findAll.employee.archive.count",
+        "source": "OrdersService.findAllAcrossArchive (archive count)",
+        "sql": """
+            SELECT count(*) FROM transaction_pesanan_archive
+            WHERE karyawan_pemesan_id = {karyawan_id}""",
+    },
+    {
+        "name": "orders.findAll.dapur",
+        "source": "OrdersService.findAll (dapur)",
+        "sql": """
+            SELECT * FROM transaction_pesanan
+            WHERE status_pesanan IN ('MENUNGGU', 'IN_PROGRESS', 'MENUNGGU_PERSETUJUAN')
+            ORDER BY waktu_dibuat DESC LIMIT 10 OFFSET 0""",
+    },
+    {
+        "name": "orders.findAll.dapur.count",
+        "source": "OrdersService.findAll (dapur)",
+        "sql": """
+            SELECT count(*) FROM transaction_pesanan
+            WHERE status_pesanan IN ('MENUNGGU', 'IN_PROGRESS', 'MENUNGGU_PERSETUJUAN')""",
+    },
+    {
+        "name": "orders.findAll.delivery",
+        "source": "OrdersService.findAll (delivery)",
+        "sql": """
+            SELECT * FROM transaction_pesanan
+            WHERE status_pesanan IN ('READY', 'ON_DELIVERY')
+            ORDER BY waktu_dibuat DESC LIMIT 10 OFFSET 0""",
+    },
+    {
+        "name": "orders.findAll.admin",
+        "source": "OrdersService.findAll (administrator, no filter)",
+        "sql": """
+            SELECT * FROM transaction_pesanan
+            ORDER BY waktu_dibuat DESC LIMIT 10 OFFSET 0""",
+    },
+    {
+        "name": "orders.findAll.admin.shift_today",
+        "source": "OrdersService.findAll (administrator, shiftId + date)",
+        "sql": """
+            SELECT * FROM transaction_pesanan
+            WHERE shift_id = {shift_id}
+              AND tanggal_pesanan >= '{today}' AND tanggal_pesanan <= '{today}'
+            ORDER BY waktu_dibuat DESC LIMIT 10 OFFSET 0""",
+    },
+    {
+        "name": "orders.findAll.admin.department_week",
+        "source": "OrdersService.findAll (administrator, departmentId + date range)",
+        "sql": """
+            SELECT * FROM transaction_pesanan
+            WHERE department_pemesan_id = {department_id}
+              AND tanggal_pesanan >= '{week_ago}' AND tanggal_pesanan <= '{today}'
+            ORDER BY waktu_dibuat DESC LIMIT 10 OFFSET 0""",
+    },
+    {
+        "name": "orders.findAll.admin.status",
+        "source": "OrdersService.findAll (administrator, status)",
+        "sql": """
+            SELECT * FROM transaction_pesanan
+            WHERE status_pesanan = 'MENUNGGU'
+            ORDER BY waktu_dibuat DESC LIMIT 10 OFFSET 0""",
+    },
+    {
+        "name": "orders.findAll.admin.requires_approval",
+        "source": "OrdersService.findAll (administrator, requiresApproval)",
+        "sql": """
+            SELECT * FROM transaction_pesanan
+            WHERE requires_approval = true
+            ORDER BY waktu_dibuat DESC LIMIT 10 OFFSET 0""",
+    },
+    {
+        "name": "orders.getChanges.employee",
+        "source": "OrdersService.getChanges (employee)",
+        "sql": """
+            WITH horizon AS (
+              SELECT ((pg_snapshot_xmin(pg_current_snapshot())::text::bigint
+                       % 4294967296)::text)::xid AS xmin
+            )
+            SELECT c.id, c.change_version, c.deleted,
+                   age(c.writer) > age(h.xmin) AS settled
+            FROM (
+              (SELECT id, change_version, false AS deleted, xmin AS writer
+               FROM transaction_pesanan
+               WHERE change_version > {since_version} AND karyawan_pemesan_id = {karyawan_id}
+               ORDER BY change_version
+               LIMIT 501)
+              UNION ALL
+              (SELECT pesanan_id, change_version, true, xmin
+               FROM transaction_pesanan_tombstone
+               WHERE change_version > {since_version} AND karyawan_pemesan_id = {karyawan_id}
+               ORDER BY change_version
+               LIMIT 501)
+            ) c
+            CROSS JOIN horizon h
+            ORDER BY c.change_version
+            LIMIT 501""",
+    },
+    {
+        "name": "orders.counters.load",
+        "source": "OrderStatusCountersService.load",
+        "sql": """
+            SELECT id, status_pesanan, department_pemesan_id, shift_id, jumlah_pesanan
+            FROM transaction_pesanan
+            WHERE tanggal_pesanan = '{today}'""",
+    },
+    {
+        "name": "orders.pendingApproval.resync",
+        "source": "PendingApprovalQueueService.resync",
+        "sql": """
+            SELECT * FROM transaction_pesanan
+            WHERE requires_approval = true AND approval_status = 'PENDING'""",
+    },
+    {
+        "name": "orders.standing.materialize",
+        "source": "StandingOrderService.insertOrders",
+        "sql": """
+            INSERT INTO transaction_pesanan (
+              kode_pesanan, karyawan_pemesan_id, department_pemesan_id, shift_id,
+              jumlah_pesanan, status_pesanan, tanggal_pesanan
+            )
+            SELECT
+              '{tomorrow_code}'::text || lpad(c.seq::text, greatest(3, length(c.seq::text)), '0'),
+              c.karyawan_id, c.department_id, c.shift_id, c.jumlah_pesanan,
+              'MENUNGGU'::"StatusPesanan", '{tomorrow}'::date
+            FROM (
+              SELECT
+                t.karyawan_id, k.department_id, t.shift_id, t.jumlah_pesanan,
+                base.n + row_number() OVER (
+                  ORDER BY k.department_id, t.shift_id, t.karyawan_id
+                ) AS seq
+              FROM transaction_pesanan_template t
+              JOIN master_karyawan k ON k.id = t.karyawan_id
+              CROSS JOIN (
+                SELECT count(*) AS n FROM transaction_pesanan
+                WHERE tanggal_pesanan = '{tomorrow}'::date
+              ) base
+              WHERE t.is_active
+                AND k.is_active
+                AND k.department_id IS NOT NULL
+                AND {tomorrow_isodow}::int = ANY (t.hari_aktif)
+                AND (t.paused_until IS NULL OR t.paused_until < '{tomorrow}'::date)
+                AND NOT EXISTS (
+                  SELECT 1 FROM transaction_pesanan p
+                  WHERE p.karyawan_pemesan_id = t.karyawan_id
+                    AND p.shift_id = t.shift_id
+                    AND p.tanggal_pesanan = '{tomorrow}'::date
+                )
+            ) c
+            RETURNING id""",
+        # Every active template is read by design
+        "allow_seq_scan": ["transaction_pesanan_template"],
+    },
+    {
+        "name": "orders.archive.batch",
+        "source": "OrderArchiveService.moveBatch",
+        "sql": """
+            SELECT id FROM transaction_pesanan
+            WHERE status_pesanan IN ('COMPLETE', 'DITOLAK')
+              AND tanggal_pesanan < '{archive_cutoff}'::date
+            ORDER BY tanggal_pesanan, id
+            LIMIT 1000
+            FOR UPDATE SKIP LOCKED""",
+    },
+    {
+        "name": "orders.archive.watermark",
+        "source": "OrderArchiveService.refreshWatermark",
+        "sql": """
+            SELECT to_char(GREATEST(
+              (SELECT max(tanggal_pesanan) FROM transaction_pesanan_archive),
+              (SELECT max(waktu_dibuat)::date FROM transaction_pesanan_archive),
+              (SELECT max(requested_at)::date FROM transaction_permintaan_persetujuan_archive)
+            ) + 1, 'YYYY-MM-DD') AS newest""",
+    },
+    {
+        "name": "reports.cache.poll",
+        "source": "ReportCacheService.pollChanges",
+        "sql": """
+            WITH horizon AS (
+              SELECT ((pg_snapshot_xmin(pg_current_snapshot())::text::bigint
+                       % 4294967296)::text)::xid AS xmin
+            )
+            SELECT c.id, c.change_version, c.deleted,
+                   age(c.writer) > age(h.xmin) AS settled,
+                   c.tanggal_pesanan, c.waktu_dibuat, c.waktu_selesai
+            FROM (
+              (SELECT id, change_version, false AS deleted, xmin AS writer,
+                      tanggal_pesanan, waktu_dibuat, waktu_selesai
+               FROM transaction_pesanan
+               WHERE change_version > {since_version}
+               ORDER BY change_version
+               LIMIT 500)
+              UNION ALL
+              (SELECT pesanan_id, change_version, true, xmin, NULL, NULL, NULL
+               FROM transaction_pesanan_tombstone
+               WHERE change_version > {since_version}
+               ORDER BY change_version
+               LIMIT 500)
+            ) c
+            CROSS JOIN horizon h
+            ORDER BY c.change_version
+            LIMIT 500""",
+    },
+    # ReportsService
+    {
+        "name": "reports.consumption.daily",
+        "source": "ReportsService.computeConsumption (DAILY)",
+        "sql": """
+            SELECT tanggal_pesanan, count(id), sum(jumlah_pesanan)
+            FROM transaction_pesanan
+            WHERE status_pesanan <> 'DITOLAK'
+              AND tanggal_pesanan >= '{month_ago}' AND tanggal_pesanan <= '{today}'
+            GROUP BY tanggal_pesanan
+            ORDER BY tanggal_pesanan ASC""",
+    },
+    {
+        "name": "reports.consumption.monthly.archive",
+        "source": "ReportsService.computeConsumption (MONTHLY, hot + archive)",
+        "sql": """
+            SELECT
+              date_trunc('month', tanggal_pesanan) AS period,
+              count(id) AS total_orders,
+              sum(jumlah_pesanan) AS total_meals
+            FROM (
+              SELECT id, tanggal_pesanan, jumlah_pesanan, status_pesanan, shift_id
+              FROM transaction_pesanan
+              UNION ALL
+              SELECT id, tanggal_pesanan, jumlah_pesanan, status_pesanan, shift_id
+              FROM transaction_pesanan_archive
+            ) AS pesanan
+            WHERE status_pesanan <> 'DITOLAK'
+              AND tanggal_pesanan BETWEEN '{year_ago}' AND '{today}'
+            GROUP BY period
+            ORDER BY period ASC""",
+    },
+    {
+        "name": "reports.department",
+        "source": "ReportsService.computeDepartments",
+        "sql": """
+            SELECT department_pemesan_id, count(id), sum(jumlah_pesanan)
+            FROM transaction_pesanan
+            WHERE tanggal_pesanan >= '{month_ago}' AND tanggal_pesanan <= '{today}'
+            GROUP BY department_pemesan_id""",
+    },
+    {
+        "name": "reports.performance",
+        "source": "ReportsService.computePerformanceTotals",
+        "sql": """
+            SELECT id, department_pemesan_id, shift_id, waktu_dibuat, waktu_diproses,
+                   waktu_siap, waktu_diantar, waktu_selesai
+            FROM transaction_pesanan
+            WHERE status_pesanan = 'COMPLETE'
+              AND waktu_dibuat >= '{month_ago}'
+              AND waktu_selesai >= '{month_ago}' AND waktu_selesai <= '{today}'
+            ORDER BY waktu_selesai ASC""",
+    },
+    {
+        "name": "reports.rejections",
+        "source": "ReportsService.computeRejections",
+        "sql": """
+            SELECT * FROM transaction_permintaan_persetujuan
+            WHERE requested_at >= '{month_ago}' AND requested_at <= '{today}'
+            ORDER BY requested_at DESC LIMIT 20 OFFSET 0""",
+    },
+    {
+        "name": "reports.rejections.department",
+        "source": "ReportsService.computeRejections (departmentId)",
+        "sql": """
+            SELECT * FROM transaction_permintaan_persetujuan
+            WHERE requested_at >= '{month_ago}' AND requested_at <= '{today}'
+              AND pesanan_id IN (
+                SELECT t1.id FROM transaction_pesanan AS t1
+                WHERE t1.department_pemesan_id = {department_id} AND t1.id IS NOT NULL
+              )
+            ORDER BY requested_at DESC LIMIT 20 OFFSET 0""",
+    },
+    # AuditTrailService.query: count + page (limit 50)
+    {
+        "name": "audit.query",
+        "source": "AuditTrailService.query (no filter)",
+        "sql": """
+            SELECT * FROM log_audit_trail
+            ORDER BY timestamp DESC LIMIT 50 OFFSET 0""",
+    },
+    {
+        "name": "audit.query.user",
+        "source": "AuditTrailService.query (userId)",
+        "sql": """
+            SELECT * FROM log_audit_trail
+            WHERE user_id = {audit_user_id}
+            ORDER BY timestamp DESC LIMIT 50 OFFSET 0""",
+    },
+    {
+        "name": "audit.query.user.count",
+        "source": "AuditTrailService.query (userId)",
+        "sql": """
+            SELECT count(*) FROM log_audit_trail
+            WHERE user_id = {audit_user_id}""",
+    },
+    {
+        "name": "audit.query.aksi_range",
+        "source": "AuditTrailService.query (aksi + tanggalMulai/tanggalAkhir)",
+        "sql": """
+            SELECT * FROM log_audit_trail
+            WHERE aksi = {audit_aksi_literal}
+              AND timestamp >= '{week_ago}' AND timestamp <= '{today}'
+            ORDER BY timestamp DESC LIMIT 50 OFFSET 0""",
+    },
+    {
+        "name": "audit.query.search.count",
+        "source": "AuditTrailService.query (search)",
+        "sql": """
+            SELECT count(*) FROM log_audit_trail
+            WHERE aksi ILIKE '%order%' OR detail ILIKE '%order%'""",
+        "allow_seq_scan": ["log_audit_trail"],
+        "note": "free-text search on aksi/detail has no index; bounded by the date filter in practice",
+    },
+    # UsersService.findAll
+    {
+        "name": "users.search",
+        "source": "UsersService.findAll (search)",
+        "sql": """
+            SELECT id, nomor_induk_karyawan, nama_lengkap FROM master_karyawan
+            WHERE nomor_induk_karyawan ILIKE '%{name_fragment}%'
+               OR nama_lengkap ILIKE '%{name_fragment}%'
+            ORDER BY nama_lengkap ASC, id ASC LIMIT 20 OFFSET 0""",
+    },
+    # MasterDataService.removeDepartment usage check
+    {
+        "name": "master.department.in_use",
+        "source": "MasterDataService.removeDepartment",
+        "sql": """
+            SELECT count(*) FROM transaction_pesanan
+            WHERE department_pemesan_id = {department_id}""",
+    },
+]
+
+SEED_SQL = """
+BEGIN;
+
+INSERT INTO master_department (nama_divisi, updated_at)
+SELECT 'Plan Dept ' || lpad(g::text, 3, '0'), now()
+FROM generate_series(1, {departments}) g;
+
+INSERT INTO master_shift (nama_shift, jam_mulai, jam_selesai, updated_at) VALUES
+  ('Plan Shift Pagi', '06:00', '14:00', now()),
+  ('Plan Shift Siang', '14:00', '22:00', now()),
+  ('Plan Shift Malam', '22:00', '06:00', now());
+
+INSERT INTO master_karyawan (nomor_induk_karyawan, nama_lengkap, department_id, role_access, updated_at)
+SELECT 'PLAN' || lpad(g::text, 7, '0'),
+       'Plan ' || initcap(substr(md5(g::text), 1, 8)) || ' ' || initcap(substr(md5(g::text), 9, 6)),
+       d.ids[1 + g % array_length(d.ids, 1)],
+       'employee', now()
+FROM generate_series(1, {employees}) g
+CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids FROM master_department
+            WHERE nama_divisi LIKE 'Plan Dept %') d;
+
+CREATE TEMP TABLE plan_karyawan AS
+SELECT row_number() OVER (ORDER BY id) AS n, id, department_id
+FROM master_karyawan WHERE nomor_induk_karyawan LIKE 'PLAN%';
+
+CREATE TEMP TABLE plan_shift AS
+SELECT row_number() OVER (ORDER BY id) AS n, id
+FROM master_shift WHERE nama_shift LIKE 'Plan Shift %';
+
+-- Hot orders: tomorrow back to {days} days ago; past days are final
+INSERT INTO transaction_pesanan (
+  kode_pesanan, karyawan_pemesan_id, department_pemesan_id, shift_id, jumlah_pesanan,
+  status_pesanan, tanggal_pesanan, requires_approval, approval_status,
+  waktu_dibuat, waktu_diproses, waktu_siap, waktu_diantar, waktu_selesai
+)
+SELECT 'PL' || lpad(o.g::text, 12, '0'), k.id, k.department_id, s.id, 1 + o.g % 4,
+       o.status::"StatusPesanan", o.day,
+       o.status IN ('DITOLAK', 'MENUNGGU_PERSETUJUAN'),
+       (CASE o.status WHEN 'DITOLAK' THEN 'APPROVED' WHEN 'MENUNGGU_PERSETUJUAN' THEN 'PENDING' END)::"ApprovalStatus",
+       o.created,
+       CASE WHEN o.status IN ('IN_PROGRESS', 'READY', 'ON_DELIVERY', 'COMPLETE') THEN o.created + interval '20 minutes' END,
+       CASE WHEN o.status IN ('READY', 'ON_DELIVERY', 'COMPLETE') THEN o.created + interval '50 minutes' END,
+       CASE WHEN o.status IN ('ON_DELIVERY', 'COMPLETE') THEN o.created + interval '60 minutes' END,
+       CASE WHEN o.status = 'COMPLETE' THEN o.created + interval '75 minutes' END
+FROM (
+  SELECT g, day,
+         day::timestamptz - interval '10 hours' + (g % 600) * interval '1 minute' AS created,
+         CASE WHEN day < CURRENT_DATE
+              THEN CASE WHEN g % 25 = 0 THEN 'DITOLAK' ELSE 'COMPLETE' END
+              ELSE (ARRAY['MENUNGGU', 'IN_PROGRESS', 'READY', 'ON_DELIVERY', 'COMPLETE',
+                          'MENUNGGU_PERSETUJUAN'])[1 + g % 6]
+         END AS status
+  FROM (SELECT g, CURRENT_DATE + 1 - (g % ({days} + 2)) AS day
+        FROM generate_series(1, {orders}) g) gen
+) o
+JOIN plan_karyawan k ON k.n = 1 + (o.g * 7919) % {employees}
+JOIN plan_shift s ON s.n = 1 + o.g % 3;
+
+-- Archived orders: older than the hot window
+INSERT INTO transaction_pesanan_archive (
+  id, kode_pesanan, karyawan_pemesan_id, department_pemesan_id, shift_id, jumlah_pesanan,
+  status_pesanan, tanggal_pesanan, requires_approval, approval_status,
+  waktu_dibuat, waktu_diproses, waktu_siap, waktu_diantar, waktu_selesai, version, change_version
+)
+SELECT nextval(pg_get_serial_sequence('transaction_pesanan', 'id')),
+       'PA' || lpad(o.g::text, 12, '0'), k.id, k.department_id, s.id, 1 + o.g % 4,
+       o.status::"StatusPesanan", o.day,
+       o.status = 'DITOLAK',
+       (CASE WHEN o.status = 'DITOLAK' THEN 'APPROVED' END)::"ApprovalStatus",
+       o.created,
+       CASE WHEN o.status = 'COMPLETE' THEN o.created + interval '20 minutes' END,
+       CASE WHEN o.status = 'COMPLETE' THEN o.created + interval '50 minutes' END,
+       CASE WHEN o.status = 'COMPLETE' THEN o.created + interval '60 minutes' END,
+       CASE WHEN o.status = 'COMPLETE' THEN o.created + interval '75 minutes' END,
+       0, nextval('transaction_pesanan_change_version_seq')
+FROM (
+  SELECT g, day,
+         day::timestamptz - interval '10 hours' + (g % 600) * interval '1 minute' AS created,
+         CASE WHEN g % 25 = 0 THEN 'DITOLAK' ELSE 'COMPLETE' END AS status
+  FROM (SELECT g, CURRENT_DATE - {days} - 1 - (g % {archive_days}) AS day
+        FROM generate_series(1, {archived_orders}) g) gen
+) o
+JOIN plan_karyawan k ON k.n = 1 + (o.g * 7919) % {employees}
+JOIN plan_shift s ON s.n = 1 + o.g % 3;
+
+INSERT INTO transaction_permintaan_persetujuan (
+  pesanan_id, request_type, jumlah_pesanan_awal, catatan_dapur, approval_status,
+  requested_at, decided_at
+)
+SELECT id, 'REJECT', jumlah_pesanan, 'Plan seed: stok bahan habis', approval_status,
+       waktu_dibuat + interval '30 minutes',
+       CASE WHEN approval_status <> 'PENDING' THEN waktu_dibuat + interval '45 minutes' END
+FROM transaction_pesanan
+WHERE kode_pesanan LIKE 'PL%' AND requires_approval;
+
+INSERT INTO transaction_permintaan_persetujuan_archive (
+  id, pesanan_id, request_type, jumlah_pesanan_awal, catatan_dapur, approval_status,
+  requested_at, decided_at
+)
+SELECT nextval(pg_get_serial_sequence('transaction_permintaan_persetujuan', 'id')),
+       id, 'REJECT', jumlah_pesanan, 'Plan seed: stok bahan habis', approval_status,
+       waktu_dibuat + interval '30 minutes', waktu_dibuat + interval '45 minutes'
+FROM transaction_pesanan_archive
+WHERE kode_pesanan LIKE 'PA%' AND requires_approval;
+
+INSERT INTO transaction_pesanan_template (karyawan_id, shift_id, jumlah_pesanan, updated_at)
+SELECT k.id, s.id, 1, now()
+FROM plan_karyawan k
+JOIN plan_shift s ON s.n = 1 + k.n % 3
+WHERE k.n % 3 = 0;
+
+INSERT INTO log_audit_trail (user_id, aksi, detail, timestamp)
+SELECT k.id,
+       (ARRAY['ORDER_CREATED', 'ORDER_STATUS_CHANGED', 'LOGIN_SUCCESS', 'APPROVAL_DECIDED'])[1 + g % 4],
+       'Plan seed ' || md5(g::text),
+       now() - (g % ({days} * 86400)) * interval '1 second'
+FROM generate_series(1, {audit}) g
+JOIN plan_karyawan k ON k.n = 1 + (g * 104729) % {employees};
+
+COMMIT;
+
+ANALYZE master_department;
+ANALYZE master_shift;
+ANALYZE master_karyawan;
+ANALYZE transaction_pesanan;
+ANALYZE transaction_pesanan_archive;
+ANALYZE transaction_permintaan_persetujuan;
+ANALYZE transaction_permintaan_persetujuan_archive;
+ANALYZE transaction_pesanan_template;
+ANALYZE log_audit_trail;
+"""
+
+
+# Database access
+
+def libpq_url(url):
+    """Drop Prisma-only parameters from a DATABASE_URL so psql accepts it."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in PRISMA_URL_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def display_url(url):
+    parts = urlsplit(url)
+    host = parts.hostname or "localhost"
+    return "%s%s%s" % (host, ":%d" % parts.port if parts.port else "", parts.path)
+
+
+def psql(url, script):
+    result = subprocess.run(
+        ["psql", url, "-X", "-q", "-A", "-t", "-v", "ON_ERROR_STOP=1"],
+        input=script,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or "psql exited with %d" % result.returncode)
+    return result.stdout
+
+
+def sql_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def resolve_params(url):
+    params = json.loads(psql(url, PARAMS_SQL))
+    missing = [k for k in ("karyawan_id", "department_id", "shift_id") if params.get(k) is None]
+    if missing:
+        sys.exit("run: no orders to take parameters from (%s); seed the database first" % ", ".join(missing))
+    params["audit_user_id"] = params.get("audit_user_id") or 0
+    params["audit_aksi_literal"] = sql_literal(params.get("audit_aksi") or "ORDER_CREATED")
+    params["name_fragment"] = re.sub(r"[^a-z0-9]", "", params.get("name_fragment") or "") or "a"
+    return params
+
+
+def table_rows(url):
+    out = psql(
+        url,
+        "SELECT json_object_agg(relname, reltuples::bigint) FROM pg_class "
+        "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace",
+    )
+    return json.loads(out) or {}
+
+
+def explain(url, sql):
+    script = "BEGIN;\nSET LOCAL statement_timeout = '%s';\nEXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) %s;\nROLLBACK;\n" % (
+        STATEMENT_TIMEOUT,
+        sql.strip(),
+    )
+    return json.loads(psql(url, script))[0]
+
+
+# Plan analysis
+
+def walk(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+
+def describe(node):
+    target = node.get("Index Name") or node.get("Relation Name") or ""
+    return "%s on %s" % (node["Node Type"], target) if target else node["Node Type"]
+
+
+def analyze(entry, plan, rows_by_table, args):
+    root = plan["Plan"]
+    findings = {}
+    indexes = set()
+    shape = []
+    allowed = set(entry.get("allow_seq_scan", []))
+
+    for node in walk(root):
+        node_type = node["Node Type"]
+        relation = node.get("Relation Name")
+        shape.append(describe(node))
+        if node.get("Index Name"):
+            indexes.add(node["Index Name"])
+
+        if (
+            node_type == "Seq Scan"
+            and relation not in allowed
+            and rows_by_table.get(relation, 0) >= args.min_table_rows
+        ):
+            findings["seq_scan:%s" % relation] = "%d rows in table" % rows_by_table[relation]
+
+        if node_type in ("Sort", "Incremental Sort") and (
+            node.get("Sort Space Type") == "Disk" or "external" in node.get("Sort Method", "")
+        ):
+            findings["spill:%s" % describe(node)] = "%s, %s kB" % (
+                node.get("Sort Method"),
+                node.get("Sort Space Used"),
+            )
+        if node_type == "Hash" and node.get("Hash Batches", 1) > 1:
+            findings["spill:Hash"] = "%d batches" % node["Hash Batches"]
+        if node_type == "Aggregate" and node.get("HashAgg Batches", 1) > 1:
+            findings["spill:HashAggregate"] = "%d batches, %s kB on disk" % (
+                node["HashAgg Batches"],
+                node.get("Disk Usage", 0),
+            )
+
+        if node.get("Actual Loops", 0) > 0:
+            estimate = max(node.get("Plan Rows", 0), 1)
+            actual = max(node.get("Actual Rows", 0), 1)
+            q_error = max(estimate, actual) / min(estimate, actual)
+            if q_error >= args.max_q_error and max(estimate, actual) >= args.min_misestimate_rows:
+                key = "misestimate:%s" % describe(node)
+                if q_error > findings.get(key, {}).get("q", 0):
+                    findings[key] = {"q": round(q_error, 1), "estimate": estimate, "actual": actual}
+
+    return {
+        "source": entry["source"],
+        "execution_ms": round(plan.get("Execution Time", 0), 2),
+        "planning_ms": round(plan.get("Planning Time", 0), 2),
+        "buffers": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+        "temp_blocks": root.get("Temp Written Blocks", 0),
+        "indexes": sorted(indexes),
+        "shape": shape,
+        "findings": findings,
+        "note": entry.get("note"),
+    }
+
+
+def finding_text(key, detail):
+    if isinstance(detail, dict):
+        return "%s (q=%.1f: estimated %d, actual %d)" % (key, detail["q"], detail["estimate"], detail["actual"])
+    return "%s (%s)" % (key, detail)
+
+
+def compare(current, base, args):
+    """Regressions of one query against its baseline record."""
+    if base is None:
+        # No baseline: every finding counts
+        return [finding_text(k, v) for k, v in sorted(current["findings"].items())]
+
+    regressions = []
+    for key, detail in sorted(current["findings"].items()):
+        previous = base["findings"].get(key)
+        if previous is None:
+            regressions.append("new " + finding_text(key, detail))
+        elif isinstance(detail, dict) and detail["q"] > previous["q"] * args.q_error_factor:
+            regressions.append("worse %s (baseline q=%.1f)" % (finding_text(key, detail), previous["q"]))
+    for index in sorted(set(base["indexes"]) - set(current["indexes"])):
+        regressions.append("index no longer used: %s" % index)
+    if (
+        current["buffers"] > base["buffers"] * args.buffer_factor
+        and current["buffers"] - base["buffers"] >= args.min_buffer_growth
+    ):
+        regressions.append("buffers %d -> %d" % (base["buffers"], current["buffers"]))
+    return regressions
+
+
+# Report
+
+def render_report(results, regressions, args, meta):
+    flagged = sum(1 for name in results if regressions.get(name))
+    lines = [
+        "# Query plan report",
+        "",
+        "- database: %s" % meta["database"],
+        "- run at: %s" % meta["run_at"],
+        "- baseline: %s" % (args.baseline or "none (every finding counts)"),
+        "- verdict: %s" % ("%d of %d queries regressed" % (flagged, len(results)) if flagged else "no regressions"),
+        "",
+        "Seq scans are flagged on tables with ≥ %d rows; row estimates when q-error ≥ %.0f on ≥ %d rows."
+        % (args.min_table_rows, args.max_q_error, args.min_misestimate_rows),
+        "",
+        "| query | ms | buffers | indexes | findings | status |",
+        "|---|---:|---:|---|---:|---|",
+    ]
+    for name, record in results.items():
+        lines.append(
+            "| %s | %.1f | %d | %s | %d | %s |"
+            % (
+                name,
+                record["execution_ms"],
+                record["buffers"],
+                ", ".join(record["indexes"]) or "-",
+                len(record["findings"]),
+                "**REGRESSED**" if regressions.get(name) else "ok",
+            )
+        )
+
+    if flagged:
+        lines += ["", "## Regressions", ""]
+        for name, items in regressions.items():
+            if not items:
+                continue
+            lines.append("- `%s` (%s)" % (name, results[name]["source"]))
+            lines += ["  - %s" % item for item in items]
+
+    detailed = [(n, r) for n, r in results.items() if r["findings"]]
+    if detailed:
+        lines += ["", "## Findings", ""]
+        for name, record in detailed:
+            lines.append("- `%s`%s" % (name, " — %s" % record["note"] if record.get("note") else ""))
+            lines += ["  - %s" % finding_text(k, v) for k, v in sorted(record["findings"].items())]
+    return "\n".join(lines) + "\n", flagged
+
+
+# Commands
+
+def cmd_seed(args):
+    if not args.yes:
+        sys.exit("seed: writes millions of rows into %s; re-run with --yes on a scratch database" % display_url(args.db))
+    existing = psql(args.db, "SELECT count(*) FROM master_karyawan WHERE nomor_induk_karyawan LIKE 'PLAN%'")
+    if int(existing.strip() or 0) > 0:
+        sys.exit("seed: %s already holds the plan dataset" % display_url(args.db))
+    print("seeding %s (%d orders, %d archived, %d audit rows) ..." % (
+        display_url(args.db), args.orders, args.archived_orders, args.audit))
+    psql(
+        args.db,
+        SEED_SQL.format(
+            departments=args.departments,
+            employees=args.employees,
+            orders=args.orders,
+            archived_orders=args.archived_orders,
+            days=args.days,
+            archive_days=args.archive_days,
+            audit=args.audit,
+        ),
+    )
+    print("done")
+
+
+def cmd_run(args):
+    params = resolve_params(args.db)
+    rows_by_table = table_rows(args.db)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)["queries"]
+
+    results = {}
+    regressions = {}
+    for entry in QUERIES:
+        if args.only and not re.search(args.only, entry["name"]):
+            continue
+        try:
+            plan = explain(args.db, entry["sql"].format(**params))
+        except RuntimeError as exc:
+            sys.exit("run: %s failed: %s" % (entry["name"], exc))
+        record = analyze(entry, plan, rows_by_table, args)
+        results[entry["name"]] = record
+        regressions[entry["name"]] = compare(record, baseline.get(entry["name"]) if args.baseline else None, args)
+        print(
+            "%-45s %9.1f ms %8d buffers  %s"
+            % (entry["name"], record["execution_ms"], record["buffers"],
+               "REGRESSED" if regressions[entry["name"]] else "ok"),
+            file=sys.stderr,
+        )
+
+    meta = {
+        "database": display_url(args.db),
+        "run_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "params": {k: v for k, v in params.items() if not k.endswith("_literal")},
+    }
+    text, flagged = render_report(results, regressions, args, meta)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text)
+    sys.stdout.write(text)
+
+    if args.write_baseline:
+        with open(args.write_baseline, "w", encoding="utf-8") as handle:
+            json.dump({"meta": meta, "queries": results}, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print("\nbaseline -> %s" % args.write_baseline)
+        return
+    sys.exit(1 if flagged else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_db(p):
+        p.add_argument("--db", default=os.environ.get("DATABASE_URL"), help="PostgreSQL URL (default: $DATABASE_URL)")
+
+    seed = sub.add_parser("seed", help="fill a scratch database with a large synthetic dataset")
+    add_db(seed)
+    seed.add_argument("--yes", action="store_true", help="confirm writing to the database")
+    seed.add_argument("--departments", type=int, default=40)
+    seed.add_argument("--employees", type=int, default=5000)
+    seed.add_argument("--orders", type=int, default=2000000, help="hot orders (default 2000000)")
+    seed.add_argument("--days", type=int, default=180, help="days covered by hot orders (default 180)")
+    seed.add_argument("--archived-orders", type=int, default=4000000, help="archived orders (default 4000000)")
+    seed.add_argument("--archive-days", type=int, default=365, help="days covered by the archive (default 365)")
+    seed.add_argument("--audit", type=int, default=3000000, help="audit trail rows (default 3000000)")
+    seed.set_defaults(func=cmd_seed)
+
+    run = sub.add_parser("run", help="explain every query shape and compare with a baseline")
+    add_db(run)
+    run.add_argument("--baseline", help="baseline JSON to compare against")
+    run.add_argument("--write-baseline", help="store this run as the new baseline")
+    run.add_argument("-o", "--output", help="write the markdown report here as well")
+    run.add_argument("--only", help="regex on query names")
+    run.add_argument("--min-table-rows", type=int, default=10000, help="seq scans on smaller tables are fine (default 10000)")
+    run.add_argument("--max-q-error", type=float, default=10, help="row-estimate error to flag (default 10)")
+    run.add_argument("--min-misestimate-rows", type=int, default=1000, help="ignore estimate errors below this many rows (default 1000)")
+    run.add_argument("--q-error-factor", type=float, default=2, help="baseline misestimate may grow this much (default 2)")
+    run.add_argument("--buffer-factor", type=float, default=2, help="buffer growth over baseline to flag (default 2)")
+    run.add_argument("--min-buffer-growth", type=int, default=1000, help="ignore buffer growth below this many blocks (default 1000)")
+    run.set_defaults(func=cmd_run)
+
+    args = parser.parse_args()
+    if not args.db:
+        parser.error("--db or $DATABASE_URL is required")
+    if shutil.which("psql") is None:
+        sys.exit("psql not found on PATH")
+    args.db = libpq_url(args.db)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,796 @@
+#!/usr/bin/env python3
+"""
+Soak test: a steady mixed workload for hours, with backend resource sampling and a
+trend report that flags slow leaks and degradation.
+
+  run     drive the workload and sample /api/metrics every --interval seconds
+  report  rebuild the trend report from a samples file
+
+Workload (each stream paced independently with Poisson arrivals):
+  - logins of random accounts
+  - order creation by employees
+  - status transitions MENUNGGU -> IN_PROGRESS -> READY (dapur) and
+    READY -> ON_DELIVERY -> COMPLETE (delivery), so created orders drain
+  - dashboard reads (order list, counters)
+  - websocket clients that connect to /notifications, stay a random time
+    answering pings, disconnect and reconnect
+
+Sampled per interval: RSS, heap, external memory, event-loop lag p99, websocket
+connections and room memberships, DB connections (pg_stat_activity), audit queue
+depth, plus client-side throughput, error rate and latency p95.
+
+Only the standard library is used (Python 3.8+).
+
+Examples:
+  python loadtest/soak_test.py run --tokens loadtest/tokens.example.json \\
+      --duration 4h --interval 30 --output loadtest/runs/soak-2026-10-19
+  python loadtest/soak_test.py report loadtest/runs/soak-2026-10-19/samples.jsonl
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from traffic_replay import Accounts, percentile, read_jsonl
+
+TIMEOUT = 30
+NAMESPACE = "/notifications"
+
+# Series from the backend and how a rising trend is judged
+SERIES = [
+    # key, label, direction that signals trouble
+    ("rss_mb", "RSS (MB)", "up"),
+    ("heap_used_mb", "Heap used (MB)", "up"),
+    ("external_mb", "External memory (MB)", "up"),
+    ("eventloop_lag_p99_ms", "Event-loop lag p99 (ms)", "up"),
+    ("ws_connections", "Websocket connections", "up"),
+    ("ws_room_members", "Websocket room memberships", "up"),
+    ("db_connections", "DB connections", "up"),
+    ("db_idle_in_transaction", "DB idle in transaction", "up"),
+    ("audit_queue_depth", "Audit write queue", "up"),
+    ("latency_p95_ms", "Client latency p95 (ms)", "up"),
+    ("error_rate", "Client error rate", "up"),
+    ("throughput_rps", "Throughput (req/s)", "down"),
+]
+
+
+# Backend access
+
+class Api:
+    """Keep-alive HTTP client, one connection per thread."""
+
+    def __init__(self, base_url, accounts):
+        self.base = urlsplit(base_url)
+        self.accounts = accounts
+        self.local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn_cls = (
+                http.client.HTTPSConnection
+                if self.base.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            conn = conn_cls(self.base.netloc, timeout=TIMEOUT)
+            self.local.conn = conn
+        return conn
+
+    def raw(self, method, path, body=None, token=None):
+        headers = {"Accept": "application/json"}
+        payload = None
+        if token:
+            headers["Authorization"] = "Bearer " + token
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        for attempt in (1, 2):
+            conn = self._conn()
+            try:
+                conn.request(method, path, payload, headers)
+                response = conn.getresponse()
+                data = response.read()
+                try:
+                    parsed = json.loads(data) if data else None
+                except ValueError:
+                    parsed = data.decode("utf-8", "replace")
+                return response.status, parsed
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                self.local.conn = None
+                if attempt == 2:
+                    raise
+        return None, None
+
+    def call(self, account, method, path, body=None):
+        token = account["token"] if account else None
+        status, data = self.raw(method, path, body, token)
+        if status == 401 and account:
+            self.accounts.refresh(account, token)
+            status, data = self.raw(method, path, body, account["token"])
+        return status, data
+
+
+class SocketIOClient:
+    """
+    Minimal Socket.IO v4 client over a raw websocket (the gateway only allows the
+    websocket transport). Enough to join the namespace, answer pings and leave.
+    """
+
+    def __init__(self, ws_url, token):
+        self.url = urlsplit(ws_url)
+        self.token = token
+        self.sock = None
+        self.buffer = b""
+        self.fragments = b""
+        self.events = 0
+
+    def connect(self):
+        host = self.url.hostname
+        port = self.url.port or (443 if self.url.scheme in ("https", "wss") else 80)
+        self.sock = socket.create_connection((host, port), timeout=10)
+        if self.url.scheme in ("https", "wss"):
+            import ssl
+
+            self.sock = ssl.create_default_context().wrap_socket(self.sock, server_hostname=host)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.sock.sendall(
+            (
+                "GET /socket.io/?EIO=4&transport=websocket HTTP/1.1\r\n"
+                "Host: %s\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                "Sec-WebSocket-Key: %s\r\nSec-WebSocket-Version: 13\r\n\r\n"
+                % (self.url.netloc, key)
+            ).encode()
+        )
+        while b"\r\n\r\n" not in self.buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("websocket handshake closed")
+            self.buffer += chunk
+        head, self.buffer = self.buffer.split(b"\r\n\r\n", 1)
+        if b" 101 " not in head.split(b"\r\n", 1)[0]:
+            raise ConnectionError("websocket upgrade refused: %s" % head.split(b"\r\n", 1)[0].decode())
+
+        opened = self.recv_text()
+        if not opened.startswith("0"):
+            raise ConnectionError("unexpected engine.io open packet")
+        self.send_text("40%s,%s" % (NAMESPACE, json.dumps({"token": self.token})))
+        while True:
+            packet = self.recv_text()
+            if packet.startswith("40" + NAMESPACE):
+                return
+            if packet.startswith("44" + NAMESPACE):
+                raise ConnectionError("namespace connect refused: %s" % packet)
+            self.handle(packet)
+
+    def hold(self, seconds, stop):
+        """Stay connected, answering pings, until the deadline or stop is set."""
+        deadline = time.monotonic() + seconds
+        self.sock.settimeout(1.0)
+        while time.monotonic() < deadline and not stop.is_set():
+            try:
+                packet = self.recv_text()
+            except socket.timeout:
+                continue
+            if packet.startswith("41" + NAMESPACE):
+                raise ConnectionError("disconnected by server")
+            self.handle(packet)
+
+    def handle(self, packet):
+        if packet == "2":
+            self.send_text("3")
+        elif packet.startswith("42" + NAMESPACE):
+            self.events += 1
+
+    def close(self):
+        if not self.sock:
+            return
+        try:
+            self.send_text("41%s," % NAMESPACE)
+            self.send_frame(0x8, struct.pack("!H", 1000))
+        except OSError:
+            pass
+        finally:
+            self.sock.close()
+            self.sock = None
+
+    # websocket framing (client frames are masked)
+
+    def send_text(self, text):
+        self.send_frame(0x1, text.encode())
+
+    def send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 65536:
+            header += bytes([0x80 | 126]) + struct.pack("!H", length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", length)
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        self.sock.sendall(header + mask + masked)
+
+    def next_frame(self):
+        """(fin, opcode, payload) of the next frame; consumed only once complete."""
+        while True:
+            frame = self.parse_frame()
+            if frame:
+                return frame
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("websocket closed")
+            self.buffer += chunk
+
+    def parse_frame(self):
+        buf = self.buffer
+        if len(buf) < 2:
+            return None
+        length = buf[1] & 0x7F
+        offset = 2
+        if length == 126:
+            if len(buf) < 4:
+                return None
+            length = struct.unpack("!H", buf[2:4])[0]
+            offset = 4
+        elif length == 127:
+            if len(buf) < 10:
+                return None
+            length = struct.unpack("!Q", buf[2:10])[0]
+            offset = 10
+        if len(buf) < offset + length:
+            return None
+        self.buffer = buf[offset + length :]
+        return bool(buf[0] & 0x80), buf[0] & 0x0F, buf[offset : offset + length]
+
+    def recv_text(self):
+        while True:
+            fin, opcode, payload = self.next_frame()
+            if opcode == 0x8:
+                raise ConnectionError("websocket closed by server")
+            if opcode == 0x9:
+                self.send_frame(0xA, payload)
+                continue
+            if opcode == 0x1:
+                self.fragments = payload
+            elif opcode == 0x0:
+                self.fragments += payload
+            else:
+                continue
+            if fin:
+                return self.fragments.decode("utf-8", "replace")
+
+
+# Workload
+
+class Stats:
+    """Client-side results, drained once per sampling interval."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.ok = 0
+        self.errors = 0
+        self.latencies = []
+        self.by_op = defaultdict(lambda: [0, 0])
+
+    def record(self, op, status, latency_ms):
+        failed = status is None or status >= 500 or status in (401, 403, 429)
+        with self.lock:
+            if failed:
+                self.errors += 1
+            else:
+                self.ok += 1
+            self.latencies.append(latency_ms)
+            self.by_op[op][1 if failed else 0] += 1
+
+    def drain(self):
+        with self.lock:
+            snapshot = (self.ok, self.errors, sorted(self.latencies), dict(self.by_op))
+            self.reset()
+        return snapshot
+
+
+class Workload:
+    def __init__(self, args, api, accounts):
+        self.args = args
+        self.api = api
+        self.accounts = accounts
+        self.stats = Stats()
+        self.stop = threading.Event()
+        self.shift_ids = []
+        self.ws_connected = 0
+        self.ws_lock = threading.Lock()
+
+    def timed(self, op, account, method, path, body=None):
+        begin = time.monotonic()
+        try:
+            status, data = self.api.call(account, method, path, body)
+        except (http.client.HTTPException, OSError):
+            status, data = None, None
+        self.stats.record(op, status, (time.monotonic() - begin) * 1000)
+        return status, data
+
+    def account(self, role, client):
+        return self.accounts.for_request(role, client)
+
+    def paced(self, name, per_minute, step):
+        """Run step() as a Poisson process at per_minute until stopped."""
+        if per_minute <= 0:
+            return
+        rng = random.Random(name)
+        while not self.stop.is_set():
+            if self.stop.wait(rng.expovariate(per_minute / 60.0)):
+                return
+            try:
+                step(rng)
+            except Exception as exc:  # keep the stream alive; failures are in Stats
+                self.stats.record(name, None, 0.0)
+                print("[%s] %s: %s" % (name, type(exc).__name__, exc), file=sys.stderr)
+
+    # streams
+
+    def login(self, rng):
+        role = rng.choice(sorted(r for r, accounts in self.accounts.accounts.items() if any("nik" in a for a in accounts)))
+        account = rng.choice([a for a in self.accounts.accounts[role] if "nik" in a])
+        self.timed("login", None, "POST", "/api/auth/login", {"nik": account["nik"], "password": account["password"]})
+
+    def create_order(self, rng):
+        client = "employee-%d" % rng.randrange(self.args.employees)
+        account = self.account("employee", client)
+        body = {"shiftId": rng.choice(self.shift_ids), "jumlahPesanan": rng.randint(1, 5)}
+        self.timed("order.create", account, "POST", "/api/orders", body)
+
+    def transition(self, role, source, target):
+        def step(rng):
+            account = self.account(role, "%s-worker" % role)
+            status, data = self.timed(
+                "order.list", account, "GET", "/api/orders?status=%s&page=1&limit=10" % source
+            )
+            orders = (data or {}).get("data") if isinstance(data, dict) else None
+            if status != 200 or not orders:
+                return
+            order = rng.choice(orders)
+            self.timed(
+                "order.status", account, "PATCH", "/api/orders/%s/status" % order["id"], {"status": target}
+            )
+
+        return step
+
+    def dashboard(self, rng):
+        role = rng.choice(["dapur", "administrator"])
+        account = self.account(role, "%s-dashboard" % role)
+        self.timed("orders.counters", account, "GET", "/api/orders/counters")
+        self.timed("orders.list", account, "GET", "/api/orders?page=1&limit=20")
+
+    def websocket_slot(self, slot):
+        rng = random.Random("ws-%d" % slot)
+        roles = [r for r in self.accounts.accounts if self.accounts.accounts[r]]
+        # Stagger the first connections over one lifetime so churn is steady
+        if self.stop.wait(rng.uniform(0, self.args.ws_lifetime)):
+            return
+        while not self.stop.is_set():
+            account = self.account(rng.choice(roles), "ws-%d" % slot)
+            client = SocketIOClient(self.args.ws_url, account["token"])
+            begin = time.monotonic()
+            try:
+                client.connect()
+                self.stats.record("ws.connect", 200, (time.monotonic() - begin) * 1000)
+                with self.ws_lock:
+                    self.ws_connected += 1
+                try:
+                    client.hold(rng.uniform(0.5, 1.5) * self.args.ws_lifetime, self.stop)
+                finally:
+                    with self.ws_lock:
+                        self.ws_connected -= 1
+            except (ConnectionError, OSError) as exc:
+                self.stats.record("ws.connect", None, (time.monotonic() - begin) * 1000)
+                if "refused" in str(exc):
+                    # Token expired between refreshes: log in again before retrying
+                    self.accounts.refresh(account, account["token"])
+                self.stop.wait(1.0)
+            finally:
+                client.close()
+
+    def start(self):
+        a = self.args
+        streams = [
+            ("login", a.login_rate, self.login),
+            ("order.create", a.order_rate, self.create_order),
+            ("dapur.start", a.order_rate * 1.2, self.transition("dapur", "MENUNGGU", "IN_PROGRESS")),
+            ("dapur.ready", a.order_rate * 1.2, self.transition("dapur", "IN_PROGRESS", "READY")),
+            ("delivery.pickup", a.order_rate * 1.2, self.transition("delivery", "READY", "ON_DELIVERY")),
+            ("delivery.complete", a.order_rate * 1.2, self.transition("delivery", "ON_DELIVERY", "COMPLETE")),
+            ("dashboard", a.read_rate, self.dashboard),
+        ]
+        threads = [
+            threading.Thread(target=self.paced, args=stream, name=stream[0], daemon=True)
+            for stream in streams
+        ]
+        threads += [
+            threading.Thread(target=self.websocket_slot, args=(slot,), name="ws-%d" % slot, daemon=True)
+            for slot in range(a.ws_clients)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+
+# Sampling
+
+def parse_prometheus(text):
+    """name -> list of (labels dict, value)."""
+    metrics = defaultdict(list)
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        try:
+            series, value = line.rsplit(" ", 1)
+            value = float(value)
+        except ValueError:
+            continue
+        labels = {}
+        if "{" in series:
+            name, raw = series.split("{", 1)
+            for part in raw.rstrip("}").split('",'):
+                if "=" in part:
+                    key, val = part.split("=", 1)
+                    labels[key.strip()] = val.strip().strip('"')
+        else:
+            name = series
+        metrics[name].append((labels, value))
+    return metrics
+
+
+def metric_value(metrics, name, **match):
+    values = [v for labels, v in metrics.get(name, []) if all(labels.get(k) == str(x) for k, x in match.items())]
+    return sum(values) if values else None
+
+
+def scrape(args):
+    url = urlsplit(args.metrics_url)
+    conn_cls = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    conn = conn_cls(url.netloc, timeout=TIMEOUT)
+    headers = {"Authorization": "Bearer " + args.metrics_token} if args.metrics_token else {}
+    try:
+        conn.request("GET", url.path or "/api/metrics", headers=headers)
+        response = conn.getresponse()
+        body = response.read().decode("utf-8", "replace")
+        if response.status != 200:
+            raise RuntimeError("metrics scrape failed: HTTP %d" % response.status)
+        return parse_prometheus(body)
+    finally:
+        conn.close()
+
+
+def build_sample(metrics, drained, interval, elapsed, ws_clients):
+    ok, errors, latencies, by_op = drained
+    mb = lambda v: round(v / 1e6, 2) if v is not None else None  # noqa: E731
+    lag = metric_value(metrics, "nodejs_eventloop_lag_seconds", quantile="0.99")
+    instances = sorted({labels.get("instance") for labels, _ in metrics.get("nodejs_memory_bytes", [])} - {None})
+    total = ok + errors
+    return {
+        "t": round(elapsed, 1),
+        "at": datetime.now(timezone.utc).isoformat(),
+        "instance": ",".join(instances) or None,
+        "rss_mb": mb(metric_value(metrics, "nodejs_memory_bytes", type="rss")),
+        "heap_used_mb": mb(metric_value(metrics, "nodejs_memory_bytes", type="heap_used")),
+        "external_mb": mb(metric_value(metrics, "nodejs_memory_bytes", type="external")),
+        "eventloop_lag_p99_ms": round(lag * 1000, 2) if lag is not None else None,
+        "ws_connections": metric_value(metrics, "websocket_connections"),
+        "ws_room_members": metric_value(metrics, "websocket_room_members"),
+        "db_connections": metric_value(metrics, "db_connections"),
+        "db_idle_in_transaction": metric_value(metrics, "db_connections", state="idle in transaction") or 0,
+        "audit_queue_depth": metric_value(metrics, "audit_write_queue_depth"),
+        "throughput_rps": round(ok / interval, 2),
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "latency_p95_ms": round(percentile(latencies, 0.95), 1) if latencies else None,
+        "ws_clients": ws_clients,
+        "ops": {op: {"ok": c[0], "errors": c[1]} for op, c in sorted(by_op.items())},
+    }
+
+
+# Trend analysis
+
+def kendall_tau(values):
+    n = len(values)
+    concordant = discordant = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            if values[j] > values[i]:
+                concordant += 1
+            elif values[j] < values[i]:
+                discordant += 1
+    pairs = n * (n - 1) / 2
+    return (concordant - discordant) / pairs if pairs else 0.0
+
+
+def theil_sen_per_hour(times, values):
+    slopes = []
+    for i in range(len(values)):
+        for j in range(i + 1, len(values)):
+            if times[j] != times[i]:
+                slopes.append((values[j] - values[i]) / (times[j] - times[i]))
+    slopes.sort()
+    return slopes[len(slopes) // 2] * 3600 if slopes else 0.0
+
+
+def median(values):
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def sparkline(values, width=40):
+    blocks = "▁▂▃▄▅▆▇█"
+    if not values:
+        return ""
+    size = max(1, math.ceil(len(values) / width))
+    buckets = [median(values[i : i + size]) for i in range(0, len(values), size)]
+    low, high = min(buckets), max(buckets)
+    span = (high - low) or 1.0
+    return "".join(blocks[min(7, int((v - low) / span * 7.999))] for v in buckets)
+
+
+def analyze(samples, warmup_s, min_tau, min_change):
+    """One row per series: trend statistics and a verdict."""
+    steady = [s for s in samples if s["t"] >= warmup_s]
+    rows = []
+    for key, label, bad_direction in SERIES:
+        points = [(s["t"], s[key]) for s in steady if s.get(key) is not None]
+        if len(points) < 6:
+            rows.append({"key": key, "label": label, "verdict": "n/a", "points": len(points)})
+            continue
+        times = [t for t, _ in points]
+        values = [v for _, v in points]
+        edge = max(3, len(values) // 10)
+        start, end = median(values[:edge]), median(values[-edge:])
+        change = (end - start) / abs(start) if start else (math.inf if end > start else 0.0)
+        tau = kendall_tau(values)
+        verdict = "ok"
+        if bad_direction == "up" and tau >= min_tau and change >= min_change:
+            verdict = "GROWING"
+        elif bad_direction == "down" and tau <= -min_tau and change <= -min_change:
+            verdict = "DECAYING"
+        rows.append(
+            {
+                "key": key,
+                "label": label,
+                "points": len(points),
+                "start": start,
+                "end": end,
+                "change": change,
+                "slope_per_hour": theil_sen_per_hour(times, values),
+                "tau": tau,
+                "verdict": verdict,
+                "spark": sparkline(values),
+            }
+        )
+    return rows
+
+
+def fmt(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float) and math.isinf(value):
+        return "inf"
+    return "%.0f" % value if abs(value) >= 100 else "%.2f" % value
+
+
+def render_report(samples, rows, args, meta):
+    duration = samples[-1]["t"] if samples else 0
+    flagged = [r for r in rows if r["verdict"] in ("GROWING", "DECAYING")]
+    lines = [
+        "# Soak test report",
+        "",
+        "- target: %s (metrics %s)" % (meta.get("base_url", "-"), meta.get("metrics_url", "-")),
+        "- duration: %.1fh, %d samples every %ss, warmup excluded: %dmin"
+        % (duration / 3600, len(samples), meta.get("interval", "-"), args.warmup_minutes),
+        "- workload: %s" % json.dumps(meta.get("workload", {})),
+        "- instances seen: %s" % (", ".join(sorted({s.get("instance") or "?" for s in samples})) or "-"),
+        "- verdict: %s" % ("%d series flagged" % len(flagged) if flagged else "no monotonic growth or decay detected"),
+        "",
+        "Flagged when Kendall τ ≥ %.2f (≤ -%.2f for throughput) and the steady-state median moved by ≥ %.0f%%."
+        % (args.min_tau, args.min_tau, args.min_change * 100),
+        "",
+        "| series | start | end | change | slope/h | τ | trend | verdict |",
+        "|---|---:|---:|---:|---:|---:|---|---|",
+    ]
+    for row in rows:
+        if row["verdict"] == "n/a":
+            lines.append("| %s | - | - | - | - | - | (%d points) | n/a |" % (row["label"], row["points"]))
+            continue
+        lines.append(
+            "| %s | %s | %s | %+.0f%% | %s | %.2f | `%s` | %s |"
+            % (
+                row["label"],
+                fmt(row["start"]),
+                fmt(row["end"]),
+                row["change"] * 100 if not math.isinf(row["change"]) else float("inf"),
+                fmt(row["slope_per_hour"]),
+                row["tau"],
+                row["spark"],
+                "**%s**" % row["verdict"] if row["verdict"] != "ok" else "ok",
+            )
+        )
+
+    totals = defaultdict(lambda: [0, 0])
+    for sample in samples:
+        for op, counts in sample.get("ops", {}).items():
+            totals[op][0] += counts["ok"]
+            totals[op][1] += counts["errors"]
+    if totals:
+        lines += ["", "| operation | ok | errors |", "|---|---:|---:|"]
+        for op, (ok, errors) in sorted(totals.items()):
+            lines.append("| %s | %d | %d |" % (op, ok, errors))
+    return "\n".join(lines) + "\n", flagged
+
+
+def write_report(samples_path, args):
+    samples = []
+    meta = {}
+    for record in read_jsonl(samples_path):
+        if "meta" in record:
+            meta = record["meta"]
+        else:
+            samples.append(record)
+    if not samples:
+        sys.exit("report: no samples in %s" % samples_path)
+    rows = analyze(samples, args.warmup_minutes * 60, args.min_tau, args.min_change)
+    text, flagged = render_report(samples, rows, args, meta)
+    report_path = os.path.join(os.path.dirname(os.path.abspath(samples_path)), "report.md")
+    with open(report_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    sys.stdout.write(text)
+    print("\nreport -> %s" % report_path)
+    return flagged
+
+
+# Commands
+
+def parse_duration(value):
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def cmd_run(args):
+    with open(args.tokens, encoding="utf-8") as handle:
+        accounts = Accounts(json.load(handle), args.base_url)
+    for role in ("employee", "dapur", "delivery"):
+        if role not in accounts.accounts:
+            sys.exit("run: --tokens needs at least one %s account" % role)
+    print("logging in:")
+    accounts.login_all()
+
+    api = Api(args.base_url, accounts)
+    workload = Workload(args, api, accounts)
+    status, shifts = api.call(accounts.for_request("employee", "setup"), "GET", "/api/master-data/shifts")
+    if status != 200 or not shifts:
+        sys.exit("run: could not load shifts (HTTP %s)" % status)
+    workload.shift_ids = [shift["id"] for shift in shifts]
+    scrape(args)  # fail fast when /api/metrics is not reachable
+
+    os.makedirs(args.output, exist_ok=True)
+    samples_path = os.path.join(args.output, "samples.jsonl")
+    duration = parse_duration(args.duration)
+    meta = {
+        "base_url": args.base_url,
+        "metrics_url": args.metrics_url,
+        "interval": args.interval,
+        "duration_s": duration,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "workload": {
+            "login_per_min": args.login_rate,
+            "orders_per_min": args.order_rate,
+            "reads_per_min": args.read_rate,
+            "ws_clients": args.ws_clients,
+            "ws_lifetime_s": args.ws_lifetime,
+        },
+    }
+    print("soak for %s, sampling every %ss -> %s" % (args.duration, args.interval, samples_path))
+
+    workload.start()
+    origin = time.monotonic()
+    next_sample = origin + args.interval
+    try:
+        with open(samples_path, "w", encoding="utf-8") as out:
+            out.write(json.dumps({"meta": meta}) + "\n")
+            while time.monotonic() - origin < duration:
+                time.sleep(max(0.0, next_sample - time.monotonic()))
+                next_sample += args.interval
+                drained = workload.stats.drain()
+                try:
+                    metrics = scrape(args)
+                except (RuntimeError, http.client.HTTPException, OSError) as exc:
+                    print("sample skipped: %s" % exc, file=sys.stderr)
+                    continue
+                sample = build_sample(metrics, drained, args.interval, time.monotonic() - origin, workload.ws_connected)
+                out.write(json.dumps(sample, separators=(",", ":")) + "\n")
+                out.flush()
+                print(
+                    "[%6.0fs] rss=%sMB heap=%sMB lag99=%sms ws=%s rooms=%s db=%s rps=%.1f err=%.1f%% p95=%sms"
+                    % (
+                        sample["t"],
+                        sample["rss_mb"],
+                        sample["heap_used_mb"],
+                        sample["eventloop_lag_p99_ms"],
+                        sample["ws_connections"],
+                        sample["ws_room_members"],
+                        sample["db_connections"],
+                        sample["throughput_rps"],
+                        sample["error_rate"] * 100,
+                        sample["latency_p95_ms"],
+                    )
+                )
+    except KeyboardInterrupt:
+        print("interrupted; writing report for the samples so far")
+    finally:
+        workload.stop.set()
+
+    flagged = write_report(samples_path, args)
+    sys.exit(1 if flagged else 0)
+
+
+def cmd_report(args):
+    flagged = write_report(args.samples, args)
+    sys.exit(1 if flagged else 0)
+
+
+def add_trend_options(parser):
+    parser.add_argument("--warmup-minutes", type=int, default=10, help="ignore the first N minutes (default 10)")
+    parser.add_argument("--min-tau", type=float, default=0.5, help="trend strength to flag (Kendall tau, default 0.5)")
+    parser.add_argument("--min-change", type=float, default=0.10, help="relative change to flag (default 0.10)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="drive the workload and sample the backend")
+    run.add_argument("--base-url", default="http://localhost:3000")
+    run.add_argument("--ws-url", default="http://localhost:3001", help="Socket.IO server (WS_PORT)")
+    run.add_argument("--metrics-url", help="default: <base-url>/api/metrics")
+    run.add_argument("--metrics-token", default=os.environ.get("METRICS_TOKEN"), help="default: $METRICS_TOKEN")
+    run.add_argument("--tokens", required=True, help="JSON: role -> account(s), as for traffic_replay.py")
+    run.add_argument("--duration", default="4h", help="e.g. 30m, 4h (default 4h)")
+    run.add_argument("--interval", type=int, default=30, help="sampling interval in seconds (default 30)")
+    run.add_argument("--login-rate", type=float, default=6, help="logins per minute (default 6)")
+    run.add_argument("--order-rate", type=float, default=30, help="orders created per minute (default 30)")
+    run.add_argument("--read-rate", type=float, default=60, help="dashboard reads per minute (default 60)")
+    run.add_argument("--employees", type=int, default=50, help="virtual employees spread over the accounts")
+    run.add_argument("--ws-clients", type=int, default=50, help="concurrent websocket clients (default 50)")
+    run.add_argument("--ws-lifetime", type=float, default=120, help="mean websocket session seconds (default 120)")
+    run.add_argument("-o", "--output", required=True, help="output directory (samples.jsonl, report.md)")
+    add_trend_options(run)
+    run.set_defaults(func=cmd_run)
+
+    report = sub.add_parser("report", help="rebuild the trend report from samples.jsonl")
+    report.add_argument("samples")
+    add_trend_options(report)
+    report.set_defaults(func=cmd_report)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        args.metrics_url = args.metrics_url or args.base_url.rstrip("/") + "/api/metrics"
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
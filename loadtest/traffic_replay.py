@@ -0,0 +1,633 @@
+#!/usr/bin/env python3
+"""
+Traffic capture & replay for staging load tests.
+
+Turns real API traffic into a replayable trace and plays it back against a local
+backend at a chosen speed, keeping the original inter-arrival timing.
+
+  capture  nginx access log (combined or the `bebang_replay` format from
+           nginx.conf.example) or a HAR capture file -> trace (JSON lines)
+  replay   trace -> run file (one JSON line per request with latency/status/lag)
+  report   run files (and optionally the original timings) -> per-route
+           latency comparison as a markdown table
+
+Only the standard library is used, so the tool runs on any host with Python 3.8+.
+
+Examples:
+  python loadtest/traffic_replay.py capture --nginx access.log \\
+      --since 2026-10-19T05:30 --until 2026-10-19T07:30 -o shift-change.jsonl
+  python loadtest/traffic_replay.py replay shift-change.jsonl \\
+      --tokens loadtest/tokens.example.json --bodies loadtest/bodies.example.json \\
+      --speed 5 -o runs/5x.jsonl
+  python loadtest/traffic_replay.py report runs/1x.jsonl runs/5x.jsonl runs/10x.jsonl \\
+      --original shift-change.jsonl
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+API_PREFIX = "/api/"
+TIMEOUT = 30
+ROLES = ("employee", "dapur", "delivery", "administrator")
+
+# Auth calls are never replayed: the replayer logs in with its own accounts and a
+# replayed logout would revoke them.
+SKIPPED_ROUTES = re.compile(r"^/api/auth/(login|refresh|logout)$")
+
+# Roles allowed per route (mirrors the @Roles guards); first match wins.
+# Routes not listed are open to every authenticated role.
+ROUTE_ROLES = [
+    ("POST", r"^/api/orders$", ("employee",)),
+    ("POST", r"^/api/orders/:id/(request-rejection|request-edit)$", ("dapur",)),
+    ("POST", r"^/api/orders/:id/approve-reject$", ("administrator",)),
+    ("PATCH", r"^/api/orders/:id/status$", ("dapur", "delivery", "administrator")),
+    ("GET", r"^/api/orders/pending-approvals", ("dapur", "administrator")),
+    ("GET", r"^/api/orders/counters$", ("dapur", "delivery", "administrator")),
+    ("POST", r"^/api/orders/templates/materialize$", ("administrator",)),
+    ("POST", r"^/api/orders/templates$", ("employee",)),
+    ("*", r"^/api/orders/templates(/|$)", ("employee", "administrator")),
+    ("*", r"^/api/(users|reports)(/|$)", ("administrator",)),
+    ("POST", r"^/api/master-data/", ("administrator",)),
+    ("PATCH", r"^/api/master-data/", ("administrator",)),
+    ("DELETE", r"^/api/master-data/", ("administrator",)),
+]
+
+UUID_RE = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I
+)
+
+# combined, optionally followed by the bebang_replay fields
+NGINX_RE = re.compile(
+    r'^(?P<addr>\S+) \S+ (?P<user>\S+) \[(?P<time>[^\]]+)\] '
+    r'"(?P<method>[A-Z]+) (?P<uri>\S+) [^"]*" (?P<status>\d{3}) (?P<bytes>\S+) '
+    r'"(?P<referer>[^"]*)" "(?P<agent>[^"]*)"'
+    r'(?: rt=(?P<rt>[\d.]+))?(?: urt=(?P<urt>\S+))?(?: msec=(?P<msec>[\d.]+))?'
+)
+
+
+# Helpers
+
+def normalize_route(path):
+    """Route pattern for grouping: query stripped, id-like segments replaced by :id."""
+    path = path.split("?", 1)[0]
+    segments = []
+    for segment in path.split("/"):
+        if segment.isdigit() or UUID_RE.match(segment):
+            segments.append(":id")
+        elif len(segment) >= 8 and re.search(r"\d", segment) and re.search(r"[-_]", segment):
+            # Order codes and similar business keys
+            segments.append(":id")
+        else:
+            segments.append(segment)
+    return "/".join(segments).rstrip("/") or "/"
+
+
+def allowed_roles(method, route):
+    for rule_method, pattern, roles in ROUTE_ROLES:
+        if rule_method in ("*", method) and re.search(pattern, route):
+            return roles
+    return ROLES
+
+
+def jwt_role(authorization):
+    """Role claim of a bearer token (signature is not checked; capture only)."""
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None, None
+    try:
+        payload = authorization.split(" ", 1)[1].split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return claims.get("role"), claims.get("sub")
+    except (IndexError, ValueError):
+        return None, None
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def parse_time(value):
+    """ISO date/time from the command line; naive values are local time."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()
+    return parsed.timestamp()
+
+
+# Capture
+
+def read_nginx(path):
+    """Requests from an nginx access log as (start_ts, request dict)."""
+    same_second = defaultdict(int)
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            match = NGINX_RE.match(line)
+            if not match or not match.group("uri").startswith(API_PREFIX):
+                continue
+            rt = float(match.group("rt")) if match.group("rt") else None
+            if match.group("msec"):
+                # $msec is logged when the response ends
+                start = float(match.group("msec")) - (rt or 0.0)
+            else:
+                # combined only has whole seconds: keep log order inside a second
+                second = datetime.strptime(
+                    match.group("time"), "%d/%b/%Y:%H:%M:%S %z"
+                ).timestamp()
+                start = second + same_second[second] * 1e-3
+                same_second[second] += 1
+            yield start, {
+                "method": match.group("method"),
+                "path": match.group("uri"),
+                "status": int(match.group("status")),
+                "latency_ms": round(rt * 1000, 1) if rt is not None else None,
+                "client": "%s|%s" % (match.group("addr"), match.group("agent")),
+                "role": None,
+                "body": None,
+            }
+
+
+def read_har(path):
+    """Requests from a HAR capture (browser devtools / proxy export)."""
+    with open(path, encoding="utf-8") as handle:
+        har = json.load(handle)
+    for entry in har.get("log", {}).get("entries", []):
+        request = entry["request"]
+        url = urlsplit(request["url"])
+        path = url.path + ("?" + url.query if url.query else "")
+        if not path.startswith(API_PREFIX):
+            continue
+        headers = {h["name"].lower(): h["value"] for h in request.get("headers", [])}
+        role, sub = jwt_role(headers.get("authorization"))
+        body = None
+        text = (request.get("postData") or {}).get("text")
+        if text:
+            try:
+                body = json.loads(text)
+            except ValueError:
+                body = None
+        start = datetime.fromisoformat(
+            entry["startedDateTime"].replace("Z", "+00:00")
+        ).timestamp()
+        yield start, {
+            "method": request["method"],
+            "path": path,
+            "status": entry.get("response", {}).get("status"),
+            "latency_ms": round(entry["time"], 1) if entry.get("time") is not None else None,
+            "client": "sub:%s" % sub if sub is not None else "har",
+            "role": role,
+            "body": body,
+        }
+
+
+def assign_roles(requests_):
+    """
+    Role per request. HAR requests carry the role of their token; for access logs a
+    client (address + user agent) gets the first role allowed on every route it
+    called, falling back per request when no single role fits.
+    """
+    client_roles = {}
+    for _, request in requests_:
+        if request["role"]:
+            continue
+        allowed = set(allowed_roles(request["method"], request["route"]))
+        client_roles[request["client"]] = client_roles.get(request["client"], set(ROLES)) & allowed
+    for _, request in requests_:
+        if request["role"]:
+            continue
+        allowed = allowed_roles(request["method"], request["route"])
+        candidates = [r for r in ROLES if r in client_roles.get(request["client"], ())]
+        request["role"] = candidates[0] if candidates else allowed[0]
+
+
+def cmd_capture(args):
+    if not args.nginx and not args.har:
+        sys.exit("capture: pass --nginx and/or --har")
+    since = parse_time(args.since) if args.since else None
+    until = parse_time(args.until) if args.until else None
+
+    requests_ = []
+    sources = [(read_nginx, p) for p in args.nginx] + [(read_har, p) for p in args.har]
+    for reader, path in sources:
+        for start, request in reader(path):
+            if since is not None and start < since:
+                continue
+            if until is not None and start >= until:
+                continue
+            request["route"] = normalize_route(request["path"])
+            if SKIPPED_ROUTES.match(request["route"]):
+                continue
+            requests_.append((start, request))
+    if not requests_:
+        sys.exit("capture: no API requests found in the given range")
+
+    requests_.sort(key=lambda item: item[0])
+    assign_roles(requests_)
+
+    # Clients become opaque ids so traces can be shared without addresses
+    client_ids = {}
+    origin = requests_[0][0]
+    with open(args.output, "w", encoding="utf-8") as out:
+        for start, request in requests_:
+            client = client_ids.setdefault(request["client"], len(client_ids))
+            record = {
+                "t": round(start - origin, 3),
+                "method": request["method"],
+                "path": request["path"],
+                "route": request["route"],
+                "role": request["role"],
+                "client": client,
+                "status": request["status"],
+                "latency_ms": request["latency_ms"],
+            }
+            if request["body"] is not None:
+                record["body"] = request["body"]
+            out.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    by_role = defaultdict(int)
+    for _, request in requests_:
+        by_role[request["role"]] += 1
+    duration = requests_[-1][0] - origin
+    print(
+        "captured %d requests over %.0fs from %d clients -> %s"
+        % (len(requests_), duration, len(client_ids), args.output)
+    )
+    print("  by role: " + ", ".join("%s=%d" % kv for kv in sorted(by_role.items())))
+
+
+# Replay
+
+class Accounts:
+    """
+    Bearer tokens per role. Each original client is pinned to one account of its
+    role (round robin), so per-user limits and data see a realistic spread.
+    """
+
+    def __init__(self, config, base_url):
+        self.base_url = base_url
+        self.accounts = {}
+        for role, entries in config.items():
+            if isinstance(entries, dict):
+                entries = [entries]
+            self.accounts[role] = [dict(entry, token=entry.get("token")) for entry in entries]
+        self.pinned = {}
+        self.lock = threading.Lock()
+
+    def login_all(self):
+        for role, entries in self.accounts.items():
+            for account in entries:
+                if not account["token"]:
+                    self.login(account)
+            print("  %s: %d account(s)" % (role, len(entries)))
+
+    def login(self, account):
+        status, body = http_json(
+            self.base_url,
+            "POST",
+            "/api/auth/login",
+            {"nik": account["nik"], "password": account["password"]},
+        )
+        if status not in (200, 201):
+            sys.exit("login failed for %s: HTTP %s" % (account.get("nik"), status))
+        account["token"] = body["accessToken"]
+
+    def for_request(self, role, client):
+        with self.lock:
+            key = (role, client)
+            if key not in self.pinned:
+                entries = self.accounts.get(role)
+                if not entries:
+                    return None
+                index = sum(1 for r, _ in self.pinned if r == role) % len(entries)
+                self.pinned[key] = entries[index]
+            return self.pinned[key]
+
+    def refresh(self, account, stale_token):
+        # Access tokens expire during long replays: one re-login per expiry
+        with self.lock:
+            if account["token"] == stale_token and account.get("nik"):
+                self.login(account)
+
+
+def http_json(base_url, method, path, body):
+    url = urlsplit(base_url)
+    conn_cls = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    conn = conn_cls(url.netloc, timeout=TIMEOUT)
+    try:
+        conn.request(method, path, json.dumps(body), {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        data = response.read()
+        return response.status, json.loads(data) if data else None
+    finally:
+        conn.close()
+
+
+class Replayer:
+    def __init__(self, args, accounts, bodies):
+        self.base = urlsplit(args.base_url)
+        self.accounts = accounts
+        self.bodies = bodies
+        self.local = threading.local()
+        self.out_lock = threading.Lock()
+        self.out = None
+        self.counts = defaultdict(int)
+
+    def connection(self):
+        # One keep-alive connection per worker thread
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn_cls = (
+                http.client.HTTPSConnection
+                if self.base.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            conn = conn_cls(self.base.netloc, timeout=TIMEOUT)
+            self.local.conn = conn
+        return conn
+
+    def send(self, method, path, body, token):
+        headers = {"Accept": "application/json"}
+        payload = None
+        if token:
+            headers["Authorization"] = "Bearer " + token
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        for attempt in (1, 2):
+            conn = self.connection()
+            try:
+                conn.request(method, path, payload, headers)
+                response = conn.getresponse()
+                size = len(response.read())
+                return response.status, size
+            except (http.client.HTTPException, OSError):
+                # Server closed an idle keep-alive connection: retry once on a new one
+                conn.close()
+                self.local.conn = None
+                if attempt == 2:
+                    raise
+        return None, 0
+
+    def execute(self, entry, scheduled, started_at):
+        lag = time.monotonic() - scheduled
+        account = self.accounts.for_request(entry["role"], entry["client"])
+        token = account["token"] if account else None
+        body = entry.get("body")
+        if body is None and entry["method"] in ("POST", "PATCH", "PUT"):
+            body = self.bodies.get("%s %s" % (entry["method"], entry["route"]))
+
+        record = {
+            "t": entry["t"],
+            "method": entry["method"],
+            "route": entry["route"],
+            "role": entry["role"],
+            "lag_ms": round(lag * 1000, 1),
+        }
+        begin = time.monotonic()
+        try:
+            status, size = self.send(entry["method"], entry["path"], body, token)
+            if status == 401 and account:
+                self.accounts.refresh(account, token)
+                begin = time.monotonic()
+                status, size = self.send(entry["method"], entry["path"], body, account["token"])
+            record.update(status=status, bytes=size)
+        except (http.client.HTTPException, OSError) as exc:
+            record.update(status=None, error=type(exc).__name__)
+        record["latency_ms"] = round((time.monotonic() - begin) * 1000, 1)
+        record["at"] = round(time.time() - started_at, 3)
+
+        with self.out_lock:
+            self.out.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self.counts[record["status"]] += 1
+
+
+def cmd_replay(args):
+    trace = list(read_jsonl(args.trace))
+    if args.read_only:
+        trace = [entry for entry in trace if entry["method"] in ("GET", "HEAD")]
+    if args.limit:
+        trace = trace[: args.limit]
+    if not trace:
+        sys.exit("replay: trace is empty")
+
+    with open(args.tokens, encoding="utf-8") as handle:
+        accounts = Accounts(json.load(handle), args.base_url)
+    bodies = {}
+    if args.bodies:
+        with open(args.bodies, encoding="utf-8") as handle:
+            bodies = json.load(handle)
+
+    missing = sorted({e["role"] for e in trace} - set(accounts.accounts))
+    if missing:
+        print("warning: no accounts for role(s) %s; sent without a token" % ", ".join(missing))
+    print("logging in:")
+    accounts.login_all()
+
+    duration = trace[-1]["t"] / args.speed
+    print(
+        "replaying %d requests at %gx (~%.0fs) against %s with %d workers"
+        % (len(trace), args.speed, duration, args.base_url, args.workers)
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    replayer = Replayer(args, accounts, bodies)
+    started_at = time.time()
+    origin = time.monotonic()
+    with open(args.output, "w", encoding="utf-8") as out:
+        replayer.out = out
+        out.write(
+            json.dumps(
+                {
+                    "meta": {
+                        "trace": os.path.basename(args.trace),
+                        "speed": args.speed,
+                        "base_url": args.base_url,
+                        "workers": args.workers,
+                        "requests": len(trace),
+                        "started_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                }
+            )
+            + "\n"
+        )
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            # Dispatcher keeps the original spacing; workers record how late they start
+            for entry in trace:
+                scheduled = origin + entry["t"] / args.speed
+                delay = scheduled - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(replayer.execute, entry, scheduled, started_at)
+
+    elapsed = time.monotonic() - origin
+    statuses = ", ".join(
+        "%s=%d" % (status if status is not None else "error", count)
+        for status, count in sorted(replayer.counts.items(), key=lambda kv: str(kv[0]))
+    )
+    print("done in %.1fs (%.1f req/s): %s -> %s" % (elapsed, len(trace) / elapsed, statuses, args.output))
+
+
+# Report
+
+def load_run(path):
+    """Latency samples per route from a run file, or the original timings of a trace."""
+    meta = {}
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    lags = []
+    for record in read_jsonl(path):
+        if "meta" in record:
+            meta = record["meta"]
+            continue
+        if record.get("latency_ms") is None:
+            continue
+        key = "%s %s" % (record["method"], record["route"])
+        samples[key].append(record["latency_ms"])
+        status = record.get("status")
+        if status is None or status >= 500:
+            errors[key] += 1
+        if "lag_ms" in record:
+            lags.append(record["lag_ms"])
+    label = "%gx" % meta["speed"] if "speed" in meta else "original"
+    return {"label": label, "path": path, "samples": samples, "errors": errors, "lags": sorted(lags)}
+
+
+def summarize(values):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": values[-1] if values else None,
+    }
+
+
+def fmt_ms(value):
+    return "-" if value is None else ("%.0f" % value if value >= 100 else "%.1f" % value)
+
+
+def cmd_report(args):
+    runs = []
+    if args.original:
+        runs.append(load_run(args.original))
+    runs.extend(load_run(path) for path in args.runs)
+    baseline = runs[0]
+
+    lines = ["# Replay latency report", ""]
+    lines.append("| run | file | requests | 5xx/errors | dispatch lag p99 (ms) |")
+    lines.append("|---|---|---:|---:|---:|")
+    for run in runs:
+        total = sum(len(v) for v in run["samples"].values())
+        errors = sum(run["errors"].values())
+        lag = fmt_ms(percentile(run["lags"], 0.99)) if run["lags"] else "-"
+        lines.append(
+            "| %s | %s | %d | %d | %s |"
+            % (run["label"], os.path.basename(run["path"]), total, errors, lag)
+        )
+
+    routes = defaultdict(int)
+    for run in runs:
+        for key, values in run["samples"].items():
+            routes[key] += len(values)
+    ordered = sorted(routes, key=lambda k: -routes[k])[: args.top]
+
+    lines += ["", "Latency per route (ms). Δp95 is relative to the first column (%s)." % baseline["label"], ""]
+    lines.append("| route | run | count | err | p50 | p95 | p99 | max | Δp95 |")
+    lines.append("|---|---|---:|---:|---:|---:|---:|---:|---:|")
+    for key in ordered:
+        base = summarize(baseline["samples"].get(key, []))
+        label = key
+        for run in runs:
+            stats = summarize(run["samples"].get(key, []))
+            if stats["count"] == 0:
+                continue
+            delta = "-"
+            if run is not baseline and base["p95"] and stats["p95"] is not None:
+                delta = "%+.0f%%" % ((stats["p95"] / base["p95"] - 1) * 100)
+            lines.append(
+                "| %s | %s | %d | %d | %s | %s | %s | %s | %s |"
+                % (
+                    label,
+                    run["label"],
+                    stats["count"],
+                    run["errors"].get(key, 0),
+                    fmt_ms(stats["p50"]),
+                    fmt_ms(stats["p95"]),
+                    fmt_ms(stats["p99"]),
+                    fmt_ms(stats["max"]),
+                    delta,
+                )
+            )
+            label = ""
+
+    text = "\n".join(lines) + "\n"
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        print("report -> %s" % args.output)
+    else:
+        sys.stdout.write(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    capture = sub.add_parser("capture", help="build a trace from access logs / HAR files")
+    capture.add_argument("--nginx", action="append", default=[], help="nginx access log (repeatable)")
+    capture.add_argument("--har", action="append", default=[], help="HAR capture file (repeatable)")
+    capture.add_argument("--since", help="keep requests from this local time (ISO)")
+    capture.add_argument("--until", help="keep requests before this local time (ISO)")
+    capture.add_argument("-o", "--output", required=True, help="trace file (JSON lines)")
+    capture.set_defaults(func=cmd_capture)
+
+    replay = sub.add_parser("replay", help="replay a trace against a backend")
+    replay.add_argument("trace")
+    replay.add_argument("--base-url", default="http://localhost:3000")
+    replay.add_argument("--speed", type=float, default=1.0, help="1, 5, 10 ... (default 1)")
+    replay.add_argument("--tokens", required=True, help="JSON: role -> account(s) {nik,password} or {token}")
+    replay.add_argument("--bodies", help="JSON: 'METHOD /api/route' -> body for requests without one")
+    replay.add_argument("--workers", type=int, default=128, help="concurrent requests (default 128)")
+    replay.add_argument("--read-only", action="store_true", help="replay GET requests only")
+    replay.add_argument("--limit", type=int, help="replay only the first N requests")
+    replay.add_argument("-o", "--output", required=True, help="run file (JSON lines)")
+    replay.set_defaults(func=cmd_replay)
+
+    report = sub.add_parser("report", help="compare latency per route between runs")
+    report.add_argument("runs", nargs="+", help="run files; the first is the baseline")
+    report.add_argument("--original", help="trace file: use its logged timings as the baseline")
+    report.add_argument("--top", type=int, default=30, help="routes by volume (default 30)")
+    report.add_argument("-o", "--output", help="write markdown here instead of stdout")
+    report.set_defaults(func=cmd_report)
+
+    args = parser.parse_args()
+    if getattr(args, "speed", 1) <= 0:
+        parser.error("--speed must be positive")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()